@@ -1,9 +1,17 @@
+import json
 import os
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 
+import httpx
 import pytz
 from app.api.v1.endpoints.auth import get_current_user
+from app.core.config import get_settings
+from app.db.redis_client import get_redis_client
 from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pydantic import BaseModel, Field
 
@@ -23,6 +31,13 @@ from spreadpilot_core.logging.logger import get_logger
 
 router = APIRouter()
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Milliseconds a progress stream blocks on Redis before sending a keep-alive
+FLATTEN_EVENTS_BLOCK_MS = 5000
+
+# Seconds the trading bot keeps flatten runs in Redis; no stream outlives a run
+FLATTEN_RUN_TTL_SECONDS = 24 * 3600
 
 # PIN for manual operations - MUST be set via environment variable or Vault
 # Security: No default value to prevent unauthorized access
@@ -187,3 +202,124 @@ async def manual_close_positions(request: ManualCloseRequest = Body(...)):
         entries will be created and no positions will be closed. Returns simulated response.
     """
     return await _manual_close_positions_impl(request)
+
+
+class EmergencyFlattenRequest(BaseModel):
+    pin: str = Field(..., description="Security PIN for manual operations")
+    follower_ids: list[str] | None = Field(
+        default=None,
+        description="Followers to flatten (all active followers if omitted)",
+    )
+    reason: str = Field(
+        default="Emergency flatten requested by admin", description="Reason for the flatten"
+    )
+
+
+async def _emergency_flatten_impl(request: EmergencyFlattenRequest) -> dict[str, Any]:
+    """Implementation of emergency flatten."""
+    # Verify PIN
+    if request.pin != MANUAL_OPERATION_PIN:
+        logger.warning("Invalid PIN attempt for emergency flatten")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid PIN")
+
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(
+                f"{settings.trading_bot_url}/flatten",
+                json={"follower_ids": request.follower_ids, "reason": request.reason},
+            )
+            response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Error starting emergency flatten on the trading bot: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to start emergency flatten on the trading bot",
+        )
+
+    run = response.json()
+    logger.warning(
+        f"Emergency flatten {run['run_id']} started for {run['followers_total']} followers: "
+        f"{request.reason}"
+    )
+    return run
+
+
+@router.post(
+    "/emergency-flatten",
+    dependencies=[Depends(get_current_user)],
+)
+@dry_run_async(
+    "manual_operation",
+    return_value={"run_id": "DRY_RUN", "status": "DRY_RUN", "followers_total": 0},
+    log_args=False,
+)
+async def emergency_flatten(request: EmergencyFlattenRequest = Body(...)):
+    """
+    Close all positions of all (or the given) followers at once.
+    Requires authentication and correct PIN configured via MANUAL_OPERATION_PIN environment variable.
+
+    The trading bot closes followers concurrently and returns immediately with the
+    run ID. Progress can be followed on /emergency-flatten/{run_id}/events.
+    """
+    return await _emergency_flatten_impl(request)
+
+
+async def _flatten_events(redis_client, run_id: str) -> AsyncIterator[str]:
+    """Relay a flatten run's Redis event stream as server-sent events.
+
+    The stream ends after the "completed" event. It also ends when the run
+    stops being RUNNING without one, when its snapshot expires (e.g. the
+    trading bot restarted mid-run), or after the run TTL at the latest.
+    """
+    key = f"flatten:{run_id}"
+    stream = f"{key}:events"
+    last_id = "0"
+    deadline = time.monotonic() + FLATTEN_RUN_TTL_SECONDS
+    while True:
+        entries = await redis_client.xread({stream: last_id}, block=FLATTEN_EVENTS_BLOCK_MS)
+        if not entries:
+            snapshot = await redis_client.get(key)
+            run_status = json.loads(snapshot)["status"] if snapshot else None
+            if run_status != "RUNNING" or time.monotonic() > deadline:
+                logger.warning(f"Flatten run {run_id} progress ended without completing")
+                yield f"data: {json.dumps({'event': 'ended', 'status': run_status})}\n\n"
+                return
+
+            # Comment line keeps proxies from closing an idle connection
+            yield ": keep-alive\n\n"
+            continue
+
+        for _, messages in entries:
+            for last_id, fields in messages:
+                yield f"data: {fields['data']}\n\n"
+                if json.loads(fields["data"]).get("event") == "completed":
+                    return
+
+
+@router.get(
+    "/emergency-flatten/{run_id}/events",
+    dependencies=[Depends(get_current_user)],
+)
+async def emergency_flatten_events(run_id: str):
+    """
+    Stream the progress of an emergency flatten as server-sent events.
+
+    Each event is a JSON object: one per closed leg, one per finished follower,
+    and a final "completed" event with the total time to flat, after which the
+    stream ends. A run that stops without completing, e.g. because the trading
+    bot restarted, ends with an "ended" event carrying its last status.
+    """
+    redis_client = get_redis_client()
+    if redis_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Redis is not available for flatten progress",
+        )
+
+    if not await redis_client.exists(f"flatten:{run_id}"):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Flatten run {run_id} not found",
+        )
+
+    return StreamingResponse(_flatten_events(redis_client, run_id), media_type="text/event-stream")
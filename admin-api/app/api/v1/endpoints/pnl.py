@@ -7,7 +7,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from spreadpilot_core.db.postgresql import get_postgres_session
 from spreadpilot_core.logging.logger import get_logger
 from spreadpilot_core.models.pnl import PnLDaily, PnLIntraday, PnLMonthly
-from sqlalchemy import and_, desc, func, select
+from spreadpilot_core.utils.time import get_month_range
+from sqlalchemy import and_, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -114,6 +115,8 @@ async def get_month_pnl(year: int | None = None, month: int | None = None):
                 detail="Invalid month. Must be between 1 and 12",
             )
 
+        month_start, month_end = get_month_range(year, month)
+
         async with get_postgres_session() as session:
             # Get monthly P&L summaries
             monthly_result = await session.execute(
@@ -128,8 +131,8 @@ async def get_month_pnl(year: int | None = None, month: int | None = None):
                 select(PnLDaily)
                 .where(
                     and_(
-                        func.extract("year", PnLDaily.trading_date) == year,
-                        func.extract("month", PnLDaily.trading_date) == month,
+                        PnLDaily.trading_date >= month_start,
+                        PnLDaily.trading_date < month_end,
                     )
                 )
                 .order_by(PnLDaily.trading_date, PnLDaily.follower_id)
@@ -38,6 +38,9 @@ class Settings(BaseModel):
     # Redis configuration
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
 
+    # Trading bot API, used to start emergency flattens
+    trading_bot_url: str = os.getenv("TRADING_BOT_URL", "http://trading-bot:8081")
+
     # Dry-run mode
     dry_run_mode: bool = os.getenv("DRY_RUN_MODE", "false").lower() == "true"
 
@@ -1,6 +1,9 @@
+import json
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from app.api.v1.endpoints import manual_operations
+from fakeredis import aioredis as fakeredis
 from fastapi.testclient import TestClient
 
 
@@ -129,3 +132,92 @@ def test_manual_close_requires_auth(client: TestClient):
 
     response = client.post("/api/v1/manual-close", json=request_data)
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_emergency_flatten_starts_run(client: TestClient, auth_headers: dict):
+    """Test that emergency flatten starts a run on the trading bot."""
+    request_data = {"pin": "0312", "reason": "Market halt"}
+    run = {"run_id": "run_123", "status": "RUNNING", "followers_total": 12}
+
+    with patch("admin-api.app.api.v1.endpoints.manual_operations.httpx.AsyncClient") as mock_http:
+        mock_client = mock_http.return_value.__aenter__.return_value
+        mock_client.post = AsyncMock()
+        mock_client.post.return_value.json = lambda: run
+
+        response = client.post("/api/v1/emergency-flatten", json=request_data, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["run_id"] == "run_123"
+    assert mock_client.post.call_args.kwargs["json"] == {
+        "follower_ids": None,
+        "reason": "Market halt",
+    }
+
+
+@pytest.mark.asyncio
+async def test_emergency_flatten_invalid_pin(client: TestClient, auth_headers: dict):
+    """Test emergency flatten with invalid PIN."""
+    request_data = {"pin": "9999"}
+
+    response = client.post("/api/v1/emergency-flatten", json=request_data, headers=auth_headers)
+
+    assert response.status_code == 403
+    assert "Invalid PIN" in response.json()["detail"]
+
+
+async def _collect_events(redis_client, run_id: str) -> list[str]:
+    with patch.object(manual_operations, "FLATTEN_EVENTS_BLOCK_MS", 10):
+        return [event async for event in manual_operations._flatten_events(redis_client, run_id)]
+
+
+@pytest.mark.asyncio
+async def test_emergency_flatten_events_unknown_run(client: TestClient, auth_headers: dict):
+    """Test that following an unknown or expired run returns 404."""
+    with patch.object(
+        manual_operations, "get_redis_client", return_value=fakeredis.FakeRedis()
+    ):
+        response = client.get("/api/v1/emergency-flatten/missing/events", headers=auth_headers)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_flatten_events_end_after_completed():
+    """Test that the stream relays events up to the completed event."""
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    await redis_client.set("flatten:run_1", json.dumps({"status": "RUNNING"}))
+    for event in ("started", "follower", "completed"):
+        await redis_client.xadd("flatten:run_1:events", {"data": json.dumps({"event": event})})
+
+    events = await _collect_events(redis_client, "run_1")
+
+    assert [json.loads(event[len("data: ") :])["event"] for event in events] == [
+        "started",
+        "follower",
+        "completed",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flatten_events_end_when_run_is_gone():
+    """Test that a run whose snapshot expired without completing ends the stream."""
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    await redis_client.xadd("flatten:run_1:events", {"data": json.dumps({"event": "started"})})
+
+    events = await _collect_events(redis_client, "run_1")
+
+    assert json.loads(events[-1][len("data: ") :]) == {"event": "ended", "status": None}
+
+
+@pytest.mark.asyncio
+async def test_flatten_events_keep_alive_while_running():
+    """Test that a running run gets keep-alives until the run TTL passes."""
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    await redis_client.set("flatten:run_1", json.dumps({"status": "RUNNING"}))
+
+    with patch.object(manual_operations, "FLATTEN_RUN_TTL_SECONDS", 0.05):
+        events = await _collect_events(redis_client, "run_1")
+
+    assert events[0] == ": keep-alive\n\n"
+    assert json.loads(events[-1][len("data: ") :]) == {"event": "ended", "status": "RUNNING"}
@@ -0,0 +1,148 @@
+"""Add position lots and realized P&L per trade
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-07-14 10:00:00.000000
+
+"""
+
+import uuid
+from collections import deque
+from collections.abc import Sequence
+from datetime import date, datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "004"
+down_revision: str | None = "003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Realized P&L booked by each fill
+    op.add_column(
+        "trades",
+        sa.Column(
+            "realized_pnl",
+            sa.Numeric(precision=12, scale=4),
+            nullable=False,
+            server_default="0",
+        ),
+    )
+
+    # Create position_lots table
+    op.create_table(
+        "position_lots",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("follower_id", sa.String(length=50), nullable=False),
+        sa.Column("symbol", sa.String(length=20), nullable=False),
+        sa.Column("contract_type", sa.String(length=10), nullable=False),
+        sa.Column("strike", sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column("expiration", sa.Date(), nullable=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("price", sa.Numeric(precision=10, scale=4), nullable=False),
+        sa.Column("opened_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_position_lots_follower_opened",
+        "position_lots",
+        ["follower_id", "opened_at"],
+        unique=False,
+    )
+
+    _backfill_open_lots()
+
+
+def _backfill_open_lots() -> None:
+    """Seed lots for positions already open by replaying recorded trades FIFO.
+
+    Without this the lot engine starts with empty books, and the first closing
+    fill of a position opened before this migration would open a new lot
+    instead of realizing P&L. Contracts that have already expired are skipped.
+    """
+    bind = op.get_bind()
+    trades = bind.execute(
+        sa.text(
+            """
+            SELECT follower_id, symbol, contract_type, strike, expiration,
+                   trade_type, quantity, price, trade_time
+            FROM trades
+            WHERE expiration >= :today
+            ORDER BY trade_time, created_at
+            """
+        ),
+        {"today": date.today()},
+    )
+
+    books: dict[tuple, deque] = {}
+    for trade in trades:
+        key = (trade.follower_id, trade.symbol, trade.contract_type, trade.strike, trade.expiration)
+        book = books.setdefault(key, deque())
+        remaining = trade.quantity if trade.trade_type == "BUY" else -trade.quantity
+
+        # Close the oldest lots on the other side first, then open the remainder
+        while remaining and book and (book[0][0] > 0) != (remaining > 0):
+            lot_quantity, price, opened_at = book[0]
+            closed = min(abs(lot_quantity), abs(remaining))
+            sign = 1 if lot_quantity > 0 else -1
+            if closed == abs(lot_quantity):
+                book.popleft()
+            else:
+                book[0] = (lot_quantity - sign * closed, price, opened_at)
+            remaining += sign * closed
+        if remaining:
+            book.append((remaining, trade.price, trade.trade_time))
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "follower_id": follower_id,
+            "symbol": symbol,
+            "contract_type": contract_type,
+            "strike": strike,
+            "expiration": expiration,
+            "quantity": quantity,
+            "price": price,
+            "opened_at": opened_at,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for (follower_id, symbol, contract_type, strike, expiration), book in books.items()
+        for quantity, price, opened_at in book
+    ]
+    if rows:
+        position_lots = sa.table(
+            "position_lots",
+            sa.column("id", postgresql.UUID(as_uuid=True)),
+            *(
+                sa.column(name)
+                for name in (
+                    "follower_id",
+                    "symbol",
+                    "contract_type",
+                    "strike",
+                    "expiration",
+                    "quantity",
+                    "price",
+                    "opened_at",
+                    "created_at",
+                    "updated_at",
+                )
+            ),
+        )
+        op.bulk_insert(position_lots, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_position_lots_follower_opened", table_name="position_lots")
+    op.drop_table("position_lots")
+    op.drop_column("trades", "realized_pnl")
@@ -0,0 +1,84 @@
+"""Make daily and monthly rollups unique per follower and period
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-07-15 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005"
+down_revision: str | None = "004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Keep only the latest rollup per follower and period before adding the unique indexes
+    op.execute(
+        """
+        DELETE FROM pnl_daily
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY follower_id, trading_date
+                    ORDER BY rollup_time DESC, created_at DESC
+                ) AS rank
+                FROM pnl_daily
+            ) ranked
+            WHERE rank > 1
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM pnl_monthly
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY follower_id, year, month
+                    ORDER BY rollup_time DESC, created_at DESC
+                ) AS rank
+                FROM pnl_monthly
+            ) ranked
+            WHERE rank > 1
+        )
+        """
+    )
+
+    # Unique indexes let bulk rollups upsert with ON CONFLICT
+    op.drop_index("ix_pnl_daily_follower_date", table_name="pnl_daily")
+    op.create_index(
+        "ix_pnl_daily_follower_date",
+        "pnl_daily",
+        ["follower_id", "trading_date"],
+        unique=True,
+    )
+    op.drop_index("ix_pnl_monthly_follower_period", table_name="pnl_monthly")
+    op.create_index(
+        "ix_pnl_monthly_follower_period",
+        "pnl_monthly",
+        ["follower_id", "year", "month"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pnl_monthly_follower_period", table_name="pnl_monthly")
+    op.create_index(
+        "ix_pnl_monthly_follower_period",
+        "pnl_monthly",
+        ["follower_id", "year", "month"],
+        unique=False,
+    )
+    op.drop_index("ix_pnl_daily_follower_date", table_name="pnl_daily")
+    op.create_index(
+        "ix_pnl_daily_follower_date",
+        "pnl_daily",
+        ["follower_id", "trading_date"],
+        unique=False,
+    )
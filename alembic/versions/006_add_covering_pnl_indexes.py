@@ -0,0 +1,41 @@
+"""Add covering indexes for per-follower P&L time range queries
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-07-18 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "006"
+down_revision: str | None = "005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Commission and volume sums over a trade_time range are answered from the index alone
+    op.drop_index("ix_trades_follower_time", table_name="trades")
+    op.create_index(
+        "ix_trades_follower_time",
+        "trades",
+        ["follower_id", "trade_time"],
+        postgresql_include=["commission", "quantity"],
+    )
+
+    # First/last snapshot of a trading day per follower
+    op.create_index(
+        "ix_pnl_intraday_follower_date_time",
+        "pnl_intraday",
+        ["follower_id", "trading_date", "snapshot_time"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pnl_intraday_follower_date_time", table_name="pnl_intraday")
+    op.drop_index("ix_trades_follower_time", table_name="trades")
+    op.create_index("ix_trades_follower_time", "trades", ["follower_id", "trade_time"])
@@ -0,0 +1,208 @@
+"""Range partition quotes by day and pnl_intraday by month
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-07-21 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "007"
+down_revision: str | None = "006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Partitions created ahead of today; the P&L service keeps extending them
+QUOTES_DAYS_AHEAD = 7
+INTRADAY_MONTHS_AHEAD = 2
+
+
+def _quote_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("symbol", sa.String(length=20), nullable=False),
+        sa.Column("contract_type", sa.String(length=10), nullable=False),
+        sa.Column("strike", sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column("expiration", sa.Date(), nullable=True),
+        sa.Column("bid", sa.Numeric(precision=10, scale=4), nullable=True),
+        sa.Column("ask", sa.Numeric(precision=10, scale=4), nullable=True),
+        sa.Column("last", sa.Numeric(precision=10, scale=4), nullable=True),
+        sa.Column("volume", sa.Integer(), nullable=True),
+        sa.Column("quote_time", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def _intraday_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("follower_id", sa.String(length=50), nullable=False),
+        sa.Column("snapshot_time", sa.DateTime(), nullable=False),
+        sa.Column("trading_date", sa.Date(), nullable=False),
+        sa.Column("realized_pnl", sa.Numeric(precision=12, scale=4), nullable=False),
+        sa.Column("unrealized_pnl", sa.Numeric(precision=12, scale=4), nullable=False),
+        sa.Column("total_pnl", sa.Numeric(precision=12, scale=4), nullable=False),
+        sa.Column("position_count", sa.Integer(), nullable=False),
+        sa.Column("total_market_value", sa.Numeric(precision=12, scale=4), nullable=False),
+        sa.Column("total_commission", sa.Numeric(precision=10, scale=4), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    ]
+
+
+def _create_quote_indexes() -> None:
+    op.create_index(
+        "ix_quotes_contract_time",
+        "quotes",
+        ["symbol", "contract_type", "strike", "expiration", "quote_time"],
+        unique=False,
+    )
+    op.create_index("ix_quotes_time", "quotes", ["quote_time"], unique=False)
+
+
+def _drop_quote_indexes() -> None:
+    op.drop_index("ix_quotes_time", table_name="quotes")
+    op.drop_index("ix_quotes_contract_time", table_name="quotes")
+
+
+def _create_intraday_indexes() -> None:
+    op.create_index("ix_pnl_intraday_follower_id", "pnl_intraday", ["follower_id"], unique=False)
+    op.create_index(
+        "ix_pnl_intraday_follower_time",
+        "pnl_intraday",
+        ["follower_id", "snapshot_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_pnl_intraday_follower_date_time",
+        "pnl_intraday",
+        ["follower_id", "trading_date", "snapshot_time"],
+        unique=False,
+    )
+    op.create_index("ix_pnl_intraday_date", "pnl_intraday", ["trading_date"], unique=False)
+
+
+def _drop_intraday_indexes() -> None:
+    op.drop_index("ix_pnl_intraday_date", table_name="pnl_intraday")
+    op.drop_index("ix_pnl_intraday_follower_date_time", table_name="pnl_intraday")
+    op.drop_index("ix_pnl_intraday_follower_time", table_name="pnl_intraday")
+    op.drop_index("ix_pnl_intraday_follower_id", table_name="pnl_intraday")
+
+
+def _copy_rows(source: str, target: str, columns: list[sa.Column]) -> None:
+    names = ", ".join(column.name for column in columns)
+    op.execute(f"INSERT INTO {target} ({names}) SELECT {names} FROM {source}")
+
+
+def upgrade() -> None:
+    # Move the existing tables aside; their index names are reused by the new tables
+    _drop_quote_indexes()
+    op.rename_table("quotes", "quotes_unpartitioned")
+    _drop_intraday_indexes()
+    op.rename_table("pnl_intraday", "pnl_intraday_unpartitioned")
+
+    # The partition key has to be part of the primary key
+    op.create_table(
+        "quotes",
+        *_quote_columns(),
+        sa.PrimaryKeyConstraint("id", "quote_time", name="quotes_partitioned_pkey"),
+        postgresql_partition_by="RANGE (quote_time)",
+    )
+    op.create_table(
+        "pnl_intraday",
+        *_intraday_columns(),
+        sa.PrimaryKeyConstraint("id", "trading_date", name="pnl_intraday_partitioned_pkey"),
+        postgresql_partition_by="RANGE (trading_date)",
+    )
+
+    # Partitions covering existing rows plus a few periods ahead
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            start_day date;
+        BEGIN
+            SELECT COALESCE(MIN(quote_time)::date, CURRENT_DATE)
+            INTO start_day FROM quotes_unpartitioned;
+
+            WHILE start_day <= CURRENT_DATE + {QUOTES_DAYS_AHEAD} LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF quotes FOR VALUES FROM (%L) TO (%L)',
+                    'quotes_p' || to_char(start_day, 'YYYYMMDD'),
+                    start_day,
+                    start_day + 1
+                );
+                start_day := start_day + 1;
+            END LOOP;
+        END $$;
+        """
+    )
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            start_month date;
+        BEGIN
+            SELECT date_trunc('month', COALESCE(MIN(trading_date), CURRENT_DATE))::date
+            INTO start_month FROM pnl_intraday_unpartitioned;
+
+            WHILE start_month <= CURRENT_DATE + interval '{INTRADAY_MONTHS_AHEAD} months' LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF pnl_intraday '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'pnl_intraday_p' || to_char(start_month, 'YYYYMM'),
+                    start_month,
+                    (start_month + interval '1 month')::date
+                );
+                start_month := (start_month + interval '1 month')::date;
+            END LOOP;
+        END $$;
+        """
+    )
+
+    # Late, replayed or clock-skewed rows outside every range land here instead of failing
+    op.execute("CREATE TABLE quotes_default PARTITION OF quotes DEFAULT")
+    op.execute("CREATE TABLE pnl_intraday_default PARTITION OF pnl_intraday DEFAULT")
+
+    _copy_rows("quotes_unpartitioned", "quotes", _quote_columns())
+    _copy_rows("pnl_intraday_unpartitioned", "pnl_intraday", _intraday_columns())
+    op.drop_table("quotes_unpartitioned")
+    op.drop_table("pnl_intraday_unpartitioned")
+
+    # Indexes on the parent are created on every partition
+    _create_quote_indexes()
+    _create_intraday_indexes()
+
+
+def downgrade() -> None:
+    _drop_quote_indexes()
+    op.rename_table("quotes", "quotes_partitioned")
+    _drop_intraday_indexes()
+    op.rename_table("pnl_intraday", "pnl_intraday_partitioned")
+
+    op.create_table(
+        "quotes",
+        *_quote_columns(),
+        sa.PrimaryKeyConstraint("id", name="quotes_pkey"),
+    )
+    op.create_table(
+        "pnl_intraday",
+        *_intraday_columns(),
+        sa.PrimaryKeyConstraint("id", name="pnl_intraday_pkey"),
+    )
+
+    _copy_rows("quotes_partitioned", "quotes", _quote_columns())
+    _copy_rows("pnl_intraday_partitioned", "pnl_intraday", _intraday_columns())
+
+    # Dropping a partitioned table drops its partitions
+    op.drop_table("quotes_partitioned")
+    op.drop_table("pnl_intraday_partitioned")
+
+    _create_quote_indexes()
+    _create_intraday_indexes()
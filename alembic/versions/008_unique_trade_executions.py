@@ -0,0 +1,50 @@
+"""Make trade executions unique per follower
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-07-24 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "008"
+down_revision: str | None = "007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Keep only the first recording of each execution before adding the unique index
+    op.execute(
+        """
+        DELETE FROM trades
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY follower_id, execution_id
+                    ORDER BY created_at, id
+                ) AS rank
+                FROM trades
+                WHERE execution_id IS NOT NULL
+            ) ranked
+            WHERE rank > 1
+        )
+        """
+    )
+
+    # Redelivered fill messages are skipped instead of recorded twice; execution_id
+    # leads so follower time range queries keep using ix_trades_follower_time
+    op.create_index(
+        "ix_trades_execution_follower",
+        "trades",
+        ["execution_id", "follower_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trades_execution_follower", table_name="trades")
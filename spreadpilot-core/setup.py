@@ -16,6 +16,7 @@ setup(
         "opentelemetry-sdk>=1.18.0,<2.0.0",
         "opentelemetry-exporter-otlp>=1.18.0,<2.0.0",
         "pandas>=2.0.0",  # Data manipulation
+        "numpy>=1.26.0",  # Vectorized option pricing
         "openpyxl>=3.1.2",  # Excel generation
         "reportlab>=4.0.4",  # PDF generation
         "sendgrid>=6.10.0",  # Email sending
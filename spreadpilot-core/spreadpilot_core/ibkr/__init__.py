@@ -3,6 +3,25 @@
 This module provides a wrapper around the Interactive Brokers API (ib_insync).
 """
 
+from .bar_store import BarStore, DailyBar, get_bar_store
 from .client import IBKRClient
+from .connections import ConnectionRegistry
+from .contract_cache import ContractCache, get_contract_cache
+from .market_data import MarketDataHub, MarketSnapshot
+from .order_tracker import OrderTracker
+from .position_store import PositionState, PositionStore
 
-__all__ = ["IBKRClient"]
+__all__ = [
+    "BarStore",
+    "ConnectionRegistry",
+    "ContractCache",
+    "DailyBar",
+    "IBKRClient",
+    "MarketDataHub",
+    "MarketSnapshot",
+    "OrderTracker",
+    "PositionState",
+    "PositionStore",
+    "get_bar_store",
+    "get_contract_cache",
+]
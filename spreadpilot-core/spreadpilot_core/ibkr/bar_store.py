@@ -0,0 +1,186 @@
+"""Persistent store of daily bars shared across clients and runs.
+
+Daily bars of completed sessions never change, so re-downloading the whole
+lookback window for every trend check is wasted historical-data pacing.
+``BarStore`` keeps bars per symbol in memory and in a Redis hash keyed by
+bar date. It asks IB at most once per New York trading date per symbol, and
+then only for the days since the last stored bar. Restarts and other
+processes pick up the stored bars and the sync marker from Redis instead of
+requesting them again.
+"""
+
+import asyncio
+import datetime
+import json
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from redis.asyncio import Redis
+
+from ..logging import get_logger
+from ..utils.redis_client import get_redis_client
+from ..utils.time import get_ny_time
+
+logger = get_logger(__name__)
+
+BARS_KEY_PREFIX = "ibkr:bars:1d"
+
+# Shared store instance
+_bar_store: "BarStore | None" = None
+
+
+@dataclass(frozen=True)
+class DailyBar:
+    """One completed regular-hours session."""
+
+    date: str  # YYYYMMDD
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    @classmethod
+    def from_ib(cls, bar: Any) -> "DailyBar":
+        """Build a bar from an ib_insync BarData."""
+        date = bar.date
+        if isinstance(date, datetime.date):
+            date = date.strftime("%Y%m%d")
+        return cls(
+            date=str(date).replace("-", "")[:8],
+            open=float(bar.open),
+            high=float(bar.high),
+            low=float(bar.low),
+            close=float(bar.close),
+            volume=float(bar.volume),
+        )
+
+
+class BarStore:
+    """Incrementally synced daily bars, persisted in Redis."""
+
+    def __init__(self, redis_client: Redis | None = None, max_bars: int = 400):
+        """Initialize the bar store.
+
+        Args:
+            redis_client: Redis client to persist bars in; memory only if None
+            max_bars: Most recent bars kept per symbol
+        """
+        self.redis_client = redis_client
+        self.max_bars = max_bars
+        self._bars: dict[str, dict[str, DailyBar]] = {}
+        # Symbol -> (NY date of the last sync, lookback it covered)
+        self._synced: dict[str, tuple[str, int]] = {}
+        self._locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def get_daily_bars(self, ib: Any, contract: Any, lookback_days: int) -> list[DailyBar]:
+        """Get the daily bars of completed sessions, syncing with IB if needed.
+
+        Args:
+            ib: Connected ib_insync.IB instance
+            contract: Qualified contract to get bars for
+            lookback_days: History needed, as an IB duration in days
+
+        Returns:
+            Stored bars in date order, oldest first
+        """
+        symbol = contract.symbol
+        async with self._locks[symbol]:
+            today = get_ny_time().strftime("%Y%m%d")
+            if not self._is_synced(symbol, today, lookback_days):
+                await self._load(symbol)
+            if not self._is_synced(symbol, today, lookback_days):
+                await self._sync(ib, contract, today, lookback_days)
+
+            bars = self._bars.get(symbol, {})
+            return [bars[date] for date in sorted(bars)]
+
+    def _is_synced(self, symbol: str, today: str, lookback_days: int) -> bool:
+        synced = self._synced.get(symbol)
+        return synced is not None and synced[0] == today and synced[1] >= lookback_days
+
+    async def _load(self, symbol: str):
+        """Load a symbol's bars and sync marker from Redis into memory."""
+        if self.redis_client is None:
+            return
+
+        key = f"{BARS_KEY_PREFIX}:{symbol}"
+        try:
+            bars = await self.redis_client.hgetall(key)
+            synced = await self.redis_client.get(f"{key}:synced")
+        except Exception as e:
+            logger.error(f"Error loading {symbol} bars from Redis: {e}")
+            return
+
+        self._bars[symbol] = {date: DailyBar(**json.loads(bar)) for date, bar in bars.items()}
+        if synced:
+            date, lookback_days = synced.split(":")
+            self._synced[symbol] = (date, int(lookback_days))
+
+    async def _sync(self, ib: Any, contract: Any, today: str, lookback_days: int):
+        """Request the bars missing since the last stored one."""
+        symbol = contract.symbol
+        bars = self._bars.setdefault(symbol, {})
+        synced = self._synced.get(symbol)
+
+        if bars and synced and synced[1] >= lookback_days:
+            last_date = datetime.datetime.strptime(max(bars), "%Y%m%d").date()
+            days = (datetime.datetime.strptime(today, "%Y%m%d").date() - last_date).days + 1
+        else:
+            days = lookback_days
+
+        logger.info(f"Requesting {days} days of {symbol} bars ({len(bars)} stored)")
+        result = await ib.reqHistoricalDataAsync(
+            contract,
+            endDateTime="",
+            durationStr=f"{days} D",
+            barSizeSetting="1 day",
+            whatToShow="TRADES",
+            useRTH=True,
+            formatDate=1,
+        )
+        if not result:
+            logger.warning(f"No historical data received for {symbol}")
+            return
+
+        # Today's session is still open, so only completed ones are stored
+        new_bars = {bar.date: bar for bar in map(DailyBar.from_ib, result) if bar.date < today}
+        bars.update(new_bars)
+        dropped = sorted(bars)[: -self.max_bars]
+        for date in dropped:
+            del bars[date]
+
+        self._synced[symbol] = (today, max(lookback_days, synced[1] if synced else 0))
+        await self._persist(symbol, new_bars, dropped)
+
+    async def _persist(self, symbol: str, new_bars: dict[str, DailyBar], dropped: list[str]):
+        if self.redis_client is None:
+            return
+
+        key = f"{BARS_KEY_PREFIX}:{symbol}"
+        synced_date, lookback_days = self._synced[symbol]
+        try:
+            if new_bars:
+                await self.redis_client.hset(
+                    key, mapping={date: json.dumps(asdict(bar)) for date, bar in new_bars.items()}
+                )
+            if dropped:
+                await self.redis_client.hdel(key, *dropped)
+            await self.redis_client.set(f"{key}:synced", f"{synced_date}:{lookback_days}")
+        except Exception as e:
+            logger.error(f"Error writing {symbol} bars to Redis: {e}")
+
+
+async def get_bar_store() -> BarStore:
+    """Get or create the shared bar store, backed by Redis when available.
+
+    Returns:
+        Shared bar store instance
+    """
+    global _bar_store
+
+    if _bar_store is None:
+        _bar_store = BarStore(await get_redis_client())
+
+    return _bar_store
@@ -2,7 +2,9 @@
 
 import asyncio
 import datetime
+import os
 import time
+from collections.abc import Awaitable, Callable
 from enum import Enum
 from functools import lru_cache
 from typing import Any
@@ -12,6 +14,10 @@ from ib_insync import BarData, Contract, Option, Order, Stock
 from ib_insync import Trade as IBTrade
 
 from ..logging import get_logger
+from .contract_cache import ContractCache, get_contract_cache
+from .market_data import MarketDataHub, MarketSnapshot
+from .order_tracker import OrderTracker
+from .position_store import PositionStore
 
 try:
     from ..dry_run import dry_run_async
@@ -87,6 +93,8 @@ class IBKRClient:
         port: int = 4002,  # Default port for paper trading
         client_id: int = 1,
         timeout: int = 30,
+        market_data_lines: int | None = None,
+        contract_cache: ContractCache | None = None,
     ):
         """Initialize the IBKR client.
 
@@ -98,6 +106,10 @@ class IBKRClient:
             port: IB Gateway port (4001 for live, 4002 for paper)
             client_id: Client ID
             timeout: Connection timeout in seconds
+            market_data_lines: Streaming market data lines this client may hold
+                (defaults to IBKR_MARKET_DATA_LINES or 100)
+            contract_cache: Contract cache to fill conIds from (defaults to the
+                shared cache, attached on connect)
         """
         self.username = username
         self.password = password
@@ -111,10 +123,21 @@ class IBKRClient:
         self.ib = ib_insync.IB()
         self._connected = False
 
-        # Cache for contracts and positions
+        # Shared streaming tickers, reused across price lookups
+        self.market_data = MarketDataHub(
+            self.ib,
+            max_lines=market_data_lines or int(os.environ.get("IBKR_MARKET_DATA_LINES", 100)),
+        )
+
+        # Awaitable order status changes
+        self.orders = OrderTracker()
+
+        # Positions and portfolio values, kept current by IB's events
+        self.position_store = PositionStore(self.ib)
+
+        # Shared daily conId cache; per-instance cache for contracts
+        self.contract_cache = contract_cache
         self._contracts_cache = {}
-        self._positions_cache = {}
-        self._last_positions_update = 0
 
         logger.info(
             "IBKR client initialized for user %s in %s mode at %s:%s",
@@ -136,10 +159,8 @@ class IBKRClient:
 
         try:
             logger.info(
-                "Connecting to IB Gateway",
-                host=self.host,
-                port=self.port,
-                client_id=self.client_id,
+                f"Connecting to IB Gateway at {self.host}:{self.port} "
+                f"(client ID {self.client_id})"
             )
 
             # Connect to IB Gateway
@@ -161,13 +182,15 @@ class IBKRClient:
 
             # Log connection
             logger.info(
-                "Connected to IB Gateway",
-                account=self.ib.client.getAccounts(),
-                server_version=self.ib.client.serverVersion(),
+                f"Connected to IB Gateway (accounts {self.ib.client.getAccounts()}, "
+                f"server version {self.ib.client.serverVersion()})"
             )
 
-            # Initialize positions cache
-            await self.update_positions()
+            if self.contract_cache is None:
+                self.contract_cache = await get_contract_cache()
+
+            # Follow position changes from here on
+            self.position_store.attach()
 
             return True
         except Exception as e:
@@ -179,10 +202,29 @@ class IBKRClient:
         """Disconnect from IB Gateway."""
         if self.ib.isConnected():
             logger.info("Disconnecting from IB Gateway")
+            self.market_data.close()
             self.ib.disconnect()
             self._connected = False
             logger.info("Disconnected from IB Gateway")
 
+    def is_connected(self) -> bool:
+        """Check whether the connection to IB Gateway is up, without reconnecting.
+
+        Returns:
+            True if connected, False otherwise
+        """
+        return self._connected and self.ib.isConnected()
+
+    @property
+    def default_account(self) -> str | None:
+        """Account operations without an explicit account apply to.
+
+        Returns:
+            First account managed by the connection, or None before it is known
+        """
+        accounts = self.ib.managedAccounts()
+        return accounts[0] if accounts else None
+
     async def ensure_connected(self) -> bool:
         """Ensure connection to IB Gateway.
 
@@ -218,29 +260,36 @@ class IBKRClient:
         cache_key = f"QQQ-{expiry}-{strike}-{right}"
 
         # Check cache
-        if cache_key in self._contracts_cache:
-            return self._contracts_cache[cache_key]
-
-        # Create contract
-        contract = Option(
-            symbol="QQQ",
-            lastTradeDateOrContractMonth=expiry,
-            strike=strike,
-            right=right,
-            exchange="SMART",
-            currency="USD",
-        )
+        contract = self._contracts_cache.get(cache_key)
+        if contract is None:
+            # Create contract
+            contract = Option(
+                symbol="QQQ",
+                lastTradeDateOrContractMonth=expiry,
+                strike=strike,
+                right=right,
+                exchange="SMART",
+                currency="USD",
+            )
 
-        # Cache contract
-        self._contracts_cache[cache_key] = contract
+            # Cache contract
+            self._contracts_cache[cache_key] = contract
+
+        # Fill in the conId if the shared cache has it, saving a lookup at IB
+        if self.contract_cache is not None:
+            self.contract_cache.apply(contract)
 
         return contract
 
-    async def get_market_price(self, contract: Contract) -> float | None:
+    async def get_market_price(self, contract: Contract, timeout: float = 1.0) -> float | None:
         """Get market price for a contract.
 
+        The contract is streamed through the market data hub, so repeated
+        lookups return the latest tick without a new subscription.
+
         Args:
             contract: Contract to get price for
+            timeout: Seconds to wait for a tick when no fresh price is streamed
 
         Returns:
             Market price or None if not available
@@ -250,35 +299,45 @@ class IBKRClient:
             return None
 
         try:
-            # Request market data
-            self.ib.reqMktData(contract)
+            price = await self.market_data.get_market_price(contract, timeout=timeout)
+            if price is None:
+                logger.warning(
+                    "Failed to get market price",
+                    extra={
+                        "contract": contract.symbol,
+                        "strike": contract.strike,
+                        "right": contract.right,
+                    },
+                )
+            return price
+        except Exception as e:
+            logger.error(f"Error getting market price: {e}")
+            return None
 
-            # Wait for market data
-            for _ in range(10):  # Try for 1 second
-                await asyncio.sleep(0.1)
-                ticker = self.ib.reqTickers(contract)[0]
+    async def get_market_snapshots(
+        self, contracts: list[Contract], timeout: float = 1.0
+    ) -> list[MarketSnapshot | None]:
+        """Get bid/ask/mid and model greeks for several contracts at once.
 
-                # Check if we have a valid price
-                if ticker.midpoint() > 0:
-                    # Cancel market data subscription
-                    self.ib.cancelMktData(contract)
-                    return ticker.midpoint()
+        All contracts are streamed through the market data hub and their ticks
+        are awaited concurrently, so pricing N legs costs one round trip.
 
-            # Cancel market data subscription
-            self.ib.cancelMktData(contract)
+        Args:
+            contracts: Contracts to snapshot
+            timeout: Seconds to wait for ticks of contracts without a fresh price
 
-            logger.warning(
-                "Failed to get market price",
-                extra={
-                    "contract": contract.symbol,
-                    "strike": contract.strike,
-                    "right": contract.right,
-                },
-            )
-            return None
+        Returns:
+            Snapshot per contract, in order, or None where no price is available
+        """
+        if not await self.ensure_connected():
+            logger.error("Not connected to IB Gateway")
+            return [None] * len(contracts)
+
+        try:
+            return await self.market_data.get_snapshots(contracts, timeout=timeout)
         except Exception as e:
-            logger.error(f"Error getting market price: {e}")
-            return None
+            logger.error(f"Error getting market snapshots: {e}")
+            return [None] * len(contracts)
 
     async def get_stock_contract(
         self, symbol: str, exchange: str = "SMART", currency: str = "USD"
@@ -491,6 +550,7 @@ class IBKRClient:
         price_increment: float = 0.01,
         min_price: float = 0.70,
         timeout_seconds: int = 5,
+        account: str | None = None,
     ) -> dict[str, Any]:
         """Place a vertical spread order.
 
@@ -503,9 +563,11 @@ class IBKRClient:
             price_increment: Price increment for each attempt
             min_price: Minimum price to accept
             timeout_seconds: Timeout in seconds for each attempt
+            account: Account to trade in (default: the connection's default account)
 
         Returns:
-            Dict with order status and details
+            Dict with order status and details. Once an order was sent,
+            ``submitted_at`` is the monotonic time the first attempt was placed.
         """
         if not await self.ensure_connected():
             logger.error("Not connected to IB Gateway")
@@ -515,6 +577,7 @@ class IBKRClient:
                 "trade_id": None,
             }
 
+        submitted_at: float | None = None
         try:
             # Determine option rights based on strategy
             if strategy == "Long":  # Bull Put
@@ -559,9 +622,12 @@ class IBKRClient:
             long_contract = self._get_qqq_option_contract(strike_long, long_right)
             short_contract = self._get_qqq_option_contract(strike_short, short_right)
 
-            # Get market prices
-            long_price = await self.get_market_price(long_contract)
-            short_price = await self.get_market_price(short_contract)
+            # Get market prices for both legs in one request
+            long_snapshot, short_snapshot = await self.get_market_snapshots(
+                [long_contract, short_contract]
+            )
+            long_price = long_snapshot.mid if long_snapshot else None
+            short_price = short_snapshot.mid if short_snapshot else None
 
             if long_price is None or short_price is None:
                 logger.error(
@@ -624,21 +690,17 @@ class IBKRClient:
                     action="BUY",
                     totalQuantity=qty_per_leg,
                     lmtPrice=limit_price,
+                    account=account or "",
                     transmit=True,
                 )
 
                 # Place order
                 trade = self.ib.placeOrder(bag, order)
+                if submitted_at is None:
+                    submitted_at = time.monotonic()
 
-                # Wait for order to be filled or timeout
-                start_time = time.time()
-                while time.time() - start_time < timeout_seconds:
-                    await asyncio.sleep(0.1)
-                    self.ib.waitOnUpdate(timeout=0.1)
-
-                    # Check order status
-                    if trade.orderStatus.status in ["Filled", "Cancelled", "Inactive"]:
-                        break
+                # Wait for order to be filled, cancelled or timeout
+                await self.orders.wait_for_status(trade, timeout=timeout_seconds)
 
                 # Check if order was filled
                 if trade.orderStatus.status == "Filled":
@@ -652,6 +714,7 @@ class IBKRClient:
                         "trade_id": str(trade.order.orderId),
                         "fill_price": trade.orderStatus.avgFillPrice,
                         "fill_time": datetime.datetime.now().isoformat(),
+                        "submitted_at": submitted_at,
                     }
 
                 # Check if order was partially filled
@@ -669,11 +732,22 @@ class IBKRClient:
                         "remaining": trade.orderStatus.remaining,
                         "fill_price": trade.orderStatus.avgFillPrice,
                         "fill_time": datetime.datetime.now().isoformat(),
+                        "submitted_at": submitted_at,
                     }
 
-                # Cancel the order if not filled
-                if trade.orderStatus.status != "Cancelled":
-                    self.ib.cancelOrder(order)
+                # Cancel the order if not filled; it can still fill while cancelling
+                if await self.orders.cancel(self.ib, trade) == "Filled":
+                    logger.info(
+                        f"Order {trade.order.orderId} filled while cancelling "
+                        f"at {trade.orderStatus.avgFillPrice}"
+                    )
+                    return {
+                        "status": OrderStatus.FILLED,
+                        "trade_id": str(trade.order.orderId),
+                        "fill_price": trade.orderStatus.avgFillPrice,
+                        "fill_time": datetime.datetime.now().isoformat(),
+                        "submitted_at": submitted_at,
+                    }
 
                 # Calculate new limit price
                 limit_price += price_increment  # Decrease the negative value
@@ -689,6 +763,7 @@ class IBKRClient:
                         "status": OrderStatus.REJECTED,
                         "error": "Limit price too high",
                         "trade_id": None,
+                        "submitted_at": submitted_at,
                     }
 
             # If we get here, all attempts failed
@@ -697,6 +772,7 @@ class IBKRClient:
                 "status": OrderStatus.REJECTED,
                 "error": "Failed to place order after all attempts",
                 "trade_id": None,
+                "submitted_at": submitted_at,
             }
         except Exception as e:
             logger.error(f"Error placing vertical spread: {e}")
@@ -704,10 +780,14 @@ class IBKRClient:
                 "status": OrderStatus.REJECTED,
                 "error": str(e),
                 "trade_id": None,
+                "submitted_at": submitted_at,
             }
 
     async def update_positions(self) -> bool:
-        """Update positions cache.
+        """Reload the position store from the positions IB holds for the connection.
+
+        The store follows IB's position events, so this is only needed to
+        resynchronize it; it sends no request to IB.
 
         Returns:
             True if successful, False otherwise
@@ -717,59 +797,72 @@ class IBKRClient:
             return False
 
         try:
-            # Get positions
-            positions = self.ib.positions()
-
-            # Update cache
-            self._positions_cache = {}
-            for position in positions:
-                contract = position.contract
-                if contract.secType == "OPT" and contract.symbol == "QQQ":
-                    key = f"{contract.strike}-{contract.right}"
-                    self._positions_cache[key] = position.position
-
-            # Update timestamp
-            self._last_positions_update = time.time()
-
-            logger.debug(
-                "Positions updated",
-                positions=self._positions_cache,
-            )
-
+            self.position_store.attach()
             return True
         except Exception as e:
             logger.error(f"Error updating positions: {e}")
             return False
 
-    async def get_positions(self, force_update: bool = False) -> dict[str, int]:
+    async def get_positions(
+        self, force_update: bool = False, account: str | None = None
+    ) -> dict[str, int]:
         """Get current positions.
 
         Args:
-            force_update: Force update of positions cache
+            force_update: Reload the position store before reading it
+            account: Account to read (default: every account of the connection)
 
         Returns:
             Dict mapping contract keys to position sizes
         """
-        # Update positions if needed
-        if force_update or time.time() - self._last_positions_update > 60:
+        if force_update:
             await self.update_positions()
 
-        return self._positions_cache
+        return self.position_store.get_option_positions("QQQ", account)
+
+    async def get_portfolio_value(self, account: str | None = None) -> float:
+        """Get the market value of all positions from the live portfolio state.
+
+        Args:
+            account: Account to read (default: every account of the connection)
+
+        Returns:
+            Portfolio market value
+        """
+        return self.position_store.get_portfolio_value(account)
+
+    async def get_portfolio_pnl(self, account: str | None = None) -> dict[str, float]:
+        """Get unrealized and realized P&L from the live portfolio state.
+
+        Unlike get_pnl, this sends no request to IB.
 
-    async def check_assignment(self) -> tuple[AssignmentState, int, int]:
+        Args:
+            account: Account to read (default: every account of the connection)
+
+        Returns:
+            Dict with unrealized_pnl and realized_pnl
+        """
+        return self.position_store.get_pnl(account)
+
+    async def check_assignment(
+        self, account: str | None = None
+    ) -> tuple[AssignmentState, int, int]:
         """Check for assignment by comparing short and long positions.
 
+        Reads the live position store, so an assignment is seen as soon as
+        IB reports the position change.
+
+        Args:
+            account: Account to check (default: every account of the connection)
+
         Returns:
             Tuple of (assignment state, short qty, long qty)
         """
-        # Update positions
-        await self.update_positions()
-
         # Count short and long positions
         short_qty = 0
         long_qty = 0
 
-        for key, qty in self._positions_cache.items():
+        for key, qty in self.position_store.get_option_positions("QQQ", account).items():
             if qty > 0:  # Long position
                 long_qty += qty
             elif qty < 0:  # Short position
@@ -786,6 +879,7 @@ class IBKRClient:
         strike: float,
         right: str,
         quantity: int,
+        account: str | None = None,
     ) -> dict[str, Any]:
         """Exercise options to compensate for assignment.
 
@@ -793,6 +887,7 @@ class IBKRClient:
             strike: Strike price of the long option to exercise
             right: Option right ("C" for call, "P" for put)
             quantity: Quantity to exercise
+            account: Account holding the options (default: the connection's default account)
 
         Returns:
             Dict with exercise status and details
@@ -809,7 +904,7 @@ class IBKRClient:
             contract = self._get_qqq_option_contract(strike, right)
 
             # Exercise option
-            self.ib.exerciseOptions(contract, quantity, 1, self.ib.wrapper.accounts[0], 0)
+            self.ib.exerciseOptions(contract, quantity, 1, account or self.default_account, 0)
 
             logger.info(
                 "Options exercised",
@@ -831,9 +926,24 @@ class IBKRClient:
                 "error": str(e),
             }
 
-    async def close_all_positions(self) -> dict[str, Any]:
+    async def close_all_positions(
+        self,
+        timeout: float = 1.0,
+        on_leg_done: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+        account: str | None = None,
+    ) -> dict[str, Any]:
         """Close all positions with market orders.
 
+        Closing orders for every leg are sent before any fill is awaited, and the
+        fills are then awaited concurrently, so the whole close takes about one
+        fill round trip however many legs are open.
+
+        Args:
+            timeout: Seconds to wait for the legs to fill
+            on_leg_done: Coroutine function called with each leg's result as soon
+                as the leg fills or its wait times out
+            account: Account to close (default: every account of the connection)
+
         Returns:
             Dict with close status and details
         """
@@ -845,20 +955,19 @@ class IBKRClient:
             }
 
         try:
-            # Update positions
-            await self.update_positions()
+            positions = self.position_store.get_option_positions("QQQ", account)
 
             # Check if we have any positions
-            if not self._positions_cache:
+            if not positions:
                 logger.info("No positions to close")
                 return {
                     "status": "SUCCESS",
                     "message": "No positions to close",
                 }
 
-            # Close each position
-            results = []
-            for key, qty in self._positions_cache.items():
+            # Send a closing order for each position
+            orders = []
+            for key, qty in positions.items():
                 if qty == 0:
                     continue
 
@@ -874,36 +983,30 @@ class IBKRClient:
                 order = ib_insync.MarketOrder(
                     action=action,
                     totalQuantity=abs(qty),
+                    account=account or "",
                     transmit=True,
                 )
 
                 # Place order
-                trade = self.ib.placeOrder(contract, order)
-
-                # Wait for order to be filled
-                for _ in range(10):  # Wait up to 1 second
-                    await asyncio.sleep(0.1)
-                    self.ib.waitOnUpdate(timeout=0.1)
-
-                    # Check order status
-                    if trade.orderStatus.status in ["Filled", "Cancelled", "Inactive"]:
-                        break
-
-                # Record result
-                results.append(
-                    {
-                        "contract": key,
-                        "qty": qty,
-                        "action": action,
-                        "status": trade.orderStatus.status,
-                        "filled": trade.orderStatus.filled,
-                    }
-                )
+                orders.append((key, qty, action, self.ib.placeOrder(contract, order)))
+
+            async def wait_for_leg(key: str, qty: float, action: str, trade: Any):
+                await self.orders.wait_for_status(trade, timeout=timeout)
+                result = {
+                    "contract": key,
+                    "qty": qty,
+                    "action": action,
+                    "status": trade.orderStatus.status,
+                    "filled": trade.orderStatus.filled,
+                }
+                if on_leg_done is not None:
+                    await on_leg_done(result)
+                return result
 
-            logger.info(
-                "Closed all positions",
-                results=results,
-            )
+            # Wait for the fills of all legs at once
+            results = list(await asyncio.gather(*(wait_for_leg(*order) for order in orders)))
+
+            logger.info(f"Closed all positions: {results}")
 
             return {
                 "status": "SUCCESS",
@@ -916,9 +1019,12 @@ class IBKRClient:
                 "error": str(e),
             }
 
-    async def get_account_summary(self) -> dict[str, Any]:
+    async def get_account_summary(self, account: str | None = None) -> dict[str, Any]:
         """Get account summary.
 
+        Args:
+            account: Account to summarize (default: the connection's default account)
+
         Returns:
             Dict with account summary
         """
@@ -928,8 +1034,7 @@ class IBKRClient:
 
         try:
             # Request account summary
-            account = self.ib.wrapper.accounts[0]
-            summary = self.ib.accountSummary(account)
+            summary = self.ib.accountSummary(account or self.default_account)
 
             # Convert to dict
             result = {}
@@ -947,6 +1052,7 @@ class IBKRClient:
         qty_per_leg: int,
         strike_long: float,
         strike_short: float,
+        account: str | None = None,
     ) -> tuple[bool, str | None]:
         """Check if account has enough margin for a trade.
 
@@ -955,6 +1061,7 @@ class IBKRClient:
             qty_per_leg: Quantity per leg
             strike_long: Strike price for long leg
             strike_short: Strike price for short leg
+            account: Account to check (default: the connection's default account)
 
         Returns:
             Tuple of (has_margin, error_message)
@@ -965,7 +1072,7 @@ class IBKRClient:
 
         try:
             # Get account summary
-            summary = await self.get_account_summary()
+            summary = await self.get_account_summary(account)
 
             # Check available funds
             available_funds = float(summary.get("AvailableFunds", 0))
@@ -982,10 +1089,8 @@ class IBKRClient:
             margin_required *= 1.2
 
             logger.info(
-                "Margin check",
-                available_funds=available_funds,
-                margin_required=margin_required,
-                strategy=strategy,
+                f"Margin check for {strategy}: available {available_funds}, "
+                f"required {margin_required}"
             )
 
             # Check if we have enough margin
@@ -1000,9 +1105,12 @@ class IBKRClient:
             logger.error(f"Error checking margin: {e}")
             return False, str(e)
 
-    async def get_pnl(self) -> dict[str, float]:
+    async def get_pnl(self, account: str | None = None) -> dict[str, float]:
         """Get current P&L.
 
+        Args:
+            account: Account to read (default: the connection's default account)
+
         Returns:
             Dict with P&L information
         """
@@ -1012,7 +1120,7 @@ class IBKRClient:
 
         try:
             # Request PnL
-            account = self.ib.wrapper.accounts[0]
+            account = account or self.default_account
             self.ib.reqPnL(account, "")
 
             # Wait for PnL data
@@ -0,0 +1,211 @@
+"""Long-lived IB sessions shared per gateway.
+
+Opening an IB API connection costs a socket handshake plus an account and
+position sync, and every connection to a gateway needs its own clientId.
+``ConnectionRegistry`` keeps one ``IBKRClient`` per gateway endpoint and hands
+the same client to every caller, so order execution, monitors and P&L
+multiplex their requests over one session. Session health follows IB's
+``connectedEvent`` and ``disconnectedEvent`` instead of being probed on each
+call. A dropped session is reconnected by the first caller that needs it, and
+concurrent callers wait on that same attempt. Sessions are kept per
+endpoint, so each gateway sees a single clientId from this process. A failed
+connect moves the session to the next id in its range, since a stale connection
+from an earlier run may still hold the old one.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..logging import get_logger
+from .client import IBKRClient
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _Session:
+    """One shared connection to a gateway."""
+
+    host: str
+    port: int
+    client: IBKRClient
+    healthy: bool = False
+    connected_at: float | None = None
+    disconnects: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class ConnectionRegistry:
+    """One long-lived IBKRClient per gateway endpoint."""
+
+    def __init__(
+        self,
+        client_id_start: int = 1,
+        client_id_end: int = 999,
+        client_factory: Callable[..., IBKRClient] = IBKRClient,
+    ):
+        """Initialize the connection registry.
+
+        Args:
+            client_id_start: First clientId this registry may use
+            client_id_end: Last clientId this registry may use
+            client_factory: Callable building an unconnected client from
+                IBKRClient's keyword arguments
+        """
+        self.client_id_start = client_id_start
+        self.client_id_end = max(client_id_start, client_id_end)
+        self.client_factory = client_factory
+
+        self._sessions: dict[tuple[str, int], _Session] = {}
+
+    def get_client(self, host: str, port: int, **client_kwargs: Any) -> IBKRClient:
+        """Get the shared client of a gateway without connecting it.
+
+        Args:
+            host: Gateway host
+            port: Gateway port
+            **client_kwargs: IBKRClient arguments used if the session is new
+
+        Returns:
+            Shared client, possibly not yet connected
+        """
+        return self._get_session(host, port, client_kwargs).client
+
+    async def connect(self, host: str, port: int, **client_kwargs: Any) -> IBKRClient | None:
+        """Get the shared client of a gateway, connecting it if its session is down.
+
+        Args:
+            host: Gateway host
+            port: Gateway port
+            **client_kwargs: IBKRClient arguments used if the session is new
+
+        Returns:
+            Connected shared client, or None if the gateway cannot be reached
+        """
+        session = self._get_session(host, port, client_kwargs)
+        if session.healthy:
+            return session.client
+
+        async with session.lock:
+            # Another caller may have reconnected while we waited
+            if session.healthy:
+                return session.client
+
+            client = session.client
+            if await client.connect():
+                self._on_connected(session)
+                return client
+
+            # A stale connection may still hold the clientId, try another next time
+            previous_id = client.client_id
+            client.client_id = self._next_client_id(previous_id)
+            logger.error(
+                f"Failed to connect to IB Gateway at {host}:{port} with client ID "
+                f"{previous_id}, next attempt uses client ID {client.client_id}"
+            )
+            return None
+
+    def is_healthy(self, host: str, port: int) -> bool:
+        """Check whether the session of a gateway is connected.
+
+        Args:
+            host: Gateway host
+            port: Gateway port
+
+        Returns:
+            True if the session exists and is connected
+        """
+        session = self._sessions.get((host, port))
+        return session is not None and session.healthy
+
+    def is_connected(self) -> bool:
+        """Check whether any session is connected.
+
+        Returns:
+            True if at least one session is connected
+        """
+        return any(session.healthy for session in self._sessions.values())
+
+    def list_sessions(self) -> dict[str, dict[str, Any]]:
+        """List all sessions and their state.
+
+        Returns:
+            Session state keyed by "host:port"
+        """
+        return {
+            f"{session.host}:{session.port}": {
+                "client_id": session.client.client_id,
+                "healthy": session.healthy,
+                "connected_at": session.connected_at,
+                "disconnects": session.disconnects,
+            }
+            for session in self._sessions.values()
+        }
+
+    async def close_all(self):
+        """Disconnect and forget every session."""
+        for session in self._sessions.values():
+            # Not a dropped connection, so do not count it as a disconnect
+            session.healthy = False
+            try:
+                await session.client.disconnect()
+                logger.info(f"Disconnected from IB Gateway at {session.host}:{session.port}")
+            except Exception as e:
+                logger.error(
+                    f"Error disconnecting from IB Gateway at {session.host}:{session.port}: {e}"
+                )
+
+        self._sessions = {}
+
+    def _get_session(self, host: str, port: int, client_kwargs: dict[str, Any]) -> _Session:
+        """Get the session of a gateway, creating an unconnected one if needed."""
+        session = self._sessions.get((host, port))
+        if session is None:
+            client = self.client_factory(
+                host=host,
+                port=port,
+                client_id=self._next_client_id(),
+                **client_kwargs,
+            )
+            session = _Session(host=host, port=port, client=client)
+            client.ib.connectedEvent += lambda: self._on_connected(session)
+            client.ib.disconnectedEvent += lambda: self._on_disconnected(session)
+            self._sessions[(host, port)] = session
+        return session
+
+    def _next_client_id(self, after: int | None = None) -> int:
+        """Pick the clientId for a session's next connection attempt.
+
+        Args:
+            after: Id that failed to connect; None for a new session
+
+        Returns:
+            client_id_start for a new session, otherwise the id after the
+            failed one, wrapping around the range
+        """
+        if after is None or after >= self.client_id_end:
+            return self.client_id_start
+        return max(self.client_id_start, after + 1)
+
+    def _on_connected(self, session: _Session):
+        """Mark a session healthy when IB reports it connected."""
+        if not session.healthy:
+            session.healthy = True
+            session.connected_at = time.time()
+            logger.info(
+                f"IB session to {session.host}:{session.port} connected "
+                f"(client ID {session.client.client_id})"
+            )
+
+    def _on_disconnected(self, session: _Session):
+        """Mark a session down; the next caller reconnects it."""
+        if session.healthy:
+            session.healthy = False
+            session.disconnects += 1
+            logger.warning(
+                f"IB session to {session.host}:{session.port} disconnected "
+                f"({session.disconnects} disconnects)"
+            )
@@ -0,0 +1,295 @@
+"""Contract definitions and option chains shared across clients and runs.
+
+Qualifying a contract or fetching an option chain is a round trip to IB that
+returns the same answer all day. ``ContractCache`` keeps conIds keyed by
+(symbol, expiry, strike, right) and chain metadata keyed by symbol, both in
+memory and in Redis hashes named after the New York trading date. The hashes
+expire at the next New York midnight, so listings are fetched fresh each day,
+and a cache warmed before the open lets the hot path skip contract lookups.
+"""
+
+import datetime
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from ib_insync import Option
+from redis.asyncio import Redis
+
+from ..logging import get_logger
+from ..utils.redis_client import get_redis_client
+from ..utils.time import get_ny_time
+
+logger = get_logger(__name__)
+
+CONTRACTS_KEY_PREFIX = "ibkr:contracts"
+CHAINS_KEY_PREFIX = "ibkr:chains"
+
+# Shared cache instance
+_contract_cache: "ContractCache | None" = None
+
+
+def get_contract_key(contract: Any) -> tuple[str, str, float, str]:
+    """Build the cache key of a contract.
+
+    Args:
+        contract: ib_insync contract
+
+    Returns:
+        (symbol, expiry, strike, right); expiry, strike and right are empty for stocks
+    """
+    return (
+        contract.symbol,
+        getattr(contract, "lastTradeDateOrContractMonth", "") or "",
+        float(getattr(contract, "strike", 0.0) or 0.0),
+        getattr(contract, "right", "") or "",
+    )
+
+
+def _encode_key(key: tuple[str, str, float, str]) -> str:
+    symbol, expiry, strike, right = key
+    return f"{symbol}|{expiry}|{strike}|{right}"
+
+
+class ContractCache:
+    """Daily cache of contract conIds and option chain metadata."""
+
+    def __init__(self, redis_client: Redis | None = None):
+        """Initialize the contract cache.
+
+        Args:
+            redis_client: Redis client to persist entries in; memory only if None
+        """
+        self.redis_client = redis_client
+        self._trading_date: str | None = None
+        self._con_ids: dict[tuple[str, str, float, str], int] = {}
+        self._chains: dict[str, list[dict[str, Any]]] = {}
+
+    def get_con_id(self, contract: Any) -> int | None:
+        """Get the cached conId of a contract without any I/O.
+
+        Args:
+            contract: ib_insync contract
+
+        Returns:
+            conId, or None if the contract is not cached for today
+        """
+        self._roll_day()
+        return self._con_ids.get(get_contract_key(contract))
+
+    def apply(self, contract: Any) -> bool:
+        """Fill in a contract's conId from the cache without any I/O.
+
+        Args:
+            contract: ib_insync contract, updated in place
+
+        Returns:
+            True if the contract now has a conId
+        """
+        if not contract.conId:
+            con_id = self.get_con_id(contract)
+            if con_id:
+                contract.conId = con_id
+        return bool(contract.conId)
+
+    async def load(self) -> int:
+        """Load today's entries from Redis into memory.
+
+        Returns:
+            Number of contracts loaded
+        """
+        self._roll_day()
+        if self.redis_client is None:
+            return 0
+
+        try:
+            contracts = await self.redis_client.hgetall(self._key(CONTRACTS_KEY_PREFIX))
+            chains = await self.redis_client.hgetall(self._key(CHAINS_KEY_PREFIX))
+        except Exception as e:
+            logger.error(f"Error loading contract cache from Redis: {e}")
+            return 0
+
+        for field, con_id in contracts.items():
+            symbol, expiry, strike, right = field.split("|")
+            self._con_ids[(symbol, expiry, float(strike), right)] = int(con_id)
+        for symbol, chain in chains.items():
+            self._chains[symbol] = json.loads(chain)
+
+        logger.info(f"Loaded {len(contracts)} contracts and {len(chains)} chains from cache")
+        return len(contracts)
+
+    async def qualify(self, ib: Any, *contracts: Any) -> list[Any]:
+        """Fill in conIds from the cache, qualifying the rest with IB in one batch.
+
+        Args:
+            ib: Connected ib_insync.IB instance
+            *contracts: Contracts to qualify, updated in place
+
+        Returns:
+            Contracts that have a conId afterwards
+        """
+        missing = [contract for contract in contracts if not self.apply(contract)]
+
+        if missing and self.redis_client is not None:
+            fields = [_encode_key(get_contract_key(contract)) for contract in missing]
+            try:
+                con_ids = await self.redis_client.hmget(self._key(CONTRACTS_KEY_PREFIX), fields)
+            except Exception as e:
+                logger.error(f"Error reading contract cache from Redis: {e}")
+                con_ids = [None] * len(missing)
+            for contract, con_id in zip(missing, con_ids):
+                if con_id:
+                    contract.conId = int(con_id)
+                    self._con_ids[get_contract_key(contract)] = contract.conId
+            missing = [contract for contract in missing if not contract.conId]
+
+        if missing:
+            await ib.qualifyContractsAsync(*missing)
+            await self._store_con_ids([contract for contract in missing if contract.conId])
+
+        return [contract for contract in contracts if contract.conId]
+
+    async def get_chains(self, ib: Any, underlying: Any) -> list[dict[str, Any]]:
+        """Get the option chains of an underlying, requesting them once a day.
+
+        Args:
+            ib: Connected ib_insync.IB instance
+            underlying: Underlying stock contract
+
+        Returns:
+            Chains as dicts with exchange, trading_class, expirations and strikes
+        """
+        self._roll_day()
+        symbol = underlying.symbol
+        if symbol in self._chains:
+            return self._chains[symbol]
+
+        if not await self.qualify(ib, underlying):
+            logger.error(f"Unable to qualify {symbol} for its option chain")
+            return []
+
+        chains = await ib.reqSecDefOptParamsAsync(
+            underlyingSymbol=symbol,
+            futFopExchange="",
+            underlyingSecType=underlying.secType,
+            underlyingConId=underlying.conId,
+        )
+        result = [
+            {
+                "exchange": chain.exchange,
+                "trading_class": chain.tradingClass,
+                "expirations": sorted(chain.expirations),
+                "strikes": sorted(chain.strikes),
+            }
+            for chain in chains or []
+        ]
+        if result:
+            self._chains[symbol] = result
+            if self.redis_client is not None:
+                await self._persist(CHAINS_KEY_PREFIX, {symbol: json.dumps(result)})
+        return result
+
+    async def warm(
+        self,
+        ib: Any,
+        underlying: Any,
+        expirations: Iterable[str],
+        rights: Iterable[str] = ("P", "C"),
+        strike_range: tuple[float, float] | None = None,
+    ) -> int:
+        """Pre-qualify the option contracts the trading day is likely to use.
+
+        Args:
+            ib: Connected ib_insync.IB instance
+            underlying: Underlying stock contract
+            expirations: Expirations in YYYYMMDD format to warm
+            rights: Option rights to warm
+            strike_range: Inclusive (low, high) strike bounds, or None for all strikes
+
+        Returns:
+            Number of option contracts cached for today
+        """
+        chains = await self.get_chains(ib, underlying)
+        expirations = set(expirations)
+
+        keys = set()
+        for chain in chains:
+            for expiry in expirations.intersection(chain["expirations"]):
+                for strike in chain["strikes"]:
+                    if strike_range and not strike_range[0] <= strike <= strike_range[1]:
+                        continue
+                    for right in rights:
+                        keys.add((expiry, strike, right))
+
+        options = [
+            Option(
+                symbol=underlying.symbol,
+                lastTradeDateOrContractMonth=expiry,
+                strike=strike,
+                right=right,
+                exchange="SMART",
+                currency="USD",
+            )
+            for expiry, strike, right in sorted(keys)
+        ]
+        qualified = await self.qualify(ib, *options)
+        logger.info(
+            f"Warmed contract cache with {len(qualified)} of {len(options)} "
+            f"{underlying.symbol} options"
+        )
+        return len(qualified)
+
+    async def _store_con_ids(self, contracts: list[Any]):
+        if not contracts:
+            return
+        mapping = {}
+        for contract in contracts:
+            key = get_contract_key(contract)
+            self._con_ids[key] = contract.conId
+            mapping[_encode_key(key)] = contract.conId
+        await self._persist(CONTRACTS_KEY_PREFIX, mapping)
+
+    async def _persist(self, prefix: str, mapping: dict[str, Any]):
+        """Write fields to today's Redis hash, expiring it at the next NY midnight."""
+        if self.redis_client is None:
+            return
+        key = self._key(prefix)
+        try:
+            await self.redis_client.hset(key, mapping=mapping)
+            await self.redis_client.expire(key, self._seconds_until_midnight())
+        except Exception as e:
+            logger.error(f"Error writing contract cache to Redis: {e}")
+
+    def _roll_day(self):
+        """Drop entries from earlier trading dates."""
+        trading_date = get_ny_time().strftime("%Y%m%d")
+        if trading_date != self._trading_date:
+            self._trading_date = trading_date
+            self._con_ids.clear()
+            self._chains.clear()
+
+    def _key(self, prefix: str) -> str:
+        self._roll_day()
+        return f"{prefix}:{self._trading_date}"
+
+    @staticmethod
+    def _seconds_until_midnight() -> int:
+        now = get_ny_time()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        midnight += datetime.timedelta(days=1)
+        return max(int((midnight - now).total_seconds()), 1)
+
+
+async def get_contract_cache() -> ContractCache:
+    """Get or create the shared contract cache, backed by Redis when available.
+
+    Returns:
+        Shared contract cache instance
+    """
+    global _contract_cache
+
+    if _contract_cache is None:
+        _contract_cache = ContractCache(await get_redis_client())
+        await _contract_cache.load()
+
+    return _contract_cache
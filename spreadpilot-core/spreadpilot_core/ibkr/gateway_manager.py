@@ -1,11 +1,19 @@
 """IBGateway Docker Container Manager for SpreadPilot."""
 
 import asyncio
+import functools
+import io
 import random
+import shlex
+import tarfile
 import time
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from typing import Any, TypeVar
 
 import backoff
 import docker
@@ -27,6 +35,25 @@ async def get_mongo_db():
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+# Environment shared by all gateway containers; credentials are added per follower
+GATEWAY_ENVIRONMENT = {
+    "TRADING_MODE": "paper",  # Default to paper trading
+    "TWS_SETTINGS_PATH": "/opt/ibc",
+    "DISPLAY": ":0",
+}
+
+# Standby containers wait for this file, load it and then run the image's own startup.
+# IBC reads the credentials when it starts, so IBGateway itself and the IB login only
+# start once a standby is bound; the pool saves creating the container, not the login.
+STANDBY_CREDENTIALS_DIR = "/tmp"
+STANDBY_CREDENTIALS_FILE = "spreadpilot-credentials.env"
+STANDBY_WAIT_SCRIPT = (
+    f"f={STANDBY_CREDENTIALS_DIR}/{STANDBY_CREDENTIALS_FILE}; "
+    'while [ ! -f "$f" ]; do sleep 0.2; done; set -a; . "$f"; set +a; exec "$@"'
+)
+
 
 class GatewayStatus(str, Enum):
     """Gateway container status."""
@@ -37,6 +64,21 @@ class GatewayStatus(str, Enum):
     FAILED = "FAILED"
 
 
+class CircuitState(str, Enum):
+    """Reconnect circuit breaker state of a gateway."""
+
+    CLOSED = "CLOSED"  # Healthy, checked normally
+    OPEN = "OPEN"  # Failing, left alone until the backoff expires
+    HALF_OPEN = "HALF_OPEN"  # Backoff expired, one reconnect probe decides
+
+
+class StandbyRefillPolicy(str, Enum):
+    """When standby gateways taken from the pool are replaced."""
+
+    IMMEDIATE = "IMMEDIATE"  # Start a replacement as soon as a standby is taken
+    MONITOR = "MONITOR"  # Top the pool up on the next monitoring pass
+
+
 @dataclass
 class GatewayInstance:
     """Represents an IBGateway Docker container instance."""
@@ -50,6 +92,23 @@ class GatewayInstance:
     ib_client: IB | None = None
     last_healthcheck: float | None = None
     connection_failures: int = 0
+    follower: Follower | None = None
+    circuit_state: CircuitState = CircuitState.CLOSED
+    circuit_opens: int = 0
+    circuit_retry_at: float | None = None
+    last_check_ms: float | None = None
+    check_timeouts: int = 0
+    started_at: float | None = None  # When the container started or a standby was bound
+
+
+@dataclass
+class StandbyGateway:
+    """Pre-started gateway container waiting to be bound to a follower."""
+
+    container: docker.models.containers.Container
+    host_port: int
+    client_id: int
+    created_at: float
 
 
 class GatewayManager:
@@ -64,8 +123,16 @@ class GatewayManager:
         client_id_range_end: int = 9999,
         container_prefix: str = "ibgateway-follower",
         healthcheck_interval: int = 30,
+        healthcheck_timeout: float = 20.0,
         max_startup_time: int = 120,
         vault_enabled: bool = True,
+        startup_concurrency: int = 16,
+        docker_max_workers: int = 32,
+        standby_pool_size: int = 0,
+        standby_refill_policy: StandbyRefillPolicy = StandbyRefillPolicy.IMMEDIATE,
+        circuit_failure_threshold: int = 2,
+        circuit_backoff_base: float = 10.0,
+        circuit_backoff_max: float = 600.0,
     ):
         """Initialize the gateway manager.
 
@@ -77,8 +144,16 @@ class GatewayManager:
             client_id_range_end: End of TWS client ID range
             container_prefix: Prefix for container names
             healthcheck_interval: Interval between healthchecks in seconds
+            healthcheck_timeout: Maximum time a single gateway's healthcheck may take
             max_startup_time: Maximum time to wait for container startup
             vault_enabled: Whether to use Vault for credential retrieval
+            startup_concurrency: Maximum number of gateways started at once
+            docker_max_workers: Threads running blocking Docker SDK calls
+            standby_pool_size: Pre-created gateway containers kept for followers (0 disables)
+            standby_refill_policy: When standby gateways taken from the pool are replaced
+            circuit_failure_threshold: Consecutive failures before a reconnect is attempted
+            circuit_backoff_base: Delay before the first probe of a failed gateway in seconds
+            circuit_backoff_max: Maximum delay between probes of a failed gateway in seconds
         """
         self.gateway_image = gateway_image
         self.port_range_start = port_range_start
@@ -87,16 +162,35 @@ class GatewayManager:
         self.client_id_range_end = client_id_range_end
         self.container_prefix = container_prefix
         self.healthcheck_interval = healthcheck_interval
+        self.healthcheck_timeout = healthcheck_timeout
         self.max_startup_time = max_startup_time
         self.vault_enabled = vault_enabled
+        self.startup_concurrency = max(1, startup_concurrency)
+        self.standby_pool_size = standby_pool_size
+        self.standby_refill_policy = StandbyRefillPolicy(standby_refill_policy)
+        self.circuit_failure_threshold = circuit_failure_threshold
+        self.circuit_backoff_base = circuit_backoff_base
+        self.circuit_backoff_max = circuit_backoff_max
 
         self.docker_client = docker.from_env()
+        # The Docker SDK is synchronous, so its calls run here instead of on the event loop
+        self._docker_executor = ThreadPoolExecutor(
+            max_workers=docker_max_workers, thread_name_prefix="docker"
+        )
         self.gateways: dict[str, GatewayInstance] = {}
         self.used_ports: set = set()
         self.used_client_ids: set = set()
 
-        # Background task handle
+        # Standby pool of pre-created containers
+        self.standby: list[StandbyGateway] = []
+        self._standby_command: list[str] | None = None
+        self._refill_lock = asyncio.Lock()
+
+        # Background task handles
         self._monitor_task: asyncio.Task | None = None
+        self._refill_task: asyncio.Task | None = None
+        # Failovers run outside the timed health checks, one per follower
+        self._failover_tasks: dict[str, asyncio.Task] = {}
         self._shutdown = False
 
     @backoff.on_exception(backoff.expo, Exception, max_tries=3, max_time=30)
@@ -151,6 +245,9 @@ class GatewayManager:
         try:
             await self._load_enabled_followers()
 
+            # Fill the standby pool in the background
+            self._schedule_refill()
+
             # Start monitoring task
             self._monitor_task = asyncio.create_task(self._monitor_gateways())
 
@@ -174,9 +271,26 @@ class GatewayManager:
             except asyncio.CancelledError:
                 pass
 
-        # Stop all gateways
-        for follower_id in list(self.gateways.keys()):
-            await self._stop_gateway(follower_id)
+        if self._refill_task:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+
+        # Cancel failovers in progress; they release what they took on the way out
+        failovers = list(self._failover_tasks.values())
+        for task in failovers:
+            task.cancel()
+        await asyncio.gather(*failovers, return_exceptions=True)
+
+        # Stop all gateways and standby containers
+        standby, self.standby = self.standby, []
+        await asyncio.gather(
+            *(self._stop_gateway(follower_id) for follower_id in list(self.gateways.keys())),
+            *(self._remove_standby(gateway) for gateway in standby),
+        )
+        self._docker_executor.shutdown(wait=False)
 
         logger.info("Gateway Manager stopped")
 
@@ -231,12 +345,56 @@ class GatewayManager:
 
         logger.info(f"Found {len(followers)} enabled followers")
 
-        # Start gateways for each follower
-        for follower in followers:
-            try:
-                await self._start_gateway(follower)
-            except Exception as e:
-                logger.error(f"Failed to start gateway for follower {follower.id}: {e}")
+        await self._start_gateways(followers)
+
+    async def _docker_call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking Docker SDK call on the Docker thread pool.
+
+        Args:
+            func: Docker SDK function or method
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._docker_executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _start_gateways(self, followers: list[Follower]) -> dict[str, GatewayInstance]:
+        """Start gateways for several followers concurrently.
+
+        At most ``startup_concurrency`` gateways are started at once, so a cold
+        start of the whole fleet takes about as long as its slowest gateway
+        rather than the sum of all of them.
+
+        Args:
+            followers: Followers to start gateways for
+
+        Returns:
+            Started gateways by follower ID
+        """
+        semaphore = asyncio.Semaphore(self.startup_concurrency)
+        started_at = time.monotonic()
+
+        async def start(follower: Follower) -> GatewayInstance | None:
+            async with semaphore:
+                try:
+                    return await self._start_gateway(follower)
+                except Exception as e:
+                    logger.error(f"Failed to start gateway for follower {follower.id}: {e}")
+                    return None
+
+        gateways = await asyncio.gather(*(start(follower) for follower in followers))
+        started = {gateway.follower_id: gateway for gateway in gateways if gateway}
+
+        logger.info(
+            f"Started {len(started)}/{len(followers)} gateways "
+            f"in {time.monotonic() - started_at:.1f}s"
+        )
+        return started
 
     async def _start_gateway(self, follower: Follower) -> GatewayInstance:
         """Start an IBGateway container for a follower.
@@ -249,17 +407,24 @@ class GatewayManager:
         """
         logger.info(f"Starting IBGateway for follower {follower.id}")
 
-        # Allocate port and client ID
-        host_port = self._allocate_port()
-        client_id = self._allocate_client_id()
+        # Take a pre-started container if one is ready, otherwise allocate port and client ID
+        standby = await self._take_standby()
+        if standby:
+            host_port, client_id = standby.host_port, standby.client_id
+        else:
+            host_port = self._allocate_port()
+            client_id = self._allocate_client_id()
 
         container_name = f"{self.container_prefix}-{follower.id}"
+        gateway = None
 
         try:
             # Remove existing container if present
             try:
-                existing = self.docker_client.containers.get(container_name)
-                existing.remove(force=True)
+                existing = await self._docker_call(
+                    self.docker_client.containers.get, container_name
+                )
+                await self._docker_call(existing.remove, force=True)
                 logger.info(f"Removed existing container {container_name}")
             except docker.errors.NotFound:
                 pass
@@ -293,24 +458,28 @@ class GatewayManager:
                 )
                 raise
 
-            # Start container
-            container = self.docker_client.containers.run(
-                self.gateway_image,
-                name=container_name,
-                ports={
-                    "4002/tcp": host_port,  # TWS API port
-                },
-                environment={
-                    "IB_USER": ibkr_username,
-                    "IB_PASS": ibkr_password,
-                    "TRADING_MODE": "paper",  # Default to paper trading
-                    "TWS_SETTINGS_PATH": "/opt/ibc",
-                    "DISPLAY": ":0",
-                },
-                detach=True,
-                remove=False,
-                auto_remove=False,
-            )
+            if standby:
+                # Hand the credentials to the waiting standby container
+                container = standby.container
+                await self._bind_standby(container, container_name, ibkr_username, ibkr_password)
+            else:
+                # Start container
+                container = await self._docker_call(
+                    self.docker_client.containers.run,
+                    self.gateway_image,
+                    name=container_name,
+                    ports={
+                        "4002/tcp": host_port,  # TWS API port
+                    },
+                    environment={
+                        "IB_USER": ibkr_username,
+                        "IB_PASS": ibkr_password,
+                        **GATEWAY_ENVIRONMENT,
+                    },
+                    detach=True,
+                    remove=False,
+                    auto_remove=False,
+                )
 
             gateway = GatewayInstance(
                 follower_id=follower.id,
@@ -319,6 +488,8 @@ class GatewayManager:
                 client_id=client_id,
                 status=GatewayStatus.STARTING,
                 container=container,
+                follower=follower,
+                started_at=time.time(),
             )
 
             self.gateways[follower.id] = gateway
@@ -332,13 +503,211 @@ class GatewayManager:
 
             return gateway
 
-        except Exception as e:
-            # Clean up allocated resources on failure
+        except (Exception, asyncio.CancelledError) as e:
+            # Clean up allocated resources on failure or cancellation
+            if gateway is not None and self.gateways.get(follower.id) is gateway:
+                self.gateways.pop(follower.id)
+            if standby:
+                await self._remove_standby(standby)
             self.used_ports.discard(host_port)
             self.used_client_ids.discard(client_id)
-            logger.error(f"Failed to start IBGateway for follower {follower.id}: {e}")
+            logger.error(f"Failed to start IBGateway for follower {follower.id}: {e!r}")
             raise
 
+        finally:
+            if standby and self.standby_refill_policy == StandbyRefillPolicy.IMMEDIATE:
+                self._schedule_refill()
+
+    async def _get_standby_command(self) -> list[str]:
+        """Get the gateway image's startup command, pulling the image if needed."""
+        if self._standby_command is None:
+            try:
+                image = await self._docker_call(self.docker_client.images.get, self.gateway_image)
+            except docker.errors.ImageNotFound:
+                image = await self._docker_call(self.docker_client.images.pull, self.gateway_image)
+
+            config = image.attrs.get("Config") or {}
+            self._standby_command = (config.get("Entrypoint") or []) + (config.get("Cmd") or [])
+
+        return self._standby_command
+
+    async def _start_standby(self) -> StandbyGateway:
+        """Start a gateway container that waits for credentials before logging in.
+
+        Returns:
+            Standby gateway
+        """
+        host_port = self._allocate_port()
+        client_id = self._allocate_client_id()
+        container_name = f"{self.container_prefix}-standby-{uuid.uuid4().hex[:8]}"
+
+        try:
+            command = await self._get_standby_command()
+            container = await self._docker_call(
+                self.docker_client.containers.run,
+                self.gateway_image,
+                name=container_name,
+                entrypoint=["sh", "-c", STANDBY_WAIT_SCRIPT, "sh"],
+                command=command,
+                ports={
+                    "4002/tcp": host_port,  # TWS API port
+                },
+                environment=GATEWAY_ENVIRONMENT,
+                detach=True,
+                remove=False,
+                auto_remove=False,
+            )
+        except Exception:
+            self.used_ports.discard(host_port)
+            self.used_client_ids.discard(client_id)
+            raise
+
+        logger.info(f"Started standby IBGateway container {container_name} on port {host_port}")
+        return StandbyGateway(
+            container=container,
+            host_port=host_port,
+            client_id=client_id,
+            created_at=time.time(),
+        )
+
+    async def _bind_standby(
+        self, container: Any, container_name: str, ibkr_username: str, ibkr_password: str
+    ) -> None:
+        """Give a standby container a follower's name and credentials.
+
+        Args:
+            container: Standby container
+            container_name: Name of the follower's gateway container
+            ibkr_username: IBKR username
+            ibkr_password: IBKR password
+        """
+        content = (
+            f"IB_USER={shlex.quote(ibkr_username)}\nIB_PASS={shlex.quote(ibkr_password)}\n"
+        ).encode()
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w") as tar:
+            info = tarfile.TarInfo(STANDBY_CREDENTIALS_FILE)
+            info.size = len(content)
+            info.mode = 0o600
+            tar.addfile(info, io.BytesIO(content))
+
+        await self._docker_call(container.rename, container_name)
+        await self._docker_call(container.put_archive, STANDBY_CREDENTIALS_DIR, archive.getvalue())
+
+    async def _take_standby(self) -> StandbyGateway | None:
+        """Take a running standby gateway from the pool.
+
+        Returns:
+            Standby gateway, or None if the pool is empty
+        """
+        while self.standby:
+            standby = self.standby.pop(0)
+            try:
+                await self._docker_call(standby.container.reload)
+                if standby.container.status == "running":
+                    return standby
+            except docker.errors.NotFound:
+                pass
+            await self._remove_standby(standby)
+
+        return None
+
+    async def _remove_standby(self, standby: StandbyGateway) -> None:
+        """Remove a standby container and free its port and client ID.
+
+        Args:
+            standby: Standby gateway to remove
+        """
+        try:
+            await self._docker_call(standby.container.remove, force=True)
+        except docker.errors.NotFound:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to remove standby container {standby.container.id}: {e}")
+
+        self.used_ports.discard(standby.host_port)
+        self.used_client_ids.discard(standby.client_id)
+
+    def _schedule_refill(self) -> None:
+        """Refill the standby pool in the background unless a refill is running."""
+        if self.standby_pool_size <= 0 or self._shutdown:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill_standby_pool())
+
+    async def _refill_standby_pool(self) -> None:
+        """Drop dead standby containers and start new ones up to the pool size."""
+        async with self._refill_lock:
+            for gateway in list(self.standby):
+                try:
+                    await self._docker_call(gateway.container.reload)
+                    alive = gateway.container.status == "running"
+                except docker.errors.NotFound:
+                    alive = False
+                except Exception as e:
+                    logger.error(f"Failed to check standby container {gateway.container.id}: {e}")
+                    alive = True
+                # The gateway may have been taken while it was being checked
+                if not alive and gateway in self.standby:
+                    self.standby.remove(gateway)
+                    await self._remove_standby(gateway)
+
+            missing = self.standby_pool_size - len(self.standby)
+            if missing <= 0:
+                return
+
+            semaphore = asyncio.Semaphore(self.startup_concurrency)
+
+            async def start() -> StandbyGateway | None:
+                async with semaphore:
+                    try:
+                        return await self._start_standby()
+                    except Exception as e:
+                        logger.error(f"Failed to start standby gateway: {e}")
+                        return None
+
+            started = await asyncio.gather(*(start() for _ in range(missing)))
+            self.standby.extend(gateway for gateway in started if gateway)
+            logger.info(f"Standby pool has {len(self.standby)}/{self.standby_pool_size} gateways")
+
+    def _schedule_failover(self, gateway: GatewayInstance) -> None:
+        """Fail over a dead gateway in the background unless a failover is running.
+
+        The failover is not part of the health check, so the check's timeout
+        cannot cancel it after the old gateway has been stopped.
+
+        Args:
+            gateway: Gateway whose container has stopped
+        """
+        follower_id = gateway.follower_id
+        if self._shutdown or follower_id in self._failover_tasks:
+            return
+
+        task = asyncio.create_task(self._failover(gateway))
+        self._failover_tasks[follower_id] = task
+        task.add_done_callback(lambda _: self._failover_tasks.pop(follower_id, None))
+
+    async def _failover(self, gateway: GatewayInstance) -> None:
+        """Replace a dead gateway with one from the standby pool.
+
+        Args:
+            gateway: Gateway whose container has stopped
+        """
+        if gateway.follower is None or not self.standby:
+            return
+
+        logger.warning(f"Failing over gateway for follower {gateway.follower_id} to a standby")
+        await self._stop_gateway(gateway.follower_id)
+        try:
+            await self._start_gateway(gateway.follower)
+        except Exception as e:
+            logger.error(f"Failover failed for follower {gateway.follower_id}: {e}")
+            await self._publish_alert(
+                follower_id=gateway.follower_id,
+                reason=f"Gateway stopped and failover to a standby failed: {str(e)}",
+                severity=AlertSeverity.CRITICAL,
+            )
+
     async def stop_follower_gateway(self, follower_id: str) -> None:
         """Stop the IBGateway container for a specific follower.
 
@@ -372,11 +741,12 @@ class GatewayManager:
         if gateway.container:
             try:
                 logger.debug(f"Sending stop signal to container for follower {follower_id}")
-                gateway.container.stop(timeout=30)  # Give container 30 seconds to stop gracefully
+                # Give container 30 seconds to stop gracefully
+                await self._docker_call(gateway.container.stop, timeout=30)
                 logger.debug(f"Waiting for container to stop for follower {follower_id}")
-                gateway.container.wait()
+                await self._docker_call(gateway.container.wait)
                 logger.debug(f"Removing container for follower {follower_id}")
-                gateway.container.remove()
+                await self._docker_call(gateway.container.remove)
                 logger.info(f"Container stopped and removed for follower {follower_id}")
             except docker.errors.NotFound:
                 logger.warning(f"Container for follower {follower_id} was already removed")
@@ -384,7 +754,7 @@ class GatewayManager:
                 logger.error(f"Error stopping container for follower {follower_id}: {e}")
                 # Force remove if graceful stop failed
                 try:
-                    gateway.container.remove(force=True)
+                    await self._docker_call(gateway.container.remove, force=True)
                     logger.warning(f"Force removed container for follower {follower_id}")
                 except Exception as e2:
                     logger.error(
@@ -396,7 +766,7 @@ class GatewayManager:
         self.used_client_ids.discard(gateway.client_id)
 
         # Remove from tracking
-        del self.gateways[follower_id]
+        self.gateways.pop(follower_id, None)
 
         # Clean MongoDB record
         await self._remove_gateway_mapping(follower_id)
@@ -475,11 +845,17 @@ class GatewayManager:
             try:
                 current_time = time.time()
 
-                for follower_id, gateway in list(self.gateways.items()):
-                    try:
-                        await self._check_gateway_health(gateway, current_time)
-                    except Exception as e:
-                        logger.error(f"Error checking health for follower {follower_id}: {e}")
+                # Check all gateways at once so one slow container does not delay the rest
+                await asyncio.gather(
+                    *(
+                        self._run_health_check(follower_id, gateway, current_time)
+                        for follower_id, gateway in self.gateways.items()
+                    )
+                )
+
+                # Replace dead or used standby gateways
+                if self.standby_pool_size > 0:
+                    await self._refill_standby_pool()
 
                 # Wait for next check
                 await asyncio.sleep(self.healthcheck_interval)
@@ -492,6 +868,59 @@ class GatewayManager:
 
         logger.info("Gateway monitoring stopped")
 
+    async def _run_health_check(
+        self, follower_id: str, gateway: GatewayInstance, current_time: float
+    ) -> None:
+        """Check one gateway within the health check timeout and record its latency.
+
+        Args:
+            follower_id: The follower ID
+            gateway: Gateway instance to check
+            current_time: Current timestamp
+        """
+        started_at = time.monotonic()
+        try:
+            await asyncio.wait_for(
+                self._check_gateway_health(gateway, current_time),
+                timeout=self.healthcheck_timeout,
+            )
+        except TimeoutError:
+            gateway.check_timeouts += 1
+            logger.warning(
+                f"Health check for follower {follower_id} timed out "
+                f"after {self.healthcheck_timeout}s"
+            )
+            await self._on_check_timeout(gateway, current_time)
+        except Exception as e:
+            logger.error(f"Error checking health for follower {follower_id}: {e}")
+        finally:
+            gateway.last_check_ms = (time.monotonic() - started_at) * 1000
+
+    async def _on_check_timeout(self, gateway: GatewayInstance, current_time: float) -> None:
+        """Count a timed out health check against the gateway.
+
+        Args:
+            gateway: Gateway instance whose check timed out
+            current_time: Timestamp of the check
+        """
+        if gateway.status == GatewayStatus.STARTING:
+            # Connection attempts to a gateway that is still logging in are slow
+            if self._startup_time(gateway, current_time) > self.max_startup_time:
+                await self._open_circuit(
+                    gateway,
+                    f"Gateway failed to start within {self.max_startup_time}s",
+                )
+            return
+
+        gateway.connection_failures += 1
+        if (
+            gateway.circuit_state == CircuitState.HALF_OPEN
+            or gateway.connection_failures >= self.circuit_failure_threshold
+        ):
+            await self._open_circuit(
+                gateway, f"Health check timed out after {self.healthcheck_timeout}s"
+            )
+
     async def _check_gateway_health(self, gateway: GatewayInstance, current_time: float) -> None:
         """Check the health of a gateway instance.
 
@@ -499,10 +928,18 @@ class GatewayManager:
             gateway: Gateway instance to check
             current_time: Current timestamp
         """
+        # Leave gateways with an open circuit alone until their retry time
+        if gateway.circuit_state == CircuitState.OPEN:
+            if current_time < gateway.circuit_retry_at:
+                return
+            gateway.circuit_state = CircuitState.HALF_OPEN
+            logger.info(f"Circuit half-open for follower {gateway.follower_id}, probing gateway")
+
         # Skip if recently checked
         if (
             gateway.last_healthcheck
             and current_time - gateway.last_healthcheck < self.healthcheck_interval
+            and gateway.circuit_state != CircuitState.HALF_OPEN
         ):
             return
 
@@ -511,11 +948,20 @@ class GatewayManager:
         # Check container status
         if gateway.container:
             try:
-                gateway.container.reload()
+                await self._docker_call(gateway.container.reload)
                 container_status = gateway.container.status
 
                 if container_status == "running":
-                    if gateway.status == GatewayStatus.STARTING:
+                    if gateway.circuit_state == CircuitState.HALF_OPEN:
+                        # Single reconnect attempt decides whether the circuit closes
+                        try:
+                            await self._reconnect(gateway)
+                        except Exception as e:
+                            await self._open_circuit(gateway, f"Reconnect probe failed: {str(e)}")
+                        else:
+                            self._close_circuit(gateway)
+
+                    elif gateway.status == GatewayStatus.STARTING:
                         # Check if gateway is ready by attempting connection
                         try:
                             await self._connect_ib_client(gateway)
@@ -525,20 +971,11 @@ class GatewayManager:
                             )
                         except Exception:
                             # Still starting up
-                            try:
-                                created_str = gateway.container.attrs["Created"]
-                                # Parse ISO timestamp from Docker
-                                created_time = datetime.fromisoformat(
-                                    created_str.replace("Z", "+00:00")
-                                ).timestamp()
-                                startup_time = current_time - created_time
-                            except (KeyError, ValueError, TypeError) as e:
-                                logger.warning(f"Failed to parse container creation time: {e}")
-                                startup_time = 0  # Assume just started
+                            startup_time = self._startup_time(gateway, current_time)
                             if startup_time > self.max_startup_time:
-                                gateway.status = GatewayStatus.FAILED
-                                logger.error(
-                                    f"Gateway for follower {gateway.follower_id} failed to start within {self.max_startup_time}s"
+                                await self._open_circuit(
+                                    gateway,
+                                    f"Gateway failed to start within {self.max_startup_time}s",
                                 )
 
                     elif gateway.status == GatewayStatus.RUNNING:
@@ -550,8 +987,8 @@ class GatewayManager:
                                     f"IB client disconnected for follower {gateway.follower_id}, failure count: {gateway.connection_failures}"
                                 )
 
-                                # Trigger reconnect after 2 failures
-                                if gateway.connection_failures >= 2:
+                                # Trigger reconnect once the failure threshold is reached
+                                if gateway.connection_failures >= self.circuit_failure_threshold:
                                     logger.info(
                                         f"Triggering reconnect for follower {gateway.follower_id} after {gateway.connection_failures} failures"
                                     )
@@ -565,11 +1002,9 @@ class GatewayManager:
                                         logger.error(
                                             f"Failed to reconnect IB client for follower {gateway.follower_id}: {e}"
                                         )
-                                        gateway.status = GatewayStatus.FAILED
-                                        await self._publish_alert(
-                                            follower_id=gateway.follower_id,
-                                            reason=f"Failed to reconnect after {gateway.connection_failures} failures: {str(e)}",
-                                            severity=AlertSeverity.CRITICAL,
+                                        await self._open_circuit(
+                                            gateway,
+                                            f"Failed to reconnect after {gateway.connection_failures} failures: {str(e)}",
                                         )
                             else:
                                 # Connection is good, reset failure counter
@@ -595,10 +1030,95 @@ class GatewayManager:
                     logger.warning(
                         f"Gateway container for follower {gateway.follower_id} has stopped"
                     )
+                    self._schedule_failover(gateway)
 
             except docker.errors.NotFound:
                 gateway.status = GatewayStatus.STOPPED
                 logger.warning(f"Gateway container for follower {gateway.follower_id} not found")
+                self._schedule_failover(gateway)
+
+    def _startup_time(self, gateway: GatewayInstance, current_time: float) -> float:
+        """Get how long a gateway has been starting up for its follower.
+
+        A standby container may sit in the pool long before it is bound, so the
+        time is measured from when the gateway was started or bound.
+
+        Args:
+            gateway: Gateway instance
+            current_time: Current timestamp
+
+        Returns:
+            Seconds since the gateway was started, 0 if unknown
+        """
+        if gateway.started_at is not None:
+            return current_time - gateway.started_at
+
+        try:
+            created_str = gateway.container.attrs["Created"]
+            # Parse ISO timestamp from Docker
+            created_time = datetime.fromisoformat(created_str.replace("Z", "+00:00")).timestamp()
+            return current_time - created_time
+        except (AttributeError, KeyError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to parse container creation time: {e}")
+            return 0  # Assume just started
+
+    def _circuit_backoff(self, opens: int) -> float:
+        """Get the jittered delay before probing a gateway whose circuit opened.
+
+        The delay doubles with each consecutive opening up to circuit_backoff_max,
+        and is drawn from the upper half of that range so gateways that failed
+        together do not all reconnect at the same moment.
+
+        Args:
+            opens: Number of consecutive times the circuit has opened
+
+        Returns:
+            Delay in seconds
+        """
+        cap = min(self.circuit_backoff_max, self.circuit_backoff_base * 2 ** (opens - 1))
+        return cap / 2 + random.uniform(0, cap / 2)
+
+    async def _open_circuit(self, gateway: GatewayInstance, reason: str) -> None:
+        """Mark a gateway as failed and hold off reconnects until the backoff expires.
+
+        Args:
+            gateway: Gateway instance
+            reason: Why the circuit opened
+        """
+        gateway.status = GatewayStatus.FAILED
+        gateway.circuit_state = CircuitState.OPEN
+        gateway.circuit_opens += 1
+        delay = self._circuit_backoff(gateway.circuit_opens)
+        gateway.circuit_retry_at = time.time() + delay
+
+        logger.error(
+            f"Circuit opened for follower {gateway.follower_id} ({reason}), "
+            f"next probe in {delay:.0f}s"
+        )
+
+        # Alert once per outage rather than on every failed probe
+        if gateway.circuit_opens == 1:
+            await self._publish_alert(
+                follower_id=gateway.follower_id,
+                reason=reason,
+                severity=AlertSeverity.CRITICAL,
+            )
+
+    def _close_circuit(self, gateway: GatewayInstance) -> None:
+        """Mark a gateway as recovered.
+
+        Args:
+            gateway: Gateway instance
+        """
+        logger.info(
+            f"Circuit closed for follower {gateway.follower_id} "
+            f"after opening {gateway.circuit_opens} times"
+        )
+        gateway.status = GatewayStatus.RUNNING
+        gateway.circuit_state = CircuitState.CLOSED
+        gateway.circuit_opens = 0
+        gateway.circuit_retry_at = None
+        gateway.connection_failures = 0
 
     def _allocate_port(self) -> int:
         """Allocate an available port for a gateway.
@@ -649,6 +1169,7 @@ class GatewayManager:
         cursor = followers_collection.find({"enabled": True, "state": FollowerState.ACTIVE.value})
 
         active_follower_ids = set()
+        new_followers = []
         async for doc in cursor:
             try:
                 follower = Follower.model_validate(doc)
@@ -656,15 +1177,21 @@ class GatewayManager:
 
                 # Start gateway if not already running
                 if follower.id not in self.gateways:
-                    await self._start_gateway(follower)
+                    new_followers.append(follower)
 
             except Exception as e:
                 logger.error(f"Failed to process follower during reload: {e}")
 
+        await self._start_gateways(new_followers)
+
         # Stop gateways for followers that are no longer active
-        for follower_id in list(self.gateways.keys()):
-            if follower_id not in active_follower_ids:
-                await self._stop_gateway(follower_id)
+        await asyncio.gather(
+            *(
+                self._stop_gateway(follower_id)
+                for follower_id in list(self.gateways.keys())
+                if follower_id not in active_follower_ids
+            )
+        )
 
         logger.info(f"Followers reloaded, now managing {len(self.gateways)} gateways")
 
@@ -694,9 +1221,29 @@ class GatewayManager:
                 "client_id": gateway.client_id,
                 "container_id": gateway.container_id,
                 "connected": (gateway.ib_client.isConnected() if gateway.ib_client else False),
+                "circuit_state": gateway.circuit_state.value,
+                "circuit_retry_at": gateway.circuit_retry_at,
+                "last_check_ms": gateway.last_check_ms,
+                "check_timeouts": gateway.check_timeouts,
             }
         return result
 
+    def list_standby(self) -> list[dict]:
+        """List the gateways waiting in the standby pool.
+
+        Returns:
+            List of standby gateway info
+        """
+        return [
+            {
+                "container_id": gateway.container.id,
+                "host_port": gateway.host_port,
+                "client_id": gateway.client_id,
+                "age_seconds": time.time() - gateway.created_at,
+            }
+            for gateway in self.standby
+        ]
+
     async def _reconnect(self, gateway: GatewayInstance) -> None:
         """Reconnect to IBGateway after connection failures.
 
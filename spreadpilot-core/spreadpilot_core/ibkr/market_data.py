@@ -0,0 +1,386 @@
+"""Shared streaming market data subscriptions for an IB connection.
+
+Every ``reqMktData`` stream uses one of the account's market data lines and
+takes a round trip before the first tick arrives. ``MarketDataHub`` keeps one
+live ``Ticker`` per contract and reference-counts its users. A subscription
+whose last user released it lingers for ``idle_ttl`` seconds so repeated
+lookups of the same contract reuse it. Idle subscriptions are cancelled, oldest
+first, when a new contract needs a line. Listeners registered with
+``add_listener`` are called with the contracts of every batch of ticks, so
+consumers can react to prices as they stream instead of polling.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+# IB's default allowance of simultaneous market data lines
+DEFAULT_MARKET_DATA_LINES = 100
+
+
+def get_contract_key(contract: Any) -> tuple:
+    """Build a hashable key identifying a contract.
+
+    Args:
+        contract: ib_insync contract
+
+    Returns:
+        conId when the contract is qualified, otherwise its defining fields
+    """
+    if getattr(contract, "conId", 0):
+        return (contract.conId,)
+    return (
+        contract.symbol,
+        contract.secType,
+        getattr(contract, "lastTradeDateOrContractMonth", ""),
+        getattr(contract, "strike", 0.0),
+        getattr(contract, "right", ""),
+        contract.exchange,
+        contract.currency,
+    )
+
+
+def _valid_price(value: Any) -> float | None:
+    """Return a tick value, or None for IB's unset markers (nan, -1)."""
+    if value is None or math.isnan(value) or value < 0:
+        return None
+    return value
+
+
+def _get_midpoint(ticker: Any) -> float | None:
+    """Return the ticker's bid/ask midpoint if it is a usable price."""
+    price = _valid_price(ticker.midpoint())
+    return price if price else None
+
+
+@dataclass
+class MarketSnapshot:
+    """Quote and model greeks of one contract at a point in time."""
+
+    bid: float | None
+    ask: float | None
+    mid: float | None
+    last: float | None
+    delta: float | None = None
+    gamma: float | None = None
+    theta: float | None = None
+    vega: float | None = None
+    implied_vol: float | None = None
+
+    @classmethod
+    def from_ticker(cls, ticker: Any) -> "MarketSnapshot":
+        """Build a snapshot from an ib_insync Ticker."""
+        greeks = getattr(ticker, "modelGreeks", None)
+        return cls(
+            bid=_valid_price(ticker.bid),
+            ask=_valid_price(ticker.ask),
+            mid=_get_midpoint(ticker),
+            last=_valid_price(ticker.last),
+            delta=greeks.delta if greeks else None,
+            gamma=greeks.gamma if greeks else None,
+            theta=greeks.theta if greeks else None,
+            vega=greeks.vega if greeks else None,
+            implied_vol=greeks.impliedVol if greeks else None,
+        )
+
+
+@dataclass
+class _Subscription:
+    """One streaming market data subscription."""
+
+    contract: Any
+    ticker: Any
+    refs: int = 0
+    updated_at: float | None = None
+    released_at: float | None = None
+    updated: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class MarketDataHub:
+    """Reference-counted streaming tickers for one IB connection."""
+
+    def __init__(
+        self,
+        ib: Any,
+        max_lines: int = DEFAULT_MARKET_DATA_LINES,
+        price_ttl: float = 30.0,
+        idle_ttl: float = 60.0,
+    ):
+        """Initialize the market data hub.
+
+        Args:
+            ib: Connected ib_insync.IB instance
+            max_lines: Market data lines this hub may use at once
+            price_ttl: Seconds a streamed price is served without waiting for a new tick
+            idle_ttl: Seconds an unused subscription is kept before it is cancelled
+        """
+        self.ib = ib
+        self.max_lines = max_lines
+        self.price_ttl = price_ttl
+        self.idle_ttl = idle_ttl
+
+        self._subscriptions: dict[tuple, _Subscription] = {}
+        self._by_ticker: dict[int, _Subscription] = {}
+        self._listeners: list[Callable[[list[Any]], None]] = []
+        self._listening = False
+
+    @property
+    def lines_in_use(self) -> int:
+        """Number of market data lines held by the hub."""
+        return len(self._subscriptions)
+
+    def acquire(self, contract: Any) -> Any | None:
+        """Subscribe to a contract, or add a reference to its live subscription.
+
+        Args:
+            contract: Contract to stream
+
+        Returns:
+            Live ticker, or None if no market data line is free
+        """
+        key = get_contract_key(contract)
+        subscription = self._subscriptions.get(key)
+
+        if subscription is None:
+            self._listen()
+            self._cancel_expired()
+            if len(self._subscriptions) >= self.max_lines and not self._evict_idle():
+                logger.warning(
+                    f"No free market data line for {contract.symbol} "
+                    f"({self.lines_in_use}/{self.max_lines} in use)"
+                )
+                return None
+
+            ticker = self.ib.reqMktData(contract, "", False, False)
+            # IB may return a ticker still holding a quote from an earlier subscription,
+            # so the price only counts as fresh once a tick arrives for this one
+            subscription = _Subscription(contract=contract, ticker=ticker)
+            self._subscriptions[key] = subscription
+            self._by_ticker[id(ticker)] = subscription
+
+        subscription.refs += 1
+        subscription.released_at = None
+        return subscription.ticker
+
+    def release(self, contract: Any):
+        """Drop a reference; unused subscriptions linger for idle_ttl seconds.
+
+        Args:
+            contract: Contract passed to acquire
+        """
+        subscription = self._subscriptions.get(get_contract_key(contract))
+        if subscription is None or subscription.refs == 0:
+            return
+
+        subscription.refs -= 1
+        if subscription.refs == 0:
+            subscription.released_at = time.monotonic()
+
+    @asynccontextmanager
+    async def subscription(self, contract: Any) -> AsyncIterator[Any | None]:
+        """Hold a subscription for the duration of a block.
+
+        Args:
+            contract: Contract to stream
+
+        Yields:
+            Live ticker, or None if no market data line is free
+        """
+        ticker = self.acquire(contract)
+        try:
+            yield ticker
+        finally:
+            if ticker is not None:
+                self.release(contract)
+
+    def get_price(self, contract: Any, max_age: float | None = None) -> float | None:
+        """Get the latest streamed midpoint without waiting.
+
+        Args:
+            contract: Subscribed contract
+            max_age: Maximum age in seconds of the last tick (defaults to price_ttl)
+
+        Returns:
+            Midpoint price, or None if not subscribed, not yet quoted or stale
+        """
+        subscription = self._subscriptions.get(get_contract_key(contract))
+        if subscription is None or subscription.updated_at is None:
+            return None
+
+        max_age = self.price_ttl if max_age is None else max_age
+        if time.monotonic() - subscription.updated_at > max_age:
+            return None
+        return _get_midpoint(subscription.ticker)
+
+    async def wait_for_price(self, contract: Any, timeout: float) -> float | None:
+        """Wait for the next valid tick of a subscribed contract.
+
+        Args:
+            contract: Subscribed contract
+            timeout: Seconds to wait
+
+        Returns:
+            Midpoint price, or None if no valid tick arrived in time
+        """
+        key = get_contract_key(contract)
+        subscription = self._subscriptions.get(key)
+        if subscription is None:
+            return None
+
+        subscription.updated.clear()
+        try:
+            await asyncio.wait_for(subscription.updated.wait(), timeout=timeout)
+        except TimeoutError:
+            return None
+
+        # Cancelled or disconnected while waiting
+        if self._subscriptions.get(key) is not subscription:
+            return None
+        return _get_midpoint(subscription.ticker)
+
+    async def get_market_price(
+        self, contract: Any, timeout: float = 1.0, max_age: float | None = None
+    ) -> float | None:
+        """Get a fresh midpoint, subscribing for the lookup if needed.
+
+        Args:
+            contract: Contract to price
+            timeout: Seconds to wait for a tick when no fresh price is streamed
+            max_age: Maximum age in seconds of a streamed price (defaults to price_ttl)
+
+        Returns:
+            Midpoint price, or None if unavailable
+        """
+        snapshot = (await self.get_snapshots([contract], timeout, max_age))[0]
+        return snapshot.mid if snapshot else None
+
+    async def get_snapshots(
+        self, contracts: list[Any], timeout: float = 1.0, max_age: float | None = None
+    ) -> list[MarketSnapshot | None]:
+        """Get fresh snapshots of several contracts, waiting for their ticks concurrently.
+
+        Args:
+            contracts: Contracts to snapshot
+            timeout: Seconds to wait for ticks of contracts without a fresh price
+            max_age: Maximum age in seconds of a streamed price (defaults to price_ttl)
+
+        Returns:
+            Snapshot per contract, in order, or None where no valid price arrived
+        """
+        tickers = [self.acquire(contract) for contract in contracts]
+
+        async def snapshot(contract: Any, ticker: Any) -> MarketSnapshot | None:
+            if ticker is None:
+                return None
+            if self.get_price(contract, max_age) is None:
+                if await self.wait_for_price(contract, timeout) is None:
+                    return None
+            return MarketSnapshot.from_ticker(ticker)
+
+        try:
+            return await asyncio.gather(
+                *(snapshot(contract, ticker) for contract, ticker in zip(contracts, tickers))
+            )
+        finally:
+            for contract, ticker in zip(contracts, tickers):
+                if ticker is not None:
+                    self.release(contract)
+
+    def add_listener(self, listener: Callable[[list[Any]], None]):
+        """Call a function with the contracts that received a valid tick.
+
+        Listeners run synchronously in the IB event handler, so they should
+        only record the update and schedule any I/O as a task.
+
+        Args:
+            listener: Function taking the list of updated contracts
+        """
+        self._listen()
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[list[Any]], None]):
+        """Stop calling a listener added with add_listener.
+
+        Args:
+            listener: Listener to remove
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def close(self):
+        """Cancel every subscription."""
+        if self.ib.isConnected():
+            for subscription in self._subscriptions.values():
+                self.ib.cancelMktData(subscription.contract)
+        self._subscriptions.clear()
+        self._by_ticker.clear()
+
+    def _listen(self):
+        """Attach to the IB events on first use."""
+        if not self._listening:
+            self.ib.pendingTickersEvent += self._on_pending_tickers
+            self.ib.disconnectedEvent += self._on_disconnected
+            self._listening = True
+
+    def _on_pending_tickers(self, tickers):
+        """Record ticks for tickers owned by the hub and notify listeners."""
+        updated = []
+        for ticker in tickers:
+            subscription = self._by_ticker.get(id(ticker))
+            if subscription is not None and self._mark_updated(subscription):
+                updated.append(subscription.contract)
+
+        if updated:
+            for listener in list(self._listeners):
+                try:
+                    listener(updated)
+                except Exception as e:
+                    logger.error(f"Error in market data listener: {e}", exc_info=True)
+
+    def _on_disconnected(self):
+        """Forget all subscriptions; IB drops them with the connection."""
+        for subscription in self._subscriptions.values():
+            # Wake waiters so they return instead of waiting out their timeout
+            subscription.updated.set()
+        self._subscriptions.clear()
+        self._by_ticker.clear()
+
+    def _mark_updated(self, subscription: _Subscription) -> bool:
+        if _get_midpoint(subscription.ticker) is None:
+            return False
+        subscription.updated_at = time.monotonic()
+        subscription.updated.set()
+        return True
+
+    def _cancel_expired(self):
+        """Cancel unused subscriptions idle for longer than idle_ttl."""
+        now = time.monotonic()
+        for key, subscription in list(self._subscriptions.items()):
+            if subscription.refs == 0 and now - subscription.released_at > self.idle_ttl:
+                self._cancel(key)
+
+    def _evict_idle(self) -> bool:
+        """Cancel the longest-unused subscription to free a line."""
+        idle = [
+            (subscription.released_at, key)
+            for key, subscription in self._subscriptions.items()
+            if subscription.refs == 0
+        ]
+        if not idle:
+            return False
+        self._cancel(min(idle)[1])
+        return True
+
+    def _cancel(self, key: tuple):
+        subscription = self._subscriptions.pop(key)
+        self._by_ticker.pop(id(subscription.ticker), None)
+        self.ib.cancelMktData(subscription.contract)
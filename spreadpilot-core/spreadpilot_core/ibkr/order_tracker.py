@@ -0,0 +1,96 @@
+"""Event-driven order status tracking.
+
+ib_insync updates a ``Trade`` in place and fires its ``statusEvent`` and
+``fillEvent`` as order status and execution messages arrive. ``OrderTracker``
+turns those events into awaitable futures, so callers wake up as soon as an
+order fills or is cancelled instead of polling ``trade.orderStatus``. Many
+orders can be awaited concurrently on one event loop without any busy-waiting.
+"""
+
+import asyncio
+from collections.abc import Collection
+from typing import Any
+
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+# Statuses after which IB sends no further fills for an order
+TERMINAL_ORDER_STATUSES = frozenset({"Filled", "Cancelled", "ApiCancelled", "Inactive"})
+
+
+class OrderTracker:
+    """Awaitable order status changes driven by ib_insync trade events."""
+
+    def __init__(self):
+        """Initialize the order tracker."""
+        # Orders with at least one coroutine waiting on them, by order ID
+        self.waiting: dict[int, int] = {}
+
+    async def wait_for_status(
+        self,
+        trade: Any,
+        statuses: Collection[str] = TERMINAL_ORDER_STATUSES,
+        timeout: float | None = None,
+    ) -> str:
+        """Wait until an order reaches one of the given statuses.
+
+        Args:
+            trade: ib_insync Trade returned by placeOrder
+            statuses: Order statuses to wait for (defaults to terminal statuses)
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            Order status when the wait ended; on timeout this is the current
+            status, which is not one of the requested statuses
+        """
+        if trade.orderStatus.status in statuses:
+            return trade.orderStatus.status
+
+        future = asyncio.get_running_loop().create_future()
+
+        def on_update(updated_trade, *args):
+            status = updated_trade.orderStatus.status
+            if status in statuses and not future.done():
+                future.set_result(status)
+
+        order_id = trade.order.orderId
+        self.waiting[order_id] = self.waiting.get(order_id, 0) + 1
+        trade.statusEvent += on_update
+        trade.fillEvent += on_update
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except TimeoutError:
+            return trade.orderStatus.status
+        finally:
+            trade.statusEvent -= on_update
+            trade.fillEvent -= on_update
+            self.waiting[order_id] -= 1
+            if not self.waiting[order_id]:
+                del self.waiting[order_id]
+
+    async def cancel(self, ib: Any, trade: Any, timeout: float = 2.0) -> str:
+        """Cancel an order and wait for IB to confirm it is done.
+
+        The order can still fill while the cancel is in flight, so callers
+        should check the returned status for "Filled".
+
+        Args:
+            ib: ib_insync.IB instance the order was placed with
+            trade: ib_insync Trade to cancel
+            timeout: Maximum seconds to wait for the confirmation
+
+        Returns:
+            Order status after the cancel
+        """
+        if trade.orderStatus.status in TERMINAL_ORDER_STATUSES:
+            return trade.orderStatus.status
+
+        ib.cancelOrder(trade.order)
+        status = await self.wait_for_status(trade, timeout=timeout)
+        if status not in TERMINAL_ORDER_STATUSES:
+            logger.warning(
+                f"Cancel of order {trade.order.orderId} not confirmed after {timeout}s "
+                f"(status {status})"
+            )
+        return status
@@ -0,0 +1,308 @@
+"""Push-based position and portfolio state for an IB connection.
+
+IB pushes every position and portfolio change over the API connection, so
+there is no need to re-read positions on a timer. ``PositionStore`` keeps the
+state of each account current from ``positionEvent``, ``updatePortfolioEvent``
+and ``execDetailsEvent`` as they arrive. Readers see the latest state without a
+request and without a staleness window. Listeners registered with
+``add_listener`` are called with the account whenever a position size changes
+or a fill arrives, so consumers such as assignment detection react to changes
+instead of polling.
+
+Changes are published to Redis in coalesced batches. The
+``positions:{account}`` hash holds the latest state per contract, and the
+``positions:events`` stream gets one entry per change.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..logging import get_logger
+from ..utils.redis_client import get_redis_client
+from .market_data import get_contract_key
+
+logger = get_logger(__name__)
+
+POSITIONS_KEY_PREFIX = "positions"
+POSITIONS_STREAM = "positions:events"
+# Approximate number of change events kept in the stream
+POSITIONS_STREAM_MAXLEN = 10000
+
+
+@dataclass
+class PositionState:
+    """Latest position and portfolio values of one contract in one account."""
+
+    account: str
+    contract: Any
+    position: float = 0.0
+    avg_cost: float = 0.0
+    market_price: float | None = None
+    market_value: float | None = None
+    unrealized_pnl: float | None = None
+    realized_pnl: float | None = None
+    updated_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the state for publishing."""
+        return {
+            "account": self.account,
+            "con_id": getattr(self.contract, "conId", 0),
+            "symbol": self.contract.symbol,
+            "sec_type": self.contract.secType,
+            "expiry": getattr(self.contract, "lastTradeDateOrContractMonth", ""),
+            "strike": getattr(self.contract, "strike", 0.0),
+            "right": getattr(self.contract, "right", ""),
+            "position": self.position,
+            "avg_cost": self.avg_cost,
+            "market_price": self.market_price,
+            "market_value": self.market_value,
+            "unrealized_pnl": self.unrealized_pnl,
+            "realized_pnl": self.realized_pnl,
+            "updated_at": self.updated_at,
+        }
+
+
+class PositionStore:
+    """Event-driven position and portfolio state of the accounts on one IB connection."""
+
+    def __init__(self, ib: Any, publish: bool = True):
+        """Initialize the position store.
+
+        Args:
+            ib: ib_insync.IB instance
+            publish: Whether changes are published to Redis
+        """
+        self.ib = ib
+        self.publish = publish
+        self.last_execution_at: float | None = None
+
+        self._accounts: dict[str, dict[tuple, PositionState]] = {}
+        self._listeners: list[Callable[[str], None]] = []
+        self._listening = False
+
+        # Changes waiting to be published
+        self._dirty: dict[str, set[tuple]] = {}
+        self._events: list[dict[str, Any]] = []
+        self._publish_task: asyncio.Task | None = None
+
+    def attach(self):
+        """Listen to IB's position events and load the positions IB already holds.
+
+        Safe to call again after a reconnect; the state is reloaded from the
+        connection's own position and portfolio lists, without a request.
+        """
+        if not self._listening:
+            self.ib.positionEvent += self._on_position
+            self.ib.updatePortfolioEvent += self._on_portfolio
+            self.ib.execDetailsEvent += self._on_exec_details
+            self._listening = True
+
+        for position in self.ib.positions():
+            self._on_position(position)
+        for item in self.ib.portfolio():
+            self._on_portfolio(item)
+
+    def detach(self):
+        """Stop listening to IB's position events."""
+        if self._listening:
+            self.ib.positionEvent -= self._on_position
+            self.ib.updatePortfolioEvent -= self._on_portfolio
+            self.ib.execDetailsEvent -= self._on_exec_details
+            self._listening = False
+
+    def get_positions(self, account: str | None = None) -> list[PositionState]:
+        """Get the open positions.
+
+        Args:
+            account: Account to read (default: all accounts)
+
+        Returns:
+            State of every contract with a non-zero position
+        """
+        return [state for state in self._iter_states(account) if state.position]
+
+    def get_option_positions(self, symbol: str, account: str | None = None) -> dict[str, float]:
+        """Get open option positions of an underlying.
+
+        Args:
+            symbol: Underlying symbol, e.g. "QQQ"
+            account: Account to read (default: all accounts)
+
+        Returns:
+            Dict mapping "strike-right" keys to position sizes
+        """
+        positions: dict[str, float] = {}
+        for state in self.get_positions(account):
+            contract = state.contract
+            if contract.secType == "OPT" and contract.symbol == symbol:
+                key = f"{contract.strike}-{contract.right}"
+                positions[key] = positions.get(key, 0) + state.position
+        return positions
+
+    def get_portfolio_value(self, account: str | None = None) -> float:
+        """Get the market value of all positions.
+
+        Args:
+            account: Account to read (default: all accounts)
+
+        Returns:
+            Sum of the positions' latest market values
+        """
+        return sum(state.market_value or 0.0 for state in self._iter_states(account))
+
+    def get_pnl(self, account: str | None = None) -> dict[str, float]:
+        """Get the P&L of the portfolio.
+
+        Args:
+            account: Account to read (default: all accounts)
+
+        Returns:
+            Dict with unrealized_pnl and realized_pnl summed over contracts
+        """
+        states = list(self._iter_states(account))
+        return {
+            "unrealized_pnl": sum(state.unrealized_pnl or 0.0 for state in states),
+            "realized_pnl": sum(state.realized_pnl or 0.0 for state in states),
+        }
+
+    def add_listener(self, listener: Callable[[str], None]):
+        """Call a function with the account whenever a position size changes or a fill arrives.
+
+        Listeners run synchronously in the IB event handler, so they should
+        only record the change and schedule any I/O as a task.
+
+        Args:
+            listener: Function taking the account
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str], None]):
+        """Stop calling a listener added with add_listener.
+
+        Args:
+            listener: Listener to remove
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _iter_states(self, account: str | None):
+        if account is not None:
+            return iter(self._accounts.get(account, {}).values())
+        return (state for states in self._accounts.values() for state in states.values())
+
+    def _get_state(self, account: str, contract: Any) -> tuple[tuple, PositionState]:
+        key = get_contract_key(contract)
+        states = self._accounts.setdefault(account, {})
+        state = states.get(key)
+        if state is None:
+            state = states[key] = PositionState(account=account, contract=contract)
+        return key, state
+
+    def _on_position(self, position: Any):
+        """Record a position update."""
+        key, state = self._get_state(position.account, position.contract)
+        if state.position == position.position and state.avg_cost == position.avgCost:
+            return
+        moved = state.position != position.position
+        state.position = position.position
+        state.avg_cost = position.avgCost
+        state.updated_at = time.time()
+        self._changed(state, key, "position", moved)
+
+    def _on_portfolio(self, item: Any):
+        """Record a portfolio update with market value and P&L."""
+        key, state = self._get_state(item.account, item.contract)
+        moved = state.position != item.position
+        state.position = item.position
+        state.avg_cost = item.averageCost
+        state.market_price = item.marketPrice
+        state.market_value = item.marketValue
+        state.unrealized_pnl = item.unrealizedPNL
+        state.realized_pnl = item.realizedPNL
+        state.updated_at = time.time()
+        self._changed(state, key, "portfolio", moved)
+
+    def _on_exec_details(self, trade: Any, fill: Any):
+        """Record an execution; IB follows it with the resulting position update."""
+        execution = fill.execution
+        self.last_execution_at = time.time()
+        self._notify(execution.acctNumber)
+        self._queue_event(
+            {
+                "type": "execution",
+                "account": execution.acctNumber,
+                "exec_id": execution.execId,
+                "con_id": getattr(fill.contract, "conId", 0),
+                "symbol": fill.contract.symbol,
+                "side": execution.side,
+                "shares": execution.shares,
+                "price": execution.price,
+                "time": self.last_execution_at,
+            }
+        )
+
+    def _changed(self, state: PositionState, key: tuple, event_type: str, moved: bool):
+        if self.publish:
+            self._dirty.setdefault(state.account, set()).add(key)
+        # Mark-to-market updates are only published; listeners care about quantities
+        if moved:
+            self._notify(state.account)
+        self._queue_event({"type": event_type, **state.to_dict()})
+
+    def _notify(self, account: str):
+        for listener in list(self._listeners):
+            try:
+                listener(account)
+            except Exception as e:
+                logger.error(f"Error in position listener: {e}", exc_info=True)
+
+    def _queue_event(self, event: dict[str, Any]):
+        """Queue a change for the next Redis publish."""
+        if not self.publish:
+            return
+        self._events.append(event)
+        if self._publish_task is None or self._publish_task.done():
+            try:
+                self._publish_task = asyncio.get_running_loop().create_task(self._flush())
+            except RuntimeError:
+                # No event loop, e.g. during synchronous setup; sent with the next change
+                pass
+
+    async def _flush(self):
+        """Publish queued changes; changes arriving meanwhile go out in the next batch."""
+        while self._events:
+            dirty, self._dirty = self._dirty, {}
+            events, self._events = self._events, []
+
+            redis_client = await get_redis_client()
+            if redis_client is None:
+                return
+
+            try:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for account, keys in dirty.items():
+                        states = self._accounts.get(account, {})
+                        pipe.hset(
+                            f"{POSITIONS_KEY_PREFIX}:{account}",
+                            mapping={
+                                ":".join(map(str, key)): json.dumps(states[key].to_dict())
+                                for key in keys
+                                if key in states
+                            },
+                        )
+                    for event in events:
+                        pipe.xadd(
+                            POSITIONS_STREAM,
+                            {"data": json.dumps(event)},
+                            maxlen=POSITIONS_STREAM_MAXLEN,
+                            approximate=True,
+                        )
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"Error publishing {len(events)} position changes: {e}")
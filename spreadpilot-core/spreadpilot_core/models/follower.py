@@ -42,6 +42,10 @@ class Follower(BaseModel):
     iban: str = Field(..., description="Follower IBAN for commission payments")
     ibkr_username: str = Field(..., description="IBKR username")
     ibkr_secret_ref: str = Field(..., description="Secret Manager reference for IBKR password")
+    ibkr_account_id: str | None = Field(
+        default=None,
+        description="IBKR account traded for the follower (default: the gateway's first account)",
+    )
     commission_pct: float = Field(..., description="Commission percentage (0-100)")
     enabled: bool = Field(default=False, description="Whether the follower is enabled")
     state: FollowerState = Field(default=FollowerState.DISABLED, description="Follower state")
@@ -46,6 +46,9 @@ class Trade(Base):
     price = Column(Numeric(10, 4), nullable=False)
     commission = Column(Numeric(10, 4), nullable=False, default=0)
 
+    # Realized P&L of the lots this fill closed (FIFO)
+    realized_pnl = Column(Numeric(12, 4), nullable=False, default=0)
+
     # Identifiers
     order_id = Column(String(50), nullable=True)
     execution_id = Column(String(50), nullable=True)
@@ -56,11 +59,45 @@ class Trade(Base):
 
     # Indexes
     __table_args__ = (
-        Index("ix_trades_follower_time", "follower_id", "trade_time"),
+        Index(
+            "ix_trades_follower_time",
+            "follower_id",
+            "trade_time",
+            postgresql_include=["commission", "quantity"],
+        ),
         Index("ix_trades_symbol_exp", "symbol", "expiration"),
+        # Leads with execution_id so it never competes with the follower/time index
+        Index("ix_trades_execution_follower", "execution_id", "follower_id", unique=True),
     )
 
 
+class PositionLot(Base):
+    """Open FIFO lots per follower and contract, used for realized P&L matching."""
+
+    __tablename__ = "position_lots"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    follower_id = Column(String(50), nullable=False)
+
+    # Contract details
+    symbol = Column(String(20), nullable=False)
+    contract_type = Column(String(10), nullable=False)  # "CALL", "PUT", "STK"
+    strike = Column(Numeric(10, 2), nullable=True)
+    expiration = Column(Date, nullable=True)
+
+    # Remaining quantity: positive for long lots, negative for short lots
+    quantity = Column(Integer, nullable=False)
+    price = Column(Numeric(10, 4), nullable=False)
+
+    # Timestamps
+    opened_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Indexes
+    __table_args__ = (Index("ix_position_lots_follower_opened", "follower_id", "opened_at"),)
+
+
 class Quote(Base):
     """Real-time market quotes for positions."""
 
@@ -80,8 +117,8 @@ class Quote(Base):
     last = Column(Numeric(10, 4), nullable=True)
     volume = Column(Integer, nullable=True)
 
-    # Timestamp
-    quote_time = Column(DateTime, nullable=False)
+    # Timestamp; part of the primary key because it is the partition key
+    quote_time = Column(DateTime, primary_key=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     # Indexes
@@ -95,6 +132,8 @@ class Quote(Base):
             "quote_time",
         ),
         Index("ix_quotes_time", "quote_time"),
+        # Daily partitions, see spreadpilot_core.pnl.partitions
+        {"postgresql_partition_by": "RANGE (quote_time)"},
     )
 
 
@@ -108,7 +147,8 @@ class PnLIntraday(Base):
 
     # Time period
     snapshot_time = Column(DateTime, nullable=False)
-    trading_date = Column(Date, nullable=False)
+    # Part of the primary key because it is the partition key
+    trading_date = Column(Date, primary_key=True)
 
     # P&L metrics
     realized_pnl = Column(Numeric(12, 4), nullable=False, default=0)
@@ -127,7 +167,12 @@ class PnLIntraday(Base):
     # Indexes
     __table_args__ = (
         Index("ix_pnl_intraday_follower_time", "follower_id", "snapshot_time"),
+        Index(
+            "ix_pnl_intraday_follower_date_time", "follower_id", "trading_date", "snapshot_time"
+        ),
         Index("ix_pnl_intraday_date", "trading_date"),
+        # Monthly partitions, see spreadpilot_core.pnl.partitions
+        {"postgresql_partition_by": "RANGE (trading_date)"},
     )
 
 
@@ -174,7 +219,7 @@ class PnLDaily(Base):
 
     # Indexes
     __table_args__ = (
-        Index("ix_pnl_daily_follower_date", "follower_id", "trading_date"),
+        Index("ix_pnl_daily_follower_date", "follower_id", "trading_date", unique=True),
         Index("ix_pnl_daily_date", "trading_date"),
     )
 
@@ -224,7 +269,7 @@ class PnLMonthly(Base):
 
     # Indexes
     __table_args__ = (
-        Index("ix_pnl_monthly_follower_period", "follower_id", "year", "month"),
+        Index("ix_pnl_monthly_follower_period", "follower_id", "year", "month", unique=True),
         Index("ix_pnl_monthly_period", "year", "month"),
     )
 
@@ -1,5 +1,6 @@
 """P&L service module for real-time monitoring and calculations."""
 
-from .service import PnLService
+from .quote_buffer import QuoteBuffer
+from .service import PnLService, get_shard_stream_name, get_stream_shard
 
-__all__ = ["PnLService"]
+__all__ = ["PnLService", "QuoteBuffer", "get_shard_stream_name", "get_stream_shard"]
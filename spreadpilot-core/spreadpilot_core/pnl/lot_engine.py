@@ -0,0 +1,153 @@
+"""FIFO lot matching for realized P&L.
+
+Open lots are kept per (follower, contract) in fill order. A closing fill
+consumes lots from the front of the queue, so each fill touches only the lots
+it closes and realized P&L is known as soon as the fill arrives. Matching is
+split into a pure planning step and an apply step so the caller can persist
+the lot changes before the in-memory state moves.
+"""
+
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+
+from ..logging import get_logger
+from .mtm_engine import CONTRACT_MULTIPLIER
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Lot:
+    """Open lot; quantity is positive for long lots and negative for short lots."""
+
+    quantity: int
+    price: Decimal
+    opened_at: datetime
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
+
+
+@dataclass
+class LotMatch:
+    """Result of matching a fill against a follower's open lots."""
+
+    follower_id: str
+    contract_key: str
+    realized_pnl: Decimal = Decimal("0")
+    closed_lot_ids: list[uuid.UUID] = field(default_factory=list)
+    # Front lot left partially open, with its remaining quantity
+    reduced_lot: tuple[uuid.UUID, int] | None = None
+    opened_lot: Lot | None = None
+
+
+class LotEngine:
+    """Per-follower FIFO lot books with running realized P&L for the day."""
+
+    def __init__(self):
+        """Initialize the lot engine."""
+        self.books: dict[tuple[str, str], deque[Lot]] = {}
+        self.realized_today: dict[str, Decimal] = {}
+        self.trading_date = date.today()
+
+    def load(
+        self,
+        lots: list[tuple[str, str, Lot]],
+        realized_today: dict[str, Decimal] | None = None,
+    ):
+        """Replace all state with persisted lots.
+
+        Args:
+            lots: List of (follower_id, contract_key, lot), oldest first
+            realized_today: Realized P&L already booked today per follower
+        """
+        self.books = {}
+        for follower_id, contract_key, lot in lots:
+            self.books.setdefault((follower_id, contract_key), deque()).append(lot)
+        self.realized_today = dict(realized_today or {})
+        self.trading_date = date.today()
+
+    def get_open_lots(self, follower_id: str, contract_key: str) -> list[Lot]:
+        """Get the open lots for a contract, oldest first."""
+        return list(self.books.get((follower_id, contract_key), ()))
+
+    def get_realized_today(self, follower_id: str) -> Decimal:
+        """Get realized P&L booked today for a follower."""
+        self._roll_trading_date()
+        return self.realized_today.get(follower_id, Decimal("0"))
+
+    def match_fill(
+        self,
+        follower_id: str,
+        contract_key: str,
+        signed_quantity: int,
+        price: Decimal,
+        fill_time: datetime,
+    ) -> LotMatch:
+        """Plan how a fill closes and opens lots without changing state.
+
+        Args:
+            follower_id: Follower ID
+            contract_key: Contract key from get_contract_key
+            signed_quantity: Positive for buys, negative for sells
+            price: Fill price per share
+            fill_time: Fill timestamp, used as the open time of a new lot
+
+        Returns:
+            LotMatch to persist and then pass to apply_match
+        """
+        match = LotMatch(follower_id=follower_id, contract_key=contract_key)
+        book = self.books.get((follower_id, contract_key), ())
+        remaining = signed_quantity
+
+        for lot in book:
+            # Lots in a book share a sign; a fill in the same direction opens a new lot
+            if remaining == 0 or (lot.quantity > 0) == (remaining > 0):
+                break
+
+            direction = 1 if lot.quantity > 0 else -1
+            matched = min(abs(lot.quantity), abs(remaining))
+            match.realized_pnl += (price - lot.price) * matched * direction * CONTRACT_MULTIPLIER
+            remaining += matched * direction
+
+            if matched == abs(lot.quantity):
+                match.closed_lot_ids.append(lot.id)
+            else:
+                match.reduced_lot = (lot.id, lot.quantity - matched * direction)
+
+        if remaining:
+            match.opened_lot = Lot(quantity=remaining, price=price, opened_at=fill_time)
+
+        return match
+
+    def apply_match(self, match: LotMatch):
+        """Apply a planned match to the in-memory lot books.
+
+        Args:
+            match: LotMatch returned by match_fill
+        """
+        key = (match.follower_id, match.contract_key)
+        book = self.books.setdefault(key, deque())
+
+        for _ in match.closed_lot_ids:
+            book.popleft()
+        if match.reduced_lot:
+            book[0].quantity = match.reduced_lot[1]
+        if match.opened_lot:
+            book.append(match.opened_lot)
+        if not book:
+            del self.books[key]
+
+        if match.realized_pnl:
+            self._roll_trading_date()
+            self.realized_today[match.follower_id] = (
+                self.realized_today.get(match.follower_id, Decimal("0")) + match.realized_pnl
+            )
+
+    def _roll_trading_date(self):
+        """Reset realized P&L counters when the trading date changes."""
+        today = date.today()
+        if self.trading_date != today:
+            self.trading_date = today
+            self.realized_today = {}
@@ -0,0 +1,273 @@
+"""Incremental mark-to-market engine.
+
+Keeps per-follower, per-contract position state in memory and maintains
+running unrealized P&L and market value totals. Fills and quotes update the
+totals by delta, so an MTM snapshot only reads precomputed values instead of
+refetching positions and prices. Expirations and assignments change positions
+without a fill, so loaded positions are reloaded on a new day and periodically.
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from ..logging import get_logger
+
+logger = get_logger(__name__)
+
+# Option contract multiplier
+CONTRACT_MULTIPLIER = Decimal("100")
+
+
+def get_contract_key(
+    symbol: str, contract_type: str, strike: Any = None, expiration: Any = None
+) -> str:
+    """Build a normalized contract key shared by fills, quotes and positions.
+
+    Args:
+        symbol: Underlying symbol, e.g. "QQQ"
+        contract_type: "CALL", "PUT" or "STK"
+        strike: Strike price as number or string (optional for stocks)
+        expiration: Expiration as date or ISO string (optional for stocks)
+
+    Returns:
+        Contract key string
+    """
+    parts = [symbol, contract_type]
+    if strike not in (None, ""):
+        parts.append(f"{Decimal(str(strike)):.2f}")
+    if expiration:
+        parts.append(expiration.isoformat() if isinstance(expiration, date) else str(expiration))
+    return "|".join(parts)
+
+
+@dataclass
+class PositionState:
+    """Open position in one contract for one follower."""
+
+    quantity: int = 0
+    avg_cost: Decimal = Decimal("0")
+
+
+@dataclass
+class FollowerMTM:
+    """Running MTM totals for one follower."""
+
+    positions: dict[str, PositionState] = field(default_factory=dict)
+    unrealized_pnl: Decimal = Decimal("0")
+    total_market_value: Decimal = Decimal("0")
+    commission_today: Decimal = Decimal("0")
+    trading_date: date = field(default_factory=date.today)
+    loaded_date: date = field(default_factory=date.today)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+class MTMEngine:
+    """In-memory MTM state updated incrementally by fill and quote events."""
+
+    def __init__(self):
+        """Initialize the MTM engine."""
+        self.followers: dict[str, FollowerMTM] = {}
+        self.marks: dict[str, Decimal] = {}
+
+        # Reverse index so a quote only touches followers holding the contract
+        self._holders: dict[str, set[str]] = {}
+
+    def is_tracked(self, follower_id: str) -> bool:
+        """Whether the follower's positions have been loaded."""
+        return follower_id in self.followers
+
+    def needs_reload(self, follower_id: str, max_age: float) -> bool:
+        """Whether the follower's positions should be reloaded from the broker.
+
+        Args:
+            follower_id: Follower ID
+            max_age: Seconds loaded positions are trusted without a reload
+
+        Returns:
+            True if the follower is untracked, was loaded on an earlier day or
+            was loaded more than max_age seconds ago
+        """
+        state = self.followers.get(follower_id)
+        if state is None:
+            return True
+        return (
+            state.loaded_date != date.today() or time.monotonic() - state.loaded_at > max_age
+        )
+
+    def load_follower(
+        self,
+        follower_id: str,
+        positions: list[tuple[str, int, Decimal]],
+        commission_today: Decimal = Decimal("0"),
+    ):
+        """Replace a follower's state with an authoritative position snapshot.
+
+        Args:
+            follower_id: Follower ID
+            positions: List of (contract_key, signed quantity, average cost)
+            commission_today: Commission already paid today
+        """
+        self.remove_follower(follower_id)
+
+        state = FollowerMTM(commission_today=commission_today)
+        self.followers[follower_id] = state
+        for contract_key, quantity, avg_cost in positions:
+            if quantity:
+                self._set_position(follower_id, state, contract_key, quantity, avg_cost)
+
+    def remove_follower(self, follower_id: str):
+        """Drop all state for a follower.
+
+        Args:
+            follower_id: Follower ID
+        """
+        state = self.followers.pop(follower_id, None)
+        if not state:
+            return
+        for contract_key in state.positions:
+            holders = self._holders.get(contract_key)
+            if holders:
+                holders.discard(follower_id)
+                if not holders:
+                    del self._holders[contract_key]
+
+    def apply_fill(
+        self,
+        follower_id: str,
+        contract_key: str,
+        signed_quantity: int,
+        price: Decimal,
+        commission: Decimal = Decimal("0"),
+    ):
+        """Apply a fill to a tracked follower's position.
+
+        Args:
+            follower_id: Follower ID
+            contract_key: Contract key from get_contract_key
+            signed_quantity: Positive for buys, negative for sells
+            price: Fill price per share
+            commission: Commission paid on the fill
+        """
+        state = self.followers.get(follower_id)
+        if state is None:
+            return
+
+        self._roll_trading_date(state)
+        state.commission_today += commission
+
+        position = state.positions.get(contract_key)
+        old_quantity = position.quantity if position else 0
+        old_cost = position.avg_cost if position else Decimal("0")
+        new_quantity = old_quantity + signed_quantity
+
+        if new_quantity == 0:
+            new_cost = Decimal("0")
+        elif old_quantity == 0 or (old_quantity > 0) != (new_quantity > 0):
+            # Opening, or flipping through zero: the remainder is opened at the fill price
+            new_cost = price
+        elif abs(new_quantity) > abs(old_quantity):
+            # Adding to the position: weighted average cost
+            new_cost = (old_cost * abs(old_quantity) + price * abs(signed_quantity)) / abs(
+                new_quantity
+            )
+        else:
+            # Reducing the position keeps the average cost
+            new_cost = old_cost
+
+        self._set_position(follower_id, state, contract_key, new_quantity, new_cost)
+
+    def update_mark(self, contract_key: str, price: Decimal):
+        """Update the mark price of a contract and every holder's totals.
+
+        Args:
+            contract_key: Contract key from get_contract_key
+            price: New mark price per share
+        """
+        old_mark = self.marks.get(contract_key)
+        self.marks[contract_key] = price
+        if old_mark == price:
+            return
+
+        for follower_id in self._holders.get(contract_key, ()):
+            state = self.followers[follower_id]
+            position = state.positions[contract_key]
+            if old_mark is None:
+                state.unrealized_pnl += self._unrealized(position, price)
+                state.total_market_value += self._market_value(position, price)
+            else:
+                delta = (price - old_mark) * CONTRACT_MULTIPLIER
+                state.unrealized_pnl += delta * position.quantity
+                state.total_market_value += delta * abs(position.quantity)
+
+    def get_totals(self, follower_id: str) -> dict[str, Any] | None:
+        """Get the precomputed MTM totals for a follower.
+
+        Args:
+            follower_id: Follower ID
+
+        Returns:
+            Dictionary of totals, or None if the follower is not tracked
+        """
+        state = self.followers.get(follower_id)
+        if state is None:
+            return None
+
+        self._roll_trading_date(state)
+        return {
+            "unrealized_pnl": state.unrealized_pnl,
+            "total_market_value": state.total_market_value,
+            "position_count": len(state.positions),
+            "total_commission": state.commission_today,
+        }
+
+    def _set_position(
+        self,
+        follower_id: str,
+        state: FollowerMTM,
+        contract_key: str,
+        quantity: int,
+        avg_cost: Decimal,
+    ):
+        """Replace one position and adjust the follower totals by the difference."""
+        mark = self.marks.get(contract_key)
+        old_position = state.positions.get(contract_key)
+
+        if old_position and mark is not None:
+            state.unrealized_pnl -= self._unrealized(old_position, mark)
+            state.total_market_value -= self._market_value(old_position, mark)
+
+        if quantity == 0:
+            state.positions.pop(contract_key, None)
+            holders = self._holders.get(contract_key)
+            if holders:
+                holders.discard(follower_id)
+                if not holders:
+                    del self._holders[contract_key]
+            return
+
+        position = PositionState(quantity=quantity, avg_cost=avg_cost)
+        state.positions[contract_key] = position
+        self._holders.setdefault(contract_key, set()).add(follower_id)
+
+        if mark is not None:
+            state.unrealized_pnl += self._unrealized(position, mark)
+            state.total_market_value += self._market_value(position, mark)
+
+    @staticmethod
+    def _roll_trading_date(state: FollowerMTM):
+        """Reset daily counters when the trading date changes."""
+        today = date.today()
+        if state.trading_date != today:
+            state.trading_date = today
+            state.commission_today = Decimal("0")
+
+    @staticmethod
+    def _unrealized(position: PositionState, mark: Decimal) -> Decimal:
+        return (mark - position.avg_cost) * position.quantity * CONTRACT_MULTIPLIER
+
+    @staticmethod
+    def _market_value(position: PositionState, mark: Decimal) -> Decimal:
+        return mark * abs(position.quantity) * CONTRACT_MULTIPLIER
@@ -0,0 +1,280 @@
+"""Range partition maintenance for high-volume P&L tables.
+
+``quotes`` is partitioned by day on ``quote_time`` and ``pnl_intraday`` by
+month on ``trading_date``. Partitions are named ``<table>_p<YYYYMMDD>`` or
+``<table>_p<YYYYMM>`` after their lower bound, so their ranges can be read back
+from the catalog without parsing partition bounds. Old partitions are dropped
+whole instead of deleting rows, which keeps indexes and vacuum work bounded.
+
+Each table also has a ``<table>_default`` partition, so late, replayed or
+clock-skewed rows outside the created ranges are still stored instead of
+failing the insert. When a range partition is created, rows already in the
+default partition for its range are moved into it.
+"""
+
+import datetime
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import and_, delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..logging import get_logger
+from ..models.pnl import PnLDaily, PnLIntraday
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """Range partitioning layout of one table."""
+
+    table: str
+    interval: str  # "day" or "month"
+    key: str  # Partition key column
+
+    @property
+    def default_partition(self) -> str:
+        """Get the name of the partition catching rows outside every range."""
+        return f"{self.table}_default"
+
+    def partition_start(self, day: date) -> date:
+        """Get the lower bound of the partition containing a day."""
+        return day if self.interval == "day" else day.replace(day=1)
+
+    def next_start(self, start: date) -> date:
+        """Get the lower bound of the partition after the one starting at start."""
+        if self.interval == "day":
+            return start + datetime.timedelta(days=1)
+        if start.month == 12:
+            return date(start.year + 1, 1, 1)
+        return date(start.year, start.month + 1, 1)
+
+    def partition_name(self, start: date) -> str:
+        """Get the partition table name for a lower bound."""
+        suffix = start.strftime("%Y%m%d" if self.interval == "day" else "%Y%m")
+        return f"{self.table}_p{suffix}"
+
+    def parse_partition_name(self, name: str) -> date | None:
+        """Get the lower bound encoded in a partition name, if it is one of ours."""
+        prefix = f"{self.table}_p"
+        if not name.startswith(prefix):
+            return None
+        try:
+            parsed = datetime.datetime.strptime(
+                name[len(prefix) :], "%Y%m%d" if self.interval == "day" else "%Y%m"
+            )
+        except ValueError:
+            return None
+        return parsed.date()
+
+
+QUOTES_PARTITIONS = PartitionSpec("quotes", "day", "quote_time")
+PNL_INTRADAY_PARTITIONS = PartitionSpec("pnl_intraday", "month", "trading_date")
+
+
+def build_create_partition_sql(spec: PartitionSpec, start: date) -> str:
+    """Build the DDL creating the partition that starts at start.
+
+    Args:
+        spec: Partitioned table layout
+        start: Partition lower bound
+
+    Returns:
+        CREATE TABLE ... PARTITION OF statement
+    """
+    return (
+        f"CREATE TABLE IF NOT EXISTS {spec.partition_name(start)} "
+        f"PARTITION OF {spec.table} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{spec.next_start(start).isoformat()}')"
+    )
+
+
+def build_create_default_partition_sql(spec: PartitionSpec) -> str:
+    """Build the DDL creating the default partition.
+
+    Args:
+        spec: Partitioned table layout
+
+    Returns:
+        CREATE TABLE ... PARTITION OF ... DEFAULT statement
+    """
+    return (
+        f"CREATE TABLE IF NOT EXISTS {spec.default_partition} "
+        f"PARTITION OF {spec.table} DEFAULT"
+    )
+
+
+def build_split_default_partition_sql(spec: PartitionSpec, start: date) -> list[str]:
+    """Build the DDL moving a range out of the default partition into its own partition.
+
+    Postgres refuses to create a partition for a range the default partition
+    holds rows of, so the partition is created detached, the rows are moved
+    into it and it is then attached.
+
+    Args:
+        spec: Partitioned table layout
+        start: Partition lower bound
+
+    Returns:
+        Statements to run in one transaction
+    """
+    name = spec.partition_name(start)
+    lower, upper = start.isoformat(), spec.next_start(start).isoformat()
+    return [
+        f"CREATE TABLE {name} (LIKE {spec.table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+        f"WITH moved AS (DELETE FROM {spec.default_partition} "
+        f"WHERE {spec.key} >= '{lower}' AND {spec.key} < '{upper}' RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        f"ALTER TABLE {spec.table} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')",
+    ]
+
+
+async def create_partitions(
+    session: AsyncSession, spec: PartitionSpec, first_day: date, last_day: date
+) -> list[str]:
+    """Create the default partition and every missing partition covering [first_day, last_day].
+
+    Args:
+        session: Database session
+        spec: Partitioned table layout
+        first_day: First day that must be covered
+        last_day: Last day that must be covered
+
+    Returns:
+        Names of the partitions that were ensured
+    """
+    await session.execute(text(build_create_default_partition_sql(spec)))
+    existing = {name for name, _ in await list_partitions(session, spec)}
+
+    names = []
+    start = spec.partition_start(first_day)
+    while start <= last_day:
+        name = spec.partition_name(start)
+        if name not in existing:
+            if await _default_partition_has_rows(session, spec, start):
+                logger.info(f"Moving rows of {name} out of {spec.default_partition}")
+                for sql in build_split_default_partition_sql(spec, start):
+                    await session.execute(text(sql))
+            else:
+                await session.execute(text(build_create_partition_sql(spec, start)))
+        names.append(name)
+        start = spec.next_start(start)
+    return names
+
+
+async def _default_partition_has_rows(
+    session: AsyncSession, spec: PartitionSpec, start: date
+) -> bool:
+    """Check whether the default partition holds rows in a partition's range."""
+    result = await session.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {spec.default_partition} "
+            f"WHERE {spec.key} >= :lower AND {spec.key} < :upper)"
+        ),
+        {"lower": start, "upper": spec.next_start(start)},
+    )
+    return bool(result.scalar())
+
+
+async def list_partitions(session: AsyncSession, spec: PartitionSpec) -> list[tuple[str, date]]:
+    """List a table's partitions with their lower bounds, oldest first.
+
+    Args:
+        session: Database session
+        spec: Partitioned table layout
+
+    Returns:
+        List of (partition name, lower bound)
+    """
+    result = await session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": spec.table},
+    )
+
+    partitions = []
+    for (name,) in result.all():
+        start = spec.parse_partition_name(name)
+        if start is not None:
+            partitions.append((name, start))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def drop_partitions_before(
+    session: AsyncSession, spec: PartitionSpec, cutoff: date
+) -> list[str]:
+    """Drop partitions whose whole range lies before cutoff.
+
+    Rows before cutoff that landed in the default partition are deleted too.
+
+    Args:
+        session: Database session
+        spec: Partitioned table layout
+        cutoff: First day that must be kept
+
+    Returns:
+        Names of the dropped partitions
+    """
+    dropped = []
+    for name, start in await list_partitions(session, spec):
+        if spec.next_start(start) > cutoff:
+            break
+        await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+        dropped.append(name)
+
+    await session.execute(
+        text(f"DELETE FROM {spec.default_partition} WHERE {spec.key} < :cutoff"),
+        {"cutoff": cutoff},
+    )
+    return dropped
+
+
+def build_intraday_downsample(trading_date: date, bucket_minutes: int):
+    """Build a delete keeping the last snapshot per follower in each time bucket.
+
+    Only followers whose daily rollup for the date is finalized are touched,
+    so rollups never read a thinned-out day.
+
+    Args:
+        trading_date: Trading date to downsample
+        bucket_minutes: Bucket width in minutes
+
+    Returns:
+        Delete statement
+    """
+    bucket = func.floor(func.extract("epoch", PnLIntraday.snapshot_time) / (bucket_minutes * 60))
+    finalized = select(PnLDaily.follower_id).where(
+        and_(PnLDaily.trading_date == trading_date, PnLDaily.is_finalized.is_(True))
+    )
+    ranked = (
+        select(
+            PnLIntraday.id,
+            func.row_number()
+            .over(
+                partition_by=(PnLIntraday.follower_id, bucket),
+                order_by=PnLIntraday.snapshot_time.desc(),
+            )
+            .label("rank"),
+        )
+        .where(
+            and_(
+                PnLIntraday.trading_date == trading_date,
+                PnLIntraday.follower_id.in_(finalized),
+            )
+        )
+        .subquery("ranked")
+    )
+
+    # trading_date is repeated so only one partition is scanned
+    return delete(PnLIntraday).where(
+        and_(
+            PnLIntraday.trading_date == trading_date,
+            PnLIntraday.id.in_(select(ranked.c.id).where(ranked.c.rank > 1)),
+        )
+    )
@@ -0,0 +1,221 @@
+"""Write-behind buffer for bulk quote persistence.
+
+Tick feeds can deliver hundreds of quotes per second; committing each one in
+its own transaction makes the database the bottleneck. The buffer collects
+quote rows in memory and flushes them as a single multi-row INSERT when either
+the batch size or the flush interval is reached.
+
+A flush that fails for a transient reason, such as a lost connection, is
+retried with the next flush. A flush rejected by the database itself, such as
+a constraint violation or a row without a partition, would fail the same way
+every time, so the batch is split in halves until the offending rows are
+isolated; those are dropped and counted, and the rest are written.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
+
+from ..db.postgresql import get_postgres_session
+from ..logging import get_logger
+from ..models.pnl import Quote
+
+logger = get_logger(__name__)
+
+# Errors that retrying the same rows cannot fix
+PERMANENT_ERRORS = (DataError, IntegrityError, ProgrammingError)
+
+
+class QuoteBuffer:
+    """Bounded write-behind buffer that bulk inserts quote rows."""
+
+    def __init__(
+        self,
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+    ):
+        """Initialize the quote buffer.
+
+        Args:
+            max_batch_size: Number of buffered rows that triggers an immediate flush
+            flush_interval: Maximum seconds a row waits before being flushed
+            max_pending: Maximum buffered rows; the oldest rows are dropped beyond this
+        """
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self._rows: deque[dict[str, Any]] = deque()
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flusher_task: asyncio.Task | None = None
+
+        # Metrics
+        self.flushed_rows = 0
+        self.flush_count = 0
+        self.failed_flushes = 0
+        self.dropped_rows = 0
+        self.rejected_rows = 0
+        self.last_flush_latency_ms = 0.0
+        self.max_flush_latency_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Number of rows waiting to be flushed."""
+        return len(self._rows)
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flusher task is active."""
+        return self._flusher_task is not None and not self._flusher_task.done()
+
+    def add(self, row: dict[str, Any]):
+        """Queue a quote row for the next flush.
+
+        Args:
+            row: Column values for a Quote row
+        """
+        if len(self._rows) >= self.max_pending:
+            self._rows.popleft()
+            self.dropped_rows += 1
+        self._rows.append(row)
+
+        if len(self._rows) >= self.max_batch_size:
+            self._flush_requested.set()
+
+    def start(self):
+        """Start the background flusher task."""
+        if not self.running:
+            self._flusher_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the background flusher and flush any remaining rows."""
+        if self._flusher_task:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+
+        await self.flush()
+
+    async def _flush_loop(self):
+        """Flush on batch size or interval, whichever comes first."""
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered rows in a single bulk INSERT.
+
+        Returns:
+            Number of rows written
+        """
+        async with self._flush_lock:
+            if not self._rows:
+                return 0
+
+            rows = list(self._rows)
+            self._rows.clear()
+            started = time.monotonic()
+
+            try:
+                await self._insert(rows)
+                written = len(rows)
+            except PERMANENT_ERRORS as e:
+                self.failed_flushes += 1
+                logger.error(
+                    f"Database rejected {len(rows)} buffered quotes, isolating bad rows: {e}"
+                )
+                retry: list[dict[str, Any]] = []
+                written = await self._insert_valid(rows, retry)
+                self._requeue(retry)
+            except Exception as e:
+                self.failed_flushes += 1
+                self._requeue(rows)
+                logger.error(f"Error flushing {len(rows)} buffered quotes: {e}", exc_info=True)
+                return 0
+
+            latency_ms = (time.monotonic() - started) * 1000
+            self.flush_count += 1
+            self.flushed_rows += written
+            self.last_flush_latency_ms = latency_ms
+            self.max_flush_latency_ms = max(self.max_flush_latency_ms, latency_ms)
+            logger.debug(f"Flushed {written} quotes in {latency_ms:.1f}ms")
+            return written
+
+    async def _insert(self, rows: list[dict[str, Any]]):
+        """Insert rows in one statement and transaction."""
+        async with get_postgres_session() as session:
+            await session.execute(insert(Quote), rows)
+            await session.commit()
+
+    async def _insert_valid(
+        self, rows: list[dict[str, Any]], retry: list[dict[str, Any]]
+    ) -> int:
+        """Insert a rejected batch in halves, dropping rows that fail on their own.
+
+        Args:
+            rows: Rows of a batch the database rejected
+            retry: Collects rows that hit a transient error, to be requeued
+
+        Returns:
+            Number of rows written
+        """
+        if len(rows) == 1:
+            self.rejected_rows += 1
+            logger.error(f"Dropping quote rejected by the database: {rows[0]}")
+            return 0
+
+        written = 0
+        middle = len(rows) // 2
+        for half in (rows[:middle], rows[middle:]):
+            try:
+                await self._insert(half)
+                written += len(half)
+            except PERMANENT_ERRORS:
+                written += await self._insert_valid(half, retry)
+            except Exception as e:
+                logger.error(f"Error flushing {len(half)} buffered quotes: {e}")
+                retry.extend(half)
+        return written
+
+    def _requeue(self, rows: list[dict[str, Any]]):
+        """Put rows from a failed flush back in front of newer rows, within capacity."""
+        capacity = self.max_pending - len(self._rows)
+        if capacity <= 0:
+            self.dropped_rows += len(rows)
+            return
+
+        # Keep the newest of the failed rows if they do not all fit
+        kept = rows[-capacity:]
+        self.dropped_rows += len(rows) - len(kept)
+        self._rows.extendleft(reversed(kept))
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Get buffer metrics.
+
+        Returns:
+            Dictionary with buffer depth, flush counters, latency and dropped or
+            rejected rows
+        """
+        return {
+            "depth": self.depth,
+            "flushed_rows": self.flushed_rows,
+            "flush_count": self.flush_count,
+            "failed_flushes": self.failed_flushes,
+            "dropped_rows": self.dropped_rows,
+            "rejected_rows": self.rejected_rows,
+            "last_flush_latency_ms": round(self.last_flush_latency_ms, 3),
+            "max_flush_latency_ms": round(self.max_flush_latency_ms, 3),
+        }
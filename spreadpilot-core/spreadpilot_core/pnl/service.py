@@ -7,32 +7,128 @@ This service subscribes to trade fills and tick feeds, updates P&L tables
 import asyncio
 import datetime
 import json
+import os
+import socket
+import zlib
 from datetime import date, time
 from decimal import Decimal
 from typing import Any
 
 import pytz
 import redis.asyncio as redis
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import and_, case, delete, desc, func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..db.mongodb import get_mongo_db
 from ..db.postgresql import get_postgres_session
 from ..logging import get_logger
-from ..models.pnl import CommissionMonthly, PnLDaily, PnLIntraday, PnLMonthly, Quote, Trade
+from ..models.pnl import (
+    CommissionMonthly,
+    PnLDaily,
+    PnLIntraday,
+    PnLMonthly,
+    PositionLot,
+    Quote,
+    Trade,
+)
 from ..utils.redis_client import get_redis_client
+from ..utils.time import get_current_trading_date, get_day_range, get_month_range
+from .lot_engine import Lot, LotEngine, LotMatch
+from .mtm_engine import MTMEngine, get_contract_key
+from .partitions import (
+    PNL_INTRADAY_PARTITIONS,
+    QUOTES_PARTITIONS,
+    build_intraday_downsample,
+    create_partitions,
+    drop_partitions_before,
+)
+from .quote_buffer import QuoteBuffer
 
 logger = get_logger(__name__)
 
 # Eastern timezone for rollup times
 ET = pytz.timezone("US/Eastern")
 
+# Redis stream consumption
+STREAM_GROUP = "pnl_service"
+FILLS_STREAM = "trade_fills"
+QUOTES_STREAM = "quotes"
+STREAM_BLOCK_MS = 1000
+STREAM_BATCH_MIN = 10
+STREAM_BATCH_MAX = 500
+# Quote reads pause while this many quotes are waiting for the quote worker
+QUOTE_QUEUE_HIGH_WATER = 5000
+# Pending messages idle this long are reclaimed from crashed consumers
+STREAM_CLAIM_MIN_IDLE_MS = 60000
+STREAM_CLAIM_INTERVAL_SECONDS = 30
+# Pending messages delivered this often without being acknowledged are dead-lettered
+STREAM_MAX_DELIVERIES = 5
+DEAD_LETTER_SUFFIX = "dead"
+
+# Partitions are created this far ahead so inserts never miss one
+QUOTE_PARTITION_DAYS_AHEAD = 7
+INTRADAY_PARTITION_DAYS_AHEAD = 62
+# and this far behind the trading date, covering the previous trading day over a weekend
+PARTITION_DAYS_BEHIND = 3
+# Finalized days this far back are revisited by downsampling, covering missed runs
+DOWNSAMPLE_LOOKBACK_DAYS = 7
+
+
+def get_stream_shard(routing_key: str, shard_count: int) -> int:
+    """Get the P&L worker shard for a routing key.
+
+    Producers route fills by follower ID so that all fills of a follower are
+    consumed, in order, by the shard that snapshots and rolls up that follower.
+    Quotes are not sharded: every shard needs every mark.
+
+    Args:
+        routing_key: Follower ID
+        shard_count: Number of P&L worker shards
+
+    Returns:
+        Shard index in [0, shard_count)
+    """
+    return zlib.crc32(routing_key.encode()) % max(shard_count, 1)
+
+
+def get_shard_stream_name(stream: str, shard_index: int, shard_count: int) -> str:
+    """Get the stream name for a shard; unsharded deployments keep the base name.
+
+    Args:
+        stream: Base stream name, e.g. "trade_fills"
+        shard_index: Shard index
+        shard_count: Number of P&L worker shards
+
+    Returns:
+        Stream name to publish to or consume from
+    """
+    if shard_count <= 1:
+        return stream
+    return f"{stream}:{shard_index}"
+
 
 class PnLService:
     """Service for P&L tracking, calculation, and rollups with commission management."""
 
-    def __init__(self):
-        """Initialize P&L service."""
+    def __init__(
+        self,
+        consumer_name: str | None = None,
+        shard_index: int | None = None,
+        shard_count: int | None = None,
+        bulk_rollups: bool | None = None,
+    ):
+        """Initialize P&L service.
+
+        Args:
+            consumer_name: Redis consumer name; must be stable across restarts of
+                the same worker (defaults to PNL_CONSUMER_NAME or the hostname)
+            shard_index: Shard consumed by this worker (defaults to PNL_SHARD_INDEX or 0)
+            shard_count: Total number of P&L worker shards (defaults to PNL_SHARD_COUNT or 1)
+            bulk_rollups: Compute daily/monthly rollups for all followers in grouped
+                SQL statements instead of per follower (defaults to PNL_BULK_ROLLUPS or True)
+        """
         self.monitoring_active = False
         self.subscriptions_active = False
 
@@ -42,6 +138,15 @@ class PnLService:
         # In-memory quote cache for faster MTM calculations
         self.quote_cache: dict[str, Quote] = {}
 
+        # Write-behind buffer so ticks are persisted in bulk, not one commit each
+        self.quote_buffer = QuoteBuffer()
+
+        # Incremental MTM state, updated by fills and quotes between snapshots
+        self.mtm_engine = MTMEngine()
+
+        # FIFO lots for realized P&L, persisted in position_lots
+        self.lot_engine = LotEngine()
+
         # Callback functions for external integrations
         self.get_follower_positions_callback = None
         self.get_market_price_callback = None
@@ -49,6 +154,61 @@ class PnLService:
 
         # Redis client for stream subscriptions
         self.redis_client: redis.Redis | None = None
+        self.stream_batch_size = STREAM_BATCH_MIN
+
+        # Consumer identity and sharding across P&L worker processes
+        self.consumer_name = (
+            consumer_name or os.environ.get("PNL_CONSUMER_NAME") or socket.gethostname()
+        )
+        self.shard_count = max(
+            shard_count if shard_count is not None else int(os.environ.get("PNL_SHARD_COUNT", 1)),
+            1,
+        )
+        self.shard_index = (
+            shard_index if shard_index is not None else int(os.environ.get("PNL_SHARD_INDEX", 0))
+        )
+        if not 0 <= self.shard_index < self.shard_count:
+            raise ValueError(
+                f"Shard index {self.shard_index} out of range for {self.shard_count} shards"
+            )
+        self.fills_stream = get_shard_stream_name(
+            FILLS_STREAM, self.shard_index, self.shard_count
+        )
+        # Each shard reads the one quotes stream through its own consumer group,
+        # so quotes are broadcast to all shards; only the first persists them
+        self.quotes_stream = QUOTES_STREAM
+        self.stream_group = get_shard_stream_name(
+            STREAM_GROUP, self.shard_index, self.shard_count
+        )
+        self.persist_quotes = self.shard_index == 0
+
+        # Set-based rollups for all followers at once
+        if bulk_rollups is None:
+            bulk_rollups = os.environ.get("PNL_BULK_ROLLUPS", "true").lower() in (
+                "true",
+                "1",
+                "yes",
+            )
+        self.bulk_rollups = bulk_rollups
+
+        # Raw data retention once rollups are finalized
+        self.quote_retention_days = int(os.environ.get("PNL_QUOTE_RETENTION_DAYS", 7))
+        self.intraday_downsample_days = int(os.environ.get("PNL_INTRADAY_DOWNSAMPLE_DAYS", 7))
+        self.intraday_downsample_minutes = int(
+            os.environ.get("PNL_INTRADAY_DOWNSAMPLE_MINUTES", 5)
+        )
+        self.intraday_retention_months = int(os.environ.get("PNL_INTRADAY_RETENTION_MONTHS", 13))
+        self.last_maintenance_date: date | None = None
+
+        # Seconds MTM positions are trusted before being re-synced with the broker
+        self.mtm_resync_seconds = int(os.environ.get("PNL_MTM_RESYNC_SECONDS", 300))
+
+        # Pending-entry recovery state
+        self._in_flight_messages: set[tuple[str, str]] = set()
+        self.stream_pending: dict[str, int] = {}
+        self.recovered_messages = 0
+        self.claimed_messages = 0
+        self.dead_lettered_messages = 0
 
         logger.info("Initialized P&L service")
 
@@ -82,6 +242,12 @@ class PnLService:
                 logger.error("Failed to connect to Redis")
                 return
 
+            self.quote_buffer.start()
+
+            # Fills must not be matched against empty books, so a failed load stops startup
+            await self._load_lot_state()
+            await self._ensure_partitions()
+
             # Start concurrent tasks
             tasks = [
                 asyncio.create_task(self._mtm_calculation_loop(shutdown_event)),
@@ -89,6 +255,11 @@ class PnLService:
                 asyncio.create_task(self._monthly_rollup_scheduler(shutdown_event)),
                 asyncio.create_task(self._redis_stream_subscriber(shutdown_event)),
             ]
+            # Partitions are shared by all followers, so only the first shard maintains them
+            if self.shard_index == 0:
+                tasks.append(
+                    asyncio.create_task(self._partition_maintenance_scheduler(shutdown_event))
+                )
 
             # Wait for any task to complete or shutdown
             await asyncio.gather(*tasks, return_exceptions=True)
@@ -98,13 +269,15 @@ class PnLService:
             raise
         except Exception as e:
             logger.error(f"Error in P&L monitoring service: {e}", exc_info=True)
+            raise
         finally:
             self.monitoring_active = False
             self.subscriptions_active = False
+            await self.quote_buffer.stop()
             if self.redis_client:
                 await self.redis_client.close()
 
-    async def record_trade_fill(self, follower_id: str, fill_data: dict[str, Any]):
+    async def record_trade_fill(self, follower_id: str, fill_data: dict[str, Any]) -> bool:
         """Record a trade fill from IBKR.
 
         Args:
@@ -121,6 +294,9 @@ class PnLService:
                 - order_id: Order ID
                 - execution_id: Execution ID
                 - trade_time: Trade timestamp
+
+        Returns:
+            True if the fill was recorded, False if recording it failed
         """
         try:
             trade = Trade(
@@ -138,9 +314,42 @@ class PnLService:
                 trade_time=fill_data["trade_time"],
             )
 
+            contract_key = get_contract_key(
+                trade.symbol, trade.contract_type, trade.strike, trade.expiration
+            )
+            signed_quantity = trade.quantity if trade.trade_type == "BUY" else -trade.quantity
+
             async with get_postgres_session() as session:
+                # Replayed and reclaimed stream messages deliver the same execution again
+                if trade.execution_id and await self._is_recorded_execution(session, trade):
+                    logger.info(
+                        f"Skipping already recorded execution {trade.execution_id} "
+                        f"for {follower_id}"
+                    )
+                    return True
+
+                # Match against open lots; state only moves once the changes are committed
+                lot_match = self.lot_engine.match_fill(
+                    follower_id, contract_key, signed_quantity, trade.price, trade.trade_time
+                )
+                trade.realized_pnl = lot_match.realized_pnl
+
+                await self._persist_lot_match(session, lot_match, trade)
                 session.add(trade)
-                await session.commit()
+                try:
+                    await session.commit()
+                except IntegrityError:
+                    # Recorded concurrently by another consumer since the check above
+                    if not trade.execution_id:
+                        raise
+                    await session.rollback()
+                    logger.info(f"Skipping concurrently recorded execution {trade.execution_id}")
+                    return True
+
+            self.lot_engine.apply_match(lot_match)
+            self.mtm_engine.apply_fill(
+                follower_id, contract_key, signed_quantity, trade.price, trade.commission
+            )
 
             logger.info(
                 f"Recorded trade fill for {follower_id}: "
@@ -148,11 +357,116 @@ class PnLService:
                 f"{fill_data['symbol']} {fill_data['strike']} {fill_data['contract_type']} "
                 f"@ ${fill_data['price']}"
             )
+            return True
 
         except Exception as e:
             logger.error(f"Error recording trade fill: {e}", exc_info=True)
+            return False
+
+    async def _is_recorded_execution(self, session: AsyncSession, trade: Trade) -> bool:
+        """Check whether a follower's execution has already been recorded.
+
+        Args:
+            session: Database session the trade is recorded in
+            trade: Trade being recorded
+
+        Returns:
+            True if a trade with the same execution ID exists
+        """
+        result = await session.execute(
+            select(Trade.id)
+            .where(
+                and_(
+                    Trade.follower_id == trade.follower_id,
+                    Trade.execution_id == trade.execution_id,
+                )
+            )
+            .limit(1)
+        )
+        return result.scalar() is not None
+
+    async def _persist_lot_match(self, session: AsyncSession, lot_match: LotMatch, trade: Trade):
+        """Write the lot changes of a fill in the caller's transaction.
+
+        Args:
+            session: Database session the trade is recorded in
+            lot_match: Planned lot changes for the fill
+            trade: Trade being recorded
+        """
+        if lot_match.closed_lot_ids:
+            await session.execute(
+                delete(PositionLot).where(PositionLot.id.in_(lot_match.closed_lot_ids))
+            )
+
+        if lot_match.reduced_lot:
+            lot_id, quantity = lot_match.reduced_lot
+            await session.execute(
+                update(PositionLot)
+                .where(PositionLot.id == lot_id)
+                .values(quantity=quantity, updated_at=datetime.datetime.utcnow())
+            )
+
+        if lot_match.opened_lot:
+            lot = lot_match.opened_lot
+            await session.execute(
+                insert(PositionLot).values(
+                    id=lot.id,
+                    follower_id=trade.follower_id,
+                    symbol=trade.symbol,
+                    contract_type=trade.contract_type,
+                    strike=trade.strike,
+                    expiration=trade.expiration,
+                    quantity=lot.quantity,
+                    price=lot.price,
+                    opened_at=lot.opened_at,
+                )
+            )
+
+    async def _load_lot_state(self):
+        """Load open lots and today's realized P&L so no trade history is replayed.
+
+        Raises:
+            Exception: If the lots cannot be loaded; matching fills against empty
+                books would book closing fills as new lots
+        """
+        try:
+            day_start, day_end = get_day_range(date.today())
+
+            async with get_postgres_session() as session:
+                result = await session.execute(
+                    select(PositionLot).order_by(PositionLot.opened_at, PositionLot.created_at)
+                )
+                lots = [
+                    (
+                        row.follower_id,
+                        get_contract_key(row.symbol, row.contract_type, row.strike, row.expiration),
+                        Lot(
+                            quantity=row.quantity,
+                            price=row.price,
+                            opened_at=row.opened_at,
+                            id=row.id,
+                        ),
+                    )
+                    for row in result.scalars().all()
+                ]
+
+                result = await session.execute(
+                    select(Trade.follower_id, func.sum(Trade.realized_pnl))
+                    .where(and_(Trade.trade_time >= day_start, Trade.trade_time < day_end))
+                    .group_by(Trade.follower_id)
+                )
+                realized_today = {
+                    follower_id: total or Decimal("0") for follower_id, total in result.all()
+                }
 
-    async def update_quote(self, quote_data: dict[str, Any]):
+            self.lot_engine.load(lots, realized_today)
+            logger.info(f"Loaded {len(lots)} open lots for realized P&L matching")
+
+        except Exception as e:
+            logger.error(f"Error loading lot state: {e}", exc_info=True)
+            raise
+
+    async def update_quote(self, quote_data: dict[str, Any]) -> bool:
         """Update market quote for a contract.
 
         Args:
@@ -166,30 +480,68 @@ class PnLService:
                 - last: Last trade price
                 - volume: Volume
                 - quote_time: Quote timestamp
+
+        Returns:
+            True if the quote was applied, False if it could not be
         """
         try:
-            quote = Quote(
-                symbol=quote_data["symbol"],
-                contract_type=quote_data["contract_type"],
-                strike=(Decimal(str(quote_data["strike"])) if quote_data.get("strike") else None),
-                expiration=quote_data.get("expiration"),
-                bid=Decimal(str(quote_data["bid"])) if quote_data.get("bid") else None,
-                ask=Decimal(str(quote_data["ask"])) if quote_data.get("ask") else None,
-                last=(Decimal(str(quote_data["last"])) if quote_data.get("last") else None),
-                volume=quote_data.get("volume"),
-                quote_time=quote_data["quote_time"],
-            )
+            row = {
+                "symbol": quote_data["symbol"],
+                "contract_type": quote_data["contract_type"],
+                "strike": (
+                    Decimal(str(quote_data["strike"])) if quote_data.get("strike") else None
+                ),
+                "expiration": quote_data.get("expiration"),
+                "bid": Decimal(str(quote_data["bid"])) if quote_data.get("bid") else None,
+                "ask": Decimal(str(quote_data["ask"])) if quote_data.get("ask") else None,
+                "last": Decimal(str(quote_data["last"])) if quote_data.get("last") else None,
+                "volume": quote_data.get("volume"),
+                "quote_time": quote_data["quote_time"],
+            }
 
-            async with get_postgres_session() as session:
-                session.add(quote)
-                await session.commit()
+            # Persistence is deferred to the write-behind buffer
+            if self.persist_quotes:
+                self.quote_buffer.add(row)
+
+                # Without the background flusher (monitoring not started) flush inline
+                if (
+                    not self.quote_buffer.running
+                    and self.quote_buffer.depth >= self.quote_buffer.max_batch_size
+                ):
+                    await self.quote_buffer.flush()
 
-            # Update cache for faster MTM calculations
+            # Update cache right away for faster MTM calculations
             cache_key = self._get_quote_cache_key(quote_data)
-            self.quote_cache[cache_key] = quote
+            self.quote_cache[cache_key] = Quote(**row)
+
+            mark = self._get_mark_price(row)
+            if mark is not None:
+                self.mtm_engine.update_mark(
+                    get_contract_key(
+                        row["symbol"], row["contract_type"], row["strike"], row["expiration"]
+                    ),
+                    mark,
+                )
+            return True
 
         except Exception as e:
             logger.error(f"Error updating quote: {e}", exc_info=True)
+            return False
+
+    def get_quote_buffer_metrics(self) -> dict[str, Any]:
+        """Get write-behind quote buffer metrics.
+
+        Returns:
+            Dictionary with buffer depth, flush latency and dropped rows
+        """
+        return self.quote_buffer.get_metrics()
+
+    @staticmethod
+    def _get_mark_price(row: dict[str, Any]) -> Decimal | None:
+        """Get the MTM mark for a quote: the mid when both sides exist, else last."""
+        if row["bid"] is not None and row["ask"] is not None:
+            return (row["bid"] + row["ask"]) / 2
+        return row["last"]
 
     def _get_quote_cache_key(self, quote_data: dict[str, Any]) -> str:
         """Generate cache key for a quote."""
@@ -209,6 +561,25 @@ class PnLService:
         self.active_followers.add(follower_id)
         logger.info(f"Added follower {follower_id} to P&L tracking")
 
+    def owns_follower(self, follower_id: str) -> bool:
+        """Check whether this worker's shard snapshots and rolls up a follower.
+
+        Args:
+            follower_id: Follower ID
+
+        Returns:
+            True if the follower's fills are routed to this shard
+        """
+        return get_stream_shard(follower_id, self.shard_count) == self.shard_index
+
+    def _get_owned_followers(self) -> list[str]:
+        """Get the active followers handled by this shard."""
+        return sorted(
+            follower_id
+            for follower_id in self.active_followers
+            if self.owns_follower(follower_id)
+        )
+
     async def remove_follower(self, follower_id: str):
         """Remove a follower from active P&L tracking.
 
@@ -216,6 +587,7 @@ class PnLService:
             follower_id: Follower ID to stop tracking
         """
         self.active_followers.discard(follower_id)
+        self.mtm_engine.remove_follower(follower_id)
         logger.info(f"Removed follower {follower_id} from P&L tracking")
 
     async def _mtm_calculation_loop(self, shutdown_event: asyncio.Event):
@@ -251,127 +623,140 @@ class PnLService:
     async def _calculate_and_store_mtm(self):
         """Calculate current mark-to-market P&L for all active followers."""
         try:
-            for follower_id in self.active_followers:
+            snapshots = []
+            for follower_id in self._get_owned_followers():
                 try:
-                    await self._calculate_follower_mtm(follower_id)
+                    snapshot = await self._build_mtm_snapshot(follower_id)
+                    if snapshot:
+                        snapshots.append(snapshot)
                 except Exception as e:
                     logger.error(f"Error calculating MTM for follower {follower_id}: {e}")
 
+            # Store all snapshots in one transaction
+            if snapshots:
+                async with get_postgres_session() as session:
+                    session.add_all(snapshots)
+                    await session.commit()
+
         except Exception as e:
             logger.error(f"Error in MTM calculation: {e}")
 
     async def _calculate_follower_mtm(self, follower_id: str):
         """Calculate MTM P&L for a specific follower."""
         try:
-            # Get current positions (using callback)
-            if not self.get_follower_positions_callback:
-                logger.debug("No position callback set, skipping MTM calculation")
-                return
+            snapshot = await self._build_mtm_snapshot(follower_id)
+            if snapshot:
+                async with get_postgres_session() as session:
+                    session.add(snapshot)
+                    await session.commit()
 
-            positions = await self.get_follower_positions_callback(follower_id)
-            if not positions:
-                logger.debug(f"No positions for follower {follower_id}")
-                return
+        except Exception as e:
+            logger.error(f"Error calculating follower MTM: {e}")
 
-            # Calculate realized P&L from today's trades
-            realized_pnl = await self._get_realized_pnl_today(follower_id)
-
-            # Calculate unrealized P&L from open positions
-            unrealized_pnl = Decimal("0")
-            total_market_value = Decimal("0")
-            position_count = 0
-
-            for position in positions:
-                if position.quantity != 0:
-                    position_count += 1
-
-                    # Get current market price
-                    if self.get_market_price_callback:
-                        market_price = await self.get_market_price_callback(position)
-                        if market_price:
-                            position_value = (
-                                Decimal(str(market_price))
-                                * Decimal(str(abs(position.quantity)))
-                                * 100
-                            )
-                            total_market_value += position_value
-
-                            # Calculate unrealized P&L
-                            avg_cost = Decimal(str(position.avg_cost))
-                            if position.quantity > 0:  # Long position
-                                unrealized = (
-                                    (Decimal(str(market_price)) - avg_cost)
-                                    * Decimal(str(position.quantity))
-                                    * 100
-                                )
-                            else:  # Short position
-                                unrealized = (
-                                    (avg_cost - Decimal(str(market_price)))
-                                    * Decimal(str(abs(position.quantity)))
-                                    * 100
-                                )
-                            unrealized_pnl += unrealized
+    async def _build_mtm_snapshot(self, follower_id: str) -> PnLIntraday | None:
+        """Build an intraday snapshot from the MTM engine's precomputed totals.
 
-            # Get today's commission
-            total_commission = await self._get_daily_commission(follower_id)
+        Args:
+            follower_id: Follower ID
 
-            # Store MTM snapshot
-            await self._store_intraday_pnl(
-                follower_id=follower_id,
-                realized_pnl=realized_pnl,
-                unrealized_pnl=unrealized_pnl,
-                position_count=position_count,
-                total_market_value=total_market_value,
-                total_commission=total_commission,
-            )
+        Returns:
+            Unsaved PnLIntraday snapshot, or None if the follower has no positions
+        """
+        if self.mtm_engine.needs_reload(follower_id, self.mtm_resync_seconds):
+            if not await self._load_follower_positions(follower_id):
+                return None
 
-        except Exception as e:
-            logger.error(f"Error calculating follower MTM: {e}")
+        totals = self.mtm_engine.get_totals(follower_id)
+        if not totals["position_count"]:
+            logger.debug(f"No positions for follower {follower_id}")
+            return None
 
-    async def _get_realized_pnl_today(self, follower_id: str) -> Decimal:
-        """Get realized P&L from today's trades."""
-        try:
-            today = date.today()
+        # Calculate realized P&L from today's trades
+        realized_pnl = await self._get_realized_pnl_today(follower_id)
 
-            async with get_postgres_session() as session:
-                # Get all trades for today
-                result = await session.execute(
-                    select(Trade)
-                    .where(
-                        and_(
-                            Trade.follower_id == follower_id,
-                            func.date(Trade.trade_time) == today,
-                        )
-                    )
-                    .order_by(Trade.trade_time)
-                )
-                trades = result.scalars().all()
+        return self._make_intraday_snapshot(
+            follower_id=follower_id,
+            realized_pnl=realized_pnl,
+            unrealized_pnl=totals["unrealized_pnl"],
+            position_count=totals["position_count"],
+            total_market_value=totals["total_market_value"],
+            total_commission=totals["total_commission"],
+        )
 
-                # Calculate realized P&L
-                # This is simplified - in reality, you'd match trades to calculate actual P&L
-                realized_pnl = Decimal("0")
-                for trade in trades:
-                    # For now, we'll use a simplified calculation
-                    # In production, you'd match opening and closing trades
-                    pass
+    async def _load_follower_positions(self, follower_id: str) -> bool:
+        """Load or re-sync a follower's positions in the MTM engine.
 
-                return realized_pnl
+        Between loads, fills and quotes keep the engine up to date. Positions
+        that close without a fill, such as expired or assigned contracts, are
+        dropped by the next load. Prices for contracts without a quote yet are
+        fetched concurrently.
 
-        except Exception as e:
-            logger.error(f"Error getting realized P&L: {e}")
-            return Decimal("0")
+        Args:
+            follower_id: Follower ID
+
+        Returns:
+            True if the follower is now tracked by the engine
+        """
+        if not self.get_follower_positions_callback:
+            logger.debug("No position callback set, skipping MTM calculation")
+            return False
+
+        positions = await self.get_follower_positions_callback(follower_id)
+        if positions is None:
+            # Positions unavailable; keep whatever the engine already holds
+            logger.debug(f"Positions unavailable for follower {follower_id}")
+            return self.mtm_engine.is_tracked(follower_id)
+
+        open_positions = []
+        for position in positions:
+            if position.quantity != 0:
+                contract_key = get_contract_key(
+                    position.symbol, position.contract_type, position.strike, position.expiration
+                )
+                open_positions.append((contract_key, position))
+
+        if self.get_market_price_callback:
+            unpriced = [
+                (contract_key, position)
+                for contract_key, position in open_positions
+                if contract_key not in self.mtm_engine.marks
+            ]
+            prices = await asyncio.gather(
+                *(self.get_market_price_callback(position) for _, position in unpriced),
+                return_exceptions=True,
+            )
+            for (contract_key, _), price in zip(unpriced, prices, strict=True):
+                if isinstance(price, Exception):
+                    logger.error(f"Error getting market price for {contract_key}: {price}")
+                elif price:
+                    self.mtm_engine.update_mark(contract_key, Decimal(str(price)))
+
+        self.mtm_engine.load_follower(
+            follower_id,
+            [
+                (contract_key, int(position.quantity), Decimal(str(position.avg_cost)))
+                for contract_key, position in open_positions
+            ],
+            commission_today=await self._get_daily_commission(follower_id),
+        )
+        return True
+
+    async def _get_realized_pnl_today(self, follower_id: str) -> Decimal:
+        """Get realized P&L from today's trades, as matched by the lot engine."""
+        return self.lot_engine.get_realized_today(follower_id)
 
     async def _get_daily_commission(self, follower_id: str) -> Decimal:
         """Get total commission paid today."""
         try:
-            today = date.today()
+            day_start, day_end = get_day_range(date.today())
 
             async with get_postgres_session() as session:
                 result = await session.execute(
                     select(func.sum(Trade.commission)).where(
                         and_(
                             Trade.follower_id == follower_id,
-                            func.date(Trade.trade_time) == today,
+                            Trade.trade_time >= day_start,
+                            Trade.trade_time < day_end,
                         )
                     )
                 )
@@ -382,7 +767,7 @@ class PnLService:
             logger.error(f"Error getting daily commission for {follower_id}: {e}")
             return Decimal("0")
 
-    async def _store_intraday_pnl(
+    def _make_intraday_snapshot(
         self,
         follower_id: str,
         realized_pnl: Decimal,
@@ -390,33 +775,30 @@ class PnLService:
         position_count: int,
         total_market_value: Decimal,
         total_commission: Decimal,
-    ):
-        """Store intraday P&L snapshot."""
-        try:
-            now = datetime.datetime.utcnow()
-            today = now.date()
-
-            pnl_snapshot = PnLIntraday(
-                follower_id=follower_id,
-                snapshot_time=now,
-                trading_date=today,
-                realized_pnl=realized_pnl,
-                unrealized_pnl=unrealized_pnl,
-                total_pnl=realized_pnl + unrealized_pnl,
-                position_count=position_count,
-                total_market_value=total_market_value,
-                total_commission=total_commission,
-            )
-
-            async with get_postgres_session() as session:
-                session.add(pnl_snapshot)
-                await session.commit()
-
-        except Exception as e:
-            logger.error(f"Error storing intraday P&L: {e}")
+    ) -> PnLIntraday:
+        """Build an intraday P&L snapshot for the current time."""
+        now = datetime.datetime.utcnow()
+        return PnLIntraday(
+            follower_id=follower_id,
+            snapshot_time=now,
+            trading_date=now.date(),
+            realized_pnl=realized_pnl,
+            unrealized_pnl=unrealized_pnl,
+            total_pnl=realized_pnl + unrealized_pnl,
+            position_count=position_count,
+            total_market_value=total_market_value,
+            total_commission=total_commission,
+        )
 
     async def _redis_stream_subscriber(self, shutdown_event: asyncio.Event):
-        """Subscribe to Redis streams for trade fills and quotes."""
+        """Subscribe to Redis streams for trade fills and quotes.
+
+        A single reader polls both streams with one XREADGROUP call and hands
+        messages to a dedicated worker per stream, so fills are never queued
+        behind quote bursts. Workers acknowledge their messages in batches.
+        On start the worker replays its own unacknowledged messages, and a
+        periodic sweep claims messages left pending by crashed consumers.
+        """
         try:
             self.subscriptions_active = True
             logger.info("Starting Redis stream subscriptions")
@@ -425,85 +807,330 @@ class PnLService:
                 logger.error("No Redis client available")
                 return
 
-            # Create consumer group if it doesn't exist
-            try:
-                await self.redis_client.xgroup_create(
-                    "trade_fills", "pnl_service", id="0", mkstream=True
-                )
-            except redis.exceptions.ResponseError as e:
-                if "BUSYGROUP" not in str(e):
-                    logger.error(f"Error creating consumer group for trade_fills: {e}")
+            # Create consumer groups if they don't exist
+            for stream in (self.fills_stream, self.quotes_stream):
+                try:
+                    await self.redis_client.xgroup_create(
+                        stream, self.stream_group, id="0", mkstream=True
+                    )
+                except redis.exceptions.ResponseError as e:
+                    if "BUSYGROUP" not in str(e):
+                        logger.error(f"Error creating consumer group for {stream}: {e}")
+
+            logger.info(
+                f"Consuming {self.fills_stream} and {self.quotes_stream} as "
+                f"{self.consumer_name} in {self.stream_group} "
+                f"(shard {self.shard_index + 1}/{self.shard_count})"
+            )
+
+            queues: dict[str, asyncio.Queue] = {
+                self.fills_stream: asyncio.Queue(),
+                self.quotes_stream: asyncio.Queue(),
+            }
+            self._in_flight_messages.clear()
+            workers = [
+                asyncio.create_task(
+                    self._stream_worker(
+                        self.fills_stream, queues[self.fills_stream], self._handle_fill
+                    )
+                ),
+                asyncio.create_task(
+                    self._stream_worker(
+                        self.quotes_stream, queues[self.quotes_stream], self.update_quote
+                    )
+                ),
+                asyncio.create_task(self._pending_claim_sweeper(shutdown_event, queues)),
+            ]
 
             try:
-                await self.redis_client.xgroup_create(
-                    "quotes", "pnl_service", id="0", mkstream=True
-                )
-            except redis.exceptions.ResponseError as e:
-                if "BUSYGROUP" not in str(e):
-                    logger.error(f"Error creating consumer group for quotes: {e}")
+                await self._recover_own_pending(queues)
+                await self._stream_reader(shutdown_event, queues)
 
-            while not shutdown_event.is_set() and self.subscriptions_active:
+                # Let workers finish what was already read before stopping them
                 try:
-                    # Read from trade_fills stream
-                    trade_messages = await self.redis_client.xreadgroup(
-                        "pnl_service",
-                        "pnl_worker",
-                        {"trade_fills": ">"},
-                        count=10,
-                        block=1000,  # 1 second timeout
+                    await asyncio.wait_for(
+                        asyncio.gather(*(queue.join() for queue in queues.values())),
+                        timeout=5,
                     )
+                except TimeoutError:
+                    logger.warning("Timed out draining Redis stream workers")
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
 
-                    for stream_name, messages in trade_messages:
-                        for message_id, fields in messages:
-                            try:
-                                # Process trade fill
-                                fill_data = json.loads(fields.get("data", "{}"))
-                                follower_id = fill_data.get("follower_id")
-                                if follower_id:
-                                    await self.record_trade_fill(follower_id, fill_data)
-
-                                # Acknowledge message
-                                await self.redis_client.xack(
-                                    "trade_fills", "pnl_service", message_id
-                                )
+        except asyncio.CancelledError:
+            logger.info("Redis stream subscription cancelled")
+            raise
+        finally:
+            self.subscriptions_active = False
 
-                            except Exception as e:
-                                logger.error(f"Error processing trade fill: {e}")
+    async def _stream_reader(
+        self, shutdown_event: asyncio.Event, queues: dict[str, asyncio.Queue]
+    ):
+        """Read both streams with one XREADGROUP call and dispatch to workers.
 
-                    # Read from quotes stream
-                    quote_messages = await self.redis_client.xreadgroup(
-                        "pnl_service",
-                        "pnl_worker",
-                        {"quotes": ">"},
-                        count=10,
-                        block=1000,  # 1 second timeout
-                    )
+        The batch size doubles while reads come back full and shrinks again when
+        the streams go quiet.
+
+        Args:
+            shutdown_event: Event to signal shutdown
+            queues: Worker queue for each stream name
+        """
+        while not shutdown_event.is_set() and self.subscriptions_active:
+            try:
+                # Skip quotes while their worker is backed up; fills are always read
+                streams = {
+                    stream: ">"
+                    for stream, queue in queues.items()
+                    if stream != self.quotes_stream or queue.qsize() < QUOTE_QUEUE_HIGH_WATER
+                }
+
+                response = await self.redis_client.xreadgroup(
+                    self.stream_group,
+                    self.consumer_name,
+                    streams,
+                    count=self.stream_batch_size,
+                    block=STREAM_BLOCK_MS,
+                )
+
+                largest_batch = 0
+                for stream_name, messages in response or []:
+                    if isinstance(stream_name, bytes):
+                        stream_name = stream_name.decode()
+                    largest_batch = max(largest_batch, len(messages))
+                    self._dispatch_messages(stream_name, queues[stream_name], messages)
+
+                if largest_batch >= self.stream_batch_size:
+                    self.stream_batch_size = min(self.stream_batch_size * 2, STREAM_BATCH_MAX)
+                elif largest_batch < self.stream_batch_size // 4:
+                    self.stream_batch_size = max(self.stream_batch_size // 2, STREAM_BATCH_MIN)
 
-                    for stream_name, messages in quote_messages:
-                        for message_id, fields in messages:
-                            try:
-                                # Process quote update
-                                quote_data = json.loads(fields.get("data", "{}"))
-                                await self.update_quote(quote_data)
+            except redis.exceptions.ConnectionError as e:
+                logger.error(f"Redis connection error: {e}")
+                await asyncio.sleep(5)  # Wait before retrying
+            except Exception as e:
+                logger.error(f"Error in Redis stream subscription: {e}", exc_info=True)
+                await asyncio.sleep(1)
 
-                                # Acknowledge message
-                                await self.redis_client.xack("quotes", "pnl_service", message_id)
+    async def _stream_worker(self, stream: str, queue: asyncio.Queue, handler):
+        """Process messages for one stream and acknowledge them in batches.
 
-                            except Exception as e:
-                                logger.error(f"Error processing quote: {e}")
+        Messages whose handler raises or returns False are left pending so they
+        can be redelivered.
+
+        Args:
+            stream: Stream name
+            queue: Queue of (message_id, fields) tuples read from the stream
+            handler: Coroutine function called with the decoded message payload
+        """
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < STREAM_BATCH_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
 
-                except redis.exceptions.ConnectionError as e:
-                    logger.error(f"Redis connection error: {e}")
-                    await asyncio.sleep(5)  # Wait before retrying
+            try:
+                processed = []
+                for message_id, fields in batch:
+                    try:
+                        if await handler(json.loads(fields.get("data", "{}"))) is False:
+                            logger.error(f"Failed to process {stream} message {message_id}")
+                            continue
+                        processed.append(message_id)
+                    except Exception as e:
+                        logger.error(f"Error processing {stream} message {message_id}: {e}")
+
+                if processed:
+                    await self.redis_client.xack(stream, self.stream_group, *processed)
+
+            except Exception as e:
+                logger.error(f"Error acknowledging {stream} messages: {e}", exc_info=True)
+            finally:
+                for message_id, _ in batch:
+                    self._in_flight_messages.discard((stream, message_id))
+                    queue.task_done()
+
+    def _dispatch_messages(self, stream: str, queue: asyncio.Queue, messages: list) -> int:
+        """Queue messages for a worker, skipping ones already being processed.
+
+        Args:
+            stream: Stream name
+            queue: Worker queue for the stream
+            messages: List of (message_id, fields) tuples
+
+        Returns:
+            Number of messages queued
+        """
+        queued = 0
+        for message_id, fields in messages:
+            # Deleted entries are returned with empty fields by XAUTOCLAIM/XREADGROUP 0
+            if not fields or (stream, message_id) in self._in_flight_messages:
+                continue
+            self._in_flight_messages.add((stream, message_id))
+            queue.put_nowait((message_id, fields))
+            queued += 1
+        return queued
+
+    async def _recover_own_pending(self, queues: dict[str, asyncio.Queue]):
+        """Replay messages delivered to this consumer but never acknowledged.
+
+        Reading from ID 0 returns this consumer's pending entries, so a worker
+        restarted under the same consumer name finishes what it had in flight.
+
+        Args:
+            queues: Worker queue for each stream name
+        """
+        for stream, queue in queues.items():
+            last_id = "0"
+            try:
+                while True:
+                    response = await self.redis_client.xreadgroup(
+                        self.stream_group,
+                        self.consumer_name,
+                        {stream: last_id},
+                        count=STREAM_BATCH_MAX,
+                    )
+                    messages = response[0][1] if response else []
+                    if not messages:
+                        break
+                    self.recovered_messages += self._dispatch_messages(stream, queue, messages)
+                    last_id = messages[-1][0]
+            except Exception as e:
+                logger.error(f"Error recovering pending {stream} messages: {e}", exc_info=True)
+
+        if self.recovered_messages:
+            logger.info(f"Recovered {self.recovered_messages} pending stream messages")
+
+    async def _pending_claim_sweeper(
+        self, shutdown_event: asyncio.Event, queues: dict[str, asyncio.Queue]
+    ):
+        """Periodically claim messages left pending by other consumers.
+
+        Args:
+            shutdown_event: Event to signal shutdown
+            queues: Worker queue for each stream name
+        """
+        while not shutdown_event.is_set():
+            try:
+                await asyncio.wait_for(shutdown_event.wait(), timeout=STREAM_CLAIM_INTERVAL_SECONDS)
+                return
+            except TimeoutError:
+                pass
+
+            for stream, queue in queues.items():
+                try:
+                    await self._claim_pending(stream, queue)
                 except Exception as e:
-                    logger.error(f"Error in Redis stream subscription: {e}", exc_info=True)
-                    await asyncio.sleep(1)
+                    logger.error(f"Error claiming pending {stream} messages: {e}", exc_info=True)
 
-        except asyncio.CancelledError:
-            logger.info("Redis stream subscription cancelled")
-            raise
-        finally:
-            self.subscriptions_active = False
+    async def _claim_pending(self, stream: str, queue: asyncio.Queue) -> int:
+        """Claim idle pending messages on a stream with XAUTOCLAIM.
+
+        Messages that already failed STREAM_MAX_DELIVERIES times are moved to the
+        dead-letter stream first, so a poison message is not reclaimed forever.
+
+        Args:
+            stream: Stream name
+            queue: Worker queue for the stream
+
+        Returns:
+            Number of messages claimed and queued
+        """
+        summary = await self.redis_client.xpending(stream, self.stream_group)
+        self.stream_pending[stream] = summary["pending"] if summary else 0
+        if not self.stream_pending[stream]:
+            return 0
+
+        await self._dead_letter_pending(stream)
+
+        claimed = 0
+        start_id = "0-0"
+        while True:
+            response = await self.redis_client.xautoclaim(
+                stream,
+                self.stream_group,
+                self.consumer_name,
+                min_idle_time=STREAM_CLAIM_MIN_IDLE_MS,
+                start_id=start_id,
+                count=STREAM_BATCH_MAX,
+            )
+            start_id, messages = response[0], response[1]
+            claimed += self._dispatch_messages(stream, queue, messages)
+            if start_id in ("0-0", b"0-0"):
+                break
+
+        if claimed:
+            self.claimed_messages += claimed
+            logger.warning(f"Claimed {claimed} idle pending messages on {stream}")
+        return claimed
+
+    async def _dead_letter_pending(self, stream: str) -> int:
+        """Move idle pending messages delivered too often to the dead-letter stream.
+
+        The original fields are kept, along with the message ID and delivery count,
+        so the message can be inspected and replayed by hand.
+
+        Args:
+            stream: Stream name
+
+        Returns:
+            Number of messages dead-lettered
+        """
+        dead_letter_stream = f"{stream}:{DEAD_LETTER_SUFFIX}"
+        dead_lettered = 0
+        start_id = "-"
+        while True:
+            entries = await self.redis_client.xpending_range(
+                stream, self.stream_group, min=start_id, max="+", count=STREAM_BATCH_MAX
+            )
+            for entry in entries:
+                message_id = entry["message_id"]
+                if (
+                    entry["times_delivered"] < STREAM_MAX_DELIVERIES
+                    or entry["time_since_delivered"] < STREAM_CLAIM_MIN_IDLE_MS
+                    or (stream, message_id) in self._in_flight_messages
+                ):
+                    continue
+
+                messages = await self.redis_client.xrange(stream, min=message_id, max=message_id)
+                # Entries trimmed from the stream have nothing left to keep
+                if messages and messages[0][1]:
+                    await self.redis_client.xadd(
+                        dead_letter_stream,
+                        {
+                            **messages[0][1],
+                            "message_id": message_id,
+                            "times_delivered": entry["times_delivered"],
+                        },
+                    )
+                await self.redis_client.xack(stream, self.stream_group, message_id)
+                dead_lettered += 1
+
+            if len(entries) < STREAM_BATCH_MAX:
+                break
+            last_id = entries[-1]["message_id"]
+            if isinstance(last_id, bytes):
+                last_id = last_id.decode()
+            start_id = f"({last_id}"
+
+        if dead_lettered:
+            self.dead_lettered_messages += dead_lettered
+            logger.error(
+                f"Moved {dead_lettered} messages failing after {STREAM_MAX_DELIVERIES} "
+                f"deliveries from {stream} to {dead_letter_stream}"
+            )
+        return dead_lettered
+
+    async def _handle_fill(self, fill_data: dict[str, Any]) -> bool:
+        """Record a trade fill message from the fills stream.
+
+        Returns:
+            False if the fill could not be recorded and must stay pending
+        """
+        follower_id = fill_data.get("follower_id")
+        if not follower_id:
+            return True
+        return await self.record_trade_fill(follower_id, fill_data)
 
     async def _subscribe_to_position_quotes(self):
         """Subscribe to quotes for all active positions."""
@@ -575,6 +1202,7 @@ class PnLService:
                         and_(
                             PnLDaily.trading_date == today,
                             PnLDaily.is_finalized == True,
+                            PnLDaily.follower_id.in_(self._get_owned_followers()),
                         )
                     )
                     .limit(1)
@@ -590,11 +1218,14 @@ class PnLService:
         try:
             today = date.today()
 
-            for follower_id in self.active_followers:
-                try:
-                    await self._rollup_daily_pnl(follower_id, today)
-                except Exception as e:
-                    logger.error(f"Error in daily rollup for follower {follower_id}: {e}")
+            if self.bulk_rollups:
+                await self._bulk_rollup_daily_pnl(today)
+            else:
+                for follower_id in self._get_owned_followers():
+                    try:
+                        await self._rollup_daily_pnl(follower_id, today)
+                    except Exception as e:
+                        logger.error(f"Error in daily rollup for follower {follower_id}: {e}")
 
             logger.info(f"Completed daily P&L rollup for {today}")
 
@@ -631,11 +1262,13 @@ class PnLService:
                 max_drawdown = min((s.total_pnl for s in snapshots), default=Decimal("0"))
 
                 # Get trading activity
+                day_start, day_end = get_day_range(trading_date)
                 trades_result = await session.execute(
                     select(Trade).where(
                         and_(
                             Trade.follower_id == follower_id,
-                            func.date(Trade.trade_time) == trading_date,
+                            Trade.trade_time >= day_start,
+                            Trade.trade_time < day_end,
                         )
                     )
                 )
@@ -645,38 +1278,196 @@ class PnLService:
                 total_volume = sum(t.quantity for t in trades)
                 total_commission = sum(t.commission for t in trades)
 
-                # Create daily summary
-                daily_pnl = PnLDaily(
-                    follower_id=follower_id,
-                    trading_date=trading_date,
-                    opening_balance=first_snapshot.total_market_value,
-                    opening_positions=first_snapshot.position_count,
-                    realized_pnl=last_snapshot.realized_pnl,
-                    unrealized_pnl_start=first_snapshot.unrealized_pnl,
-                    unrealized_pnl_end=last_snapshot.unrealized_pnl,
-                    total_pnl=last_snapshot.total_pnl,
-                    trades_count=trades_count,
-                    total_volume=total_volume,
-                    total_commission=total_commission,
-                    closing_balance=last_snapshot.total_market_value,
-                    closing_positions=last_snapshot.position_count,
-                    max_drawdown=max_drawdown,
-                    max_profit=max_profit,
-                    is_finalized=True,
-                    rollup_time=datetime.datetime.utcnow(),
-                )
+                # Create or replace the daily summary
+                daily_pnl = {
+                    "follower_id": follower_id,
+                    "trading_date": trading_date,
+                    "opening_balance": first_snapshot.total_market_value,
+                    "opening_positions": first_snapshot.position_count,
+                    "realized_pnl": last_snapshot.realized_pnl,
+                    "unrealized_pnl_start": first_snapshot.unrealized_pnl,
+                    "unrealized_pnl_end": last_snapshot.unrealized_pnl,
+                    "total_pnl": last_snapshot.total_pnl,
+                    "trades_count": trades_count,
+                    "total_volume": total_volume,
+                    "total_commission": total_commission,
+                    "closing_balance": last_snapshot.total_market_value,
+                    "closing_positions": last_snapshot.position_count,
+                    "max_drawdown": max_drawdown,
+                    "max_profit": max_profit,
+                    "is_finalized": True,
+                    "rollup_time": datetime.datetime.utcnow(),
+                }
 
-                session.add(daily_pnl)
+                await session.execute(
+                    self._build_rollup_upsert(PnLDaily, ["follower_id", "trading_date"]),
+                    [daily_pnl],
+                )
                 await session.commit()
 
                 logger.info(
                     f"Completed daily rollup for follower {follower_id}: "
-                    f"total_pnl=${daily_pnl.total_pnl:.2f}, trades={trades_count}"
+                    f"total_pnl=${daily_pnl['total_pnl']:.2f}, trades={trades_count}"
                 )
 
         except Exception as e:
             logger.error(f"Error in daily rollup for {follower_id}: {e}")
 
+    def _build_daily_rollup_query(self, trading_date: date, follower_ids: list[str]):
+        """Build one grouped query computing the daily summary of every follower.
+
+        Window functions rank each follower's snapshots to pick the first and
+        last of the day; trade activity is aggregated in the same statement.
+
+        Args:
+            trading_date: Trading date to roll up
+            follower_ids: Followers to include
+
+        Returns:
+            Select statement with one row per follower that has snapshots
+        """
+        day_start, day_end = get_day_range(trading_date)
+
+        ranked = (
+            select(
+                PnLIntraday.follower_id,
+                PnLIntraday.realized_pnl,
+                PnLIntraday.unrealized_pnl,
+                PnLIntraday.total_pnl,
+                PnLIntraday.position_count,
+                PnLIntraday.total_market_value,
+                func.row_number()
+                .over(partition_by=PnLIntraday.follower_id, order_by=PnLIntraday.snapshot_time)
+                .label("first_rank"),
+                func.row_number()
+                .over(
+                    partition_by=PnLIntraday.follower_id,
+                    order_by=PnLIntraday.snapshot_time.desc(),
+                )
+                .label("last_rank"),
+            )
+            .where(
+                and_(
+                    PnLIntraday.trading_date == trading_date,
+                    PnLIntraday.follower_id.in_(follower_ids),
+                )
+            )
+            .cte("ranked_snapshots")
+        )
+
+        def first(column):
+            return func.max(case((ranked.c.first_rank == 1, column)))
+
+        def last(column):
+            return func.max(case((ranked.c.last_rank == 1, column)))
+
+        snapshots = (
+            select(
+                ranked.c.follower_id,
+                first(ranked.c.total_market_value).label("opening_balance"),
+                first(ranked.c.position_count).label("opening_positions"),
+                last(ranked.c.realized_pnl).label("realized_pnl"),
+                first(ranked.c.unrealized_pnl).label("unrealized_pnl_start"),
+                last(ranked.c.unrealized_pnl).label("unrealized_pnl_end"),
+                last(ranked.c.total_pnl).label("total_pnl"),
+                last(ranked.c.total_market_value).label("closing_balance"),
+                last(ranked.c.position_count).label("closing_positions"),
+                func.min(ranked.c.total_pnl).label("max_drawdown"),
+                func.max(ranked.c.total_pnl).label("max_profit"),
+            )
+            .group_by(ranked.c.follower_id)
+            .subquery("daily_snapshots")
+        )
+
+        trades = (
+            select(
+                Trade.follower_id,
+                func.count().label("trades_count"),
+                func.sum(Trade.quantity).label("total_volume"),
+                func.sum(Trade.commission).label("total_commission"),
+            )
+            .where(
+                and_(
+                    Trade.follower_id.in_(follower_ids),
+                    Trade.trade_time >= day_start,
+                    Trade.trade_time < day_end,
+                )
+            )
+            .group_by(Trade.follower_id)
+            .subquery("daily_trades")
+        )
+
+        return select(
+            snapshots,
+            func.coalesce(trades.c.trades_count, 0).label("trades_count"),
+            func.coalesce(trades.c.total_volume, 0).label("total_volume"),
+            func.coalesce(trades.c.total_commission, 0).label("total_commission"),
+        ).select_from(
+            snapshots.outerjoin(trades, trades.c.follower_id == snapshots.c.follower_id)
+        )
+
+    async def _bulk_rollup_daily_pnl(self, trading_date: date):
+        """Roll up daily P&L for all active followers with set-based SQL.
+
+        Args:
+            trading_date: Trading date to roll up
+        """
+        try:
+            follower_ids = self._get_owned_followers()
+            if not follower_ids:
+                return
+
+            rollup_time = datetime.datetime.utcnow()
+            async with get_postgres_session() as session:
+                result = await session.execute(
+                    self._build_daily_rollup_query(trading_date, follower_ids)
+                )
+                rows = [
+                    {
+                        **row._asdict(),
+                        "trading_date": trading_date,
+                        "is_finalized": True,
+                        "rollup_time": rollup_time,
+                    }
+                    for row in result.all()
+                ]
+
+                if not rows:
+                    logger.debug(f"No intraday data for daily rollup on {trading_date}")
+                    return
+
+                await session.execute(
+                    self._build_rollup_upsert(PnLDaily, ["follower_id", "trading_date"]), rows
+                )
+                await session.commit()
+
+            logger.info(f"Completed bulk daily rollup for {len(rows)} followers on {trading_date}")
+
+        except Exception as e:
+            logger.error(f"Error in bulk daily rollup for {trading_date}: {e}", exc_info=True)
+
+    @staticmethod
+    def _build_rollup_upsert(model, conflict_columns: list[str]):
+        """Build a bulk INSERT .. ON CONFLICT DO UPDATE for a rollup table.
+
+        Args:
+            model: PnLDaily or PnLMonthly
+            conflict_columns: Columns of the table's unique follower/period index
+
+        Returns:
+            Insert statement to execute with a list of row dictionaries
+        """
+        statement = pg_insert(model)
+        excluded_columns = {"id", "created_at", *conflict_columns}
+        return statement.on_conflict_do_update(
+            index_elements=conflict_columns,
+            set_={
+                column.name: statement.excluded[column.name]
+                for column in model.__table__.columns
+                if column.name not in excluded_columns
+            },
+        )
+
     async def _monthly_rollup_scheduler(self, shutdown_event: asyncio.Event):
         """Schedule monthly rollups at 00:10 ET on the 1st of each month."""
         try:
@@ -724,6 +1515,7 @@ class PnLService:
                             PnLMonthly.year == year,
                             PnLMonthly.month == month,
                             PnLMonthly.is_finalized == True,
+                            PnLMonthly.follower_id.in_(self._get_owned_followers()),
                         )
                     )
                     .limit(1)
@@ -744,11 +1536,14 @@ class PnLService:
             else:
                 year, month = now.year, now.month - 1
 
-            for follower_id in self.active_followers:
-                try:
-                    await self._rollup_monthly_pnl(follower_id, year, month)
-                except Exception as e:
-                    logger.error(f"Error in monthly rollup for follower {follower_id}: {e}")
+            if self.bulk_rollups:
+                await self._bulk_rollup_monthly_pnl(year, month)
+            else:
+                for follower_id in self._get_owned_followers():
+                    try:
+                        await self._rollup_monthly_pnl(follower_id, year, month)
+                    except Exception as e:
+                        logger.error(f"Error in monthly rollup for follower {follower_id}: {e}")
 
             logger.info(f"Completed monthly P&L rollup for {year}-{month:02d}")
 
@@ -758,6 +1553,8 @@ class PnLService:
     async def _rollup_monthly_pnl(self, follower_id: str, year: int, month: int):
         """Rollup monthly P&L for a specific follower."""
         try:
+            month_start, month_end = get_month_range(year, month)
+
             async with get_postgres_session() as session:
                 # Get all daily summaries for the month
                 daily_result = await session.execute(
@@ -765,8 +1562,8 @@ class PnLService:
                     .where(
                         and_(
                             PnLDaily.follower_id == follower_id,
-                            func.extract("year", PnLDaily.trading_date) == year,
-                            func.extract("month", PnLDaily.trading_date) == month,
+                            PnLDaily.trading_date >= month_start,
+                            PnLDaily.trading_date < month_end,
                         )
                     )
                     .order_by(PnLDaily.trading_date)
@@ -809,31 +1606,35 @@ class PnLService:
                 first_day = daily_summaries[0]
                 last_day = daily_summaries[-1]
 
-                monthly_pnl = PnLMonthly(
-                    follower_id=follower_id,
-                    year=year,
-                    month=month,
-                    realized_pnl=total_realized,
-                    unrealized_pnl_start=first_day.unrealized_pnl_start,
-                    unrealized_pnl_end=last_day.unrealized_pnl_end,
-                    total_pnl=total_pnl,
-                    trading_days=len(daily_summaries),
-                    total_trades=total_trades,
-                    total_volume=total_volume,
-                    total_commission=total_commission,
-                    best_day_pnl=best_day,
-                    worst_day_pnl=worst_day,
-                    max_drawdown=max_drawdown,
-                    max_profit=max_profit,
-                    avg_daily_pnl=avg_daily_pnl,
-                    winning_days=winning_days,
-                    losing_days=losing_days,
-                    breakeven_days=breakeven_days,
-                    is_finalized=True,
-                    rollup_time=datetime.datetime.utcnow(),
-                )
+                monthly_pnl = {
+                    "follower_id": follower_id,
+                    "year": year,
+                    "month": month,
+                    "realized_pnl": total_realized,
+                    "unrealized_pnl_start": first_day.unrealized_pnl_start,
+                    "unrealized_pnl_end": last_day.unrealized_pnl_end,
+                    "total_pnl": total_pnl,
+                    "trading_days": len(daily_summaries),
+                    "total_trades": total_trades,
+                    "total_volume": total_volume,
+                    "total_commission": total_commission,
+                    "best_day_pnl": best_day,
+                    "worst_day_pnl": worst_day,
+                    "max_drawdown": max_drawdown,
+                    "max_profit": max_profit,
+                    "avg_daily_pnl": avg_daily_pnl,
+                    "winning_days": winning_days,
+                    "losing_days": losing_days,
+                    "breakeven_days": breakeven_days,
+                    "is_finalized": True,
+                    "rollup_time": datetime.datetime.utcnow(),
+                }
 
-                session.add(monthly_pnl)
+                # Upsert so a re-run replaces the month instead of violating its unique index
+                await session.execute(
+                    self._build_rollup_upsert(PnLMonthly, ["follower_id", "year", "month"]),
+                    [monthly_pnl],
+                )
                 await session.commit()
 
                 # Calculate monthly commission after P&L rollup
@@ -843,13 +1644,261 @@ class PnLService:
 
                 logger.info(
                     f"Completed monthly rollup for follower {follower_id} {year}-{month:02d}: "
-                    f"total_pnl=${monthly_pnl.total_pnl:.2f}, "
+                    f"total_pnl=${total_pnl:.2f}, "
                     f"winning_days={winning_days}, losing_days={losing_days}"
                 )
 
         except Exception as e:
             logger.error(f"Error in monthly rollup for {follower_id}: {e}")
 
+    def _build_monthly_rollup_query(self, year: int, month: int, follower_ids: list[str]):
+        """Build one grouped query computing the monthly summary of every follower.
+
+        Args:
+            year: Year of the month
+            month: Month number
+            follower_ids: Followers to include
+
+        Returns:
+            Select statement with one row per follower that has daily rows
+        """
+        month_start, month_end = get_month_range(year, month)
+
+        ranked = (
+            select(
+                PnLDaily.follower_id,
+                PnLDaily.realized_pnl,
+                PnLDaily.unrealized_pnl_start,
+                PnLDaily.unrealized_pnl_end,
+                PnLDaily.total_pnl,
+                PnLDaily.trades_count,
+                PnLDaily.total_volume,
+                PnLDaily.total_commission,
+                PnLDaily.max_drawdown,
+                PnLDaily.max_profit,
+                func.row_number()
+                .over(partition_by=PnLDaily.follower_id, order_by=PnLDaily.trading_date)
+                .label("first_rank"),
+                func.row_number()
+                .over(partition_by=PnLDaily.follower_id, order_by=PnLDaily.trading_date.desc())
+                .label("last_rank"),
+            )
+            .where(
+                and_(
+                    PnLDaily.trading_date >= month_start,
+                    PnLDaily.trading_date < month_end,
+                    PnLDaily.follower_id.in_(follower_ids),
+                )
+            )
+            .cte("ranked_days")
+        )
+
+        return select(
+            ranked.c.follower_id,
+            func.sum(ranked.c.realized_pnl).label("realized_pnl"),
+            func.max(case((ranked.c.first_rank == 1, ranked.c.unrealized_pnl_start))).label(
+                "unrealized_pnl_start"
+            ),
+            func.max(case((ranked.c.last_rank == 1, ranked.c.unrealized_pnl_end))).label(
+                "unrealized_pnl_end"
+            ),
+            func.sum(ranked.c.total_pnl).label("total_pnl"),
+            func.count().label("trading_days"),
+            func.sum(ranked.c.trades_count).label("total_trades"),
+            func.sum(ranked.c.total_volume).label("total_volume"),
+            func.sum(ranked.c.total_commission).label("total_commission"),
+            func.max(ranked.c.total_pnl).label("best_day_pnl"),
+            func.min(ranked.c.total_pnl).label("worst_day_pnl"),
+            # Zero and missing extremes are ignored, as in the per-follower rollup
+            func.coalesce(
+                func.min(ranked.c.max_drawdown).filter(ranked.c.max_drawdown != 0), 0
+            ).label("max_drawdown"),
+            func.coalesce(func.max(ranked.c.max_profit).filter(ranked.c.max_profit != 0), 0).label(
+                "max_profit"
+            ),
+            func.count().filter(ranked.c.total_pnl > 0).label("winning_days"),
+            func.count().filter(ranked.c.total_pnl < 0).label("losing_days"),
+            func.count().filter(ranked.c.total_pnl == 0).label("breakeven_days"),
+        ).group_by(ranked.c.follower_id)
+
+    async def _bulk_rollup_monthly_pnl(self, year: int, month: int):
+        """Roll up monthly P&L for all active followers with set-based SQL.
+
+        Args:
+            year: Year of the month
+            month: Month number
+        """
+        try:
+            follower_ids = self._get_owned_followers()
+            if not follower_ids:
+                return
+
+            rollup_time = datetime.datetime.utcnow()
+            async with get_postgres_session() as session:
+                result = await session.execute(
+                    self._build_monthly_rollup_query(year, month, follower_ids)
+                )
+                rows = [
+                    {
+                        **row._asdict(),
+                        "year": year,
+                        "month": month,
+                        "avg_daily_pnl": row.total_pnl / row.trading_days,
+                        "is_finalized": True,
+                        "rollup_time": rollup_time,
+                    }
+                    for row in result.all()
+                ]
+
+                if not rows:
+                    logger.debug(f"No daily data for monthly rollup in {year}-{month:02d}")
+                    return
+
+                await session.execute(
+                    self._build_rollup_upsert(PnLMonthly, ["follower_id", "year", "month"]), rows
+                )
+                await session.commit()
+
+                # Commission depends on per-follower settings stored in MongoDB
+                for row in rows:
+                    await self._calculate_monthly_commission(
+                        session, row["follower_id"], year, month, row["total_pnl"]
+                    )
+
+            logger.info(
+                f"Completed bulk monthly rollup for {len(rows)} followers in {year}-{month:02d}"
+            )
+
+        except Exception as e:
+            logger.error(f"Error in bulk monthly rollup for {year}-{month:02d}: {e}", exc_info=True)
+
+    async def _partition_maintenance_scheduler(self, shutdown_event: asyncio.Event):
+        """Schedule partition creation and raw data retention at 01:00 ET."""
+        try:
+            while not shutdown_event.is_set() and self.monitoring_active:
+                try:
+                    now_et = datetime.datetime.now(ET)
+
+                    if (
+                        time(1, 0) <= now_et.time() <= time(1, 15)
+                        and self.last_maintenance_date != now_et.date()
+                    ):
+                        logger.info("Starting P&L partition maintenance at 01:00 ET")
+                        await self._perform_partition_maintenance()
+                        self.last_maintenance_date = now_et.date()
+
+                    # Check every 5 minutes
+                    await asyncio.sleep(300)
+
+                except Exception as e:
+                    logger.error(f"Error in partition maintenance scheduler: {e}", exc_info=True)
+                    await asyncio.sleep(600)  # Wait 10 minutes before retrying
+
+        except asyncio.CancelledError:
+            logger.info("Partition maintenance scheduler cancelled")
+            raise
+
+    async def _ensure_partitions(self):
+        """Create quote and intraday partitions around the current NY trading date.
+
+        Rows outside the created ranges go to each table's default partition.
+        """
+        try:
+            trading_date = datetime.datetime.strptime(get_current_trading_date(), "%Y%m%d").date()
+            first_day = trading_date - datetime.timedelta(days=PARTITION_DAYS_BEHIND)
+
+            async with get_postgres_session() as session:
+                await create_partitions(
+                    session,
+                    QUOTES_PARTITIONS,
+                    first_day,
+                    trading_date + datetime.timedelta(days=QUOTE_PARTITION_DAYS_AHEAD),
+                )
+                await create_partitions(
+                    session,
+                    PNL_INTRADAY_PARTITIONS,
+                    first_day,
+                    trading_date + datetime.timedelta(days=INTRADAY_PARTITION_DAYS_AHEAD),
+                )
+                await session.commit()
+
+        except Exception as e:
+            logger.error(f"Error creating P&L partitions: {e}")
+
+    async def _perform_partition_maintenance(self) -> dict[str, Any]:
+        """Create upcoming partitions, downsample and drop raw data behind finalized rollups.
+
+        Intraday snapshots of finalized days older than intraday_downsample_days are
+        thinned to one per follower per intraday_downsample_minutes. Quote partitions
+        older than quote_retention_days and intraday partitions older than
+        intraday_retention_months are dropped, but never past the last finalized
+        daily or monthly rollup.
+
+        Returns:
+            Dictionary with downsampled row count and dropped partition names
+        """
+        summary = {"downsampled_snapshots": 0, "dropped_partitions": []}
+        await self._ensure_partitions()
+
+        try:
+            today = date.today()
+
+            async with get_postgres_session() as session:
+                downsample_before = today - datetime.timedelta(days=self.intraday_downsample_days)
+                for offset in range(DOWNSAMPLE_LOOKBACK_DAYS, 0, -1):
+                    trading_date = downsample_before - datetime.timedelta(days=offset)
+                    result = await session.execute(
+                        build_intraday_downsample(trading_date, self.intraday_downsample_minutes)
+                    )
+                    summary["downsampled_snapshots"] += result.rowcount or 0
+
+                # Quote ticks are only needed until the day's rollup is finalized
+                last_finalized_day = (
+                    await session.execute(
+                        select(func.max(PnLDaily.trading_date)).where(
+                            PnLDaily.is_finalized == True
+                        )
+                    )
+                ).scalar()
+                if last_finalized_day:
+                    quote_cutoff = min(
+                        today - datetime.timedelta(days=self.quote_retention_days),
+                        last_finalized_day + datetime.timedelta(days=1),
+                    )
+                    summary["dropped_partitions"] += await drop_partitions_before(
+                        session, QUOTES_PARTITIONS, quote_cutoff
+                    )
+
+                last_finalized_month = (
+                    await session.execute(
+                        select(PnLMonthly.year, PnLMonthly.month)
+                        .where(PnLMonthly.is_finalized == True)
+                        .order_by(desc(PnLMonthly.year), desc(PnLMonthly.month))
+                        .limit(1)
+                    )
+                ).first()
+                if last_finalized_month:
+                    months = today.year * 12 + today.month - 1 - self.intraday_retention_months
+                    intraday_cutoff = min(
+                        date(months // 12, months % 12 + 1, 1),
+                        get_month_range(*last_finalized_month)[1],
+                    )
+                    summary["dropped_partitions"] += await drop_partitions_before(
+                        session, PNL_INTRADAY_PARTITIONS, intraday_cutoff
+                    )
+
+                await session.commit()
+
+            logger.info(
+                f"P&L partition maintenance downsampled {summary['downsampled_snapshots']} "
+                f"snapshots and dropped {len(summary['dropped_partitions'])} partitions"
+            )
+
+        except Exception as e:
+            logger.error(f"Error in P&L partition maintenance: {e}")
+
+        return summary
+
     async def _calculate_monthly_commission(
         self,
         session: AsyncSession,
@@ -1,23 +1,47 @@
 """Utility functions for SpreadPilot.
 
 This module provides utility functions for report generation, alerts, etc.
+
+The helpers are imported on first access, so importing a light submodule such
+as ``utils.redis_client`` or ``utils.time`` does not pull in the report and
+alerting dependencies (reportlab, openpyxl, aiosmtplib, ...).
 """
 
-from .email import send_email
-from .excel import generate_excel_report
-from .pdf import generate_pdf_report
-from .telegram import send_telegram_message
-from .time import get_ny_time, is_market_open
-from .vault import VaultClient, get_ibkr_credentials_from_vault, get_vault_client
-
-__all__ = [
-    "VaultClient",
-    "generate_excel_report",
-    "generate_pdf_report",
-    "get_ibkr_credentials_from_vault",
-    "get_ny_time",
-    "get_vault_client",
-    "is_market_open",
-    "send_email",
-    "send_telegram_message",
-]
+import importlib
+from typing import Any
+
+# Exported name -> submodule defining it
+_EXPORTS = {
+    "RollingMean": "indicators",
+    "TrendIndicators": "indicators",
+    "VaultClient": "vault",
+    "bs_delta": "black_scholes",
+    "bs_price": "black_scholes",
+    "chain_greeks": "black_scholes",
+    "generate_excel_report": "excel",
+    "generate_pdf_report": "pdf",
+    "get_day_range": "time",
+    "get_ibkr_credentials_from_vault": "vault",
+    "get_month_range": "time",
+    "get_ny_time": "time",
+    "get_vault_client": "vault",
+    "implied_volatility": "black_scholes",
+    "is_market_open": "time",
+    "send_email": "email",
+    "send_telegram_message": "telegram",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import an exported helper from its submodule on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,138 @@
+"""Rolling technical indicators updated in constant time per bar.
+
+Indicators keep running state instead of recomputing over the whole price
+history, so feeding a new daily close costs O(1) however long the window is.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+
+
+class RollingMean:
+    """Simple moving average over the last ``period`` values."""
+
+    def __init__(self, period: int):
+        """Initialize the moving average.
+
+        Args:
+            period: Number of values averaged
+        """
+        if period < 1:
+            raise ValueError(f"Period must be positive, got {period}")
+        self.period = period
+        self._window: deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Whether a full window of values has been seen."""
+        return len(self._window) == self.period
+
+    @property
+    def value(self) -> float | None:
+        """Current average, or None until the window is full."""
+        return self._sum / self.period if self.ready else None
+
+    def update(self, value: float) -> float | None:
+        """Add a value, dropping the oldest one once the window is full.
+
+        Args:
+            value: New value
+
+        Returns:
+            Current average, or None until the window is full
+        """
+        if self.ready:
+            self._sum -= self._window[0]
+        self._window.append(value)
+        self._sum += value
+        return self.value
+
+
+class ExponentialMovingAverage:
+    """Exponential moving average seeded with the simple average of its first period."""
+
+    def __init__(self, period: int):
+        """Initialize the moving average.
+
+        Args:
+            period: Period, giving a smoothing factor of 2 / (period + 1)
+        """
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._seed = RollingMean(period)
+        self._value: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the average has been seeded."""
+        return self._value is not None
+
+    @property
+    def value(self) -> float | None:
+        """Current average, or None until ``period`` values have been seen."""
+        return self._value
+
+    def update(self, value: float) -> float | None:
+        """Add a value.
+
+        Args:
+            value: New value
+
+        Returns:
+            Current average, or None until ``period`` values have been seen
+        """
+        if self._value is None:
+            self._value = self._seed.update(value)
+        else:
+            self._value += self.alpha * (value - self._value)
+        return self._value
+
+
+class TrendIndicators:
+    """Moving averages of a close series, fed one bar at a time."""
+
+    def __init__(self, sma_periods: Iterable[int] = (), ema_periods: Iterable[int] = ()):
+        """Initialize the indicator set.
+
+        Args:
+            sma_periods: Periods of the simple moving averages to maintain
+            ema_periods: Periods of the exponential moving averages to maintain
+        """
+        self._smas = {period: RollingMean(period) for period in sma_periods}
+        self._emas = {period: ExponentialMovingAverage(period) for period in ema_periods}
+        self.count = 0
+        self.last_close: float | None = None
+
+    def update(self, close: float):
+        """Feed the next close to every indicator.
+
+        Args:
+            close: Closing price of the next bar
+        """
+        for indicator in (*self._smas.values(), *self._emas.values()):
+            indicator.update(close)
+        self.count += 1
+        self.last_close = close
+
+    def sma(self, period: int) -> float | None:
+        """Get a simple moving average.
+
+        Args:
+            period: Period passed in sma_periods
+
+        Returns:
+            Average, or None until ``period`` closes have been fed
+        """
+        return self._smas[period].value
+
+    def ema(self, period: int) -> float | None:
+        """Get an exponential moving average.
+
+        Args:
+            period: Period passed in ema_periods
+
+        Returns:
+            Average, or None until ``period`` closes have been fed
+        """
+        return self._emas[period].value
@@ -0,0 +1,128 @@
+"""Unit tests for the vectorized Black-Scholes engine."""
+
+import datetime
+
+import numpy as np
+import pytest
+import pytz
+from spreadpilot_core.utils.black_scholes import (
+    MIN_TIME_TO_EXPIRY,
+    bs_delta,
+    bs_price,
+    bs_vega,
+    chain_greeks,
+    implied_volatility,
+    norm_cdf,
+    time_to_expiry,
+)
+
+
+def test_norm_cdf_matches_reference_values():
+    """Test the normal CDF against tabulated values."""
+    x = np.array([-3.0, -1.0, 0.0, 0.5, 1.96, 3.0])
+    expected = np.array([0.0013498980, 0.1586552539, 0.5, 0.6914624613, 0.9750021049, 0.9986501020])
+
+    np.testing.assert_allclose(norm_cdf(x), expected, atol=1e-10)
+
+
+@pytest.mark.parametrize(
+    "spot, strike, t, rate, vol, q, call, put, call_delta",
+    [
+        # Hull, Options, Futures and Other Derivatives, example 15.6
+        (42.0, 40.0, 0.5, 0.10, 0.20, 0.0, 4.7594, 0.8086, 0.7791),
+        # At-the-money one year option
+        (100.0, 100.0, 1.0, 0.05, 0.20, 0.0, 10.4506, 5.5735, 0.6368),
+        # Haug, The Complete Guide to Option Pricing Formulas, generalized BSM example
+        (100.0, 95.0, 0.5, 0.10, 0.20, 0.05, 9.6290, 2.4648, 0.7111),
+    ],
+)
+def test_prices_and_delta_match_reference_values(
+    spot, strike, t, rate, vol, q, call, put, call_delta
+):
+    """Test prices and delta against published examples."""
+    assert bs_price(spot, strike, t, rate, vol, True, q) == pytest.approx(call, abs=1e-4)
+    assert bs_price(spot, strike, t, rate, vol, False, q) == pytest.approx(put, abs=1e-4)
+    assert bs_delta(spot, strike, t, rate, vol, True, q) == pytest.approx(call_delta, abs=1e-4)
+    assert bs_delta(spot, strike, t, rate, vol, False, q) == pytest.approx(
+        call_delta - np.exp(-q * t), abs=1e-4
+    )
+
+
+def test_put_call_parity_across_chain():
+    """Test that call minus put equals the discounted forward minus strike."""
+    strikes = np.arange(400.0, 501.0, 5.0)
+    spot, t, rate, q = 450.0, 7 / 365, 0.045, 0.006
+
+    calls = bs_price(spot, strikes, t, rate, 0.22, True, q)
+    puts = bs_price(spot, strikes, t, rate, 0.22, False, q)
+
+    np.testing.assert_allclose(
+        calls - puts, spot * np.exp(-q * t) - strikes * np.exp(-rate * t), atol=1e-6
+    )
+
+
+def test_vega_matches_finite_difference():
+    """Test vega against a central difference of the price."""
+    bump = 1e-4
+    up = bs_price(450.0, 445.0, 0.02, 0.045, 0.2 + bump, False)
+    down = bs_price(450.0, 445.0, 0.02, 0.045, 0.2 - bump, False)
+
+    assert bs_vega(450.0, 445.0, 0.02, 0.045, 0.2) == pytest.approx(
+        (up - down) / (2 * bump), rel=1e-4
+    )
+
+
+def test_implied_volatility_round_trips_a_chain_in_one_call():
+    """Test that a whole chain with a volatility smile is solved at once."""
+    strikes = np.arange(420.0, 481.0, 2.0)
+    spot, t, rate = 450.0, 1 / 365, 0.045
+    vols = 0.18 + 0.5 * ((strikes - spot) / spot) ** 2
+    # Mix in-the-money and out-of-the-money strikes of both rights
+    is_call = np.arange(len(strikes)) % 2 == 0
+    prices = bs_price(spot, strikes, t, rate, vols, is_call)
+    # Skip strikes whose time value is lost to floating point precision
+    priced = bs_price(spot, strikes, t, rate, vols, strikes >= spot) > 1e-6
+
+    solved = implied_volatility(prices, spot, strikes, t, rate, is_call)
+
+    np.testing.assert_allclose(solved[priced], vols[priced], rtol=1e-6)
+
+
+def test_implied_volatility_is_nan_outside_arbitrage_bounds():
+    """Test that prices no volatility can produce are rejected."""
+    solved = implied_volatility(
+        [0.5, 120.0, np.nan, 5.0], 100.0, [90.0, 100.0, 100.0, 100.0], 0.5, 0.0, True
+    )
+
+    # Below intrinsic, above the spot, missing, and solvable
+    assert np.isnan(solved[:3]).all()
+    assert np.isfinite(solved[3])
+
+
+def test_chain_greeks_from_quotes():
+    """Test that deltas come from quote mids and missing quotes are skipped."""
+    strikes = np.array([440.0, 445.0, 450.0, 455.0])
+    spot, t, rate = 450.0, 3 / 365, 0.045
+    mids = bs_price(spot, strikes, t, rate, 0.2, False)
+    bids = mids - 0.05
+    asks = mids + 0.05
+    bids[3] = np.nan
+
+    vols, deltas = chain_greeks(bids, asks, strikes, spot, t, "P", rate)
+
+    np.testing.assert_allclose(vols[:3], 0.2, rtol=1e-5)
+    np.testing.assert_allclose(deltas[:3], bs_delta(spot, strikes[:3], t, rate, 0.2, False))
+    assert np.isnan(vols[3]) and np.isnan(deltas[3])
+    # Puts get more negative as the strike rises
+    assert deltas[0] > deltas[1] > deltas[2]
+
+
+def test_time_to_expiry_measures_to_the_close():
+    """Test time to expiry to the 4:00 PM New York close."""
+    ny = pytz.timezone("America/New_York")
+
+    morning = ny.localize(datetime.datetime(2025, 1, 10, 9, 30))
+    assert time_to_expiry("20250110", morning) == pytest.approx(6.5 / (365 * 24))
+
+    after_close = ny.localize(datetime.datetime(2025, 1, 10, 16, 30))
+    assert time_to_expiry("20250110", after_close) == MIN_TIME_TO_EXPIRY
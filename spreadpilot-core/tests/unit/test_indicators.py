@@ -0,0 +1,53 @@
+"""Unit tests for the rolling trend indicators."""
+
+import pytest
+from spreadpilot_core.utils.indicators import (
+    ExponentialMovingAverage,
+    RollingMean,
+    TrendIndicators,
+)
+
+
+def test_rolling_mean_matches_full_recomputation():
+    """Test that the running sum tracks a recomputed window average."""
+    values = [100.0 + (i * 7) % 13 for i in range(200)]
+    mean = RollingMean(20)
+
+    for i, value in enumerate(values):
+        result = mean.update(value)
+        if i < 19:
+            assert result is None
+        else:
+            assert result == pytest.approx(sum(values[i - 19 : i + 1]) / 20)
+
+
+def test_rolling_mean_rejects_empty_period():
+    """Test that a zero-length window is refused."""
+    with pytest.raises(ValueError):
+        RollingMean(0)
+
+
+def test_ema_is_seeded_with_simple_average():
+    """Test the EMA seed and recurrence."""
+    ema = ExponentialMovingAverage(3)
+
+    assert ema.update(1.0) is None
+    assert ema.update(2.0) is None
+    assert ema.update(3.0) == pytest.approx(2.0)
+    # alpha = 2 / (3 + 1) = 0.5
+    assert ema.update(6.0) == pytest.approx(4.0)
+
+
+def test_trend_indicators_update_every_average():
+    """Test that one close updates all configured averages."""
+    indicators = TrendIndicators(sma_periods=(2, 4), ema_periods=(2,))
+
+    for close in (10.0, 20.0, 30.0, 40.0):
+        indicators.update(close)
+
+    assert indicators.count == 4
+    assert indicators.last_close == 40.0
+    assert indicators.sma(2) == pytest.approx(35.0)
+    assert indicators.sma(4) == pytest.approx(25.0)
+    # Seeded at 15, then 25 and 35 with alpha = 2 / 3
+    assert indicators.ema(2) == pytest.approx(35.0)
@@ -0,0 +1,203 @@
+"""Unit tests for FIFO lot matching and realized P&L."""
+
+import asyncio
+import datetime
+import uuid
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from spreadpilot_core.models.pnl import Trade
+from spreadpilot_core.pnl.lot_engine import Lot, LotEngine
+from spreadpilot_core.pnl.mtm_engine import get_contract_key
+from spreadpilot_core.pnl.service import PnLService
+
+CALL = get_contract_key("QQQ", "CALL", 450, date(2025, 1, 17))
+NOW = datetime.datetime(2025, 1, 10, 15, 0)
+
+
+def _fill(engine, quantity, price):
+    match = engine.match_fill("f1", CALL, quantity, Decimal(price), NOW)
+    engine.apply_match(match)
+    return match
+
+
+class TestLotEngine:
+    """Test cases for LotEngine."""
+
+    def test_fifo_closes_oldest_lots_first(self):
+        """Test that a sell closes the oldest long lots at their own prices."""
+        engine = LotEngine()
+        _fill(engine, 2, "2.00")
+        _fill(engine, 3, "3.00")
+
+        match = _fill(engine, -4, "3.50")
+
+        # 2 @ 2.00 -> +300, 2 @ 3.00 -> +100
+        assert match.realized_pnl == Decimal("400.00")
+        assert len(match.closed_lot_ids) == 1
+        assert match.reduced_lot[1] == 1
+        lots = engine.get_open_lots("f1", CALL)
+        assert [(lot.quantity, lot.price) for lot in lots] == [(1, Decimal("3.00"))]
+        assert engine.get_realized_today("f1") == Decimal("400.00")
+
+    def test_short_lots_realize_on_buy_to_close(self):
+        """Test realized P&L for short lots closed by a buy."""
+        engine = LotEngine()
+        _fill(engine, -5, "1.20")
+
+        match = _fill(engine, 5, "0.70")
+
+        assert match.realized_pnl == Decimal("250.00")
+        assert engine.get_open_lots("f1", CALL) == []
+        assert CALL not in {key for _, key in engine.books}
+
+    def test_flip_opens_new_lot_for_remainder(self):
+        """Test that a fill larger than the open lots opens an opposite lot."""
+        engine = LotEngine()
+        _fill(engine, 2, "2.00")
+
+        match = _fill(engine, -5, "1.50")
+
+        assert match.realized_pnl == Decimal("-100.00")
+        assert match.opened_lot.quantity == -3
+        lots = engine.get_open_lots("f1", CALL)
+        assert [(lot.quantity, lot.price) for lot in lots] == [(-3, Decimal("1.50"))]
+
+    def test_match_does_not_change_state_until_applied(self):
+        """Test that planning a match leaves lots and realized P&L untouched."""
+        engine = LotEngine()
+        _fill(engine, 2, "2.00")
+
+        engine.match_fill("f1", CALL, -2, Decimal("3.00"), NOW)
+
+        assert [lot.quantity for lot in engine.get_open_lots("f1", CALL)] == [2]
+        assert engine.get_realized_today("f1") == Decimal("0")
+
+    def test_load_restores_lots_and_realized(self):
+        """Test that persisted lots are matched after a restart."""
+        engine = LotEngine()
+        engine.load(
+            [("f1", CALL, Lot(quantity=3, price=Decimal("2.00"), opened_at=NOW))],
+            {"f1": Decimal("50")},
+        )
+
+        _fill(engine, -3, "2.10")
+
+        assert engine.get_realized_today("f1") == Decimal("80.00")
+
+
+@pytest.fixture
+def fill_data():
+    return {
+        "symbol": "QQQ",
+        "contract_type": "CALL",
+        "strike": 450.0,
+        "expiration": date(2025, 1, 17),
+        "trade_type": "SELL",
+        "quantity": 2,
+        "price": 2.50,
+        "commission": 1.30,
+        "trade_time": NOW,
+    }
+
+
+class TestServiceLots:
+    """Test cases for lot matching in PnLService."""
+
+    @pytest.mark.asyncio
+    async def test_fill_books_realized_pnl_and_persists_lots(self, fill_data):
+        """Test that a closing fill stores realized P&L and lot changes in one commit."""
+        service = PnLService()
+        lot_id = uuid.uuid4()
+        service.lot_engine.load(
+            [("f1", CALL, Lot(quantity=5, price=Decimal("2.00"), opened_at=NOW, id=lot_id))]
+        )
+        session = AsyncMock()
+        session.add = MagicMock()
+
+        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+            mock_get_session.return_value.__aenter__.return_value = session
+            await service.record_trade_fill("f1", fill_data)
+
+        trade = session.add.call_args[0][0]
+        assert isinstance(trade, Trade)
+        assert trade.realized_pnl == Decimal("100.00")
+        session.commit.assert_awaited_once()
+
+        # Partial close of the lot is written as an update
+        statement = session.execute.call_args[0][0]
+        assert statement.table.name == "position_lots"
+        assert statement.compile().params["quantity"] == 3
+
+        assert service.lot_engine.get_open_lots("f1", CALL)[0].quantity == 3
+        assert await service._get_realized_pnl_today("f1") == Decimal("100.00")
+
+    @pytest.mark.asyncio
+    async def test_failed_commit_leaves_lots_unchanged(self, fill_data):
+        """Test that lots only move once the fill is persisted."""
+        service = PnLService()
+        service.lot_engine.load(
+            [("f1", CALL, Lot(quantity=5, price=Decimal("2.00"), opened_at=NOW))]
+        )
+        session = AsyncMock()
+        session.add = MagicMock()
+        session.commit.side_effect = Exception("db down")
+
+        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+            mock_get_session.return_value.__aenter__.return_value = session
+            recorded = await service.record_trade_fill("f1", fill_data)
+
+        assert recorded is False
+        assert service.lot_engine.get_open_lots("f1", CALL)[0].quantity == 5
+        assert await service._get_realized_pnl_today("f1") == Decimal("0")
+
+    @pytest.mark.asyncio
+    async def test_load_lot_state(self):
+        """Test loading persisted lots and today's realized P&L."""
+        service = PnLService()
+        lot_row = MagicMock(
+            follower_id="f1",
+            symbol="QQQ",
+            contract_type="CALL",
+            strike=Decimal("450.00"),
+            expiration=date(2025, 1, 17),
+            quantity=-2,
+            price=Decimal("1.10"),
+            opened_at=NOW,
+            id=uuid.uuid4(),
+        )
+        lots_result = MagicMock()
+        lots_result.scalars.return_value.all.return_value = [lot_row]
+        realized_result = MagicMock()
+        realized_result.all.return_value = [("f1", Decimal("42.00"))]
+        session = AsyncMock()
+        session.execute.side_effect = [lots_result, realized_result]
+
+        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+            mock_get_session.return_value.__aenter__.return_value = session
+            await service._load_lot_state()
+
+        lots = service.lot_engine.get_open_lots("f1", CALL)
+        assert [(lot.quantity, lot.price) for lot in lots] == [(-2, Decimal("1.10"))]
+        assert service.lot_engine.get_realized_today("f1") == Decimal("42.00")
+
+    @pytest.mark.asyncio
+    async def test_lot_state_load_failure_stops_startup(self):
+        """Test that the service does not start consuming fills with empty lot books."""
+        service = PnLService()
+        session = AsyncMock()
+        session.execute.side_effect = Exception("db down")
+        service._redis_stream_subscriber = AsyncMock()
+
+        with (
+            patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session,
+            patch("spreadpilot_core.pnl.service.get_redis_client", return_value=AsyncMock()),
+        ):
+            mock_get_session.return_value.__aenter__.return_value = session
+            with pytest.raises(Exception, match="db down"):
+                await service.start_monitoring(asyncio.Event())
+
+        service._redis_stream_subscriber.assert_not_called()
+        assert service.monitoring_active is False
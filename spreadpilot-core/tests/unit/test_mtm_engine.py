@@ -0,0 +1,231 @@
+"""Unit tests for the incremental MTM engine."""
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from spreadpilot_core.models.pnl import PnLIntraday
+from spreadpilot_core.pnl.mtm_engine import MTMEngine, get_contract_key
+from spreadpilot_core.pnl.service import PnLService
+
+CALL = get_contract_key("QQQ", "CALL", 450, date(2025, 1, 17))
+PUT = get_contract_key("QQQ", "PUT", 440, date(2025, 1, 17))
+
+
+class TestContractKey:
+    """Test cases for contract key normalization."""
+
+    def test_strike_and_expiration_formats_match(self):
+        """Test that fills, quotes and positions produce the same key."""
+        assert get_contract_key("QQQ", "CALL", "450.0", "2025-01-17") == CALL
+        assert get_contract_key("QQQ", "CALL", Decimal("450"), date(2025, 1, 17)) == CALL
+        assert get_contract_key("QQQ", "STK") == "QQQ|STK"
+
+
+class TestMTMEngine:
+    """Test cases for MTMEngine."""
+
+    def test_load_and_mark_long_and_short(self):
+        """Test unrealized P&L and market value for long and short positions."""
+        engine = MTMEngine()
+        engine.load_follower(
+            "f1",
+            [(CALL, 5, Decimal("2.50")), (PUT, -3, Decimal("1.20"))],
+            commission_today=Decimal("4.00"),
+        )
+
+        engine.update_mark(CALL, Decimal("2.75"))
+        engine.update_mark(PUT, Decimal("1.00"))
+
+        totals = engine.get_totals("f1")
+        # Long: (2.75 - 2.50) * 5 * 100 = 125; short: (1.20 - 1.00) * 3 * 100 = 60
+        assert totals["unrealized_pnl"] == Decimal("185.00")
+        assert totals["total_market_value"] == Decimal("1675.00")
+        assert totals["position_count"] == 2
+        assert totals["total_commission"] == Decimal("4.00")
+
+    def test_quote_updates_apply_deltas(self):
+        """Test that repeated marks adjust totals by delta to the exact value."""
+        engine = MTMEngine()
+        engine.load_follower("f1", [(CALL, 5, Decimal("2.50"))])
+
+        for mark in ("2.60", "2.40", "2.55", "2.70"):
+            engine.update_mark(CALL, Decimal(mark))
+
+        totals = engine.get_totals("f1")
+        assert totals["unrealized_pnl"] == Decimal("100.00")
+        assert totals["total_market_value"] == Decimal("1350.00")
+
+    def test_fills_update_quantity_cost_and_commission(self):
+        """Test adding to, reducing and closing a position with fills."""
+        engine = MTMEngine()
+        engine.update_mark(CALL, Decimal("3.00"))
+        engine.load_follower("f1", [])
+
+        engine.apply_fill("f1", CALL, 2, Decimal("2.00"), Decimal("1.00"))
+        engine.apply_fill("f1", CALL, 2, Decimal("3.00"), Decimal("1.00"))
+        position = engine.followers["f1"].positions[CALL]
+        assert position.quantity == 4
+        assert position.avg_cost == Decimal("2.50")
+        assert engine.get_totals("f1")["unrealized_pnl"] == Decimal("200.00")
+
+        engine.apply_fill("f1", CALL, -1, Decimal("3.00"), Decimal("0.50"))
+        assert engine.followers["f1"].positions[CALL].avg_cost == Decimal("2.50")
+        assert engine.get_totals("f1")["unrealized_pnl"] == Decimal("150.00")
+
+        engine.apply_fill("f1", CALL, -3, Decimal("3.00"), Decimal("0.50"))
+        totals = engine.get_totals("f1")
+        assert totals["position_count"] == 0
+        assert totals["unrealized_pnl"] == Decimal("0")
+        assert totals["total_market_value"] == Decimal("0")
+        assert totals["total_commission"] == Decimal("3.00")
+
+    def test_flip_opens_remainder_at_fill_price(self):
+        """Test that selling through zero opens a short at the fill price."""
+        engine = MTMEngine()
+        engine.load_follower("f1", [(CALL, 2, Decimal("2.00"))])
+
+        engine.apply_fill("f1", CALL, -5, Decimal("2.40"))
+
+        position = engine.followers["f1"].positions[CALL]
+        assert position.quantity == -3
+        assert position.avg_cost == Decimal("2.40")
+
+    def test_quotes_only_touch_holders(self):
+        """Test that a quote does not change followers without the contract."""
+        engine = MTMEngine()
+        engine.load_follower("f1", [(CALL, 1, Decimal("2.00"))])
+        engine.load_follower("f2", [(PUT, 1, Decimal("1.00"))])
+
+        engine.update_mark(CALL, Decimal("2.50"))
+
+        assert engine.get_totals("f1")["unrealized_pnl"] == Decimal("50.00")
+        assert engine.get_totals("f2")["unrealized_pnl"] == Decimal("0")
+
+        engine.remove_follower("f1")
+        engine.update_mark(CALL, Decimal("3.00"))
+        assert engine.get_totals("f1") is None
+
+    def test_untracked_follower_fill_is_ignored(self):
+        """Test that fills for followers that were never loaded are ignored."""
+        engine = MTMEngine()
+        engine.apply_fill("unknown", CALL, 1, Decimal("2.00"))
+
+        assert not engine.is_tracked("unknown")
+
+
+class TestServiceMTM:
+    """Test cases for MTM snapshots built from the engine."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reads_engine_after_fills_and_quotes(self):
+        """Test that positions are fetched once and later updates come from events."""
+        service = PnLService()
+        position = MagicMock(
+            symbol="QQQ",
+            contract_type="CALL",
+            strike=450.0,
+            expiration=date(2025, 1, 17),
+            quantity=5,
+            avg_cost=2.50,
+        )
+        get_positions = AsyncMock(return_value=[position])
+        get_price = AsyncMock(return_value=2.50)
+        service.set_callbacks(get_positions_fn=get_positions, get_market_price_fn=get_price)
+
+        session = AsyncMock()
+        session.add = MagicMock()
+        session.add_all = MagicMock()
+        session.execute.return_value.scalar = MagicMock(return_value=Decimal("0"))
+        session.execute.return_value.scalars.return_value.all.return_value = []
+
+        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+            mock_get_session.return_value.__aenter__.return_value = session
+            await service.add_follower("f1")
+
+            await service._calculate_and_store_mtm()
+
+            await service.update_quote(
+                {
+                    "symbol": "QQQ",
+                    "contract_type": "CALL",
+                    "strike": 450.0,
+                    "expiration": date(2025, 1, 17),
+                    "bid": 2.70,
+                    "ask": 2.80,
+                    "quote_time": None,
+                }
+            )
+            await service.record_trade_fill(
+                "f1",
+                {
+                    "symbol": "QQQ",
+                    "contract_type": "CALL",
+                    "strike": 450.0,
+                    "expiration": date(2025, 1, 17),
+                    "trade_type": "SELL",
+                    "quantity": 2,
+                    "price": 2.75,
+                    "commission": 1.30,
+                    "trade_time": None,
+                },
+            )
+
+            await service._calculate_and_store_mtm()
+
+        get_positions.assert_awaited_once()
+        get_price.assert_awaited_once()
+
+        snapshot = session.add_all.call_args[0][0][0]
+        assert isinstance(snapshot, PnLIntraday)
+        assert snapshot.position_count == 1
+        # 3 contracts left at avg 2.50, marked at the 2.75 mid
+        assert snapshot.unrealized_pnl == Decimal("75.00")
+        assert snapshot.total_market_value == Decimal("825.00")
+        assert snapshot.total_commission == Decimal("1.30")
+
+    @pytest.mark.asyncio
+    async def test_expired_position_is_dropped_on_resync(self):
+        """Test that positions closed without a fill are dropped when positions re-sync."""
+        service = PnLService()
+        service.mtm_resync_seconds = 300
+        position = MagicMock(
+            symbol="QQQ",
+            contract_type="CALL",
+            strike=450.0,
+            expiration=date(2025, 1, 17),
+            quantity=5,
+            avg_cost=2.50,
+        )
+        get_positions = AsyncMock(return_value=[position])
+        service.set_callbacks(
+            get_positions_fn=get_positions, get_market_price_fn=AsyncMock(return_value=3.00)
+        )
+        service._get_daily_commission = AsyncMock(return_value=Decimal("0"))
+
+        snapshot = await service._build_mtm_snapshot("f1")
+        assert snapshot.position_count == 1
+
+        # Within the resync interval the engine's state is used as is
+        await service._build_mtm_snapshot("f1")
+        get_positions.assert_awaited_once()
+
+        # The contract expired overnight; the broker no longer reports it
+        get_positions.return_value = []
+        service.mtm_engine.followers["f1"].loaded_date = date(2025, 1, 17)
+
+        assert await service._build_mtm_snapshot("f1") is None
+        assert service.mtm_engine.get_totals("f1")["unrealized_pnl"] == Decimal("0")
+        assert service.mtm_engine.get_totals("f1")["position_count"] == 0
+
+    def test_needs_reload_after_max_age(self):
+        """Test that loaded positions are re-synced once they are older than max_age."""
+        engine = MTMEngine()
+        assert engine.needs_reload("f1", 300)
+
+        engine.load_follower("f1", [(CALL, 1, Decimal("2.00"))])
+        assert not engine.needs_reload("f1", 300)
+
+        engine.followers["f1"].loaded_at -= 301
+        assert engine.needs_reload("f1", 300)
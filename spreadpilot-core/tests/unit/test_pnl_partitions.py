@@ -0,0 +1,207 @@
+"""Unit tests for P&L table partitioning and retention."""
+
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from spreadpilot_core.models.pnl import PnLIntraday, Quote
+from spreadpilot_core.pnl.partitions import (
+    PNL_INTRADAY_PARTITIONS,
+    QUOTES_PARTITIONS,
+    build_create_partition_sql,
+    build_intraday_downsample,
+    create_partitions,
+    drop_partitions_before,
+)
+from spreadpilot_core.pnl.service import PnLService
+from sqlalchemy.dialects import postgresql
+
+
+def _executed_sql(session) -> list[str]:
+    return [str(call[0][0]) for call in session.execute.call_args_list]
+
+
+def _catalog_result(names):
+    result = MagicMock()
+    result.all.return_value = [(name,) for name in names]
+    return result
+
+
+class TestPartitionSpec:
+    """Test cases for partition naming and bounds."""
+
+    def test_daily_and_monthly_names(self):
+        """Test partition names and upper bounds for both layouts."""
+        assert QUOTES_PARTITIONS.partition_name(date(2025, 1, 9)) == "quotes_p20250109"
+        assert QUOTES_PARTITIONS.next_start(date(2025, 2, 28)) == date(2025, 3, 1)
+        assert PNL_INTRADAY_PARTITIONS.partition_start(date(2025, 1, 9)) == date(2025, 1, 1)
+        assert PNL_INTRADAY_PARTITIONS.next_start(date(2024, 12, 1)) == date(2025, 1, 1)
+        assert PNL_INTRADAY_PARTITIONS.partition_name(date(2025, 1, 1)) == "pnl_intraday_p202501"
+
+    def test_parse_ignores_foreign_tables(self):
+        """Test that only partitions named by this module are recognized."""
+        assert QUOTES_PARTITIONS.parse_partition_name("quotes_p20250109") == date(2025, 1, 9)
+        assert QUOTES_PARTITIONS.parse_partition_name("quotes_default") is None
+        assert PNL_INTRADAY_PARTITIONS.parse_partition_name("pnl_intraday_p2025") is None
+
+    def test_create_partition_sql(self):
+        """Test the partition DDL bounds."""
+        sql = build_create_partition_sql(PNL_INTRADAY_PARTITIONS, date(2025, 12, 1))
+
+        assert sql == (
+            "CREATE TABLE IF NOT EXISTS pnl_intraday_p202512 PARTITION OF pnl_intraday "
+            "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')"
+        )
+
+    def test_models_are_partitioned(self):
+        """Test that the partition key is part of each primary key."""
+        assert Quote.__table__.dialect_options["postgresql"]["partition_by"] == "RANGE (quote_time)"
+        assert [c.name for c in Quote.__table__.primary_key] == ["id", "quote_time"]
+        assert [c.name for c in PnLIntraday.__table__.primary_key] == ["id", "trading_date"]
+
+
+class TestPartitionMaintenance:
+    """Test cases for creating and dropping partitions."""
+
+    @pytest.mark.asyncio
+    async def test_create_partitions_covers_range(self):
+        """Test that every month touched by the range gets a partition, plus the default."""
+        session = AsyncMock()
+        session.execute.side_effect = [
+            MagicMock(),
+            _catalog_result(["pnl_intraday_p202501"]),
+            MagicMock(scalar=MagicMock(return_value=False)),
+            MagicMock(),
+            MagicMock(scalar=MagicMock(return_value=False)),
+            MagicMock(),
+        ]
+
+        names = await create_partitions(
+            session, PNL_INTRADAY_PARTITIONS, date(2025, 1, 20), date(2025, 3, 2)
+        )
+
+        assert names == ["pnl_intraday_p202501", "pnl_intraday_p202502", "pnl_intraday_p202503"]
+        sql = _executed_sql(session)
+        assert sql[0] == (
+            "CREATE TABLE IF NOT EXISTS pnl_intraday_default PARTITION OF pnl_intraday DEFAULT"
+        )
+        # The existing January partition is left alone
+        assert sql[3] == build_create_partition_sql(PNL_INTRADAY_PARTITIONS, date(2025, 2, 1))
+        assert sql[5] == build_create_partition_sql(PNL_INTRADAY_PARTITIONS, date(2025, 3, 1))
+
+    @pytest.mark.asyncio
+    async def test_rows_in_default_partition_are_moved(self):
+        """Test that a range already holding rows in the default partition is split out."""
+        session = AsyncMock()
+        session.execute.side_effect = [
+            MagicMock(),
+            _catalog_result([]),
+            MagicMock(scalar=MagicMock(return_value=True)),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+        ]
+
+        await create_partitions(session, QUOTES_PARTITIONS, date(2025, 1, 9), date(2025, 1, 9))
+
+        assert _executed_sql(session)[3:] == [
+            "CREATE TABLE quotes_p20250109 (LIKE quotes INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+            "WITH moved AS (DELETE FROM quotes_default "
+            "WHERE quote_time >= '2025-01-09' AND quote_time < '2025-01-10' RETURNING *) "
+            "INSERT INTO quotes_p20250109 SELECT * FROM moved",
+            "ALTER TABLE quotes ATTACH PARTITION quotes_p20250109 "
+            "FOR VALUES FROM ('2025-01-09') TO ('2025-01-10')",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_drop_only_partitions_fully_before_cutoff(self):
+        """Test that partitions overlapping the cutoff are kept."""
+        session = AsyncMock()
+        session.execute.side_effect = [
+            _catalog_result(["quotes_p20250103", "quotes_p20250101", "quotes_p20250102"]),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+        ]
+
+        dropped = await drop_partitions_before(session, QUOTES_PARTITIONS, date(2025, 1, 3))
+
+        assert dropped == ["quotes_p20250101", "quotes_p20250102"]
+        assert _executed_sql(session)[1:] == [
+            "DROP TABLE IF EXISTS quotes_p20250101",
+            "DROP TABLE IF EXISTS quotes_p20250102",
+            "DELETE FROM quotes_default WHERE quote_time < :cutoff",
+        ]
+
+    def test_downsample_keeps_last_snapshot_per_bucket(self):
+        """Test that downsampling is limited to one date and finalized followers."""
+        sql = str(
+            build_intraday_downsample(date(2025, 1, 10), 5).compile(dialect=postgresql.dialect())
+        )
+
+        assert sql.startswith("DELETE FROM pnl_intraday")
+        assert "ORDER BY pnl_intraday.snapshot_time DESC" in sql
+        assert "pnl_daily.is_finalized IS true" in sql
+        assert "ranked.rank >" in sql
+
+
+class TestServiceRetention:
+    """Test cases for the retention job in PnLService."""
+
+    @pytest.mark.asyncio
+    async def test_cutoffs_never_pass_finalized_rollups(self):
+        """Test that raw data behind unfinalized rollups is kept."""
+        service = PnLService()
+        service.quote_retention_days = 7
+        service.intraday_retention_months = 1
+        today = date.today()
+        last_finalized_day = today - timedelta(days=30)
+
+        downsample = MagicMock(rowcount=4)
+        session = AsyncMock()
+        session.execute.side_effect = [downsample] * 7 + [
+            MagicMock(scalar=MagicMock(return_value=last_finalized_day)),
+            MagicMock(first=MagicMock(return_value=(2020, 1))),
+        ]
+
+        with (
+            patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session,
+            patch.object(service, "_ensure_partitions", new_callable=AsyncMock),
+            patch(
+                "spreadpilot_core.pnl.service.drop_partitions_before",
+                new_callable=AsyncMock,
+                side_effect=[["quotes_p20200101"], []],
+            ) as mock_drop,
+        ):
+            mock_get_session.return_value.__aenter__.return_value = session
+            summary = await service._perform_partition_maintenance()
+
+        assert summary["downsampled_snapshots"] == 28
+        assert summary["dropped_partitions"] == ["quotes_p20200101"]
+        quote_call, intraday_call = mock_drop.await_args_list
+        assert quote_call[0][1:] == (QUOTES_PARTITIONS, last_finalized_day + timedelta(days=1))
+        assert intraday_call[0][1:] == (PNL_INTRADAY_PARTITIONS, date(2020, 2, 1))
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_partitions_start_before_the_ny_trading_date(self):
+        """Test that partitions cover the previous trading day, not just the server's today."""
+        service = PnLService()
+        session = AsyncMock()
+
+        with (
+            patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session,
+            patch(
+                "spreadpilot_core.pnl.service.get_current_trading_date", return_value="20250113"
+            ),
+            patch(
+                "spreadpilot_core.pnl.service.create_partitions", new_callable=AsyncMock
+            ) as mock_create,
+        ):
+            mock_get_session.return_value.__aenter__.return_value = session
+            await service._ensure_partitions()
+
+        quote_call, intraday_call = mock_create.await_args_list
+        # Monday's partitions reach back to Friday
+        assert quote_call[0][1:] == (QUOTES_PARTITIONS, date(2025, 1, 10), date(2025, 1, 20))
+        assert intraday_call[0][2] == date(2025, 1, 10)
@@ -0,0 +1,183 @@
+"""Query plan regression tests for P&L time range queries."""
+
+import os
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from spreadpilot_core.models.pnl import Base, PnLIntraday, Trade
+from spreadpilot_core.pnl.partitions import PNL_INTRADAY_PARTITIONS, build_create_partition_sql
+from spreadpilot_core.pnl.service import PnLService
+from spreadpilot_core.utils.time import get_day_range, get_month_range
+from sqlalchemy import and_, func, select, text
+from sqlalchemy.dialects import postgresql
+
+# Database for EXPLAIN checks, e.g. postgresql+asyncpg://postgres@localhost/pnl_test;
+# set by the integration job of the CI workflow, which runs a PostgreSQL service
+TEST_DATABASE_URL = os.environ.get("PNL_TEST_DATABASE_URL")
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def _daily_commission_query(follower_id: str, trading_date: date):
+    day_start, day_end = get_day_range(trading_date)
+    return select(func.sum(Trade.commission)).where(
+        and_(
+            Trade.follower_id == follower_id,
+            Trade.trade_time >= day_start,
+            Trade.trade_time < day_end,
+        )
+    )
+
+
+class TestTimeRanges:
+    """Test cases for the half-open range helpers."""
+
+    def test_day_range(self):
+        """Test that a day range ends at the next midnight."""
+        start, end = get_day_range(date(2025, 2, 28))
+
+        assert start.isoformat() == "2025-02-28T00:00:00"
+        assert end.isoformat() == "2025-03-01T00:00:00"
+
+    def test_month_range_wraps_year(self):
+        """Test that December ends on January 1st of the next year."""
+        assert get_month_range(2024, 12) == (date(2024, 12, 1), date(2025, 1, 1))
+        assert get_month_range(2025, 2) == (date(2025, 2, 1), date(2025, 3, 1))
+
+
+class TestSargablePredicates:
+    """Test cases asserting hot queries filter on the raw indexed columns."""
+
+    @pytest.mark.asyncio
+    async def test_daily_commission_uses_trade_time_range(self):
+        """Test that the daily commission query has no date() on trade_time."""
+        service = PnLService()
+        session = AsyncMock()
+        session.execute.return_value.scalar = MagicMock(return_value=None)
+
+        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+            mock_get_session.return_value.__aenter__.return_value = session
+            await service._get_daily_commission("f1")
+
+        sql = _compile(session.execute.call_args[0][0])
+        assert "date(trades.trade_time)" not in sql
+        assert "trades.trade_time >=" in sql
+        assert "trades.trade_time <" in sql
+
+    @pytest.mark.asyncio
+    async def test_monthly_rollup_uses_trading_date_range(self):
+        """Test that the per-follower monthly rollup has no EXTRACT on trading_date."""
+        service = PnLService()
+        session = AsyncMock()
+        session.execute.return_value.scalars.return_value.all.return_value = []
+
+        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+            mock_get_session.return_value.__aenter__.return_value = session
+            await service._rollup_monthly_pnl("f1", 2025, 3)
+
+        sql = _compile(session.execute.call_args_list[0][0][0])
+        assert "EXTRACT" not in sql
+        assert "pnl_daily.trading_date >=" in sql
+        assert "pnl_daily.trading_date <" in sql
+
+
+class TestCoveringIndexes:
+    """Test cases for the covering index definitions."""
+
+    def test_trades_index_includes_commission_and_quantity(self):
+        """Test that the follower/time trades index covers commission and volume sums."""
+        index = next(i for i in Trade.__table__.indexes if i.name == "ix_trades_follower_time")
+
+        assert [c.name for c in index.columns] == ["follower_id", "trade_time"]
+        assert index.dialect_options["postgresql"]["include"] == ["commission", "quantity"]
+
+    def test_trade_executions_are_unique_without_leading_follower(self):
+        """Test that the execution index dedupes fills but is not a follower index."""
+        index = next(
+            i for i in Trade.__table__.indexes if i.name == "ix_trades_execution_follower"
+        )
+
+        assert index.unique
+        assert [c.name for c in index.columns] == ["execution_id", "follower_id"]
+
+    def test_intraday_index_on_follower_date_time(self):
+        """Test that intraday snapshots are indexed by follower, trading date and time."""
+        index = next(
+            i
+            for i in PnLIntraday.__table__.indexes
+            if i.name == "ix_pnl_intraday_follower_date_time"
+        )
+
+        assert [c.name for c in index.columns] == ["follower_id", "trading_date", "snapshot_time"]
+
+
+# 20 followers trading 20 times on each day of January 2025
+SEED_TRADES_SQL = """
+INSERT INTO trades (id, follower_id, symbol, contract_type, strike, expiration, trade_type,
+                    quantity, price, commission, realized_pnl, trade_time, created_at)
+SELECT gen_random_uuid(), 'f' || f, 'QQQ', 'PUT', 380, DATE '2025-02-21', 'BUY', 1, 1.25,
+       0.65, 0, TIMESTAMP '2025-01-01 14:30' + d * INTERVAL '1 day' + t * INTERVAL '15 minutes',
+       now()
+FROM generate_series(1, 20) f, generate_series(0, 30) d, generate_series(0, 19) t
+"""
+
+# 20 followers with a snapshot every 5 minutes of each trading session in January 2025
+SEED_INTRADAY_SQL = """
+INSERT INTO pnl_intraday (id, follower_id, snapshot_time, trading_date, realized_pnl,
+                          unrealized_pnl, total_pnl, position_count, total_market_value,
+                          total_commission, created_at)
+SELECT gen_random_uuid(), 'f' || f, DATE '2025-01-01' + d + TIME '14:30' + s * INTERVAL '5 minutes',
+       DATE '2025-01-01' + d, 0, 0, 0, 0, 0, 0, now()
+FROM generate_series(1, 20) f, generate_series(0, 30) d, generate_series(0, 77) s
+"""
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="PNL_TEST_DATABASE_URL not set")
+class TestQueryPlans:
+    """Test cases running EXPLAIN against a real PostgreSQL database."""
+
+    @pytest.mark.asyncio
+    async def test_hot_queries_use_indexes(self):
+        """Test that the planner can answer the hot queries from the new indexes."""
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        engine = create_async_engine(TEST_DATABASE_URL)
+        statements = {
+            "ix_trades_follower_time": _daily_commission_query("f1", date(2025, 1, 10)),
+            # Indexes on partitions are named after the partition and columns
+            "follower_id_trading_date_snapshot_time_idx": select(PnLIntraday)
+            .where(
+                and_(
+                    PnLIntraday.follower_id == "f1",
+                    PnLIntraday.trading_date == date(2025, 1, 10),
+                )
+            )
+            .order_by(PnLIntraday.snapshot_time),
+        }
+
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.execute(
+                    text(build_create_partition_sql(PNL_INTRADAY_PARTITIONS, date(2025, 1, 1)))
+                )
+                # Plans on empty tables are arbitrary; seed a month of trades and
+                # snapshots for 20 followers and collect statistics
+                await conn.execute(text(SEED_TRADES_SQL))
+                await conn.execute(text(SEED_INTRADAY_SQL))
+                await conn.execute(text("ANALYZE trades, pnl_intraday"))
+
+                for index_name, statement in statements.items():
+                    compiled = statement.compile(
+                        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+                    )
+                    result = await conn.execute(text(f"EXPLAIN {compiled}"))
+                    plan = "\n".join(row[0] for row in result)
+                    assert index_name in plan, plan
+
+                await conn.run_sync(Base.metadata.drop_all)
+        finally:
+            await engine.dispose()
@@ -0,0 +1,333 @@
+"""Unit tests for set-based daily and monthly P&L rollups."""
+
+import os
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from spreadpilot_core.models.pnl import Base, PnLDaily, PnLIntraday, PnLMonthly, Trade
+from spreadpilot_core.pnl.partitions import PNL_INTRADAY_PARTITIONS, build_create_partition_sql
+from spreadpilot_core.pnl.service import PnLService
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+# Optional database for comparing rollup paths, e.g. postgresql+asyncpg://localhost/pnl_test
+TEST_DATABASE_URL = os.environ.get("PNL_TEST_DATABASE_URL")
+
+DailyRow = namedtuple(
+    "DailyRow",
+    [
+        "follower_id",
+        "opening_balance",
+        "opening_positions",
+        "realized_pnl",
+        "unrealized_pnl_start",
+        "unrealized_pnl_end",
+        "total_pnl",
+        "closing_balance",
+        "closing_positions",
+        "max_drawdown",
+        "max_profit",
+        "trades_count",
+        "total_volume",
+        "total_commission",
+    ],
+)
+
+MonthlyRow = namedtuple(
+    "MonthlyRow",
+    [
+        "follower_id",
+        "realized_pnl",
+        "unrealized_pnl_start",
+        "unrealized_pnl_end",
+        "total_pnl",
+        "trading_days",
+        "total_trades",
+        "total_volume",
+        "total_commission",
+        "best_day_pnl",
+        "worst_day_pnl",
+        "max_drawdown",
+        "max_profit",
+        "winning_days",
+        "losing_days",
+        "breakeven_days",
+    ],
+)
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def pnl_service():
+    """Create a P&L service with bulk rollups and three followers."""
+    service = PnLService(bulk_rollups=True)
+    service.active_followers.update({"f1", "f2", "f3"})
+    return service
+
+
+@pytest.fixture
+def mock_session():
+    """Patch the postgres session used by the service."""
+    session = AsyncMock()
+    session.add = MagicMock()
+    with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+        mock_get_session.return_value.__aenter__.return_value = session
+        yield session
+
+
+class TestRollupQueries:
+    """Test cases for the grouped rollup statements."""
+
+    def test_daily_query_groups_all_followers(self, pnl_service):
+        """Test that the daily query ranks snapshots and aggregates trades per follower."""
+        sql = _compile(pnl_service._build_daily_rollup_query(date(2025, 1, 10), ["f1", "f2"]))
+
+        assert "row_number() OVER (PARTITION BY pnl_intraday.follower_id" in sql
+        assert "GROUP BY ranked_snapshots.follower_id" in sql
+        assert "GROUP BY trades.follower_id" in sql
+        assert "LEFT OUTER JOIN" in sql
+        # Trade activity uses a half-open time range, not date(trade_time)
+        assert "trades.trade_time >=" in sql
+        assert "trades.trade_time <" in sql
+        assert "date(trades.trade_time)" not in sql
+
+    def test_monthly_query_uses_date_range(self, pnl_service):
+        """Test that the monthly query filters the month as a date range."""
+        statement = pnl_service._build_monthly_rollup_query(2024, 12, ["f1"])
+        sql = _compile(statement)
+        params = statement.compile(dialect=postgresql.dialect()).params
+
+        assert "GROUP BY ranked_days.follower_id" in sql
+        assert "FILTER (WHERE ranked_days.total_pnl >" in sql
+        assert date(2024, 12, 1) in params.values()
+        assert date(2025, 1, 1) in params.values()
+
+    def test_upsert_updates_on_conflict(self, pnl_service):
+        """Test that rollup rows are upserted on the follower/period index."""
+        from spreadpilot_core.models.pnl import PnLDaily
+
+        sql = _compile(pnl_service._build_rollup_upsert(PnLDaily, ["follower_id", "trading_date"]))
+
+        assert "ON CONFLICT (follower_id, trading_date) DO UPDATE" in sql
+        assert "total_pnl = excluded.total_pnl" in sql
+        assert "id = excluded.id" not in sql
+
+
+class TestBulkRollups:
+    """Test cases for running bulk rollups."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_daily_rollup_single_upsert(self, pnl_service, mock_session):
+        """Test that all followers are rolled up with one select and one upsert."""
+        rows = [
+            DailyRow(
+                follower_id,
+                Decimal("1000"),
+                2,
+                Decimal("50"),
+                Decimal("10"),
+                Decimal("30"),
+                Decimal("80"),
+                Decimal("1100"),
+                2,
+                Decimal("-20"),
+                Decimal("90"),
+                3,
+                7,
+                Decimal("4.50"),
+            )
+            for follower_id in ("f1", "f2")
+        ]
+        result = MagicMock()
+        result.all.return_value = rows
+        mock_session.execute.side_effect = [result, MagicMock()]
+
+        await pnl_service._perform_daily_rollup()
+
+        assert mock_session.execute.await_count == 2
+        upsert, upsert_rows = mock_session.execute.call_args[0]
+        assert "ON CONFLICT" in _compile(upsert)
+        assert [row["follower_id"] for row in upsert_rows] == ["f1", "f2"]
+        assert upsert_rows[0]["trading_date"] == date.today()
+        assert upsert_rows[0]["is_finalized"] is True
+        assert upsert_rows[0]["total_commission"] == Decimal("4.50")
+        mock_session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_monthly_rollup_rows_and_commission(self, pnl_service, mock_session):
+        """Test monthly rows derived from grouped results and per-follower commission."""
+        row = MonthlyRow(
+            "f1",
+            Decimal("500"),
+            Decimal("10"),
+            Decimal("25"),
+            Decimal("600"),
+            20,
+            40,
+            80,
+            Decimal("30"),
+            Decimal("150"),
+            Decimal("-90"),
+            Decimal("-120"),
+            Decimal("200"),
+            12,
+            7,
+            1,
+        )
+        result = MagicMock()
+        result.all.return_value = [row]
+        mock_session.execute.side_effect = [result, MagicMock()]
+
+        with patch.object(
+            pnl_service, "_calculate_monthly_commission", new_callable=AsyncMock
+        ) as mock_commission:
+            await pnl_service._bulk_rollup_monthly_pnl(2025, 5)
+
+        upsert_rows = mock_session.execute.call_args[0][1]
+        assert upsert_rows[0]["avg_daily_pnl"] == Decimal("30")
+        assert upsert_rows[0]["year"] == 2025
+        assert upsert_rows[0]["month"] == 5
+        mock_commission.assert_awaited_once_with(mock_session, "f1", 2025, 5, Decimal("600"))
+
+    @pytest.mark.asyncio
+    async def test_per_follower_mode_when_disabled(self, mock_session):
+        """Test that disabling bulk rollups keeps the per-follower path."""
+        service = PnLService(bulk_rollups=False)
+        service.active_followers.update({"f1", "f2"})
+
+        with patch.object(service, "_rollup_daily_pnl", new_callable=AsyncMock) as mock_rollup:
+            await service._perform_daily_rollup()
+
+        assert mock_rollup.await_count == 2
+        mock_session.execute.assert_not_called()
+
+
+def _intraday(follower_id: str, hour: int, realized: str, unrealized: str) -> PnLIntraday:
+    return PnLIntraday(
+        follower_id=follower_id,
+        snapshot_time=datetime(2025, 1, 10, hour),
+        trading_date=date(2025, 1, 10),
+        realized_pnl=Decimal(realized),
+        unrealized_pnl=Decimal(unrealized),
+        total_pnl=Decimal(realized) + Decimal(unrealized),
+        position_count=hour % 3,
+        total_market_value=Decimal(1000 * hour),
+    )
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="PNL_TEST_DATABASE_URL not set")
+class TestRollupPathsAgainstPostgres:
+    """Test cases comparing the bulk and per-follower rollups on a real database."""
+
+    @staticmethod
+    @asynccontextmanager
+    async def _test_database():
+        """Create the P&L tables and route the service's sessions to the test database."""
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        engine = create_async_engine(TEST_DATABASE_URL)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                text(build_create_partition_sql(PNL_INTRADAY_PARTITIONS, date(2025, 1, 1)))
+            )
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        @asynccontextmanager
+        async def get_session():
+            async with factory() as session:
+                yield session
+
+        try:
+            with patch("spreadpilot_core.pnl.service.get_postgres_session", get_session):
+                yield factory
+        finally:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+            await engine.dispose()
+
+    @staticmethod
+    async def _rollup_rows(factory, model) -> list[dict]:
+        """Read rollup rows without the columns that differ between runs."""
+        skipped = {"id", "created_at", "updated_at", "rollup_time"}
+        async with factory() as session:
+            rows = (await session.execute(select(model))).scalars().all()
+        return sorted(
+            (
+                {
+                    column.name: getattr(row, column.name)
+                    for column in model.__table__.columns
+                    if column.name not in skipped
+                }
+                for row in rows
+            ),
+            key=lambda row: row["follower_id"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_bulk_and_per_follower_rollups_match(self):
+        """Test that both paths write the same rollups and re-running them upserts."""
+        trading_date = date(2025, 1, 10)
+        async with self._test_database() as session_factory:
+            async with session_factory() as session:
+                session.add_all(
+                    [
+                        _intraday("f1", 10, "0", "-40"),
+                        _intraday("f1", 11, "25", "30"),
+                        _intraday("f2", 10, "-10", "5"),
+                        Trade(
+                            follower_id="f1",
+                            symbol="QQQ",
+                            contract_type="CALL",
+                            strike=Decimal("450"),
+                            expiration=date(2025, 1, 17),
+                            trade_type="SELL",
+                            quantity=3,
+                            price=Decimal("2.10"),
+                            commission=Decimal("1.95"),
+                            trade_time=datetime(2025, 1, 10, 10, 30),
+                        ),
+                    ]
+                )
+                await session.commit()
+
+            per_follower = PnLService(bulk_rollups=False)
+            bulk = PnLService(bulk_rollups=True)
+            for service in (per_follower, bulk):
+                service.active_followers.update({"f1", "f2"})
+                service._calculate_monthly_commission = AsyncMock()
+
+            for follower_id in ("f1", "f2"):
+                await per_follower._rollup_daily_pnl(follower_id, trading_date)
+
+            # A later snapshot is picked up when the day is rolled up again
+            async with session_factory() as session:
+                session.add(_intraday("f1", 12, "25", "60"))
+                await session.commit()
+            for follower_id in ("f1", "f2"):
+                await per_follower._rollup_daily_pnl(follower_id, trading_date)
+            daily = await self._rollup_rows(session_factory, PnLDaily)
+
+            assert len(daily) == 2
+            assert daily[0]["total_pnl"] == Decimal("85")
+            assert daily[0]["trades_count"] == 1
+
+            await bulk._bulk_rollup_daily_pnl(trading_date)
+            assert await self._rollup_rows(session_factory, PnLDaily) == daily
+
+            for follower_id in ("f1", "f2"):
+                await per_follower._rollup_monthly_pnl(follower_id, 2025, 1)
+                await per_follower._rollup_monthly_pnl(follower_id, 2025, 1)
+            monthly = await self._rollup_rows(session_factory, PnLMonthly)
+
+            assert [row["trading_days"] for row in monthly] == [1, 1]
+
+            await bulk._bulk_rollup_monthly_pnl(2025, 1)
+            assert await self._rollup_rows(session_factory, PnLMonthly) == monthly
@@ -10,9 +10,7 @@ import pytest
 import pytz
 from spreadpilot_core.models.pnl import (
     CommissionMonthly,
-    PnLDaily,
     PnLIntraday,
-    PnLMonthly,
     Quote,
     Trade,
 )
@@ -105,6 +103,8 @@ class TestPnLService:
         """Test recording trade fills."""
         with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = mock_db_session
+            # Execution not recorded yet
+            mock_db_session.execute.return_value = MagicMock(scalar=MagicMock(return_value=None))
 
             # Record a random trade
             trade_data = random_trades[0]
@@ -119,10 +119,26 @@ class TestPnLService:
             assert added_trade.quantity == trade_data["quantity"]
             assert mock_db_session.commit.called
 
+    @pytest.mark.asyncio
+    async def test_redelivered_fill_is_skipped(self, pnl_service, mock_db_session, random_trades):
+        """Test that a fill whose execution is already recorded is not booked again."""
+        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+            mock_get_session.return_value.__aenter__.return_value = mock_db_session
+            mock_db_session.execute.return_value = MagicMock(scalar=MagicMock(return_value=1))
+
+            recorded = await pnl_service.record_trade_fill("test-follower-1", random_trades[0])
+
+        assert recorded is True
+        mock_db_session.add.assert_not_called()
+        mock_db_session.commit.assert_not_called()
+        assert not pnl_service.mtm_engine.is_tracked("test-follower-1")
+
     @pytest.mark.asyncio
     async def test_update_quote(self, pnl_service, mock_db_session):
         """Test updating market quotes."""
-        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+        with patch(
+            "spreadpilot_core.pnl.quote_buffer.get_postgres_session"
+        ) as mock_get_session:
             mock_get_session.return_value.__aenter__.return_value = mock_db_session
 
             quote_data = {
@@ -139,16 +155,20 @@ class TestPnLService:
 
             await pnl_service.update_quote(quote_data)
 
-            # Verify quote was added and cached
-            assert mock_db_session.add.called
-            added_quote = mock_db_session.add.call_args[0][0]
-            assert isinstance(added_quote, Quote)
-            assert added_quote.symbol == "QQQ"
-            assert added_quote.last == Decimal("2.48")
-
-            # Verify quote was cached
+            # Verify quote was cached immediately and buffered, not written per tick
             cache_key = pnl_service._get_quote_cache_key(quote_data)
-            assert cache_key in pnl_service.quote_cache
+            cached_quote = pnl_service.quote_cache[cache_key]
+            assert isinstance(cached_quote, Quote)
+            assert cached_quote.symbol == "QQQ"
+            assert cached_quote.last == Decimal("2.48")
+            assert pnl_service.quote_buffer.depth == 1
+            assert not mock_db_session.execute.called
+
+            # Verify the buffered row is persisted with a bulk insert on flush
+            assert await pnl_service.quote_buffer.flush() == 1
+            rows = mock_db_session.execute.call_args[0][1]
+            assert rows[0]["last"] == Decimal("2.48")
+            assert mock_db_session.commit.called
 
     @pytest.mark.asyncio
     async def test_calculate_mtm_with_positions(
@@ -222,19 +242,20 @@ class TestPnLService:
             mock_result2 = MagicMock()
             mock_result2.scalars.return_value.all.return_value = trades
 
-            mock_db_session.execute.side_effect = [mock_result1, mock_result2]
+            mock_db_session.execute.side_effect = [mock_result1, mock_result2, MagicMock()]
 
             # Add follower and perform rollup
             await pnl_service.add_follower("test-follower-1")
             await pnl_service._rollup_daily_pnl("test-follower-1", date.today())
 
-            # Verify daily P&L was created
-            assert mock_db_session.add.called
-            added_daily = mock_db_session.add.call_args[0][0]
-            assert isinstance(added_daily, PnLDaily)
-            assert added_daily.follower_id == "test-follower-1"
-            assert added_daily.trades_count == len(trades)
-            assert added_daily.is_finalized
+            # Verify daily P&L was upserted
+            statement, [added_daily] = mock_db_session.execute.call_args[0]
+            assert statement.table.name == "pnl_daily"
+            assert added_daily["follower_id"] == "test-follower-1"
+            assert added_daily["trades_count"] == len(trades)
+            assert added_daily["is_finalized"]
+            mock_db_session.add.assert_not_called()
+            mock_db_session.commit.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_monthly_rollup_with_commission(
@@ -268,7 +289,7 @@ class TestPnLService:
             mock_result.scalars.return_value.all.return_value = daily_summaries
             mock_result.scalar.return_value = None  # No existing commission
 
-            mock_db_session.execute.side_effect = [mock_result, MagicMock()]
+            mock_db_session.execute.side_effect = [mock_result, MagicMock(), mock_result]
 
             # Mock follower data retrieval
             with patch.object(pnl_service, "_get_follower_data", return_value=mock_follower_data):
@@ -276,17 +297,15 @@ class TestPnLService:
                 await pnl_service.add_follower("test-follower-1")
                 await pnl_service._rollup_monthly_pnl("test-follower-1", 2025, 6)
 
-            # Verify monthly P&L and commission were created
-            assert mock_db_session.add.call_count == 2  # Monthly P&L + Commission
-
-            # Check monthly P&L
-            monthly_pnl = mock_db_session.add.call_args_list[0][0][0]
-            assert isinstance(monthly_pnl, PnLMonthly)
-            assert monthly_pnl.follower_id == "test-follower-1"
-            assert monthly_pnl.trading_days == len(daily_summaries)
+            # Verify monthly P&L was upserted and commission created
+            statement, [monthly_pnl] = mock_db_session.execute.call_args_list[1][0]
+            assert statement.table.name == "pnl_monthly"
+            assert monthly_pnl["follower_id"] == "test-follower-1"
+            assert monthly_pnl["trading_days"] == len(daily_summaries)
 
             # Check commission calculation
-            commission = mock_db_session.add.call_args_list[1][0][0]
+            assert mock_db_session.add.call_count == 1
+            commission = mock_db_session.add.call_args[0][0]
             assert isinstance(commission, CommissionMonthly)
             assert commission.follower_id == "test-follower-1"
 
@@ -0,0 +1,139 @@
+"""Unit tests for the write-behind quote buffer."""
+
+import asyncio
+import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from spreadpilot_core.pnl.quote_buffer import QuoteBuffer
+from sqlalchemy.exc import IntegrityError
+
+
+def _row(i: int) -> dict:
+    return {
+        "symbol": "QQQ",
+        "contract_type": "CALL",
+        "strike": Decimal("450"),
+        "expiration": datetime.date(2025, 1, 17),
+        "bid": Decimal("2.45"),
+        "ask": Decimal("2.55"),
+        "last": Decimal(str(2.5 + i / 100)),
+        "volume": i,
+        "quote_time": datetime.datetime(2025, 1, 10, 15, 30, i % 60),
+    }
+
+
+@pytest.fixture
+def mock_session():
+    """Patch the postgres session used by the buffer."""
+    session = AsyncMock()
+    with patch("spreadpilot_core.pnl.quote_buffer.get_postgres_session") as mock_get_session:
+        mock_get_session.return_value.__aenter__.return_value = session
+        yield session
+
+
+class TestQuoteBuffer:
+    """Test cases for QuoteBuffer."""
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_single_bulk_insert(self, mock_session):
+        """Test that buffered rows are written in one execute and one commit."""
+        buffer = QuoteBuffer(max_batch_size=100)
+        for i in range(25):
+            buffer.add(_row(i))
+
+        assert buffer.depth == 25
+        assert await buffer.flush() == 25
+
+        mock_session.execute.assert_awaited_once()
+        mock_session.commit.assert_awaited_once()
+        assert len(mock_session.execute.call_args[0][1]) == 25
+
+        metrics = buffer.get_metrics()
+        assert metrics["depth"] == 0
+        assert metrics["flushed_rows"] == 25
+        assert metrics["flush_count"] == 1
+        assert metrics["dropped_rows"] == 0
+
+    @pytest.mark.asyncio
+    async def test_size_trigger_flushes_in_background(self, mock_session):
+        """Test that reaching the batch size flushes before the interval elapses."""
+        buffer = QuoteBuffer(max_batch_size=10, flush_interval=60)
+        buffer.start()
+        try:
+            for i in range(10):
+                buffer.add(_row(i))
+            await asyncio.sleep(0.05)
+        finally:
+            await buffer.stop()
+
+        assert buffer.flushed_rows == 10
+        mock_session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_time_trigger_flushes_partial_batch(self, mock_session):
+        """Test that a partial batch is flushed once the interval elapses."""
+        buffer = QuoteBuffer(max_batch_size=100, flush_interval=0.05)
+        buffer.start()
+        try:
+            buffer.add(_row(1))
+            await asyncio.sleep(0.15)
+            assert buffer.flushed_rows == 1
+        finally:
+            await buffer.stop()
+
+    @pytest.mark.asyncio
+    async def test_overflow_drops_oldest_rows(self, mock_session):
+        """Test that the buffer stays bounded and counts dropped rows."""
+        buffer = QuoteBuffer(max_batch_size=100, max_pending=5)
+        for i in range(8):
+            buffer.add(_row(i))
+
+        assert buffer.depth == 5
+        assert buffer.dropped_rows == 3
+
+        await buffer.flush()
+        volumes = [row["volume"] for row in mock_session.execute.call_args[0][1]]
+        assert volumes == [3, 4, 5, 6, 7]
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_requeues_rows(self, mock_session):
+        """Test that rows from a failed flush are retried on the next flush."""
+        mock_session.execute.side_effect = [Exception("db down"), None]
+        buffer = QuoteBuffer(max_batch_size=100)
+        buffer.add(_row(1))
+        buffer.add(_row(2))
+
+        assert await buffer.flush() == 0
+        assert buffer.depth == 2
+        assert buffer.failed_flushes == 1
+
+        assert await buffer.flush() == 2
+        assert buffer.depth == 0
+        assert buffer.dropped_rows == 0
+
+    @pytest.mark.asyncio
+    async def test_permanently_failing_row_is_dropped(self, mock_session):
+        """Test that a row the database always rejects does not block the rows around it."""
+        written = []
+
+        async def execute(statement, rows):
+            if any(row["volume"] == 3 for row in rows):
+                raise IntegrityError("INSERT", {}, Exception("no partition for row"))
+            written.extend(row["volume"] for row in rows)
+
+        mock_session.execute.side_effect = execute
+        buffer = QuoteBuffer(max_batch_size=100)
+        for i in range(8):
+            buffer.add(_row(i))
+
+        assert await buffer.flush() == 7
+        assert sorted(written) == [0, 1, 2, 4, 5, 6, 7]
+        assert buffer.depth == 0
+        assert buffer.rejected_rows == 1
+
+        # Later flushes are not held up by the rejected row
+        buffer.add(_row(8))
+        assert await buffer.flush() == 1
+        assert buffer.get_metrics()["rejected_rows"] == 1
@@ -16,7 +16,7 @@ import uuid
 from collections.abc import AsyncGenerator, Generator
 from pathlib import Path
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import httpx
 import motor.motor_asyncio  # Added for MongoDB
@@ -108,6 +108,7 @@ class MockIBKRClient:
             "UnrealizedPnL": 500.0,
             "RealizedPnL": 500.0,
         }
+        self.position_store = MagicMock()
 
     async def connect(self) -> bool:
         """Mock connect method."""
@@ -154,11 +155,15 @@ class MockIBKRClient:
         """Mock update_positions method."""
         return True
 
-    async def get_positions(self, force_update: bool = False) -> dict[str, int]:
+    async def get_positions(
+        self, force_update: bool = False, account: str | None = None
+    ) -> dict[str, int]:
         """Mock get_positions method."""
         return self.positions
 
-    async def check_assignment(self) -> tuple[AssignmentState, int, int]:
+    async def check_assignment(
+        self, account: str | None = None
+    ) -> tuple[AssignmentState, int, int]:
         """Mock check_assignment method."""
         return AssignmentState.NONE, 0, 0
 
@@ -194,7 +199,7 @@ class MockIBKRClient:
         # Basic mock logic, can be enhanced if needed
         return True, None
 
-    async def get_pnl(self) -> dict[str, float]:
+    async def get_pnl(self, account: str | None = None) -> dict[str, float]:
         """Mock get_pnl method."""
         return self.pnl
 
@@ -0,0 +1,129 @@
+import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytz
+from fakeredis import aioredis as fakeredis
+from spreadpilot_core.ibkr.bar_store import BarStore
+
+NY = pytz.timezone("America/New_York")
+
+
+def make_bars(closes, start=datetime.date(2025, 1, 2)):
+    return [
+        SimpleNamespace(
+            date=start + datetime.timedelta(days=i),
+            open=close,
+            high=close,
+            low=close,
+            close=close,
+            volume=1000,
+        )
+        for i, close in enumerate(closes)
+    ]
+
+
+def at(year, month, day, hour=9):
+    return patch(
+        "spreadpilot_core.ibkr.bar_store.get_ny_time",
+        return_value=NY.localize(datetime.datetime(year, month, day, hour)),
+    )
+
+
+@pytest.fixture
+async def fake_redis():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def mock_ib():
+    ib = MagicMock()
+    ib.reqHistoricalDataAsync = AsyncMock(return_value=make_bars([500.0, 501.0, 502.0]))
+    return ib
+
+
+@pytest.fixture
+def qqq():
+    return SimpleNamespace(symbol="QQQ")
+
+
+@pytest.mark.asyncio
+async def test_bars_are_requested_once_a_day(mock_ib, qqq):
+    """Test that later calls on the same day are served from memory."""
+    store = BarStore()
+
+    with at(2025, 1, 5):
+        first = await store.get_daily_bars(mock_ib, qqq, 60)
+        second = await store.get_daily_bars(mock_ib, qqq, 60)
+
+    assert [bar.close for bar in first] == [500.0, 501.0, 502.0]
+    assert second == first
+    mock_ib.reqHistoricalDataAsync.assert_awaited_once()
+    assert mock_ib.reqHistoricalDataAsync.await_args.kwargs["durationStr"] == "60 D"
+
+
+@pytest.mark.asyncio
+async def test_todays_unfinished_bar_is_not_stored(mock_ib, qqq):
+    """Test that only completed sessions are kept."""
+    with at(2025, 1, 4, hour=12):
+        bars = await BarStore().get_daily_bars(mock_ib, qqq, 60)
+
+    assert [bar.date for bar in bars] == ["20250102", "20250103"]
+
+
+@pytest.mark.asyncio
+async def test_restart_reuses_bars_from_redis(mock_ib, qqq, fake_redis):
+    """Test that a new process picks up today's bars without asking IB."""
+    with at(2025, 1, 5):
+        await BarStore(fake_redis).get_daily_bars(mock_ib, qqq, 60)
+        mock_ib.reset_mock()
+
+        bars = await BarStore(fake_redis).get_daily_bars(mock_ib, qqq, 60)
+
+    assert [bar.close for bar in bars] == [500.0, 501.0, 502.0]
+    mock_ib.reqHistoricalDataAsync.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_next_day_requests_only_new_bars(mock_ib, qqq, fake_redis):
+    """Test that a later day only asks for the days since the last stored bar."""
+    with at(2025, 1, 5):
+        await BarStore(fake_redis).get_daily_bars(mock_ib, qqq, 60)
+
+    mock_ib.reqHistoricalDataAsync.return_value = make_bars(
+        [502.0, 503.0], start=datetime.date(2025, 1, 4)
+    )
+    with at(2025, 1, 7):
+        bars = await BarStore(fake_redis).get_daily_bars(mock_ib, qqq, 60)
+
+    assert mock_ib.reqHistoricalDataAsync.await_args.kwargs["durationStr"] == "4 D"
+    assert [bar.date for bar in bars] == ["20250102", "20250103", "20250104", "20250105"]
+
+
+@pytest.mark.asyncio
+async def test_longer_lookback_requests_full_history(mock_ib, qqq):
+    """Test that a caller needing more history than was synced gets a full request."""
+    store = BarStore()
+
+    with at(2025, 1, 5):
+        await store.get_daily_bars(mock_ib, qqq, 30)
+        await store.get_daily_bars(mock_ib, qqq, 60)
+        await store.get_daily_bars(mock_ib, qqq, 30)
+
+    durations = [
+        call.kwargs["durationStr"] for call in mock_ib.reqHistoricalDataAsync.await_args_list
+    ]
+    assert durations == ["30 D", "60 D"]
+
+
+@pytest.mark.asyncio
+async def test_oldest_bars_are_trimmed(mock_ib, qqq, fake_redis):
+    """Test that only the most recent max_bars bars are kept."""
+    with at(2025, 1, 5):
+        bars = await BarStore(fake_redis, max_bars=2).get_daily_bars(mock_ib, qqq, 60)
+
+    assert [bar.date for bar in bars] == ["20250103", "20250104"]
+    assert sorted(await fake_redis.hkeys("ibkr:bars:1d:QQQ")) == ["20250103", "20250104"]
@@ -318,3 +318,55 @@ async def test_request_stock_positions_no_matching(
     assert positions == expected_positions
     mock_ib_insync.reqPositionsAsync.assert_called_once()
     ibkr_client.ensure_connected.assert_called_once()
+
+
+# --- Test close_all_positions ---
+
+
+@pytest.mark.asyncio
+async def test_close_all_positions_places_every_leg_before_waiting(
+    ibkr_client: IBKRClient, mock_ib_insync: MagicMock
+):
+    """Test that all closing orders are sent before any fill is awaited."""
+    ibkr_client.position_store.get_option_positions = MagicMock(
+        return_value={"380.0-P": 2, "385.0-P": -2, "390.0-C": 0}
+    )
+    ibkr_client._get_qqq_option_contract = MagicMock()
+    placed_when_waiting = []
+
+    async def wait_for_status(trade, timeout):
+        placed_when_waiting.append(mock_ib_insync.placeOrder.call_count)
+
+    ibkr_client.orders.wait_for_status = AsyncMock(side_effect=wait_for_status)
+    on_leg_done = AsyncMock()
+
+    result = await ibkr_client.close_all_positions(timeout=5.0, on_leg_done=on_leg_done)
+
+    assert result["status"] == "SUCCESS"
+    assert [leg["action"] for leg in result["results"]] == ["SELL", "BUY"]
+    assert placed_when_waiting == [2, 2]
+    assert on_leg_done.await_count == 2
+    for call in ibkr_client.orders.wait_for_status.call_args_list:
+        assert call.kwargs["timeout"] == 5.0
+
+
+# --- Test check_margin_for_trade ---
+
+
+@pytest.mark.asyncio
+async def test_check_margin_for_trade_uses_spread_width(ibkr_client: IBKRClient):
+    """Test that the requirement is the spread width with a 20% buffer, without quotes."""
+    ibkr_client.get_account_summary = AsyncMock(return_value={"AvailableFunds": "1500"})
+    ibkr_client.get_market_snapshots = AsyncMock()
+
+    # 5-point bull put on 2 contracts: 5 * 100 * 2 * 1.2 = 1200
+    has_margin, error = await ibkr_client.check_margin_for_trade("Long", 2, 380.0, 385.0, "DU123")
+    assert (has_margin, error) == (True, None)
+
+    # Same width on 3 contracts needs 1800
+    has_margin, error = await ibkr_client.check_margin_for_trade("Short", 3, 390.0, 385.0)
+    assert has_margin is False
+    assert error
+
+    ibkr_client.get_account_summary.assert_any_await("DU123")
+    ibkr_client.get_market_snapshots.assert_not_called()
@@ -0,0 +1,97 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from eventkit import Event
+from spreadpilot_core.ibkr.connections import ConnectionRegistry
+
+
+class FakeClient:
+    """IBKRClient stand-in whose connect succeeds for the given client IDs."""
+
+    def __init__(self, host, port, client_id, accepted_ids=(1,), **kwargs):
+        self.host = host
+        self.port = port
+        self.client_id = client_id
+        self.kwargs = kwargs
+        self.accepted_ids = accepted_ids
+        self.connect_calls = 0
+        self.ib = MagicMock()
+        self.ib.connectedEvent = Event("connectedEvent")
+        self.ib.disconnectedEvent = Event("disconnectedEvent")
+
+    async def connect(self):
+        self.connect_calls += 1
+        await asyncio.sleep(0.01)
+        return self.client_id in self.accepted_ids
+
+    async def disconnect(self):
+        self.ib.disconnectedEvent.emit()
+
+
+@pytest.fixture
+def registry():
+    return ConnectionRegistry(client_id_start=1, client_id_end=3, client_factory=FakeClient)
+
+
+@pytest.mark.asyncio
+async def test_callers_share_one_session_per_gateway(registry: ConnectionRegistry):
+    """Test that concurrent callers share one client and one connect attempt."""
+    clients = await asyncio.gather(
+        *(registry.connect("gateway", 4002, username="user") for _ in range(5))
+    )
+    other = await registry.connect("other-gateway", 4002)
+
+    assert all(client is clients[0] for client in clients)
+    assert clients[0].connect_calls == 1
+    assert clients[0].client_id == 1
+    assert other is not clients[0]
+    assert registry.is_healthy("gateway", 4002)
+
+
+@pytest.mark.asyncio
+async def test_disconnect_event_marks_session_down_and_next_call_reconnects(
+    registry: ConnectionRegistry,
+):
+    """Test that health follows IB's connection events rather than probes."""
+    client = await registry.connect("gateway", 4002)
+
+    client.ib.disconnectedEvent.emit()
+    assert not registry.is_healthy("gateway", 4002)
+    assert registry.list_sessions()["gateway:4002"]["disconnects"] == 1
+
+    assert await registry.connect("gateway", 4002) is client
+    assert client.connect_calls == 2
+    assert registry.is_connected()
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_moves_to_next_client_id():
+    """Test that a client ID held by a stale session is skipped, wrapping the range."""
+    registry = ConnectionRegistry(
+        client_id_start=1,
+        client_id_end=3,
+        client_factory=lambda **kwargs: FakeClient(accepted_ids=(3,), **kwargs),
+    )
+
+    assert await registry.connect("gateway", 4002) is None
+    assert await registry.connect("gateway", 4002) is None
+    client = await registry.connect("gateway", 4002)
+
+    assert client is not None
+    assert client.client_id == 3
+    assert registry._next_client_id(3) == 1
+
+
+@pytest.mark.asyncio
+async def test_close_all_disconnects_without_counting_drops(registry: ConnectionRegistry):
+    """Test that closing sessions is not reported as a dropped connection."""
+    client = await registry.connect("gateway", 4002)
+    session = registry._sessions[("gateway", 4002)]
+
+    await registry.close_all()
+
+    assert session.disconnects == 0
+    assert registry.list_sessions() == {}
+    assert not registry.is_connected()
+    assert client.connect_calls == 1
@@ -0,0 +1,155 @@
+import datetime
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytz
+from fakeredis import aioredis as fakeredis
+from spreadpilot_core.ibkr.contract_cache import ContractCache
+
+
+def make_contract(symbol="QQQ", expiry="", strike=0.0, right="", sec_type="STK"):
+    return SimpleNamespace(
+        symbol=symbol,
+        secType=sec_type,
+        lastTradeDateOrContractMonth=expiry,
+        strike=strike,
+        right=right,
+        exchange="SMART",
+        currency="USD",
+        conId=0,
+    )
+
+
+def make_option(symbol, lastTradeDateOrContractMonth, strike, right, **kwargs):
+    return make_contract(symbol, lastTradeDateOrContractMonth, strike, right, sec_type="OPT")
+
+
+def qualify(*contracts):
+    """Qualify contracts with made-up conIds derived from strike and right."""
+    for contract in contracts:
+        if contract.secType == "STK":
+            contract.conId = 320227571
+        else:
+            contract.conId = int(contract.strike * 10) + (1 if contract.right == "P" else 0)
+    return list(contracts)
+
+
+@pytest.fixture
+async def fake_redis():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def mock_ib():
+    ib = MagicMock()
+    ib.qualifyContractsAsync = AsyncMock(side_effect=qualify)
+    ib.reqSecDefOptParamsAsync = AsyncMock(
+        return_value=[
+            SimpleNamespace(
+                exchange="SMART",
+                tradingClass="QQQ",
+                expirations={"20250110", "20250117"},
+                strikes={440.0, 445.0, 450.0, 455.0, 460.0},
+            )
+        ]
+    )
+    return ib
+
+
+@pytest.fixture
+def trading_day():
+    now = pytz.timezone("America/New_York").localize(datetime.datetime(2025, 1, 10, 9, 0))
+    with patch("spreadpilot_core.ibkr.contract_cache.get_ny_time", return_value=now):
+        yield now
+
+
+@pytest.mark.asyncio
+async def test_qualify_batches_misses_and_serves_hits_from_memory(trading_day, mock_ib):
+    """Test that only unknown contracts are sent to IB, all in one request."""
+    cache = ContractCache()
+    await cache.qualify(mock_ib, make_option("QQQ", "20250110", 450.0, "P"))
+
+    contracts = [make_option("QQQ", "20250110", strike, "P") for strike in (445.0, 450.0)]
+    qualified = await cache.qualify(mock_ib, *contracts)
+
+    assert qualified == contracts
+    assert mock_ib.qualifyContractsAsync.await_count == 2
+    assert mock_ib.qualifyContractsAsync.await_args[0] == (contracts[0],)
+    assert cache.apply(make_option("QQQ", "20250110", 445.0, "P"))
+
+
+@pytest.mark.asyncio
+async def test_entries_persist_in_redis_until_midnight(trading_day, mock_ib, fake_redis):
+    """Test that a new process reuses today's conIds and chains from Redis."""
+    await ContractCache(fake_redis).get_chains(mock_ib, make_contract())
+
+    assert await fake_redis.hget("ibkr:contracts:20250110", "QQQ||0.0|") == "320227571"
+    # Expires at the next New York midnight, 15 hours away
+    assert 15 * 3600 - 5 <= await fake_redis.ttl("ibkr:contracts:20250110") <= 15 * 3600
+
+    cache = ContractCache(fake_redis)
+    assert await cache.load() == 1
+    mock_ib.reset_mock()
+
+    underlying = make_contract()
+    assert cache.apply(underlying)
+    assert underlying.conId == 320227571
+    assert (await cache.get_chains(mock_ib, make_contract()))[0]["strikes"][0] == 440.0
+    mock_ib.qualifyContractsAsync.assert_not_awaited()
+    mock_ib.reqSecDefOptParamsAsync.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_with_the_trading_day(mock_ib):
+    """Test that conIds cached on one day are not served the next."""
+    cache = ContractCache()
+    ny = pytz.timezone("America/New_York")
+    with patch(
+        "spreadpilot_core.ibkr.contract_cache.get_ny_time",
+        return_value=ny.localize(datetime.datetime(2025, 1, 9, 15, 0)),
+    ):
+        await cache.qualify(mock_ib, make_contract())
+
+    with patch(
+        "spreadpilot_core.ibkr.contract_cache.get_ny_time",
+        return_value=ny.localize(datetime.datetime(2025, 1, 10, 9, 0)),
+    ):
+        assert cache.get_con_id(make_contract()) is None
+
+
+@pytest.mark.asyncio
+async def test_warm_qualifies_strikes_in_range(trading_day, mock_ib):
+    """Test that warming qualifies both rights of listed strikes within the range."""
+    cache = ContractCache()
+
+    with patch("spreadpilot_core.ibkr.contract_cache.Option", side_effect=make_option):
+        count = await cache.warm(
+            mock_ib,
+            make_contract(),
+            ["20250110", "20250111"],
+            strike_range=(444.0, 451.0),
+        )
+
+    assert count == 4
+    assert cache.get_con_id(make_option("QQQ", "20250110", 445.0, "C")) == 4450
+    assert cache.get_con_id(make_option("QQQ", "20250110", 440.0, "C")) is None
+
+
+def test_importing_ibkr_does_not_load_report_dependencies():
+    """Test that the IBKR package only needs the Redis helper from utils."""
+    code = (
+        "import sys, spreadpilot_core.ibkr, spreadpilot_core.utils as utils; "
+        "print(sorted(m for m in ('aiosmtplib', 'openpyxl', 'reportlab', "
+        "'spreadpilot_core.utils.email') if m in sys.modules)); "
+        "print(callable(utils.get_ny_time))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.splitlines()[-2:] == ["[]", "True"]
@@ -0,0 +1,214 @@
+import asyncio
+import math
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from spreadpilot_core.ibkr.market_data import MarketDataHub, MarketSnapshot
+
+
+def make_contract(strike: float, con_id: int = 0):
+    return SimpleNamespace(
+        conId=con_id,
+        symbol="QQQ",
+        secType="OPT",
+        lastTradeDateOrContractMonth="20250117",
+        strike=strike,
+        right="C",
+        exchange="SMART",
+        currency="USD",
+    )
+
+
+def make_ticker(midpoint: float = math.nan):
+    ticker = MagicMock()
+    ticker.midpoint.return_value = midpoint
+    ticker.bid = ticker.ask = ticker.last = math.nan
+    ticker.modelGreeks = None
+    return ticker
+
+
+@pytest.fixture
+def mock_ib():
+    """Fixture for an IB connection returning a new ticker per subscription."""
+    ib = MagicMock()
+    ib.isConnected.return_value = True
+    ib.reqMktData.side_effect = lambda *args: make_ticker()
+    return ib
+
+
+@pytest.fixture
+def hub(mock_ib):
+    return MarketDataHub(mock_ib, max_lines=2, price_ttl=5.0, idle_ttl=60.0)
+
+
+def test_acquire_shares_one_subscription(hub: MarketDataHub, mock_ib: MagicMock):
+    """Test that several users of a contract share one market data line."""
+    first = hub.acquire(make_contract(450.0))
+    second = hub.acquire(make_contract(450.0))
+
+    assert first is second
+    assert hub.lines_in_use == 1
+    mock_ib.reqMktData.assert_called_once()
+
+    hub.release(make_contract(450.0))
+    hub.release(make_contract(450.0))
+    # Released subscriptions linger for reuse
+    mock_ib.cancelMktData.assert_not_called()
+    assert hub.acquire(make_contract(450.0)) is first
+
+
+def test_line_limit_evicts_idle_then_refuses(hub: MarketDataHub, mock_ib: MagicMock):
+    """Test that idle subscriptions free lines and held ones do not."""
+    hub.acquire(make_contract(450.0))
+    hub.acquire(make_contract(451.0))
+    hub.release(make_contract(450.0))
+
+    assert hub.acquire(make_contract(452.0)) is not None
+    mock_ib.cancelMktData.assert_called_once()
+    assert mock_ib.cancelMktData.call_args[0][0].strike == 450.0
+
+    assert hub.acquire(make_contract(453.0)) is None
+    assert hub.lines_in_use == 2
+
+
+def test_idle_subscriptions_expire(hub: MarketDataHub, mock_ib: MagicMock):
+    """Test that subscriptions unused for idle_ttl are cancelled on the next acquire."""
+    with patch("spreadpilot_core.ibkr.market_data.time.monotonic", return_value=100.0):
+        hub.acquire(make_contract(450.0))
+        hub.release(make_contract(450.0))
+
+    with patch("spreadpilot_core.ibkr.market_data.time.monotonic", return_value=161.0):
+        hub.acquire(make_contract(451.0))
+
+    mock_ib.cancelMktData.assert_called_once()
+    assert hub.lines_in_use == 1
+
+
+def test_stale_price_is_not_served(hub: MarketDataHub):
+    """Test that prices older than price_ttl are treated as missing."""
+    contract = make_contract(450.0)
+    with patch("spreadpilot_core.ibkr.market_data.time.monotonic", return_value=100.0):
+        ticker = hub.acquire(contract)
+        ticker.midpoint.return_value = 2.5
+        hub._on_pending_tickers({ticker})
+        assert hub.get_price(contract) == 2.5
+
+    with patch("spreadpilot_core.ibkr.market_data.time.monotonic", return_value=106.0):
+        assert hub.get_price(contract) is None
+        assert hub.get_price(contract, max_age=10.0) == 2.5
+
+
+@pytest.mark.asyncio
+async def test_reused_ticker_waits_for_new_tick(hub: MarketDataHub, mock_ib: MagicMock):
+    """Test that a ticker returned with an old quote is not served until it ticks."""
+    contract = make_contract(450.0)
+    mock_ib.reqMktData.side_effect = lambda *args: make_ticker(midpoint=9.99)
+
+    assert hub.acquire(contract) is not None
+    assert hub.get_price(contract) is None
+    assert await hub.get_market_price(contract, timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_get_market_price_waits_for_first_tick(hub: MarketDataHub, mock_ib: MagicMock):
+    """Test that a lookup returns as soon as the first valid tick arrives."""
+    contract = make_contract(450.0)
+    lookup = asyncio.create_task(hub.get_market_price(contract, timeout=1.0))
+    await asyncio.sleep(0)
+
+    ticker = next(iter(hub._subscriptions.values())).ticker
+    ticker.midpoint.return_value = 1.75
+    hub._on_pending_tickers({ticker})
+
+    assert await lookup == 1.75
+    # A repeated lookup reads the live ticker without a new request
+    assert await hub.get_market_price(contract) == 1.75
+    mock_ib.reqMktData.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_market_price_times_out_without_tick(hub: MarketDataHub):
+    """Test that a lookup without a valid tick returns None."""
+    assert await hub.get_market_price(make_contract(450.0), timeout=0.01) is None
+
+
+def test_snapshot_maps_quote_and_greeks():
+    """Test that a snapshot carries bid/ask/mid and model greeks, dropping unset values."""
+    ticker = make_ticker(2.05)
+    ticker.bid, ticker.ask, ticker.last = 2.0, 2.1, -1.0
+    ticker.modelGreeks = SimpleNamespace(
+        delta=-0.25, gamma=0.04, theta=-0.12, vega=0.3, impliedVol=0.22
+    )
+
+    snapshot = MarketSnapshot.from_ticker(ticker)
+
+    assert (snapshot.bid, snapshot.ask, snapshot.mid) == (2.0, 2.1, 2.05)
+    assert snapshot.last is None
+    assert snapshot.delta == -0.25
+    assert snapshot.implied_vol == 0.22
+
+
+@pytest.mark.asyncio
+async def test_get_snapshots_waits_for_legs_concurrently(hub: MarketDataHub):
+    """Test that one snapshot request waits for all legs at once, not one after another."""
+    contracts = [make_contract(450.0), make_contract(455.0)]
+    lookup = asyncio.create_task(hub.get_snapshots(contracts, timeout=0.5))
+    await asyncio.sleep(0)
+
+    # Both legs are subscribed before any tick arrives
+    tickers = [subscription.ticker for subscription in hub._subscriptions.values()]
+    assert len(tickers) == 2
+    for ticker, price in zip(tickers, (1.25, 0.75)):
+        ticker.midpoint.return_value = price
+    hub._on_pending_tickers(set(tickers))
+
+    snapshots = await asyncio.wait_for(lookup, timeout=0.1)
+    assert [snapshot.mid for snapshot in snapshots] == [1.25, 0.75]
+
+
+@pytest.mark.asyncio
+async def test_get_snapshots_returns_none_for_missing_legs(hub: MarketDataHub):
+    """Test that legs without a line or a tick come back as None."""
+    contracts = [make_contract(450.0), make_contract(455.0), make_contract(460.0)]
+
+    snapshots = await hub.get_snapshots(contracts, timeout=0.01)
+
+    assert snapshots == [None, None, None]
+    # Lines taken for the lookup are released again
+    assert all(s.refs == 0 for s in hub._subscriptions.values())
+
+
+@pytest.mark.asyncio
+async def test_disconnect_drops_subscriptions(hub: MarketDataHub, mock_ib: MagicMock):
+    """Test that a disconnect forgets subscriptions and wakes waiters."""
+    contract = make_contract(450.0, con_id=99)
+    hub.acquire(contract)
+    waiter = asyncio.create_task(hub.wait_for_price(contract, timeout=1.0))
+    await asyncio.sleep(0)
+
+    hub._on_disconnected()
+
+    assert await waiter is None
+    assert hub.lines_in_use == 0
+    hub.acquire(contract)
+    assert mock_ib.reqMktData.call_count == 2
+
+
+def test_listeners_receive_ticked_contracts(hub: MarketDataHub):
+    """Test that listeners get the contracts of valid ticks only."""
+    ticked = make_contract(450.0)
+    quiet = make_contract(455.0)
+    ticker = hub.acquire(ticked)
+    other = hub.acquire(quiet)
+    received = []
+    hub.add_listener(received.append)
+
+    ticker.midpoint.return_value = 1.25
+    hub._on_pending_tickers({ticker, other})
+
+    assert received == [[ticked]]
+
+    hub.remove_listener(received.append)
+    hub._on_pending_tickers({ticker})
+    assert len(received) == 1
@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from spreadpilot_core.ibkr.order_tracker import OrderTracker
+
+
+class FakeEvent:
+    """Minimal stand-in for an eventkit Event."""
+
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        self.handlers.remove(handler)
+        return self
+
+    def emit(self, *args):
+        for handler in list(self.handlers):
+            handler(*args)
+
+
+def make_trade(status: str = "Submitted", order_id: int = 1):
+    return SimpleNamespace(
+        order=SimpleNamespace(orderId=order_id),
+        orderStatus=SimpleNamespace(status=status, filled=0),
+        statusEvent=FakeEvent(),
+        fillEvent=FakeEvent(),
+    )
+
+
+def set_status(trade, status: str):
+    trade.orderStatus.status = status
+    trade.statusEvent.emit(trade)
+
+
+@pytest.mark.asyncio
+async def test_wait_resolves_on_status_event():
+    """Test that a waiter wakes on the status event, not on a poll interval."""
+    tracker = OrderTracker()
+    trade = make_trade()
+    waiter = asyncio.create_task(tracker.wait_for_status(trade, timeout=5))
+    await asyncio.sleep(0)
+    assert tracker.waiting == {1: 1}
+
+    set_status(trade, "Filled")
+
+    assert await asyncio.wait_for(waiter, timeout=0.05) == "Filled"
+    assert tracker.waiting == {}
+    assert trade.statusEvent.handlers == []
+    assert trade.fillEvent.handlers == []
+
+
+@pytest.mark.asyncio
+async def test_wait_ignores_non_matching_updates_and_times_out():
+    """Test that partial fills do not end a wait for a terminal status."""
+    tracker = OrderTracker()
+    trade = make_trade()
+    waiter = asyncio.create_task(tracker.wait_for_status(trade, timeout=0.05))
+    await asyncio.sleep(0)
+
+    trade.orderStatus.filled = 1
+    trade.fillEvent.emit(trade, MagicMock())
+
+    assert await waiter == "Submitted"
+
+
+@pytest.mark.asyncio
+async def test_wait_returns_immediately_when_already_done():
+    """Test that a trade already in a requested status does not wait."""
+    tracker = OrderTracker()
+
+    assert await tracker.wait_for_status(make_trade("Cancelled"), timeout=None) == "Cancelled"
+
+
+@pytest.mark.asyncio
+async def test_many_orders_wait_concurrently():
+    """Test that orders for many followers are awaited on one loop."""
+    tracker = OrderTracker()
+    trades = [make_trade(order_id=i) for i in range(50)]
+    waiters = [asyncio.create_task(tracker.wait_for_status(t, timeout=5)) for t in trades]
+    await asyncio.sleep(0)
+
+    for trade in trades:
+        set_status(trade, "Filled")
+
+    assert await asyncio.wait_for(asyncio.gather(*waiters), timeout=0.1) == ["Filled"] * 50
+
+
+@pytest.mark.asyncio
+async def test_cancel_reports_fill_during_cancel():
+    """Test that an order filling while the cancel is in flight is reported as filled."""
+    tracker = OrderTracker()
+    trade = make_trade()
+    ib = MagicMock()
+    ib.cancelOrder.side_effect = lambda order: asyncio.get_running_loop().call_soon(
+        set_status, trade, "Filled"
+    )
+
+    assert await tracker.cancel(ib, trade, timeout=1) == "Filled"
+    ib.cancelOrder.assert_called_once_with(trade.order)
@@ -0,0 +1,141 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from eventkit import Event
+from spreadpilot_core.ibkr.position_store import POSITIONS_STREAM, PositionStore
+
+
+def make_option(strike: float, right: str, con_id: int):
+    return SimpleNamespace(
+        conId=con_id,
+        symbol="QQQ",
+        secType="OPT",
+        lastTradeDateOrContractMonth="20250117",
+        strike=strike,
+        right=right,
+        exchange="SMART",
+        currency="USD",
+    )
+
+
+def make_position(contract, qty: float, account: str = "DU123"):
+    return SimpleNamespace(account=account, contract=contract, position=qty, avgCost=1.0)
+
+
+def make_portfolio_item(contract, qty: float, value: float, unrealized: float):
+    return SimpleNamespace(
+        account="DU123",
+        contract=contract,
+        position=qty,
+        marketPrice=value / qty if qty else 0.0,
+        marketValue=value,
+        averageCost=1.0,
+        unrealizedPNL=unrealized,
+        realizedPNL=0.0,
+    )
+
+
+LONG_PUT = make_option(380.0, "P", 1)
+SHORT_PUT = make_option(385.0, "P", 2)
+
+
+@pytest.fixture
+def mock_ib():
+    """Fixture for an IB connection with real events and one existing position."""
+    ib = MagicMock()
+    ib.positionEvent = Event("positionEvent")
+    ib.updatePortfolioEvent = Event("updatePortfolioEvent")
+    ib.execDetailsEvent = Event("execDetailsEvent")
+    ib.positions.return_value = [make_position(LONG_PUT, 2)]
+    ib.portfolio.return_value = []
+    return ib
+
+
+@pytest.fixture
+def store(mock_ib):
+    store = PositionStore(mock_ib, publish=False)
+    store.attach()
+    return store
+
+
+def test_attach_loads_existing_positions(store: PositionStore):
+    """Test that positions IB already holds are loaded without a request."""
+    assert store.get_option_positions("QQQ") == {"380.0-P": 2}
+
+
+def test_position_events_update_state_and_notify(store: PositionStore, mock_ib: MagicMock):
+    """Test that pushed position changes are visible at once and reach listeners."""
+    listener = MagicMock()
+    store.add_listener(listener)
+
+    mock_ib.positionEvent.emit(make_position(SHORT_PUT, -2))
+    mock_ib.positionEvent.emit(make_position(SHORT_PUT, -1))
+    # Unchanged position is not reported again
+    mock_ib.positionEvent.emit(make_position(SHORT_PUT, -1))
+
+    assert store.get_option_positions("QQQ") == {"380.0-P": 2, "385.0-P": -1}
+    assert listener.call_count == 2
+    listener.assert_called_with("DU123")
+
+    # Closed positions drop out
+    mock_ib.positionEvent.emit(make_position(LONG_PUT, 0))
+    assert store.get_option_positions("QQQ") == {"385.0-P": -1}
+
+
+def test_portfolio_updates_feed_value_and_pnl(store: PositionStore, mock_ib: MagicMock):
+    """Test that market value and P&L follow portfolio updates, without notifying on marks."""
+    listener = MagicMock()
+    store.add_listener(listener)
+
+    mock_ib.updatePortfolioEvent.emit(make_portfolio_item(LONG_PUT, 2, 300.0, 100.0))
+    mock_ib.updatePortfolioEvent.emit(make_portfolio_item(SHORT_PUT, -2, -200.0, -50.0))
+    mock_ib.updatePortfolioEvent.emit(make_portfolio_item(SHORT_PUT, -2, -150.0, 0.0))
+
+    assert store.get_portfolio_value() == 150.0
+    assert store.get_pnl() == {"unrealized_pnl": 100.0, "realized_pnl": 0.0}
+    # Only the new short position changed a quantity
+    assert listener.call_count == 1
+
+
+def test_execution_notifies_listeners(store: PositionStore, mock_ib: MagicMock):
+    """Test that fills wake listeners before the position update arrives."""
+    listener = MagicMock()
+    store.add_listener(listener)
+    fill = SimpleNamespace(
+        contract=SHORT_PUT,
+        execution=SimpleNamespace(
+            acctNumber="DU123", execId="0001", side="SLD", shares=1, price=1.25
+        ),
+    )
+
+    mock_ib.execDetailsEvent.emit(MagicMock(), fill)
+
+    listener.assert_called_once_with("DU123")
+    assert store.last_execution_at is not None
+
+
+@pytest.mark.asyncio
+async def test_changes_are_published_in_one_batch(mock_ib: MagicMock):
+    """Test that changes are coalesced into one Redis pipeline."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value.__aenter__ = AsyncMock(return_value=pipe)
+    redis_client.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    with patch(
+        "spreadpilot_core.ibkr.position_store.get_redis_client",
+        AsyncMock(return_value=redis_client),
+    ):
+        store = PositionStore(mock_ib)
+        store.attach()
+        mock_ib.positionEvent.emit(make_position(SHORT_PUT, -2))
+        await store._publish_task
+
+    pipe.execute.assert_awaited_once()
+    assert [call.args[0] for call in pipe.hset.call_args_list] == ["positions:DU123"]
+    published = pipe.hset.call_args.kwargs["mapping"]
+    assert {json.loads(state)["position"] for state in published.values()} == {2, -2}
+    assert [call.args[0] for call in pipe.xadd.call_args_list] == [POSITIONS_STREAM] * 2
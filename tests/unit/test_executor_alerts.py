@@ -8,10 +8,16 @@ import pytest
 from fakeredis import aioredis as fakeredis
 from ib_insync import IB
 from spreadpilot_core.ibkr.client import IBKRClient, OrderStatus
+from spreadpilot_core.ibkr.market_data import MarketSnapshot
 from spreadpilot_core.models.alert import Alert, AlertSeverity
 from trading_bot.app.service.executor import VerticalSpreadExecutor
 
 
+def snapshots(*mids):
+    """Build market snapshots with the given midpoints."""
+    return [MarketSnapshot(bid=None, ask=None, mid=mid, last=None) for mid in mids]
+
+
 @pytest.fixture
 async def fake_redis():
     """Create a fake Redis client for testing."""
@@ -26,7 +32,7 @@ def mock_ibkr_client():
     client = MagicMock(spec=IBKRClient)
     client.ensure_connected = AsyncMock(return_value=True)
     client.get_account_summary = AsyncMock(return_value={"AvailableFunds": "10000"})
-    client.get_market_price = AsyncMock(return_value=1.0)
+    client.get_market_snapshots = AsyncMock(return_value=snapshots(1.0, 1.0))
     client._get_qqq_option_contract = MagicMock()
 
     # Mock IB instance
@@ -96,7 +102,7 @@ class TestExecutorAlerts:
         executor.ibkr_client.get_account_summary.return_value = {"AvailableFunds": "10000"}
 
         # Mock market prices to get low MID
-        executor.ibkr_client.get_market_price.side_effect = [0.30, 0.60]  # MID = 0.30
+        executor.ibkr_client.get_market_snapshots.return_value = snapshots(0.30, 0.60)  # MID = 0.30
 
         # Execute trade
         signal = {"strategy": "Long", "qty_per_leg": 10, "strike_long": 450, "strike_short": 455}
@@ -130,7 +136,8 @@ class TestExecutorAlerts:
         whatif_result.initMarginChange = 500
         executor.ibkr_client.ib.whatIfOrderAsync.return_value = whatif_result
         executor.ibkr_client.get_account_summary.return_value = {"AvailableFunds": "10000"}
-        executor.ibkr_client.get_market_price.side_effect = [1.50, 2.50]  # MID = -1.00
+        # MID = -1.00
+        executor.ibkr_client.get_market_snapshots.return_value = snapshots(1.50, 2.50)
 
         # Mock order placement that never fills
         mock_trade = MagicMock()
@@ -200,7 +207,8 @@ class TestExecutorAlerts:
         whatif_result.initMarginChange = 500
         executor.ibkr_client.ib.whatIfOrderAsync.return_value = whatif_result
         executor.ibkr_client.get_account_summary.return_value = {"AvailableFunds": "10000"}
-        executor.ibkr_client.get_market_price.side_effect = [1.50, 2.50]  # MID = -1.00
+        # MID = -1.00
+        executor.ibkr_client.get_market_snapshots.return_value = snapshots(1.50, 2.50)
 
         # Mock IB rejection
         executor.ibkr_client.ib.placeOrder.side_effect = Exception("Order rejected by IB")
@@ -233,7 +241,8 @@ class TestExecutorAlerts:
         whatif_result.initMarginChange = 500
         executor.ibkr_client.ib.whatIfOrderAsync.return_value = whatif_result
         executor.ibkr_client.get_account_summary.return_value = {"AvailableFunds": "10000"}
-        executor.ibkr_client.get_market_price.side_effect = [1.50, 2.50]  # MID = -1.00
+        # MID = -1.00
+        executor.ibkr_client.get_market_snapshots.return_value = snapshots(1.50, 2.50)
 
         # Mock successful order fill
         mock_trade = MagicMock()
@@ -272,7 +281,7 @@ class TestExecutorAlerts:
 
         # 2. MID too low
         executor.ibkr_client.get_account_summary.return_value = {"AvailableFunds": "10000"}
-        executor.ibkr_client.get_market_price.side_effect = [0.20, 0.40]
+        executor.ibkr_client.get_market_snapshots.return_value = snapshots(0.20, 0.40)
 
         signal2 = {"strategy": "Short", "qty_per_leg": 5, "strike_long": 460, "strike_short": 465}
         await executor.execute_vertical_spread(signal2, "follower_002")
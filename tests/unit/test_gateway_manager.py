@@ -1,13 +1,21 @@
 """Unit tests for GatewayManager with mocked Docker SDK."""
 
 import asyncio
+import io
+import tarfile
 import time
 from dataclasses import dataclass
 from unittest.mock import AsyncMock, Mock, patch
 
 import docker
 import pytest
-from spreadpilot_core.ibkr.gateway_manager import GatewayInstance, GatewayManager, GatewayStatus
+from spreadpilot_core.ibkr.gateway_manager import (
+    CircuitState,
+    GatewayInstance,
+    GatewayManager,
+    GatewayStatus,
+    StandbyGateway,
+)
 from spreadpilot_core.models.alert import AlertSeverity
 from spreadpilot_core.models.follower import FollowerState
 
@@ -565,3 +573,402 @@ class TestGatewayManager:
                 call_args = mock_redis_client.xadd.call_args[0]
                 assert call_args[0] == "alerts"
                 assert "Failed to reconnect" in call_args[1]["data"]
+
+    @pytest.mark.asyncio
+    async def test_start_gateways_runs_docker_calls_concurrently(self):
+        """Test that gateways start in parallel without blocking the event loop."""
+        # Arrange
+        def run_container(*args, **kwargs):
+            time.sleep(0.2)  # Blocking Docker SDK call
+            container = Mock()
+            container.id = kwargs["name"]
+            return container
+
+        self.gateway_manager.docker_client.containers.run.side_effect = run_container
+        self.gateway_manager.docker_client.containers.get.side_effect = docker.errors.NotFound(
+            "Not found"
+        )
+        self.gateway_manager.startup_concurrency = 5
+        followers = [MockFollower(id=f"follower_{i}", ibkr_username="user") for i in range(5)]
+        credentials = {"IB_USER": "user", "IB_PASS": "pass"}
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        # Act
+        ticker_task = asyncio.create_task(ticker())
+        started_at = time.monotonic()
+        with patch.object(
+            self.gateway_manager, "_get_ibkr_credentials_from_vault", return_value=credentials
+        ), patch.object(self.gateway_manager, "_store_gateway_mapping"):
+            started = await self.gateway_manager._start_gateways(followers)
+        elapsed = time.monotonic() - started_at
+        ticker_task.cancel()
+
+        # Assert
+        assert set(started) == {follower.id for follower in followers}
+        assert elapsed < 0.5  # Not 5 x 0.2s one after another
+        assert ticks >= 10  # Event loop kept running during the Docker calls
+        assert len({gateway.host_port for gateway in started.values()}) == 5
+
+    @pytest.mark.asyncio
+    async def test_start_gateways_respects_startup_concurrency(self):
+        """Test that no more than startup_concurrency gateways start at once."""
+        # Arrange
+        in_flight = 0
+        peak = 0
+
+        async def start_gateway(follower):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            if follower.id == "follower_3":
+                raise RuntimeError("Container failed")
+            return Mock(follower_id=follower.id)
+
+        self.gateway_manager.startup_concurrency = 2
+        followers = [MockFollower(id=f"follower_{i}", ibkr_username="user") for i in range(6)]
+
+        # Act
+        with patch.object(self.gateway_manager, "_start_gateway", side_effect=start_gateway):
+            started = await self.gateway_manager._start_gateways(followers)
+
+        # Assert
+        assert peak == 2
+        assert "follower_3" not in started
+        assert len(started) == 5
+
+    @pytest.mark.asyncio
+    async def test_start_gateway_binds_standby_container(self):
+        """Test that a follower gets a pre-started standby container instead of a cold start."""
+        # Arrange
+        standby_container = Mock()
+        standby_container.id = "standby_container_id"
+        standby_container.status = "running"
+        standby = StandbyGateway(
+            container=standby_container, host_port=4150, client_id=1500, created_at=time.time()
+        )
+        self.gateway_manager.standby = [standby]
+        self.gateway_manager.standby_pool_size = 1
+        self.gateway_manager.docker_client.containers.get.side_effect = docker.errors.NotFound(
+            "Not found"
+        )
+        credentials = {"IB_USER": "vault_user", "IB_PASS": "pa ss'word"}
+        follower = MockFollower(id="test_follower", ibkr_username="stored_user")
+
+        # Act
+        with patch.object(
+            self.gateway_manager, "_get_ibkr_credentials_from_vault", return_value=credentials
+        ), patch.object(self.gateway_manager, "_store_gateway_mapping"), patch.object(
+            self.gateway_manager, "_refill_standby_pool"
+        ) as mock_refill:
+            gateway = await self.gateway_manager._start_gateway(follower)
+            await asyncio.sleep(0)
+
+        # Assert
+        # Binding only renames the container and hands it the credentials
+        self.gateway_manager.docker_client.containers.run.assert_not_called()
+        self.gateway_manager.docker_client.images.get.assert_not_called()
+        standby_container.start.assert_not_called()
+        standby_container.restart.assert_not_called()
+        assert gateway.container is standby_container
+        assert (gateway.host_port, gateway.client_id) == (4150, 1500)
+        assert gateway.follower is follower
+        assert self.gateway_manager.standby == []
+        standby_container.rename.assert_called_once_with("ibgateway-follower-test_follower")
+
+        path, data = standby_container.put_archive.call_args[0]
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            content = tar.extractfile(tar.getmembers()[0]).read().decode()
+        assert path == "/tmp"
+        assert "IB_USER=vault_user" in content
+        assert "IB_PASS='pa ss'\"'\"'word'" in content
+        mock_refill.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_bound_standby_startup_time_starts_at_binding(self):
+        """Test that time spent waiting in the pool does not count against startup."""
+        # Arrange
+        standby_container = Mock()
+        standby_container.status = "running"
+        # Created well over max_startup_time ago
+        standby_container.attrs = {"Created": "2020-01-01T00:00:00Z"}
+        self.gateway_manager.standby = [
+            StandbyGateway(
+                container=standby_container,
+                host_port=4150,
+                client_id=1500,
+                created_at=time.time() - 3600,
+            )
+        ]
+        self.gateway_manager.docker_client.containers.get.side_effect = docker.errors.NotFound(
+            "Not found"
+        )
+        credentials = {"IB_USER": "vault_user", "IB_PASS": "secret"}
+        follower = MockFollower(id="test_follower", ibkr_username="stored_user")
+
+        with patch.object(
+            self.gateway_manager, "_get_ibkr_credentials_from_vault", return_value=credentials
+        ), patch.object(self.gateway_manager, "_store_gateway_mapping"), patch.object(
+            self.gateway_manager, "_schedule_refill"
+        ):
+            gateway = await self.gateway_manager._start_gateway(follower)
+
+        # Act: the gateway is still logging in when first checked
+        with patch.object(
+            self.gateway_manager, "_connect_ib_client", side_effect=ConnectionError("refused")
+        ), patch.object(self.gateway_manager, "_open_circuit") as mock_open_circuit:
+            await self.gateway_manager._check_gateway_health(gateway, time.time())
+
+        # Assert
+        assert self.gateway_manager._startup_time(gateway, time.time()) < 5
+        assert gateway.status == GatewayStatus.STARTING
+        mock_open_circuit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_refill_standby_pool_replaces_dead_standby(self):
+        """Test that refilling drops dead standby containers and tops the pool up."""
+        # Arrange
+        dead_container = Mock()
+        dead_container.status = "exited"
+        dead = StandbyGateway(
+            container=dead_container, host_port=4100, client_id=1000, created_at=time.time()
+        )
+        self.gateway_manager.standby = [dead]
+        self.gateway_manager.used_ports.add(4100)
+        self.gateway_manager.used_client_ids.add(1000)
+        self.gateway_manager.standby_pool_size = 2
+
+        image = Mock()
+        image.attrs = {"Config": {"Entrypoint": None, "Cmd": ["/home/ibgateway/scripts/run.sh"]}}
+        self.gateway_manager.docker_client.images.get.return_value = image
+
+        # Act
+        await self.gateway_manager._refill_standby_pool()
+
+        # Assert
+        dead_container.remove.assert_called_once_with(force=True)
+        assert len(self.gateway_manager.standby) == 2
+        assert dead not in self.gateway_manager.standby
+        run_kwargs = self.gateway_manager.docker_client.containers.run.call_args[1]
+        assert run_kwargs["entrypoint"][:2] == ["sh", "-c"]
+        assert run_kwargs["command"] == ["/home/ibgateway/scripts/run.sh"]
+        assert "IB_USER" not in run_kwargs["environment"]
+        assert len(self.gateway_manager.used_ports) == 2
+
+    @pytest.mark.asyncio
+    async def test_exited_gateway_fails_over_to_standby(self):
+        """Test that a stopped gateway is replaced using the standby pool."""
+        # Arrange
+        follower = MockFollower(id="test_follower", ibkr_username="test_user")
+        gateway = GatewayInstance(
+            follower_id="test_follower",
+            container_id="test_container",
+            host_port=4100,
+            client_id=1000,
+            status=GatewayStatus.RUNNING,
+            container=Mock(),
+            follower=follower,
+        )
+        gateway.container.status = "exited"
+        self.gateway_manager.gateways["test_follower"] = gateway
+        self.gateway_manager.standby = [Mock()]
+
+        # Act
+        with patch.object(self.gateway_manager, "_stop_gateway") as mock_stop, patch.object(
+            self.gateway_manager, "_start_gateway"
+        ) as mock_start:
+            await self.gateway_manager._check_gateway_health(gateway, time.time())
+            await asyncio.gather(*self.gateway_manager._failover_tasks.values())
+
+        # Assert
+        mock_stop.assert_called_once_with("test_follower")
+        mock_start.assert_called_once_with(follower)
+        assert self.gateway_manager._failover_tasks == {}
+
+    @pytest.mark.asyncio
+    async def test_failover_outlives_health_check_timeout(self):
+        """Test that a slow failover is not cancelled by the health check timeout."""
+        # Arrange
+        follower = MockFollower(id="test_follower", ibkr_username="test_user")
+        gateway = GatewayInstance(
+            follower_id="test_follower",
+            container_id="test_container",
+            host_port=4100,
+            client_id=1000,
+            status=GatewayStatus.RUNNING,
+            container=Mock(),
+            follower=follower,
+        )
+        gateway.container.status = "exited"
+        self.gateway_manager.gateways["test_follower"] = gateway
+        self.gateway_manager.standby = [Mock()]
+        self.gateway_manager.healthcheck_timeout = 0.05
+        started = []
+
+        async def start_gateway(follower):
+            await asyncio.sleep(0.2)
+            started.append(follower.id)
+
+        # Act
+        with patch.object(self.gateway_manager, "_stop_gateway"), patch.object(
+            self.gateway_manager, "_start_gateway", side_effect=start_gateway
+        ):
+            await self.gateway_manager._run_health_check("test_follower", gateway, time.time())
+            # A second check while the failover runs does not start another one
+            gateway.last_healthcheck = None
+            await self.gateway_manager._run_health_check("test_follower", gateway, time.time())
+            failovers = list(self.gateway_manager._failover_tasks.values())
+            await asyncio.gather(*failovers)
+
+        # Assert
+        assert gateway.check_timeouts == 0
+        assert len(failovers) == 1
+        assert started == ["test_follower"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_start_releases_standby(self):
+        """Test that cancelling a start hands back the standby, port and client ID."""
+        # Arrange
+        standby_container = Mock()
+        standby_container.status = "running"
+        standby = StandbyGateway(
+            container=standby_container, host_port=4150, client_id=1500, created_at=time.time()
+        )
+        self.gateway_manager.standby = [standby]
+        self.gateway_manager.used_ports.add(4150)
+        self.gateway_manager.used_client_ids.add(1500)
+        self.gateway_manager.docker_client.containers.get.side_effect = docker.errors.NotFound(
+            "Not found"
+        )
+        follower = MockFollower(id="test_follower", ibkr_username="test_user")
+
+        async def get_credentials(follower):
+            await asyncio.sleep(10)
+
+        # Act
+        with patch.object(
+            self.gateway_manager, "_get_ibkr_credentials_from_vault", side_effect=get_credentials
+        ), patch.object(self.gateway_manager, "_schedule_refill"):
+            task = asyncio.create_task(self.gateway_manager._start_gateway(follower))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        # Assert
+        standby_container.remove.assert_called_once_with(force=True)
+        assert 4150 not in self.gateway_manager.used_ports
+        assert 1500 not in self.gateway_manager.used_client_ids
+        assert "test_follower" not in self.gateway_manager.gateways
+
+    @pytest.mark.asyncio
+    async def test_hung_gateway_check_times_out_without_delaying_others(self):
+        """Test that health checks run concurrently and a hung check is cut off."""
+        # Arrange
+        gateways = {
+            follower_id: GatewayInstance(
+                follower_id=follower_id,
+                container_id=f"{follower_id}_container",
+                host_port=4100 + i,
+                client_id=1000 + i,
+                status=GatewayStatus.RUNNING,
+            )
+            for i, follower_id in enumerate(["healthy_1", "hung", "healthy_2"])
+        }
+        self.gateway_manager.gateways.update(gateways)
+        self.gateway_manager.healthcheck_timeout = 0.1
+        checked = []
+
+        async def check_gateway_health(gateway, current_time):
+            if gateway.follower_id == "hung":
+                await asyncio.sleep(10)
+            checked.append(gateway.follower_id)
+
+        # Act
+        started_at = time.monotonic()
+        with patch.object(
+            self.gateway_manager, "_check_gateway_health", side_effect=check_gateway_health
+        ):
+            await asyncio.gather(
+                *(
+                    self.gateway_manager._run_health_check(follower_id, gateway, time.time())
+                    for follower_id, gateway in gateways.items()
+                )
+            )
+        elapsed = time.monotonic() - started_at
+
+        # Assert
+        assert elapsed < 0.5
+        assert sorted(checked) == ["healthy_1", "healthy_2"]
+        assert gateways["hung"].check_timeouts == 1
+        assert gateways["hung"].connection_failures == 1
+        assert gateways["hung"].last_check_ms >= 100
+        assert gateways["healthy_1"].last_check_ms < 100
+        listed = self.gateway_manager.list_gateways()
+        assert listed["hung"]["last_check_ms"] == gateways["hung"].last_check_ms
+
+    @pytest.mark.asyncio
+    async def test_circuit_breaker_opens_probes_and_closes(self):
+        """Test the closed -> open -> half-open -> open -> half-open -> closed cycle."""
+        # Arrange
+        gateway = GatewayInstance(
+            follower_id="test_follower",
+            container_id="test_container",
+            host_port=4100,
+            client_id=1000,
+            status=GatewayStatus.RUNNING,
+            container=Mock(),
+        )
+        gateway.container.status = "running"
+        self.gateway_manager.circuit_backoff_base = 10
+        reconnect = AsyncMock(side_effect=[Exception("Still down"), None])
+
+        with patch.object(self.gateway_manager, "_reconnect", reconnect), patch.object(
+            self.gateway_manager, "_publish_alert"
+        ) as mock_alert:
+            # Act: open the circuit
+            await self.gateway_manager._open_circuit(gateway, "Failed to reconnect")
+            first_retry_at = gateway.circuit_retry_at
+
+            # Assert: left alone until the backoff expires
+            assert gateway.status == GatewayStatus.FAILED
+            assert gateway.circuit_state == CircuitState.OPEN
+            assert 5 <= first_retry_at - time.time() <= 10
+            await self.gateway_manager._check_gateway_health(gateway, time.time())
+            reconnect.assert_not_called()
+
+            # Act: failed probe reopens with a longer backoff
+            await self.gateway_manager._check_gateway_health(gateway, first_retry_at)
+            assert gateway.circuit_state == CircuitState.OPEN
+            assert gateway.circuit_opens == 2
+            assert 10 <= gateway.circuit_retry_at - time.time() <= 20
+
+            # Act: successful probe closes the circuit
+            await self.gateway_manager._check_gateway_health(gateway, gateway.circuit_retry_at)
+
+        # Assert
+        assert reconnect.call_count == 2
+        assert gateway.circuit_state == CircuitState.CLOSED
+        assert gateway.status == GatewayStatus.RUNNING
+        assert gateway.circuit_opens == 0
+        mock_alert.assert_called_once()  # One alert per outage
+
+    def test_circuit_backoff_is_jittered_and_capped(self):
+        """Test that probe delays grow, stay within the upper half and respect the cap."""
+        self.gateway_manager.circuit_backoff_base = 10
+        self.gateway_manager.circuit_backoff_max = 60
+
+        delays = [self.gateway_manager._circuit_backoff(opens) for opens in range(1, 7)]
+
+        for opens, delay in enumerate(delays, start=1):
+            cap = min(60, 10 * 2 ** (opens - 1))
+            assert cap / 2 <= delay <= cap
+        assert len({round(self.gateway_manager._circuit_backoff(6), 6) for _ in range(5)}) > 1
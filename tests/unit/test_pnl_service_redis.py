@@ -12,7 +12,7 @@ import pytz
 from fakeredis import aioredis as fakeredis
 from freezegun import freeze_time
 from spreadpilot_core.models.pnl import PnLIntraday, Trade
-from spreadpilot_core.pnl.service import PnLService
+from spreadpilot_core.pnl.service import PnLService, get_shard_stream_name, get_stream_shard
 
 
 @pytest.fixture
@@ -64,6 +64,7 @@ class TestPnLServiceRedisStreams:
         # Mock database operations
         with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_session:
             session = AsyncMock()
+            session.execute.return_value = MagicMock(scalar=MagicMock(return_value=None))
             mock_session.return_value.__aenter__.return_value = session
 
             # Add trade fill to Redis stream
@@ -118,7 +119,7 @@ class TestPnLServiceRedisStreams:
         pnl_service.redis_client = fake_redis
 
         # Mock database operations
-        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_session:
+        with patch("spreadpilot_core.pnl.quote_buffer.get_postgres_session") as mock_session:
             session = AsyncMock()
             mock_session.return_value.__aenter__.return_value = session
 
@@ -143,9 +144,10 @@ class TestPnLServiceRedisStreams:
 
             # Process the quote
             await pnl_service.update_quote(quote_data)
+            await pnl_service.quote_buffer.flush()
 
-            # Verify quote was added to session
-            session.add.assert_called_once()
+            # Verify quote was bulk inserted in a single commit
+            session.execute.assert_called_once()
             session.commit.assert_called_once()
 
     @freeze_time("2025-06-29 10:30:00")  # Market hours (ET)
@@ -383,8 +385,11 @@ class TestPnLServiceRedisStreams:
     @pytest.mark.timeout(5)  # Prevent infinite hanging in CI
     async def test_pnl_service_lifecycle(self, pnl_service, fake_redis):
         """Test complete P&L service lifecycle."""
-        # Mock Redis client
-        with patch("spreadpilot_core.pnl.service.get_redis_client", return_value=fake_redis):
+        # Mock Redis client; lot state comes from PostgreSQL, which is not available here
+        with (
+            patch("spreadpilot_core.pnl.service.get_redis_client", return_value=fake_redis),
+            patch.object(pnl_service, "_load_lot_state", new_callable=AsyncMock),
+        ):
             # Create shutdown event
             shutdown_event = asyncio.Event()
 
@@ -414,3 +419,299 @@ class TestPnLServiceRedisStreams:
 
             # Verify cleanup
             assert pnl_service.monitoring_active is False
+
+
+class TestPnLServiceStreamConsumer:
+    """Test the multi-stream reader and per-stream workers."""
+
+    async def _run_subscriber(self, pnl_service, until, timeout=2.0):
+        """Run the stream subscriber until the condition holds, then shut it down."""
+        shutdown_event = asyncio.Event()
+        task = asyncio.create_task(pnl_service._redis_stream_subscriber(shutdown_event))
+        try:
+            deadline = time.monotonic() + timeout
+            while not until() and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+        finally:
+            shutdown_event.set()
+            await asyncio.wait_for(task, timeout=3)
+
+    @pytest.mark.asyncio
+    async def test_fills_and_quotes_processed_and_acked(self, pnl_service, fake_redis):
+        """Test that one reader dispatches both streams and acks every message."""
+        pnl_service.redis_client = fake_redis
+        fills, quotes = [], []
+
+        async def record_trade_fill(follower_id, fill_data):
+            fills.append(fill_data)
+
+        async def update_quote(quote_data):
+            quotes.append(quote_data)
+
+        pnl_service.record_trade_fill = record_trade_fill
+        pnl_service.update_quote = update_quote
+
+        for i in range(3):
+            await fake_redis.xadd("trade_fills", {"data": json.dumps({"follower_id": f"f{i}"})})
+        for i in range(50):
+            await fake_redis.xadd("quotes", {"data": json.dumps({"symbol": "QQQ", "n": i})})
+
+        await self._run_subscriber(pnl_service, lambda: len(fills) == 3 and len(quotes) == 50)
+
+        assert [f["follower_id"] for f in fills] == ["f0", "f1", "f2"]
+        assert [q["n"] for q in quotes] == list(range(50))
+        assert (await fake_redis.xpending("trade_fills", "pnl_service"))["pending"] == 0
+        assert (await fake_redis.xpending("quotes", "pnl_service"))["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fills_not_blocked_by_slow_quotes(self, pnl_service, fake_redis):
+        """Test that a backed-up quote worker does not delay fill processing."""
+        pnl_service.redis_client = fake_redis
+        fills = []
+        release_quotes = asyncio.Event()
+
+        async def record_trade_fill(follower_id, fill_data):
+            fills.append(fill_data)
+
+        async def update_quote(quote_data):
+            await release_quotes.wait()
+
+        pnl_service.record_trade_fill = record_trade_fill
+        pnl_service.update_quote = update_quote
+
+        for i in range(20):
+            await fake_redis.xadd("quotes", {"data": json.dumps({"n": i})})
+        await fake_redis.xadd("trade_fills", {"data": json.dumps({"follower_id": "f1"})})
+
+        shutdown_event = asyncio.Event()
+        task = asyncio.create_task(pnl_service._redis_stream_subscriber(shutdown_event))
+        try:
+            for _ in range(100):
+                if fills:
+                    break
+                await asyncio.sleep(0.01)
+            assert len(fills) == 1
+        finally:
+            release_quotes.set()
+            shutdown_event.set()
+            await asyncio.wait_for(task, timeout=3)
+
+    @pytest.mark.asyncio
+    async def test_failed_messages_stay_pending(self, pnl_service, fake_redis):
+        """Test that messages whose handler fails are not acknowledged."""
+        pnl_service.redis_client = fake_redis
+        seen = []
+
+        async def update_quote(quote_data):
+            seen.append(quote_data)
+            if quote_data["n"] == 1:
+                raise ValueError("bad quote")
+
+        pnl_service.update_quote = update_quote
+
+        for i in range(3):
+            await fake_redis.xadd("quotes", {"data": json.dumps({"n": i})})
+
+        await self._run_subscriber(pnl_service, lambda: len(seen) == 3)
+
+        assert (await fake_redis.xpending("quotes", "pnl_service"))["pending"] == 1
+
+    @pytest.mark.asyncio
+    async def test_fill_that_fails_to_record_stays_pending(self, pnl_service, fake_redis):
+        """Test that a fill whose database write fails is not acknowledged."""
+        pnl_service.redis_client = fake_redis
+        fill_data = {
+            "follower_id": "f1",
+            "symbol": "QQQ",
+            "contract_type": "CALL",
+            "strike": 450.0,
+            "expiration": "2025-01-17",
+            "trade_type": "BUY",
+            "quantity": 1,
+            "price": 2.5,
+            "trade_time": "2025-01-02T15:00:00",
+        }
+        await fake_redis.xadd("trade_fills", {"data": json.dumps(fill_data)})
+        session = AsyncMock()
+        session.add = MagicMock()
+        session.commit.side_effect = Exception("db down")
+
+        with patch("spreadpilot_core.pnl.service.get_postgres_session") as mock_get_session:
+            mock_get_session.return_value.__aenter__.return_value = session
+            await self._run_subscriber(pnl_service, lambda: session.commit.await_count > 0)
+
+        assert (await fake_redis.xpending("trade_fills", "pnl_service"))["pending"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_size_adapts_to_load(self, pnl_service, fake_redis):
+        """Test that the read batch size grows under load and shrinks when idle."""
+        pnl_service.redis_client = fake_redis
+        pnl_service.subscriptions_active = True
+        pnl_service.update_quote = AsyncMock()
+        await fake_redis.xgroup_create("trade_fills", "pnl_service", id="0", mkstream=True)
+        await fake_redis.xgroup_create("quotes", "pnl_service", id="0", mkstream=True)
+
+        for i in range(100):
+            await fake_redis.xadd("quotes", {"data": json.dumps({"n": i})})
+
+        queues = {"trade_fills": asyncio.Queue(), "quotes": asyncio.Queue()}
+        shutdown_event = asyncio.Event()
+        sizes = []
+
+        original_xreadgroup = fake_redis.xreadgroup
+
+        async def xreadgroup(*args, **kwargs):
+            sizes.append(kwargs["count"])
+            if len(sizes) >= 6:
+                shutdown_event.set()
+            kwargs["block"] = 10
+            return await original_xreadgroup(*args, **kwargs)
+
+        with patch.object(fake_redis, "xreadgroup", side_effect=xreadgroup):
+            await pnl_service._stream_reader(shutdown_event, queues)
+
+        assert sizes[:4] == [10, 20, 40, 80]
+        assert pnl_service.stream_batch_size < 80
+        assert queues["quotes"].qsize() == 100
+
+
+class TestPnLServiceStreamSharding:
+    """Test consumer identity, sharding and pending-message recovery."""
+
+    def test_consumer_identity_and_shard_streams(self):
+        """Test that sharded workers consume their own fills stream under their own name."""
+        service = PnLService(consumer_name="pnl-2", shard_index=2, shard_count=4)
+
+        assert service.consumer_name == "pnl-2"
+        assert service.fills_stream == "trade_fills:2"
+        # Quotes are broadcast through one consumer group per shard
+        assert service.quotes_stream == "quotes"
+        assert service.stream_group == "pnl_service:2"
+        assert service.persist_quotes is False
+
+    @pytest.mark.asyncio
+    async def test_shard_snapshots_only_its_followers(self):
+        """Test that MTM snapshots are only taken for followers routed to the shard."""
+        services = [PnLService(shard_index=i, shard_count=2) for i in range(2)]
+        followers = {f"follower-{i}" for i in range(10)}
+        snapshotted = []
+
+        for service in services:
+            service.active_followers = set(followers)
+            service._build_mtm_snapshot = AsyncMock(side_effect=snapshotted.append)
+            await service._calculate_and_store_mtm()
+
+        assert sorted(snapshotted) == sorted(followers)
+        assert all(
+            services[get_stream_shard(follower_id, 2)].owns_follower(follower_id)
+            for follower_id in followers
+        )
+
+    @pytest.mark.asyncio
+    async def test_quotes_are_broadcast_to_every_shard(self, fake_redis):
+        """Test that each shard sees every quote but only the first persists it."""
+        await fake_redis.xadd("quotes", {"data": json.dumps({"symbol": "QQQ"})})
+        seen = []
+
+        for shard_index in range(2):
+            service = PnLService(
+                consumer_name=f"pnl-{shard_index}", shard_index=shard_index, shard_count=2
+            )
+            service.redis_client = fake_redis
+            service.update_quote = AsyncMock(side_effect=seen.append)
+            await TestPnLServiceStreamConsumer()._run_subscriber(
+                service, lambda: len(seen) > shard_index
+            )
+
+        assert len(seen) == 2
+        assert PnLService(shard_index=0, shard_count=2).persist_quotes is True
+
+    @pytest.mark.asyncio
+    async def test_poison_message_is_dead_lettered(self, fake_redis):
+        """Test that a message failing every delivery is moved aside instead of reclaimed."""
+        await fake_redis.xgroup_create("trade_fills", "pnl_service", id="0", mkstream=True)
+        message_id = await fake_redis.xadd("trade_fills", {"data": "not json"})
+        await fake_redis.xreadgroup("pnl_service", "pnl-a", {"trade_fills": ">"})
+        # Claimed and failed again until the delivery limit is reached
+        for _ in range(4):
+            await fake_redis.xautoclaim("trade_fills", "pnl_service", "pnl-a", 0, "0-0")
+
+        service = PnLService(consumer_name="pnl-b")
+        service.redis_client = fake_redis
+        queue = asyncio.Queue()
+
+        with patch("spreadpilot_core.pnl.service.STREAM_CLAIM_MIN_IDLE_MS", 0):
+            claimed = await service._claim_pending("trade_fills", queue)
+
+        assert claimed == 0
+        assert service.dead_lettered_messages == 1
+        assert (await fake_redis.xpending("trade_fills", "pnl_service"))["pending"] == 0
+        [(_, fields)] = await fake_redis.xrange("trade_fills:dead")
+        assert fields["data"] == "not json"
+        assert fields["message_id"] == message_id
+
+    def test_unsharded_defaults_from_environment(self, monkeypatch):
+        """Test that identity comes from the environment and one shard keeps base names."""
+        monkeypatch.setenv("PNL_CONSUMER_NAME", "pnl-host-a")
+        monkeypatch.delenv("PNL_SHARD_COUNT", raising=False)
+        monkeypatch.delenv("PNL_SHARD_INDEX", raising=False)
+
+        service = PnLService()
+
+        assert service.consumer_name == "pnl-host-a"
+        assert service.fills_stream == "trade_fills"
+        assert service.quotes_stream == "quotes"
+
+    def test_invalid_shard_index_rejected(self):
+        """Test that a shard index outside the shard count is rejected."""
+        with pytest.raises(ValueError):
+            PnLService(shard_index=3, shard_count=3)
+
+    def test_stream_shard_is_stable(self):
+        """Test that a routing key always maps to the same shard."""
+        shards = {get_stream_shard(f"follower-{i}", 4) for i in range(50)}
+
+        assert shards == {0, 1, 2, 3}
+        assert get_stream_shard("follower-7", 4) == get_stream_shard("follower-7", 4)
+        assert get_shard_stream_name("trade_fills", get_stream_shard("x", 1), 1) == "trade_fills"
+
+    @pytest.mark.asyncio
+    async def test_restarted_worker_replays_own_pending(self, fake_redis):
+        """Test that unacknowledged messages are replayed after a restart."""
+        await fake_redis.xgroup_create("trade_fills", "pnl_service", id="0", mkstream=True)
+        await fake_redis.xadd("trade_fills", {"data": json.dumps({"follower_id": "f1"})})
+        # Delivered to the worker before it crashed, never acknowledged
+        await fake_redis.xreadgroup("pnl_service", "pnl-a", {"trade_fills": ">"})
+
+        service = PnLService(consumer_name="pnl-a")
+        service.redis_client = fake_redis
+        queue = asyncio.Queue()
+
+        await service._recover_own_pending({"trade_fills": queue, "quotes": asyncio.Queue()})
+
+        assert service.recovered_messages == 1
+        message_id, fields = queue.get_nowait()
+        assert json.loads(fields["data"])["follower_id"] == "f1"
+
+    @pytest.mark.asyncio
+    async def test_sweep_claims_messages_from_crashed_consumer(self, fake_redis):
+        """Test that idle pending messages of another consumer are claimed."""
+        await fake_redis.xgroup_create("trade_fills", "pnl_service", id="0", mkstream=True)
+        for i in range(3):
+            await fake_redis.xadd("trade_fills", {"data": json.dumps({"follower_id": f"f{i}"})})
+        await fake_redis.xreadgroup("pnl_service", "pnl-crashed", {"trade_fills": ">"})
+
+        service = PnLService(consumer_name="pnl-b")
+        service.redis_client = fake_redis
+        queue = asyncio.Queue()
+
+        with patch("spreadpilot_core.pnl.service.STREAM_CLAIM_MIN_IDLE_MS", 0):
+            claimed = await service._claim_pending("trade_fills", queue)
+            # Messages already queued locally are not dispatched twice
+            assert await service._claim_pending("trade_fills", queue) == 0
+
+        assert claimed == 3
+        assert queue.qsize() == 3
+        assert service.stream_pending["trade_fills"] == 3
+        pending = await fake_redis.xpending("trade_fills", "pnl_service")
+        assert pending["consumers"] == [{"name": "pnl-b", "pending": 3}]
@@ -2,16 +2,23 @@
 
 import asyncio
 import json
+import math
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fakeredis import aioredis as fakeredis
 from ib_insync import Contract, Stock
+from spreadpilot_core.ibkr.market_data import MarketDataHub, MarketSnapshot
 from spreadpilot_core.models.alert import Alert, AlertSeverity
 from trading_bot.app.service.time_value_monitor import TimeValueMonitor, TimeValueStatus
 
 
+def snapshots(*mids):
+    """Build market snapshots with the given midpoints."""
+    return [MarketSnapshot(bid=None, ask=None, mid=mid, last=None) for mid in mids]
+
+
 @pytest.fixture
 async def fake_redis():
     """Create a fake Redis client for testing."""
@@ -28,6 +35,9 @@ def mock_service():
 
     # Mock IBKR manager
     mock_ibkr_manager = MagicMock()
+    mock_ibkr_manager.group_by_account = AsyncMock(
+        side_effect=lambda follower_ids: [[follower_id] for follower_id in follower_ids]
+    )
     service.ibkr_manager = mock_ibkr_manager
 
     return service
@@ -44,7 +54,7 @@ def mock_ibkr_client():
     client.ib = mock_ib
 
     # Mock market price methods
-    client.get_market_price = AsyncMock()
+    client.get_market_snapshots = AsyncMock()
 
     return client
 
@@ -138,7 +148,7 @@ class TestTimeValueMonitor:
         mock_ibkr_client.ib.positions.return_value = [mock_position]
 
         # Mock prices: option at $3.50, underlying at $455, intrinsic = $5, TV = -$1.50
-        mock_ibkr_client.get_market_price.side_effect = [3.50, 455.0]
+        mock_ibkr_client.get_market_snapshots.side_effect = [snapshots(455.0, 3.50)]
 
         # Run check
         await tv_monitor._check_follower_positions(
@@ -175,7 +185,7 @@ class TestTimeValueMonitor:
         mock_ibkr_client.ib.positions.return_value = [mock_position]
 
         # Mock prices: option at $5.50, underlying at $445, intrinsic = $5, TV = $0.50
-        mock_ibkr_client.get_market_price.side_effect = [5.50, 445.0]
+        mock_ibkr_client.get_market_snapshots.side_effect = [snapshots(445.0, 5.50)]
 
         # Run check
         await tv_monitor._check_follower_positions(
@@ -217,7 +227,7 @@ class TestTimeValueMonitor:
         mock_ibkr_client.ib.positions.return_value = [mock_position]
 
         # Mock prices: option at $5.08, underlying at $445, intrinsic = $5, TV = $0.08
-        mock_ibkr_client.get_market_price.side_effect = [5.08, 445.0]
+        mock_ibkr_client.get_market_snapshots.side_effect = [snapshots(445.0, 5.08)]
 
         # Mock order placement
         mock_trade = MagicMock()
@@ -293,17 +303,21 @@ class TestTimeValueMonitor:
 
         mock_ibkr_client.ib.positions.return_value = positions
 
-        # Mock prices for each position check
+        # Mock prices, underlying first, then one per position
         # Position 1: Safe (TV = $2.00)
         # Position 2: Risk (TV = $0.75)
         # Position 3: Critical (TV = $0.05)
-        mock_ibkr_client.get_market_price.side_effect = [
-            7.00,
-            445.0,  # Position 1: option $7, underlying $445, intrinsic $5, TV $2
-            5.75,
-            445.0,  # Position 2: option $5.75, underlying $445, intrinsic $5, TV $0.75
-            0.05,
-            445.0,  # Position 3: option $0.05, underlying $445, intrinsic $0, TV $0.05
+        mock_ibkr_client.get_market_snapshots.side_effect = [
+            snapshots(
+                # Underlying $445
+                445.0,
+                # Position 1: option $7, intrinsic $5, TV $2
+                7.00,
+                # Position 2: option $5.75, intrinsic $5, TV $0.75
+                5.75,
+                # Position 3: option $0.05, intrinsic $0, TV $0.05
+                0.05,
+            )
         ]
 
         # Mock order for critical position
@@ -319,9 +333,9 @@ class TestTimeValueMonitor:
         )
 
         # Verify only QQQ options were checked (3 positions)
-        assert (
-            mock_ibkr_client.get_market_price.call_count == 6
-        )  # 2 calls per position (option + underlying)
+        # One snapshot request for the underlying and all positions
+        mock_ibkr_client.get_market_snapshots.assert_called_once()
+        assert len(mock_ibkr_client.get_market_snapshots.call_args[0][0]) == 4
 
         # Check alerts
         alerts = await fake_redis.xrange("alerts")
@@ -365,7 +379,7 @@ class TestTimeValueMonitor:
         mock_ibkr_client.ib.positions.return_value = [mock_position]
 
         # Mock price failure
-        mock_ibkr_client.get_market_price.return_value = None
+        mock_ibkr_client.get_market_snapshots.return_value = [None, None]
 
         # Run check - should handle gracefully
         await tv_monitor._check_follower_positions(
@@ -375,3 +389,173 @@ class TestTimeValueMonitor:
         # No alerts or status should be published
         alerts = await fake_redis.xrange("alerts")
         assert len(alerts) == 0
+
+    @pytest.mark.asyncio
+    async def test_sweep_shares_quotes_across_followers(
+        self, tv_monitor, mock_service, mock_ibkr_client, fake_redis
+    ):
+        """Test that followers holding the same option share one quote request."""
+        mock_service.active_followers = {
+            "follower_a": MagicMock(id="follower_a"),
+            "follower_b": MagicMock(id="follower_b"),
+        }
+        mock_service.ibkr_manager.get_client = AsyncMock(return_value=mock_ibkr_client)
+
+        # Both followers hold the same short put
+        mock_position = MagicMock()
+        mock_position.contract.secType = "OPT"
+        mock_position.contract.symbol = "QQQ"
+        mock_position.contract.lastTradeDateOrContractMonth = "20250110"
+        mock_position.contract.strike = 450.0
+        mock_position.contract.right = "P"
+        mock_position.position = -5
+        mock_ibkr_client.ib.positions.return_value = [mock_position]
+
+        # Underlying $445, option $5.50, intrinsic $5, TV $0.50
+        mock_ibkr_client.get_market_snapshots.side_effect = [snapshots(445.0, 5.50)]
+
+        await tv_monitor._check_all_positions()
+
+        # Underlying and the shared option quoted once
+        mock_ibkr_client.get_market_snapshots.assert_called_once()
+        assert len(mock_ibkr_client.get_market_snapshots.call_args[0][0]) == 2
+
+        for follower_id in ("follower_a", "follower_b"):
+            status_data = json.loads(await fake_redis.get(f"tv:{follower_id}"))
+            assert status_data["status"] == "RISK"
+
+        metrics = tv_monitor.get_metrics()
+        assert metrics["sweep_count"] == 1
+        assert metrics["last_sweep_positions"] == 2
+        assert metrics["overrun_count"] == 0
+
+    def test_hysteresis_holds_status_near_boundary(self, tv_monitor):
+        """Test that a status is only lowered once the TV clears the boundary band."""
+        # Raising severity is immediate
+        assert tv_monitor._apply_hysteresis(TimeValueStatus.SAFE, 0.99) == TimeValueStatus.RISK
+        assert tv_monitor._apply_hysteresis(TimeValueStatus.RISK, 0.10) == TimeValueStatus.CRITICAL
+
+        # Lowering it needs the TV to clear the boundary by the $0.05 band
+        assert tv_monitor._apply_hysteresis(TimeValueStatus.RISK, 1.03) == TimeValueStatus.RISK
+        assert tv_monitor._apply_hysteresis(TimeValueStatus.RISK, 1.06) == TimeValueStatus.SAFE
+        assert tv_monitor._apply_hysteresis(TimeValueStatus.CRITICAL, 0.12) == (
+            TimeValueStatus.CRITICAL
+        )
+        assert tv_monitor._apply_hysteresis(None, 0.12) == TimeValueStatus.RISK
+
+    @pytest.mark.asyncio
+    async def test_streamed_tick_closes_position(
+        self, tv_monitor, mock_service, mock_ibkr_client, fake_redis
+    ):
+        """Test that a tick crossing the threshold closes the position without a sweep."""
+        mock_service.ibkr_manager.get_client = AsyncMock(return_value=mock_ibkr_client)
+        tv_monitor.streaming = True
+        tv_monitor.debounce = 0.01
+        tv_monitor._close_position = AsyncMock()
+
+        # Stream quotes through a real hub on a mocked IB connection
+        mock_ib = MagicMock()
+        mock_ib.reqMktData.side_effect = lambda *args: MagicMock(
+            midpoint=MagicMock(return_value=math.nan)
+        )
+        mock_ibkr_client.market_data = MarketDataHub(mock_ib)
+
+        mock_position = MagicMock()
+        mock_position.contract.secType = "OPT"
+        mock_position.contract.symbol = "QQQ"
+        mock_position.contract.lastTradeDateOrContractMonth = "20250110"
+        mock_position.contract.strike = 450.0
+        mock_position.contract.right = "P"
+        mock_position.position = -10
+        mock_ibkr_client.ib.positions.return_value = [mock_position]
+
+        # Sweep: underlying $445, option $5.50, TV $0.50, subscribes both
+        mock_ibkr_client.get_market_snapshots.side_effect = [snapshots(445.0, 5.50)]
+        await tv_monitor._check_all_positions()
+        assert tv_monitor.get_metrics()["watched_contracts"] == 2
+        tv_monitor._close_position.assert_not_called()
+
+        # Ticks: underlying $445, option $5.08, TV $0.08
+        tickers = []
+        for subscription in mock_ibkr_client.market_data._subscriptions.values():
+            is_underlying = subscription.contract is tv_monitor._underlying
+            subscription.ticker.midpoint.return_value = 445.0 if is_underlying else 5.08
+            tickers.append(subscription.ticker)
+        mock_ibkr_client.market_data._on_pending_tickers(tickers)
+        # A burst of ticks is evaluated once
+        mock_ibkr_client.market_data._on_pending_tickers(tickers)
+        await asyncio.sleep(0.05)
+
+        tv_monitor._close_position.assert_called_once_with(
+            "test_follower_123", mock_ibkr_client, mock_position.contract, -10, pytest.approx(0.08)
+        )
+        metrics = tv_monitor.get_metrics()
+        assert metrics["tick_evaluations"] == 1
+        assert 0 < metrics["last_trigger_latency_ms"] < 1000
+
+        # Unwatching releases the lines and ignores further ticks
+        tv_monitor._unwatch()
+        mock_ibkr_client.market_data._on_pending_tickers(tickers)
+        await asyncio.sleep(0.05)
+        tv_monitor._close_position.assert_called_once()
+        assert all(s.refs == 0 for s in mock_ibkr_client.market_data._subscriptions.values())
+
+    @pytest.mark.asyncio
+    async def test_streamed_close_is_not_repeated_after_fill(
+        self, tv_monitor, mock_service, mock_ibkr_client, fake_redis
+    ):
+        """Test that a filled close stops tick evaluation of the cached position."""
+        mock_service.ibkr_manager.get_client = AsyncMock(return_value=mock_ibkr_client)
+        tv_monitor.streaming = True
+        tv_monitor.debounce = 0.01
+        tv_monitor._close_position = AsyncMock(return_value=True)
+
+        mock_ib = MagicMock()
+        mock_ib.reqMktData.side_effect = lambda *args: MagicMock(
+            midpoint=MagicMock(return_value=math.nan)
+        )
+        mock_ibkr_client.market_data = MarketDataHub(mock_ib)
+
+        mock_position = MagicMock()
+        mock_position.contract.secType = "OPT"
+        mock_position.contract.symbol = "QQQ"
+        mock_position.contract.lastTradeDateOrContractMonth = "20250110"
+        mock_position.contract.strike = 450.0
+        mock_position.contract.right = "P"
+        mock_position.position = -10
+        mock_ibkr_client.ib.positions.return_value = [mock_position]
+
+        mock_ibkr_client.get_market_snapshots.side_effect = [snapshots(445.0, 5.50)]
+        await tv_monitor._check_all_positions()
+
+        async def tick(option_price):
+            tickers = []
+            for subscription in mock_ibkr_client.market_data._subscriptions.values():
+                is_underlying = subscription.contract is tv_monitor._underlying
+                price = 445.0 if is_underlying else option_price
+                subscription.ticker.midpoint.return_value = price
+                tickers.append(subscription.ticker)
+            mock_ibkr_client.market_data._on_pending_tickers(tickers)
+            await asyncio.sleep(0.05)
+
+        # TV drops to $0.08 and the close fills
+        await tick(5.08)
+        tv_monitor._close_position.assert_called_once()
+
+        # TV recovers and drops again before the next sweep
+        await tick(5.50)
+        await tick(5.08)
+        tv_monitor._close_position.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_close_skipped_when_live_position_is_flat(
+        self, tv_monitor, mock_service, mock_ibkr_client
+    ):
+        """Test that a close is not sent for a position that is already flat."""
+        tv_monitor._close_position = AsyncMock(return_value=True)
+        contract = MagicMock(conId=123)
+        mock_ibkr_client.ib.positions.return_value = [MagicMock(contract=contract, position=0)]
+
+        await tv_monitor._close_once("test_follower_123", mock_ibkr_client, contract, -10, 0.08)
+
+        tv_monitor._close_position.assert_not_called()
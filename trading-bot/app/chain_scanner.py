@@ -0,0 +1,299 @@
+"""Non-blocking option chain and greeks scanner.
+
+Strike selection needs the model delta of a set of candidate strikes. Qualifying
+and subscribing them one at a time costs a round trip each, which adds up to
+many seconds for a 20-strike sample. ``OptionChainScanner`` qualifies all
+candidates in a single batch, subscribes them all at once and returns as soon
+as every target delta is bracketed by two adjacent strikes, which is enough to
+know the strike closest to each target. Chains and conIds come from the shared
+daily contract cache, so a cache warmed before the open saves those round trips.
+
+Quotes usually arrive before IB's model greeks, so when the underlying price is
+known the deltas of strikes without model greeks are computed locally from
+their bid/ask with a vectorized Black-Scholes pass over the whole chain.
+"""
+
+import asyncio
+import math
+from collections.abc import Iterable
+
+import numpy as np
+from ib_insync import IB, Option, Stock
+from spreadpilot_core.ibkr.contract_cache import ContractCache, get_contract_cache
+from spreadpilot_core.logging import get_logger
+from spreadpilot_core.utils.black_scholes import chain_greeks, time_to_expiry
+
+logger = get_logger(__name__)
+
+
+def get_ticker_delta(ticker) -> float | None:
+    """
+    Get the absolute model delta of an option ticker.
+
+    Args:
+        ticker: ib_insync Ticker
+
+    Returns:
+        Absolute delta, or None if IB has not sent model greeks yet
+    """
+    greeks = getattr(ticker, "modelGreeks", None)
+    if not greeks or not greeks.delta:
+        return None
+    return abs(greeks.delta)
+
+
+def get_quote_deltas(
+    tickers: dict[float, object],
+    right: str,
+    underlying_price: float,
+    expiration: str,
+    rate: float = 0.0,
+) -> dict[float, float]:
+    """
+    Compute absolute deltas of option tickers from their bid/ask quotes.
+
+    Args:
+        tickers: ib_insync Ticker by strike
+        right: "P" or "C"
+        underlying_price: Current underlying price
+        expiration: Option expiration in YYYYMMDD format
+        rate: Annual risk-free rate
+
+    Returns:
+        Absolute delta by strike for the strikes with a usable two-sided quote
+    """
+    if not tickers:
+        return {}
+
+    strikes = list(tickers)
+    bids = [_quote_price(getattr(ticker, "bid", None)) for ticker in tickers.values()]
+    asks = [_quote_price(getattr(ticker, "ask", None)) for ticker in tickers.values()]
+    _, deltas = chain_greeks(
+        bids, asks, strikes, underlying_price, time_to_expiry(expiration), right, rate
+    )
+    return {
+        strike: abs(float(delta))
+        for strike, delta in zip(strikes, deltas)
+        if np.isfinite(delta) and delta != 0
+    }
+
+
+def _quote_price(value) -> float:
+    """Return a quote as a float, nan if IB has not sent it."""
+    if isinstance(value, int | float) and not math.isnan(value) and value > 0:
+        return float(value)
+    return math.nan
+
+
+def is_target_bracketed(strikes: list[float], deltas: dict[float, float], target: float) -> bool:
+    """
+    Check whether two adjacent strikes have deltas on either side of a target.
+
+    Delta is monotonic in strike, so once adjacent strikes straddle the target
+    the closest strike is one of the two, whatever the remaining strikes report.
+
+    Args:
+        strikes: Scanned strikes in ascending order
+        deltas: Absolute delta by strike for strikes that have reported
+        target: Target absolute delta
+
+    Returns:
+        True if the closest strike to the target is already known
+    """
+    for lower, upper in zip(strikes, strikes[1:]):
+        if lower in deltas and upper in deltas:
+            if (deltas[lower] - target) * (deltas[upper] - target) <= 0:
+                return True
+    return False
+
+
+class OptionChainScanner:
+    """
+    Scans option chains and model greeks without blocking the event loop.
+    """
+
+    def __init__(
+        self,
+        ib_client: IB,
+        greeks_timeout: float = 1.5,
+        contract_cache: ContractCache | None = None,
+        risk_free_rate: float = 0.045,
+    ):
+        """
+        Initialize the chain scanner.
+
+        Args:
+            ib_client: Interactive Brokers client for market data
+            greeks_timeout: Maximum seconds to wait for model greeks (default 1.5)
+            contract_cache: Contract cache to use (defaults to the shared cache)
+            risk_free_rate: Annual rate for deltas computed from quotes (default 0.045)
+        """
+        self.ib = ib_client
+        self.greeks_timeout = greeks_timeout
+        self.contract_cache = contract_cache
+        self.risk_free_rate = risk_free_rate
+
+    async def get_contract_cache(self) -> ContractCache:
+        """
+        Get the contract cache, attaching the shared one on first use.
+
+        Returns:
+            Contract cache
+        """
+        if self.contract_cache is None:
+            self.contract_cache = await get_contract_cache()
+        return self.contract_cache
+
+    async def qualify(self, *contracts) -> list:
+        """
+        Qualify contracts, using cached conIds where available.
+
+        Args:
+            *contracts: Contracts to qualify, updated in place
+
+        Returns:
+            Contracts that have a conId afterwards
+        """
+        cache = await self.get_contract_cache()
+        return await cache.qualify(self.ib, *contracts)
+
+    async def warm(self, symbol: str, expirations: list[str], strike_range=None) -> int:
+        """
+        Pre-qualify an underlying's options so the trading day skips contract lookups.
+
+        Args:
+            symbol: Underlying stock symbol
+            expirations: Expirations in YYYYMMDD format
+            strike_range: Inclusive (low, high) strike bounds, or None for all strikes
+
+        Returns:
+            Number of option contracts cached
+        """
+        cache = await self.get_contract_cache()
+        return await cache.warm(
+            self.ib, Stock(symbol, "SMART", "USD"), expirations, strike_range=strike_range
+        )
+
+    async def get_strikes(self, symbol: str, expiration: str) -> list[float]:
+        """
+        Get the strikes listed for an expiration.
+
+        Args:
+            symbol: Underlying stock symbol
+            expiration: Option expiration in YYYYMMDD format
+
+        Returns:
+            Strikes in ascending order, empty if no chain lists the expiration
+        """
+        cache = await self.get_contract_cache()
+        chains = await cache.get_chains(self.ib, Stock(symbol, "SMART", "USD"))
+        if not chains:
+            logger.error(f"No option chains available for {symbol}")
+            return []
+
+        for chain in chains:
+            if expiration in chain["expirations"]:
+                return chain["strikes"]
+
+        logger.error(f"No option chain found for {symbol} expiration {expiration}")
+        return []
+
+    async def scan_deltas(
+        self,
+        symbol: str,
+        expiration: str,
+        right: str,
+        strikes: Iterable[float],
+        target_deltas: Iterable[float] = (),
+        timeout: float | None = None,
+        underlying_price: float | None = None,
+    ) -> dict[float, float]:
+        """
+        Get the deltas of several strikes with one concurrent request.
+
+        IB's model delta is used where it has been sent. If the underlying price
+        is given, the remaining strikes get a delta computed from their quotes.
+
+        Args:
+            symbol: Underlying stock symbol
+            expiration: Option expiration in YYYYMMDD format
+            right: "P" or "C"
+            strikes: Strikes to scan
+            target_deltas: Absolute deltas being searched for; the scan ends as
+                soon as each one is bracketed by two adjacent strikes
+            timeout: Maximum seconds to wait for greeks (defaults to greeks_timeout)
+            underlying_price: Current underlying price, enables deltas from quotes
+
+        Returns:
+            Absolute delta by strike for the strikes that reported in time
+        """
+        strikes = sorted(strikes)
+        targets = list(target_deltas)
+        timeout = self.greeks_timeout if timeout is None else timeout
+
+        options = [Option(symbol, expiration, strike, right, "SMART") for strike in strikes]
+        await self.qualify(*options)
+        candidates = [(strike, option) for strike, option in zip(strikes, options) if option.conId]
+        if len(candidates) < len(options):
+            logger.warning(
+                f"Qualified {len(candidates)} of {len(options)} "
+                f"{symbol} {expiration} {right} strikes"
+            )
+        if not candidates:
+            return {}
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        updated = asyncio.Event()
+        subscribed: list[Option] = []
+        tickers = {}
+
+        def on_pending_tickers(pending):
+            updated.set()
+
+        self.ib.pendingTickersEvent += on_pending_tickers
+        try:
+            for strike, option in candidates:
+                tickers[strike] = self.ib.reqMktData(option, "", False, False)
+                subscribed.append(option)
+
+            while True:
+                updated.clear()
+                deltas = {
+                    strike: delta
+                    for strike, ticker in tickers.items()
+                    if (delta := get_ticker_delta(ticker)) is not None
+                }
+                if underlying_price and len(deltas) < len(tickers):
+                    missing = {
+                        strike: ticker for strike, ticker in tickers.items() if strike not in deltas
+                    }
+                    deltas.update(
+                        get_quote_deltas(
+                            missing, right, underlying_price, expiration, self.risk_free_rate
+                        )
+                    )
+                if len(deltas) == len(tickers):
+                    break
+                if targets and all(
+                    is_target_bracketed(list(tickers), deltas, target) for target in targets
+                ):
+                    break
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    logger.warning(
+                        f"Greeks for {len(deltas)} of {len(tickers)} {symbol} strikes "
+                        f"after {timeout}s"
+                    )
+                    break
+                try:
+                    await asyncio.wait_for(updated.wait(), timeout=remaining)
+                except TimeoutError:
+                    pass
+        finally:
+            self.ib.pendingTickersEvent -= on_pending_tickers
+            for option in subscribed:
+                self.ib.cancelMktData(option)
+
+        return deltas
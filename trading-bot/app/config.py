@@ -54,11 +54,26 @@ class Settings(BaseSettings):
         env="SMA_LONG_PERIOD",
         description="Long-term SMA period for trend analysis (days)",
     )
+    risk_free_rate: float = Field(
+        default=0.045,
+        env="RISK_FREE_RATE",
+        description="Annual risk-free rate for computing option deltas from quotes",
+    )
     qty_per_leg: int = Field(
         default=1,
         env="QTY_PER_LEG",
         description="Default quantity of contracts per leg",
     )
+    contract_cache_prewarm_time: str = Field(
+        default="09:00:00",
+        env="CONTRACT_CACHE_PREWARM_TIME",
+        description="Time to pre-qualify option contracts (HH:MM:SS in NY timezone)",
+    )
+    contract_cache_strike_range: float = Field(
+        default=0.08,
+        env="CONTRACT_CACHE_STRIKE_RANGE",
+        description="Fraction around the last close whose strikes are pre-qualified",
+    )
 
     # IBKR
     ib_gateway_host: str = Field(
@@ -76,6 +91,11 @@ class Settings(BaseSettings):
         env="IB_CLIENT_ID",
         description="IB client ID",
     )
+    ib_client_id_range: int = Field(
+        default=10,
+        env="IB_CLIENT_ID_RANGE",
+        description="Client IDs, from IB_CLIENT_ID up, to rotate through when one is still in use",
+    )
     ib_trading_mode: str = Field(
         default="paper",
         env="IB_TRADING_MODE",
@@ -104,6 +124,57 @@ class Settings(BaseSettings):
         description="Timeout in seconds for each limit order attempt",
     )
 
+    # Signal fan-out parameters
+    signal_fanout_enabled: bool = Field(
+        default=True,
+        env="SIGNAL_FANOUT_ENABLED",
+        description="Process signals for all active followers concurrently",
+    )
+    signal_fanout_max_in_flight: int = Field(
+        default=10,
+        env="SIGNAL_FANOUT_MAX_IN_FLIGHT",
+        description="Maximum number of followers processed concurrently for one signal",
+    )
+    signal_follower_timeout_seconds: float = Field(
+        default=120.0,
+        env="SIGNAL_FOLLOWER_TIMEOUT_SECONDS",
+        description="Deadline in seconds for processing a signal for a single follower",
+    )
+
+    # Emergency flatten parameters
+    flatten_max_in_flight: int = Field(
+        default=50,
+        env="FLATTEN_MAX_IN_FLIGHT",
+        description="Maximum number of followers flattened concurrently",
+    )
+    flatten_fill_timeout_seconds: float = Field(
+        default=10.0,
+        env="FLATTEN_FILL_TIMEOUT_SECONDS",
+        description="Seconds to wait for the closing orders of a follower to fill",
+    )
+    flatten_follower_timeout_seconds: float = Field(
+        default=30.0,
+        env="FLATTEN_FOLLOWER_TIMEOUT_SECONDS",
+        description="Deadline in seconds for flattening a single follower",
+    )
+
+    # Time value monitor parameters
+    time_value_streaming_enabled: bool = Field(
+        default=True,
+        env="TIME_VALUE_STREAMING_ENABLED",
+        description="Re-evaluate time value on every tick of streamed position quotes",
+    )
+    time_value_debounce_ms: float = Field(
+        default=250.0,
+        env="TIME_VALUE_DEBOUNCE_MS",
+        description="Milliseconds ticks are collected before one streamed time value check",
+    )
+    time_value_hysteresis: float = Field(
+        default=0.05,
+        env="TIME_VALUE_HYSTERESIS",
+        description="Dollars time value must clear a status boundary by to lower the status",
+    )
+
     # Polling parameters
     polling_interval_seconds: float = Field(
         default=1.0,
@@ -115,6 +186,16 @@ class Settings(BaseSettings):
         env="POSITION_CHECK_INTERVAL_SECONDS",
         description="Interval in seconds for checking positions",
     )
+    position_check_max_in_flight: int = Field(
+        default=10,
+        env="POSITION_CHECK_MAX_IN_FLIGHT",
+        description="Maximum number of followers whose positions are checked concurrently",
+    )
+    position_check_timeout_seconds: float = Field(
+        default=30.0,
+        env="POSITION_CHECK_TIMEOUT_SECONDS",
+        description="Deadline in seconds for checking positions of a single follower",
+    )
 
     # Firestore
     firestore_emulator_host: str | None = Field(
@@ -137,6 +137,13 @@ class TradeSignal(BaseModel):
     follower_id: str | None = None
 
 
+class FlattenRequest(BaseModel):
+    """Emergency flatten request model."""
+
+    follower_ids: list[str] | None = None
+    reason: str = "Emergency flatten"
+
+
 @app.on_event("startup")
 async def startup_event():
     """Initialize the application on startup."""
@@ -227,6 +234,8 @@ async def get_status():
         "ibkr_connected": trading_service.is_ibkr_connected(),
         "signal_generator_enabled": trading_service.is_signal_generator_enabled(),
         "active_followers": trading_service.get_active_follower_count(),
+        "time_value_monitor": trading_service.time_value_monitor.get_metrics(),
+        "position_check": trading_service.position_manager.last_check_stats,
     }
 
 
@@ -257,6 +266,20 @@ async def process_trade_signal(signal: TradeSignal):
     return result
 
 
+@app.post("/close/all")
+async def close_all_positions():
+    """Close all positions for all followers."""
+    if not trading_service:
+        raise HTTPException(status_code=503, detail="Trading bot is not initialized")
+
+    logger.info("Closing all positions for all followers")
+
+    # Close all positions
+    result = await trading_service.close_all_positions()
+
+    return result
+
+
 @app.post("/close/{follower_id}")
 async def close_positions(follower_id: str):
     """Close all positions for a follower."""
@@ -271,18 +294,31 @@ async def close_positions(follower_id: str):
     return result
 
 
-@app.post("/close/all")
-async def close_all_positions():
-    """Close all positions for all followers."""
+@app.post("/flatten")
+async def start_flatten(request: FlattenRequest):
+    """Start closing all positions of all (or the given) followers concurrently."""
     if not trading_service:
         raise HTTPException(status_code=503, detail="Trading bot is not initialized")
 
-    logger.info("Closing all positions for all followers")
+    logger.warning(f"Emergency flatten requested: {request.reason}")
 
-    # Close all positions
-    result = await trading_service.close_all_positions()
+    # Progress is published to Redis and available from GET /flatten/{run_id}
+    return await trading_service.flatten_engine.start(
+        follower_ids=request.follower_ids, reason=request.reason
+    )
 
-    return result
+
+@app.get("/flatten/{run_id}")
+async def get_flatten_run(run_id: str):
+    """Get the progress of an emergency flatten run."""
+    if not trading_service:
+        raise HTTPException(status_code=503, detail="Trading bot is not initialized")
+
+    run = trading_service.flatten_engine.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Flatten run {run_id} not found")
+
+    return run
 
 
 @app.exception_handler(Exception)
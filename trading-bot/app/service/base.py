@@ -24,6 +24,7 @@ from spreadpilot_core.utils.time import (
 from ..config import VERTICAL_SPREADS_STRATEGY, Settings
 from ..signal_generator import QQQSignalGenerator
 from .alerts import AlertManager
+from .flatten import FlattenEngine
 from .ibkr import IBKRManager
 from .pnl_service import PnLService
 from .positions import PositionManager
@@ -78,7 +79,13 @@ class TradingService:
         self.alert_manager = AlertManager(self)
         self.signal_processor = SignalProcessor(self)
         self.pnl_service = PnLService(self)
-        self.time_value_monitor = TimeValueMonitor(self)
+        self.flatten_engine = FlattenEngine(self)
+        self.time_value_monitor = TimeValueMonitor(
+            self,
+            streaming=settings.time_value_streaming_enabled,
+            debounce=settings.time_value_debounce_ms / 1000,
+            hysteresis=settings.time_value_hysteresis,
+        )
         self.vertical_spreads_strategy_handler = VerticalSpreadsStrategyHandler(
             self, VERTICAL_SPREADS_STRATEGY
         )
@@ -148,6 +155,8 @@ class TradingService:
                     sma_short_period=self.settings.sma_short_period,
                     sma_long_period=self.settings.sma_long_period,
                     qty_per_leg=self.settings.qty_per_leg,
+                    risk_free_rate=self.settings.risk_free_rate,
+                    prewarm_strike_range=self.settings.contract_cache_strike_range,
                 )
                 logger.info("Signal generator initialized successfully")
             else:
@@ -10,6 +10,7 @@ import ib_insync
 import redis.asyncio as redis
 from ib_insync import LimitOrder
 from spreadpilot_core.ibkr.client import IBKRClient, OrderStatus
+from spreadpilot_core.ibkr.order_tracker import TERMINAL_ORDER_STATUSES, OrderTracker
 from spreadpilot_core.logging import get_logger
 from spreadpilot_core.models.alert import Alert, AlertSeverity
 
@@ -29,6 +30,8 @@ class VerticalSpreadExecutor:
         self.ibkr_client = ibkr_client
         self.redis_url = redis_url
         self.redis_client: redis.Redis | None = None
+        # Fills wake the ladder through trade events instead of polling
+        self.order_tracker = OrderTracker()
         logger.info("VerticalSpreadExecutor initialized")
 
     async def connect_redis(self):
@@ -329,9 +332,12 @@ class VerticalSpreadExecutor:
             long_contract = self.ibkr_client._get_qqq_option_contract(strike_long, long_right)
             short_contract = self.ibkr_client._get_qqq_option_contract(strike_short, short_right)
 
-            # Get market prices
-            long_price = await self.ibkr_client.get_market_price(long_contract)
-            short_price = await self.ibkr_client.get_market_price(short_contract)
+            # Get market prices for both legs in one request
+            long_snapshot, short_snapshot = await self.ibkr_client.get_market_snapshots(
+                [long_contract, short_contract]
+            )
+            long_price = long_snapshot.mid if long_snapshot else None
+            short_price = short_snapshot.mid if short_snapshot else None
 
             if long_price is None or short_price is None:
                 return {
@@ -459,17 +465,18 @@ class VerticalSpreadExecutor:
                 # Place the order
                 trade = self.ibkr_client.ib.placeOrder(combo_contract, order)
 
-                # Wait for fill or timeout
-                start_time = time.time()
-                while time.time() - start_time < timeout_per_attempt:
-                    await asyncio.sleep(0.1)
-                    self.ibkr_client.ib.waitOnUpdate(timeout=0.1)
+                # Wait for fill, cancellation or timeout
+                status = await self.order_tracker.wait_for_status(
+                    trade, timeout=timeout_per_attempt
+                )
 
-                    if trade.orderStatus.status in ["Filled", "Cancelled", "Inactive"]:
-                        break
+                # Cancel an unfilled order before checking the outcome, since it
+                # can still fill while the cancel is in flight
+                if status not in TERMINAL_ORDER_STATUSES and trade.orderStatus.filled == 0:
+                    status = await self.order_tracker.cancel(self.ibkr_client.ib, trade)
 
                 # Check if order was filled
-                if trade.orderStatus.status == "Filled":
+                if status == "Filled":
                     logger.info(
                         f"Order filled on attempt {attempt} for follower {follower_id}",
                         extra={
@@ -493,7 +500,7 @@ class VerticalSpreadExecutor:
                     }
 
                 # Check for IB rejection
-                elif trade.orderStatus.status in ["Cancelled", "Inactive"]:
+                elif status in ["Cancelled", "Inactive"]:
                     # Check if this was an IB rejection rather than timeout cancellation
                     rejection_reasons = [
                         "reject",
@@ -523,12 +530,14 @@ class VerticalSpreadExecutor:
                         }
 
                 # Check for partial fills
-                if trade.orderStatus.status == "Submitted" and trade.orderStatus.filled > 0:
+                if trade.orderStatus.filled > 0:
                     logger.info(
                         f"Partial fill on attempt {attempt} for follower {follower_id}",
-                        order_id=trade.order.orderId,
-                        filled=trade.orderStatus.filled,
-                        remaining=trade.orderStatus.remaining,
+                        extra={
+                            "order_id": trade.order.orderId,
+                            "filled": trade.orderStatus.filled,
+                            "remaining": trade.orderStatus.remaining,
+                        },
                     )
 
                     return {
@@ -543,11 +552,6 @@ class VerticalSpreadExecutor:
                         "final_limit": current_limit_price,
                     }
 
-                # Cancel unfilled order before next attempt
-                if trade.orderStatus.status not in ["Cancelled", "Inactive"]:
-                    self.ibkr_client.ib.cancelOrder(order)
-                    await asyncio.sleep(0.5)  # Wait for cancellation
-
                 # Increment limit price for next attempt (make it less negative)
                 current_limit_price += price_increment
 
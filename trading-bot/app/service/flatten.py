@@ -0,0 +1,241 @@
+"""Emergency flatten engine for SpreadPilot trading service.
+
+Flattening closes every open leg of every follower. All followers are closed
+concurrently, up to ``flatten_max_in_flight`` at a time. Each follower sends
+the closing orders for all of its legs before awaiting any fill, and fills are
+awaited through order status events, so the time to flat is close to one fill
+round trip rather than the sum over accounts and legs. Followers that trade in
+the same IB account are closed once, by the first of them, since closing the
+account for each would send its closing orders several times over.
+
+Each run is tracked in memory and published to Redis. ``flatten:{run_id}``
+holds the latest snapshot of the run. The ``flatten:{run_id}:events`` stream
+gets one entry per closed leg and per finished follower, plus a final entry
+when the run completes. The admin API relays that stream to operators.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from spreadpilot_core.logging import get_logger
+from spreadpilot_core.utils.redis_client import get_redis_client
+from spreadpilot_core.utils.time import get_ny_time
+
+logger = get_logger(__name__)
+
+FLATTEN_KEY_PREFIX = "flatten"
+
+# Seconds runs and their event streams are kept in Redis
+FLATTEN_RUN_TTL_SECONDS = 24 * 3600
+
+
+class FlattenEngine:
+    """Concurrent close-out of all followers' positions with progress reporting."""
+
+    def __init__(self, service):
+        """Initialize the flatten engine.
+
+        Args:
+            service: Trading service instance
+        """
+        self.service = service
+        self.runs: dict[str, dict[str, Any]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+        logger.info("Initialized flatten engine")
+
+    async def start(
+        self, follower_ids: list[str] | None = None, reason: str = "Emergency flatten"
+    ) -> dict[str, Any]:
+        """Start flattening in the background.
+
+        Args:
+            follower_ids: Followers to flatten (default: all active followers)
+            reason: Reason recorded with the run
+
+        Returns:
+            Initial snapshot of the run, including its run_id
+        """
+        run = self._new_run(follower_ids, reason)
+        # Publish before returning so the run ID can be followed right away
+        await self._publish_started(run)
+        task = asyncio.create_task(self._execute(run))
+        self._tasks[run["run_id"]] = task
+        task.add_done_callback(lambda _: self._tasks.pop(run["run_id"], None))
+        return dict(run)
+
+    async def flatten(
+        self, follower_ids: list[str] | None = None, reason: str = "Emergency flatten"
+    ) -> dict[str, Any]:
+        """Flatten and wait for the run to finish.
+
+        Args:
+            follower_ids: Followers to flatten (default: all active followers)
+            reason: Reason recorded with the run
+
+        Returns:
+            Final snapshot of the run
+        """
+        run = self._new_run(follower_ids, reason)
+        await self._publish_started(run)
+        await self._execute(run)
+        return run
+
+    def get_run(self, run_id: str) -> dict[str, Any] | None:
+        """Get the latest snapshot of a run.
+
+        Args:
+            run_id: Run ID returned by start or flatten
+
+        Returns:
+            Run snapshot, or None if the run is unknown
+        """
+        return self.runs.get(run_id)
+
+    def _new_run(self, follower_ids: list[str] | None, reason: str) -> dict[str, Any]:
+        if follower_ids is None:
+            follower_ids = list(self.service.active_followers)
+
+        run = {
+            "run_id": uuid.uuid4().hex,
+            "reason": reason,
+            "status": "RUNNING",
+            "started_at": get_ny_time().isoformat(),
+            "followers_total": len(follower_ids),
+            "followers_done": 0,
+            "followers_flat": 0,
+            "legs_done": 0,
+            "legs_filled": 0,
+            "duration_ms": None,
+            "time_to_flat_ms": None,
+            "follower_ids": follower_ids,
+            "results": {},
+        }
+        self.runs[run["run_id"]] = run
+        return run
+
+    async def _execute(self, run: dict[str, Any]):
+        """Close all followers of a run concurrently and record the outcome."""
+        settings = self.service.settings
+        semaphore = asyncio.Semaphore(max(1, settings.flatten_max_in_flight))
+        started_at = time.monotonic()
+
+        logger.warning(
+            f"Flattening {run['followers_total']} followers (run {run['run_id']}): "
+            f"{run['reason']}"
+        )
+
+        def elapsed_ms() -> float:
+            return (time.monotonic() - started_at) * 1000
+
+        async def flatten_account(follower_ids: list[str]):
+            follower_id = follower_ids[0]
+
+            async def on_leg_done(leg: dict[str, Any]):
+                run["legs_done"] += 1
+                if leg["status"] == "Filled":
+                    run["legs_filled"] += 1
+                await self._publish(
+                    run,
+                    {
+                        "event": "leg",
+                        "follower_id": follower_id,
+                        "elapsed_ms": elapsed_ms(),
+                        **leg,
+                    },
+                )
+
+            async with semaphore:
+                result = await self._flatten_follower(follower_id, on_leg_done)
+
+            flat = result["success"] and all(
+                leg["status"] == "Filled" for leg in result.get("results", [])
+            )
+            for account_follower_id in follower_ids:
+                run["results"][account_follower_id] = {**result, "flat": flat}
+                run["followers_done"] += 1
+                run["followers_flat"] += flat
+                await self._publish(
+                    run,
+                    {
+                        "event": "follower",
+                        "follower_id": account_follower_id,
+                        "flat": flat,
+                        "error": result.get("error"),
+                        "elapsed_ms": elapsed_ms(),
+                    },
+                )
+
+        accounts = await self.service.ibkr_manager.group_by_account(run["follower_ids"])
+        await asyncio.gather(*(flatten_account(follower_ids) for follower_ids in accounts))
+
+        run["duration_ms"] = elapsed_ms()
+        if run["followers_flat"] == run["followers_total"]:
+            run["status"] = "COMPLETED"
+            run["time_to_flat_ms"] = run["duration_ms"]
+        else:
+            run["status"] = "PARTIAL"
+
+        logger.warning(
+            f"Flatten run {run['run_id']} {run['status']}: "
+            f"{run['followers_flat']}/{run['followers_total']} followers flat, "
+            f"{run['legs_filled']}/{run['legs_done']} legs filled in {run['duration_ms']:.0f} ms"
+        )
+        await self._publish(
+            run,
+            {
+                "event": "completed",
+                "status": run["status"],
+                "time_to_flat_ms": run["time_to_flat_ms"],
+                "elapsed_ms": run["duration_ms"],
+            },
+        )
+
+    async def _flatten_follower(
+        self, follower_id: str, on_leg_done: Callable[[dict[str, Any]], Awaitable[None]]
+    ) -> dict[str, Any]:
+        """Close one follower's positions within the per-follower deadline."""
+        if follower_id not in self.service.active_followers:
+            return {"success": False, "error": f"Follower not found or not active: {follower_id}"}
+
+        settings = self.service.settings
+        timeout = settings.flatten_follower_timeout_seconds
+        try:
+            return await asyncio.wait_for(
+                self.service.ibkr_manager.close_positions(
+                    follower_id,
+                    timeout=settings.flatten_fill_timeout_seconds,
+                    on_leg_done=on_leg_done,
+                ),
+                timeout=timeout,
+            )
+        except TimeoutError:
+            logger.error(f"Flattening follower {follower_id} exceeded {timeout}s deadline")
+            return {"success": False, "error": f"Timed out after {timeout}s"}
+        except Exception as e:
+            logger.error(f"Error flattening follower {follower_id}: {e}", exc_info=True)
+            return {"success": False, "error": str(e)}
+
+    async def _publish_started(self, run: dict[str, Any]):
+        """Store the initial snapshot of a run and its started event."""
+        await self._publish(run, {"event": "started", "followers": run["followers_total"]})
+
+    async def _publish(self, run: dict[str, Any], event: dict[str, Any]):
+        """Store the run snapshot and append an event to its Redis stream."""
+        redis_client = await get_redis_client()
+        if redis_client is None:
+            return
+
+        key = f"{FLATTEN_KEY_PREFIX}:{run['run_id']}"
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                pipe.set(key, json.dumps(run), ex=FLATTEN_RUN_TTL_SECONDS)
+                pipe.xadd(f"{key}:events", {"data": json.dumps(event)})
+                pipe.expire(f"{key}:events", FLATTEN_RUN_TTL_SECONDS)
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error publishing flatten progress for run {run['run_id']}: {e}")
@@ -1,13 +1,25 @@
 """IBKR manager for SpreadPilot trading service."""
 
-from spreadpilot_core.ibkr import IBKRClient
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ib_insync import IB
+from spreadpilot_core.ibkr import ConnectionRegistry, IBKRClient
 from spreadpilot_core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
 class IBKRManager:
-    """Manager for IBKR client interactions."""
+    """Manager for IBKR client interactions.
+
+    Followers share one long-lived session per IB Gateway, owned by a
+    ConnectionRegistry, instead of each opening their own connection. Every
+    operation for a follower is therefore scoped to the follower's IB account,
+    and work fanned out over followers must act once per account; see
+    group_by_account.
+    """
 
     def __init__(self, service):
         """Initialize the IBKR manager.
@@ -16,78 +28,137 @@ class IBKRManager:
             service: Trading service instance
         """
         self.service = service
-        self.ibkr_clients: dict[str, IBKRClient] = {}
+        self.connections = ConnectionRegistry(
+            client_id_start=service.settings.ib_client_id,
+            client_id_end=service.settings.ib_client_id + service.settings.ib_client_id_range - 1,
+        )
+        # IBKR credentials of followers whose secret has been fetched
+        self._credentials: dict[str, dict[str, str]] = {}
 
         logger.info("Initialized IBKR manager")
 
+    @property
+    def ib(self) -> IB:
+        """IB connection of the gateway session, connected once a client is requested."""
+        return self.connections.get_client(*self._gateway(), **self._client_kwargs()).ib
+
     async def get_client(self, follower_id: str) -> IBKRClient | None:
         """Get IBKR client for a follower.
 
+        The client is the gateway's shared session. While that session is up
+        this returns without any I/O; its health is tracked from IB's
+        connection events rather than probed on every call.
+
         Args:
             follower_id: Follower ID
 
         Returns:
             IBKR client or None if not available
         """
-        # Check if client already exists
-        if follower_id in self.ibkr_clients:
-            # Check if client is connected
-            client = self.ibkr_clients[follower_id]
-            if await client.ensure_connected():
-                return client
-
-            # Client is not connected, remove it
-            del self.ibkr_clients[follower_id]
-
         # Get follower
         follower = self.service.active_followers.get(follower_id)
         if not follower:
             logger.error(f"Follower not found: {follower_id}")
+            self._credentials.pop(follower_id, None)
             return None
 
-        # Get IBKR password from Secret Manager
-        ibkr_password = await self.service.get_secret(follower.ibkr_secret_ref)
-        if not ibkr_password:
-            logger.error(f"Failed to get IBKR password for follower {follower_id}")
-            return None
+        credentials = self._credentials.get(follower_id)
+        if credentials is None:
+            # Get IBKR password from Secret Manager
+            ibkr_password = await self.service.get_secret(follower.ibkr_secret_ref)
+            if not ibkr_password:
+                logger.error(f"Failed to get IBKR password for follower {follower_id}")
+                return None
 
-        # Create IBKR client
-        client = IBKRClient(
-            username=follower.ibkr_username,
-            password=ibkr_password,
-            trading_mode=self.service.settings.ib_trading_mode,
-            host=self.service.settings.ib_gateway_host,
-            port=self.service.settings.ib_gateway_port,
-            client_id=self.service.settings.ib_client_id,
-        )
+            credentials = {"username": follower.ibkr_username, "password": ibkr_password}
+            self._credentials[follower_id] = credentials
 
-        # Connect to IBKR
-        if not await client.connect():
+        # Connects only if the gateway session is down
+        client = await self.connections.connect(
+            *self._gateway(), **self._client_kwargs(credentials)
+        )
+        if not client:
             logger.error(f"Failed to connect to IBKR for follower {follower_id}")
             return None
 
-        # Store client
-        self.ibkr_clients[follower_id] = client
+        return client
+
+    def get_account(self, follower_id: str, client: IBKRClient) -> str | None:
+        """Get the IB account a follower trades in on its gateway session.
+
+        Args:
+            follower_id: Follower ID
+            client: The follower's client, from get_client
+
+        Returns:
+            The follower's configured account, else the session's default account
+        """
+        follower = self.service.active_followers.get(follower_id)
+        return getattr(follower, "ibkr_account_id", None) or client.default_account
+
+    async def group_by_account(self, follower_ids: list[str]) -> list[list[str]]:
+        """Group followers that trade in the same account of the same gateway session.
+
+        Closing, exercising or checking positions for each follower of a group
+        would act on the one account once per follower, so callers fanning
+        out over followers act once per group instead. Followers whose client
+        cannot be had form groups of their own, so their errors are reported
+        per follower.
 
-        logger.info(
-            "Connected to IBKR",
-            follower_id=follower_id,
-            username=follower.ibkr_username,
+        Args:
+            follower_ids: Follower IDs
+
+        Returns:
+            Groups of follower IDs, in the order of their first follower
+        """
+        clients = await asyncio.gather(
+            *(self.get_client(follower_id) for follower_id in follower_ids),
+            return_exceptions=True,
         )
 
-        return client
+        groups: dict[Any, list[str]] = {}
+        for follower_id, client in zip(follower_ids, clients):
+            if client is None or isinstance(client, BaseException):
+                key = follower_id
+            else:
+                key = (client.host, client.port, self.get_account(follower_id, client))
+            groups.setdefault(key, []).append(follower_id)
+        return list(groups.values())
+
+    async def get_gateway_client(self) -> IBKRClient | None:
+        """Get the gateway's shared session for work not tied to one follower.
+
+        Returns:
+            IBKR client or None if the gateway cannot be reached
+        """
+        return await self.connections.connect(*self._gateway(), **self._client_kwargs())
 
     async def disconnect_all(self):
-        """Disconnect all IBKR clients."""
-        for follower_id, client in self.ibkr_clients.items():
-            try:
-                await client.disconnect()
-                logger.info(f"Disconnected from IBKR for follower {follower_id}")
-            except Exception as e:
-                logger.error(f"Error disconnecting from IBKR for follower {follower_id}: {e}")
+        """Disconnect all IBKR gateway sessions."""
+        await self.connections.close_all()
+        self._credentials = {}
+
+    def _gateway(self) -> tuple[str, int]:
+        """Get the host and port of the IB Gateway followers trade through."""
+        return self.service.settings.ib_gateway_host, self.service.settings.ib_gateway_port
+
+    def _client_kwargs(self, credentials: dict[str, str] | None = None) -> dict[str, str]:
+        """Get the IBKRClient arguments for a new gateway session.
 
-        # Clear clients
-        self.ibkr_clients = {}
+        The gateway is already logged in, so credentials only label the session.
+
+        Args:
+            credentials: Username and password of the requesting follower, if any
+
+        Returns:
+            Keyword arguments for IBKRClient
+        """
+        return {
+            "username": "",
+            "password": "",
+            "trading_mode": self.service.settings.ib_trading_mode,
+            **(credentials or {}),
+        }
 
     async def check_margin_for_trade(
         self,
@@ -120,6 +191,7 @@ class IBKRManager:
             qty_per_leg=qty_per_leg,
             strike_long=strike_long,
             strike_short=strike_short,
+            account=self.get_account(follower_id, client),
         )
 
     async def place_vertical_spread(
@@ -160,13 +232,21 @@ class IBKRManager:
             price_increment=self.service.settings.price_increment,
             min_price=self.service.settings.min_price,
             timeout_seconds=self.service.settings.timeout_seconds,
+            account=self.get_account(follower_id, client),
         )
 
-    async def close_positions(self, follower_id: str) -> dict:
-        """Close all positions for a follower.
+    async def close_positions(
+        self,
+        follower_id: str,
+        timeout: float = 1.0,
+        on_leg_done: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
+    ) -> dict:
+        """Close all positions in a follower's account.
 
         Args:
             follower_id: Follower ID
+            timeout: Seconds to wait for the closing orders to fill
+            on_leg_done: Coroutine function called with each leg's result
 
         Returns:
             Dict with results
@@ -180,7 +260,11 @@ class IBKRManager:
             }
 
         # Close positions
-        result = await client.close_all_positions()
+        result = await client.close_all_positions(
+            timeout=timeout,
+            on_leg_done=on_leg_done,
+            account=self.get_account(follower_id, client),
+        )
 
         return {
             "success": result.get("status") == "SUCCESS",
@@ -219,6 +303,7 @@ class IBKRManager:
             strike=strike,
             right=right,
             quantity=quantity,
+            account=self.get_account(follower_id, client),
         )
 
         return {
@@ -227,9 +312,9 @@ class IBKRManager:
         }
 
     def is_connected(self) -> bool:
-        """Check if any IBKR client is connected.
+        """Check if any IBKR gateway session is connected.
 
         Returns:
-            True if any client is connected, False otherwise
+            True if any session is connected, False otherwise
         """
-        return len(self.ibkr_clients) > 0
+        return self.connections.is_connected()
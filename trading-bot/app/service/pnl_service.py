@@ -17,6 +17,7 @@ from spreadpilot_core.models.pnl import (
     Quote,
     Trade,
 )
+from spreadpilot_core.utils.time import get_day_range, get_month_range
 from sqlalchemy import and_, desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -140,15 +141,18 @@ class PnLService:
                 logger.warning(f"No IBKR client available for follower {follower_id}")
                 return
 
-            # Get current P&L from IBKR
-            ibkr_pnl = await client.get_pnl()
-            if ibkr_pnl is None:
+            # Unrealized P&L of the follower's account from the live portfolio state,
+            # without a request to IBKR
+            account = self.trading_service.ibkr_manager.get_account(follower_id, client)
+            portfolio_pnl = await client.get_portfolio_pnl(account)
+            if not portfolio_pnl:
                 logger.warning(f"Could not get P&L from IBKR for follower {follower_id}")
                 return
+            ibkr_pnl = portfolio_pnl["unrealized_pnl"]
 
             # Calculate additional metrics
             position_count = self._count_active_positions(position_doc)
-            total_market_value = await self._calculate_market_value(client, position_doc)
+            total_market_value = await self._calculate_market_value(client, account)
             total_commission = await self._get_daily_commission(follower_id)
 
             # Store intraday P&L snapshot
@@ -176,11 +180,11 @@ class PnLService:
         short_qty = position_doc.get("short_qty", 0)
         return abs(long_qty) + abs(short_qty)
 
-    async def _calculate_market_value(self, client, position_doc: dict) -> Decimal:
-        """Calculate total market value of positions."""
+    async def _calculate_market_value(self, client, account: str | None) -> Decimal:
+        """Calculate total market value of an account's positions."""
         try:
             # Get current market value from IBKR
-            market_value = await client.get_portfolio_value()
+            market_value = await client.get_portfolio_value(account)
             return Decimal(str(market_value or 0))
         except Exception as e:
             logger.error(f"Error calculating market value: {e}")
@@ -189,14 +193,15 @@ class PnLService:
     async def _get_daily_commission(self, follower_id: str) -> Decimal:
         """Get total commission for today."""
         try:
-            today = datetime.date.today()
+            day_start, day_end = get_day_range(datetime.date.today())
 
             async with get_postgres_session() as session:
                 result = await session.execute(
                     select(func.sum(Trade.commission)).where(
                         and_(
                             Trade.follower_id == follower_id,
-                            func.date(Trade.trade_time) == today,
+                            Trade.trade_time >= day_start,
+                            Trade.trade_time < day_end,
                         )
                     )
                 )
@@ -280,7 +285,8 @@ class PnLService:
 
                 # Get current market quotes for all active positions
                 try:
-                    positions = client.ib.positions()
+                    account = self.trading_service.ibkr_manager.get_account(follower_id, client)
+                    positions = client.ib.positions(account)
                     for position in positions:
                         contract = position.contract
 
@@ -503,6 +509,7 @@ class PnLService:
                 last_snapshot = intraday_snapshots[-1]
 
                 # Get trade count and volume for the day
+                day_start, day_end = get_day_range(trading_date)
                 trades_result = await session.execute(
                     select(
                         func.count(Trade.id),
@@ -511,7 +518,8 @@ class PnLService:
                     ).where(
                         and_(
                             Trade.follower_id == follower_id,
-                            func.date(Trade.trade_time) == trading_date,
+                            Trade.trade_time >= day_start,
+                            Trade.trade_time < day_end,
                         )
                     )
                 )
@@ -580,6 +588,8 @@ class PnLService:
     async def _rollup_monthly_pnl(self, follower_id: str, year: int, month: int):
         """Rollup monthly P&L for a specific follower."""
         try:
+            month_start, month_end = get_month_range(year, month)
+
             async with get_postgres_session() as session:
                 # Get all daily summaries for the month
                 daily_result = await session.execute(
@@ -587,8 +597,8 @@ class PnLService:
                     .where(
                         and_(
                             PnLDaily.follower_id == follower_id,
-                            func.extract("year", PnLDaily.trading_date) == year,
-                            func.extract("month", PnLDaily.trading_date) == month,
+                            PnLDaily.trading_date >= month_start,
+                            PnLDaily.trading_date < month_end,
                         )
                     )
                     .order_by(PnLDaily.trading_date)
@@ -2,8 +2,11 @@
 
 import asyncio
 import datetime
+import time
+from collections.abc import Callable
 from typing import Any
 
+from pymongo import UpdateOne
 from spreadpilot_core.logging import get_logger
 from spreadpilot_core.models import AlertSeverity, AlertType, AssignmentState, Position, Trade
 from spreadpilot_core.utils.time import get_current_trading_date
@@ -22,6 +25,12 @@ class PositionManager:
         """
         self.service = service
         self.positions: dict[str, Position] = {}
+        self.last_check_stats: dict[str, Any] | None = None
+
+        # Refreshes triggered by position changes pushed from IB, between periodic checks
+        self._watched: dict[str, tuple[Any, Callable[[str], None], str | None]] = {}
+        self._change_checks: dict[str, asyncio.Task] = {}
+        self._recheck: set[str] = set()
 
         logger.info("Initialized position manager")
 
@@ -115,8 +124,7 @@ class PositionManager:
                     # Check if market is open
                     if self.service.is_market_open():
                         # Check positions for all active followers
-                        for follower_id in self.service.active_followers:
-                            await self.check_positions(follower_id)
+                        await self.check_all_positions()
 
                     # Wait for next check
                     await asyncio.sleep(self.service.settings.position_check_interval_seconds)
@@ -134,11 +142,87 @@ class PositionManager:
         except Exception as e:
             logger.error(f"Error in position check task: {e}", exc_info=True)
 
-    async def check_positions(self, follower_id: str):
+    async def check_all_positions(self) -> dict[str, Any]:
+        """Check positions of all active followers concurrently.
+
+        At most ``position_check_max_in_flight`` followers are checked at the
+        same time and each check is bounded by ``position_check_timeout_seconds``.
+        The position updates of all followers are written in one ``bulk_write``.
+        Followers that trade in the same IB account all record its positions,
+        but only the first of them handles an assignment, so it is exercised once.
+
+        Returns:
+            Cycle statistics: followers, timeouts, writes and durations
+        """
+        settings = self.service.settings
+        follower_ids = list(self.service.active_followers)
+        semaphore = asyncio.Semaphore(max(1, settings.position_check_max_in_flight))
+        timeout = settings.position_check_timeout_seconds
+        writes: list[UpdateOne] = []
+        started_at = time.monotonic()
+
+        async def check_follower(follower_id: str, handle_assignment: bool) -> bool:
+            async with semaphore:
+                try:
+                    await asyncio.wait_for(
+                        self.check_positions(follower_id, writes, handle_assignment), timeout
+                    )
+                    return True
+                except TimeoutError:
+                    logger.error(
+                        f"Position check for follower {follower_id} exceeded {timeout}s deadline"
+                    )
+                    return False
+
+        accounts = await self.service.ibkr_manager.group_by_account(follower_ids)
+        completed = await asyncio.gather(
+            *(
+                check_follower(follower_id, handle_assignment=index == 0)
+                for account_follower_ids in accounts
+                for index, follower_id in enumerate(account_follower_ids)
+            )
+        )
+        checked_at = time.monotonic()
+
+        if writes:
+            try:
+                await self.service.mongo_db["positions"].bulk_write(writes, ordered=False)
+            except Exception as e:
+                logger.error(f"Error writing {len(writes)} position updates to MongoDB: {e}")
+
+        stats = {
+            "followers": len(follower_ids),
+            "max_in_flight": settings.position_check_max_in_flight,
+            "timeouts": completed.count(False),
+            "writes": len(writes),
+            "check_ms": (checked_at - started_at) * 1000,
+            "write_ms": (time.monotonic() - checked_at) * 1000,
+            "total_ms": (time.monotonic() - started_at) * 1000,
+        }
+        self.last_check_stats = stats
+
+        logger.info(
+            f"Checked positions of {len(follower_ids)} followers in {stats['total_ms']:.0f} ms "
+            f"({stats['timeouts']} timed out, {len(writes)} writes)",
+            extra=stats,
+        )
+
+        return stats
+
+    async def check_positions(
+        self,
+        follower_id: str,
+        writes: list[UpdateOne] | None = None,
+        handle_assignment: bool = True,
+    ):
         """Check positions for a follower.
 
         Args:
             follower_id: Follower ID
+            writes: If given, the position update is appended here for a later
+                bulk write instead of being written right away
+            handle_assignment: Alert on and compensate a detected assignment;
+                otherwise only quantities and P&L are recorded
         """
         try:
             # Get IBKR client
@@ -147,8 +231,16 @@ class PositionManager:
                 logger.error(f"Failed to get IBKR client for follower {follower_id}")
                 return
 
+            # Positions are read from the follower's account of the shared session
+            account = self.service.ibkr_manager.get_account(follower_id, client)
+
+            # Check again as soon as IB reports a position change
+            self._watch_positions(follower_id, client, account)
+
             # Check for assignment
-            assignment_state, short_qty, long_qty = await client.check_assignment()
+            assignment_state, short_qty, long_qty = await client.check_assignment(account)
+            if not handle_assignment:
+                assignment_state = AssignmentState.NONE
 
             if not self.service.mongo_db:
                 logger.error("MongoDB not initialized, cannot check position.")
@@ -184,17 +276,16 @@ class PositionManager:
                 position.short_qty = short_qty
                 position.long_qty = long_qty
 
+            changed = False
+
             # Check for assignment
             if assignment_state == AssignmentState.ASSIGNED:
                 # Calculate missing short positions
                 missing_short_qty = long_qty - short_qty
 
                 logger.warning(
-                    "Assignment detected",
-                    follower_id=follower_id,
-                    short_qty=short_qty,
-                    long_qty=long_qty,
-                    missing_short_qty=missing_short_qty,
+                    f"Assignment detected for follower {follower_id}: short {short_qty}, "
+                    f"long {long_qty}, missing short {missing_short_qty}"
                 )
 
                 # Create alert
@@ -212,7 +303,8 @@ class PositionManager:
                 position.assignment_state = AssignmentState.ASSIGNED
                 position.updated_at = datetime.datetime.now(datetime.UTC)  # Ensure UTC
 
-                # Save position to MongoDB (Upsert)
+                # Save position to MongoDB (Upsert) right away, even in a batched check,
+                # so the assignment is recorded before options are exercised
                 position_dict = position.model_dump(
                     by_alias=True, exclude={"id"} if not existing_doc else {}
                 )
@@ -224,120 +316,205 @@ class PositionManager:
                 # Update cache
                 self.positions[follower_id] = position
 
-                # Exercise long options to compensate
-                # Note: This is a simplified implementation, in a real system we would need to
-                # determine the correct strike price for the long options to exercise
+                # Exercise long options to compensate. The exercise and its record run to
+                # completion even if the check exceeds its deadline, so a cancelled check
+                # cannot leave an exercised assignment marked ASSIGNED for the next cycle
                 if missing_short_qty > 0:
-                    # Get position details from IBKR to determine which long options to exercise
-                    positions = await client.get_positions(force_update=True)
-
-                    # Find long positions
-                    long_positions = {}
-                    for key, qty in positions.items():
-                        if qty > 0:  # Long position
-                            strike, right = key.split("-")
-                            long_positions[key] = {
-                                "strike": float(strike),
-                                "right": right,
-                                "qty": qty,
-                            }
-
-                    if long_positions:
-                        # Exercise the first long position we find
-                        # In a real system, we would need to be more selective
-                        key, pos = next(iter(long_positions.items()))
-
-                        logger.info(
-                            "Exercising long options",
-                            follower_id=follower_id,
-                            strike=pos["strike"],
-                            right=pos["right"],
-                            qty=min(missing_short_qty, pos["qty"]),
-                        )
-
-                        # Exercise options
-                        result = await self.service.ibkr_manager.exercise_options(
-                            follower_id=follower_id,
-                            strike=pos["strike"],
-                            right=pos["right"],
-                            quantity=min(missing_short_qty, pos["qty"]),
-                        )
-
-                        if result["success"]:
-                            # Update position state
-                            position.assignment_state = AssignmentState.COMPENSATED
-
-                            # Update position state
-                            position.assignment_state = AssignmentState.COMPENSATED
-                            position.updated_at = datetime.datetime.now(datetime.UTC)  # Ensure UTC
-
-                            # Save position to MongoDB (Update existing)
-                            # We know it exists because we just updated it to ASSIGNED
-                            position_dict = position.model_dump(
-                                by_alias=True
-                            )  # Don't exclude ID on update
-                            await positions_collection.update_one(
-                                query,
-                                {"$set": position_dict},
-                                # No upsert needed here, we expect it to exist
-                            )
-                            logger.debug(
-                                f"Updated compensated position for follower {follower_id} on {trading_date} to MongoDB."
-                            )
-
-                            # Update cache
-                            self.positions[follower_id] = position
-
-                            # Create alert
-                            await self.service.alert_manager.create_alert(
-                                follower_id=follower_id,
-                                alert_type=AlertType.ASSIGNMENT_COMPENSATED,
-                                severity=AlertSeverity.INFO,
-                                message=f"Assignment compensated for follower {follower_id}: exercised {min(missing_short_qty, pos['qty'])} options",
-                            )
-                        else:
-                            logger.error(
-                                f"Failed to exercise options: {result.get('error')}",
-                                follower_id=follower_id,
-                            )
-                    else:
-                        logger.error(
-                            "No long positions found to exercise",
-                            follower_id=follower_id,
+                    await asyncio.shield(
+                        self._compensate_assignment(
+                            follower_id, client, account, position, query, missing_short_qty
                         )
+                    )
 
             # Update P&L
-            pnl = await client.get_pnl()
+            pnl = await client.get_pnl(account)
             if pnl:
                 position.pnl_realized = pnl.get("realized_pnl", 0.0)
                 position.pnl_mtm = pnl.get("unrealized_pnl", 0.0)
 
                 position.updated_at = datetime.datetime.now(datetime.UTC)  # Ensure UTC
+                changed = True
 
+                # Update cache
+                self.positions[follower_id] = position
+
+            if changed:
                 # Save position to MongoDB (Upsert, as PNL update might be the first write)
                 position_dict = position.model_dump(
                     by_alias=True, exclude={"id"} if not existing_doc else {}
                 )
-                await positions_collection.update_one(query, {"$set": position_dict}, upsert=True)
-                logger.debug(
-                    f"Upserted PNL position for follower {follower_id} on {trading_date} to MongoDB."
+                if writes is not None:
+                    writes.append(UpdateOne(query, {"$set": position_dict}, upsert=True))
+                else:
+                    await positions_collection.update_one(
+                        query, {"$set": position_dict}, upsert=True
+                    )
+                    logger.debug(
+                        f"Upserted position for follower {follower_id} on {trading_date} "
+                        "to MongoDB."
+                    )
+
+            logger.debug(
+                f"Checked positions for follower {follower_id}: short {short_qty}, "
+                f"long {long_qty}, {assignment_state}, realized P&L {position.pnl_realized}, "
+                f"MTM {position.pnl_mtm}"
+            )
+
+        except Exception as e:
+            logger.error(f"Error checking positions for follower {follower_id}: {e}")
+
+    async def _compensate_assignment(
+        self,
+        follower_id: str,
+        client,
+        account: str | None,
+        position: Position,
+        query: dict[str, Any],
+        missing_short_qty: int,
+    ):
+        """Exercise long options against an assignment and record it as compensated.
+
+        The COMPENSATED state is written right away, like ASSIGNED, rather than
+        with the batched position update, so it is not lost if the check is
+        abandoned after the exercise.
+
+        Args:
+            follower_id: Follower ID
+            client: IBKR client of the follower
+            account: IB account of the follower
+            position: Position recorded as assigned
+            query: MongoDB filter of the position document
+            missing_short_qty: Number of assigned short options
+        """
+        try:
+            # Get live position details to determine which long options to exercise
+            positions = await client.get_positions(account=account)
+
+            # Find long positions
+            long_positions = {}
+            for key, qty in positions.items():
+                if qty > 0:  # Long position
+                    strike, right = key.split("-")
+                    long_positions[key] = {
+                        "strike": float(strike),
+                        "right": right,
+                        "qty": qty,
+                    }
+
+            if not long_positions:
+                logger.error(f"No long positions found to exercise for {follower_id}")
+                return
+
+            # Exercise the first long position we find
+            # In a real system, we would need to be more selective
+            key, pos = next(iter(long_positions.items()))
+            quantity = min(missing_short_qty, pos["qty"])
+
+            logger.info(
+                f"Exercising {quantity} long {pos['strike']}{pos['right']} options "
+                f"for follower {follower_id}"
+            )
+
+            # Exercise options
+            result = await self.service.ibkr_manager.exercise_options(
+                follower_id=follower_id,
+                strike=pos["strike"],
+                right=pos["right"],
+                quantity=quantity,
+            )
+
+            if not result["success"]:
+                logger.error(
+                    f"Failed to exercise options for follower {follower_id}: "
+                    f"{result.get('error')}"
                 )
+                return
 
-                # Update cache
-                self.positions[follower_id] = position
+            # Update position state
+            position.assignment_state = AssignmentState.COMPENSATED
+            position.updated_at = datetime.datetime.now(datetime.UTC)  # Ensure UTC
 
-            logger.debug(
-                "Checked positions",
+            # Update cache
+            self.positions[follower_id] = position
+
+            # Save position to MongoDB right away, even in a batched check
+            await self.service.mongo_db["positions"].update_one(
+                query,
+                {"$set": position.model_dump(by_alias=True, exclude={"id"})},
+                upsert=True,
+            )
+
+            # Create alert
+            await self.service.alert_manager.create_alert(
                 follower_id=follower_id,
-                short_qty=short_qty,
-                long_qty=long_qty,
-                assignment_state=assignment_state,
-                pnl_realized=position.pnl_realized,
-                pnl_mtm=position.pnl_mtm,
+                alert_type=AlertType.ASSIGNMENT_COMPENSATED,
+                severity=AlertSeverity.INFO,
+                message=(
+                    f"Assignment compensated for follower {follower_id}: "
+                    f"exercised {quantity} options"
+                ),
             )
 
         except Exception as e:
-            logger.error(f"Error checking positions for follower {follower_id}: {e}")
+            logger.error(f"Error compensating assignment for follower {follower_id}: {e}")
+
+    def _watch_positions(self, follower_id: str, client, account: str | None):
+        """Refresh a follower's recorded positions whenever its account's positions change.
+
+        Args:
+            follower_id: Follower ID
+            client: IBKR client of the follower
+            account: IB account of the follower, None for every account of the client
+        """
+        watched = self._watched.get(follower_id)
+        if watched is not None:
+            if watched[0] is client and watched[2] == account:
+                return
+            # The follower moved to another client or account
+            watched[0].position_store.remove_listener(watched[1])
+
+        def listener(changed_account: str):
+            if account is None or changed_account == account:
+                self._on_positions_changed(follower_id)
+
+        client.position_store.add_listener(listener)
+        self._watched[follower_id] = (client, listener, account)
+
+    def _on_positions_changed(self, follower_id: str):
+        """Schedule a refresh of a follower's recorded positions after a pushed change.
+
+        Args:
+            follower_id: Follower ID
+        """
+        if follower_id not in self.service.active_followers:
+            return
+
+        task = self._change_checks.get(follower_id)
+        if task is not None and not task.done():
+            # Checked again once the running check finishes
+            self._recheck.add(follower_id)
+            return
+
+        self._change_checks[follower_id] = asyncio.create_task(
+            self._check_on_change(follower_id)
+        )
+
+    async def _check_on_change(self, follower_id: str):
+        """Refresh a follower's positions until no further change arrived meanwhile.
+
+        The legs of a spread fill one at a time, so a pushed change can show a
+        long and short imbalance that only lasts until the next fill. Refreshes
+        therefore record quantities and P&L only; assignments are detected and
+        compensated by the periodic check.
+
+        Args:
+            follower_id: Follower ID
+        """
+        while True:
+            self._recheck.discard(follower_id)
+            await self.check_positions(follower_id, handle_assignment=False)
+            if follower_id not in self._recheck:
+                return
 
     async def close_positions(self, follower_id: str) -> dict[str, Any]:
         """Close all positions for a follower.
@@ -383,24 +560,15 @@ class PositionManager:
             }
 
     async def close_all_positions(self) -> dict[str, Any]:
-        """Close all positions for all followers.
+        """Close all positions for all followers concurrently.
 
         Returns:
-            Dict with results
+            Dict with results per follower and the flatten run summary
         """
-        results = {}
-        success = True
-
-        # Close positions for each follower
-        for follower_id in self.service.active_followers:
-            result = await self.close_positions(follower_id)
-            results[follower_id] = result
-
-            # Update overall success
-            if not result["success"]:
-                success = False
+        run = await self.service.flatten_engine.flatten(reason="Close all positions requested")
 
         return {
-            "success": success,
-            "results": results,
+            "success": run["status"] == "COMPLETED",
+            "results": run["results"],
+            "flatten": {key: value for key, value in run.items() if key != "results"},
         }
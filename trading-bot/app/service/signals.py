@@ -1,6 +1,8 @@
 """Signal processor for SpreadPilot trading service."""
 
+import asyncio
 import datetime
+import time
 import uuid
 from typing import Any
 
@@ -21,6 +23,9 @@ class SignalProcessor:
         """
         self.service = service
 
+        # Fan-out statistics for the most recent multi-follower signal
+        self.last_fanout_stats: dict[str, Any] = {}
+
         logger.info("Initialized signal processor")
 
     async def process_signal(
@@ -61,6 +66,14 @@ class SignalProcessor:
             )
 
         # Process for all active followers
+        if self.service.settings.signal_fanout_enabled:
+            return await self._fan_out_signal(
+                strategy=strategy,
+                qty_per_leg=qty_per_leg,
+                strike_long=strike_long,
+                strike_short=strike_short,
+            )
+
         results = {}
         for follower_id in self.service.active_followers:
             results[follower_id] = await self._process_signal_for_follower(
@@ -76,6 +89,100 @@ class SignalProcessor:
             "results": results,
         }
 
+    async def _fan_out_signal(
+        self,
+        strategy: str,
+        qty_per_leg: int,
+        strike_long: float,
+        strike_short: float,
+    ) -> dict[str, Any]:
+        """Process a trading signal for all active followers concurrently.
+
+        At most ``signal_fanout_max_in_flight`` followers are processed at the
+        same time and each follower is bounded by ``signal_follower_timeout_seconds``.
+        Results are keyed by follower ID in the order of ``active_followers``.
+
+        Args:
+            strategy: Strategy type ("Long" for Bull Put, "Short" for Bear Call)
+            qty_per_leg: Quantity per leg
+            strike_long: Strike price for long leg
+            strike_short: Strike price for short leg
+
+        Returns:
+            Dict with processing results and fan-out latency statistics
+        """
+        settings = self.service.settings
+        follower_ids = list(self.service.active_followers)
+        semaphore = asyncio.Semaphore(max(1, settings.signal_fanout_max_in_flight))
+        timeout = settings.signal_follower_timeout_seconds
+        signal_started_at = time.monotonic()
+
+        async def process_follower(follower_id: str) -> dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        self._process_signal_for_follower(
+                            follower_id=follower_id,
+                            strategy=strategy,
+                            qty_per_leg=qty_per_leg,
+                            strike_long=strike_long,
+                            strike_short=strike_short,
+                            signal_started_at=signal_started_at,
+                        ),
+                        timeout=timeout,
+                    )
+                except TimeoutError:
+                    logger.error(
+                        f"Signal processing for follower {follower_id} exceeded {timeout}s deadline"
+                    )
+
+                    await self.service.alert_manager.create_alert(
+                        follower_id=follower_id,
+                        alert_type=AlertType.LIMIT_REACHED,
+                        severity=AlertSeverity.CRITICAL,
+                        message=(
+                            f"Signal processing for follower {follower_id} timed out after "
+                            f"{timeout}s, verify open orders"
+                        ),
+                    )
+
+                    return {
+                        "success": False,
+                        "error": f"Timed out after {timeout}s",
+                    }
+
+        outcomes = await asyncio.gather(
+            *(process_follower(follower_id) for follower_id in follower_ids)
+        )
+        results = dict(zip(follower_ids, outcomes, strict=True))
+
+        # First-to-last order latency spread across followers that reached the broker
+        latencies = [
+            result["order_latency_ms"] for result in outcomes if "order_latency_ms" in result
+        ]
+        stats = {
+            "followers": len(follower_ids),
+            "max_in_flight": settings.signal_fanout_max_in_flight,
+            "orders": len(latencies),
+            "first_order_ms": min(latencies) if latencies else None,
+            "last_order_ms": max(latencies) if latencies else None,
+            "order_latency_spread_ms": (max(latencies) - min(latencies)) if latencies else None,
+            "total_ms": (time.monotonic() - signal_started_at) * 1000,
+        }
+        self.last_fanout_stats = stats
+
+        logger.info(
+            f"Processed {strategy} signal for {len(follower_ids)} followers, "
+            f"order latency spread {stats['order_latency_spread_ms']} ms",
+            extra=stats,
+        )
+
+        return {
+            "success": True,
+            "results": results,
+            "fanout": stats,
+        }
+
     async def _process_signal_for_follower(
         self,
         follower_id: str,
@@ -83,6 +190,7 @@ class SignalProcessor:
         qty_per_leg: int,
         strike_long: float,
         strike_short: float,
+        signal_started_at: float | None = None,
     ) -> dict[str, Any]:
         """Process a trading signal for a specific follower.
 
@@ -92,6 +200,8 @@ class SignalProcessor:
             qty_per_leg: Quantity per leg
             strike_long: Strike price for long leg
             strike_short: Strike price for short leg
+            signal_started_at: Monotonic start time of the signal fan-out (optional),
+                used to report the latency until this follower's first order was sent
 
         Returns:
             Dict with processing results
@@ -131,6 +241,13 @@ class SignalProcessor:
                 strike_short=strike_short,
             )
 
+            # Latency to the first order submission, not to the end of the limit ladder
+            order_latency = {}
+            if signal_started_at is not None and result.get("submitted_at") is not None:
+                order_latency["order_latency_ms"] = (
+                    result["submitted_at"] - signal_started_at
+                ) * 1000
+
             # Check result
             if result["status"] == "REJECTED":
                 logger.error(f"Order rejected for follower {follower_id}: {result.get('error')}")
@@ -159,6 +276,7 @@ class SignalProcessor:
                 return {
                     "success": False,
                     "error": result.get("error", "Order rejected"),
+                    **order_latency,
                 }
 
             # Create trade record
@@ -212,12 +330,14 @@ class SignalProcessor:
 
             logger.info(
                 "Processed signal for follower",
-                follower_id=follower_id,
-                strategy=strategy,
-                qty_per_leg=qty_per_leg,
-                strike_long=strike_long,
-                strike_short=strike_short,
-                status=result["status"],
+                extra={
+                    "follower_id": follower_id,
+                    "strategy": strategy,
+                    "qty_per_leg": qty_per_leg,
+                    "strike_long": strike_long,
+                    "strike_short": strike_short,
+                    "status": result["status"],
+                },
             )
 
             return {
@@ -226,6 +346,7 @@ class SignalProcessor:
                 "status": result["status"],
                 "filled": result.get("filled", qty_per_leg),
                 "fill_price": result.get("fill_price", 0),
+                **order_latency,
             }
         except Exception as e:
             logger.error(
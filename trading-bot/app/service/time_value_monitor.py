@@ -1,11 +1,23 @@
 """Time Value Monitor for SpreadPilot trading service.
 
 Monitors open positions and automatically closes them when time value falls below $0.10.
+Each cycle is one concurrent sweep over all followers: the underlying and every
+distinct option are quoted once, however many followers hold them. Followers
+that trade in the same IB account are swept once, through the first of them,
+so a position of the account is evaluated and closed only once.
+
+In streaming mode the sweep also keeps live subscriptions to QQQ and every held
+option, and each batch of ticks re-evaluates the positions it affects. Ticks
+are debounced, so a threshold crossing reaches ``_close_position`` within the
+debounce window plus one evaluation instead of up to a whole interval later.
+Status changes use a hysteresis band so a time value hovering at a boundary
+does not flood the alerts stream.
 """
 
 import asyncio
 import json
 import time
+from collections import defaultdict
 from enum import Enum
 from typing import Any
 
@@ -14,6 +26,7 @@ import redis.asyncio as redis
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from ib_insync import Contract, MarketOrder
+from spreadpilot_core.ibkr.contract_cache import get_contract_key
 from spreadpilot_core.logging import get_logger
 from spreadpilot_core.models.alert import Alert, AlertSeverity
 
@@ -28,15 +41,35 @@ class TimeValueStatus(str, Enum):
     CRITICAL = "CRITICAL"  # TV <= $0.10
 
 
+# Status ranks, from safest to most severe
+_STATUS_RANK = {
+    TimeValueStatus.SAFE: 0,
+    TimeValueStatus.RISK: 1,
+    TimeValueStatus.CRITICAL: 2,
+}
+
+UNDERLYING_KEY = ("QQQ", "", 0.0, "")
+
+
 class TimeValueMonitor:
     """Monitor for tracking time value of open positions."""
 
-    def __init__(self, service, redis_url: str = "redis://localhost:6379"):
+    def __init__(
+        self,
+        service,
+        redis_url: str = "redis://localhost:6379",
+        streaming: bool = False,
+        debounce: float = 0.25,
+        hysteresis: float = 0.05,
+    ):
         """Initialize the time value monitor.
 
         Args:
             service: Trading service instance
             redis_url: Redis connection URL
+            streaming: Re-evaluate positions on every tick of streamed quotes
+            debounce: Seconds ticks are collected before one streamed evaluation
+            hysteresis: Dollars the time value must clear a boundary by to lower a status
         """
         self.service = service
         self.redis_url = redis_url
@@ -46,6 +79,35 @@ class TimeValueMonitor:
         self.is_running = False
         self.scheduler = AsyncIOScheduler()
 
+        # Sweep metrics
+        self.sweep_count = 0
+        self.last_sweep_positions = 0
+        self.last_sweep_duration_ms = 0.0
+        self.max_sweep_duration_ms = 0.0
+        self.overrun_count = 0
+
+        # Streaming state
+        self.streaming = streaming
+        self.debounce = debounce
+        self.hysteresis = hysteresis
+        self._underlying = ib_insync.Stock("QQQ", "SMART", "USD")
+        self._stream_hub: Any = None
+        # Contract key -> contract subscribed on the stream hub
+        self._watched: dict[tuple, Any] = {}
+        # Contract key -> (follower ID, IBKR client, position) holding it
+        self._holders: dict[tuple, list[tuple[str, Any, Any]]] = {}
+        # (follower ID, contract key) -> last streamed status
+        self._statuses: dict[tuple, TimeValueStatus] = {}
+        self._closing: set[tuple] = set()
+        self._dirty: set[tuple] = set()
+        self._dirty_since: float | None = None
+        self._evaluation: asyncio.Task | None = None
+
+        # Streaming metrics
+        self.tick_evaluations = 0
+        self.last_trigger_latency_ms = 0.0
+        self.max_trigger_latency_ms = 0.0
+
         logger.info("Initialized time value monitor")
 
     async def connect_redis(self):
@@ -89,7 +151,14 @@ class TimeValueMonitor:
 
         self.scheduler.start()
         self.is_running = True
-        logger.info("Started time value monitoring with 60s interval")
+        logger.info(
+            f"Started time value monitoring with {self.monitoring_interval}s interval"
+            f"{' and streaming quotes' if self.streaming else ''}"
+        )
+
+        # Subscribe right away instead of waiting out the first interval
+        if self.streaming:
+            await self._check_all_positions()
 
     async def stop_monitoring(self):
         """Stop the time value monitoring."""
@@ -99,22 +168,27 @@ class TimeValueMonitor:
 
         self.is_running = False
         self.scheduler.shutdown(wait=False)
+        if self._evaluation:
+            self._evaluation.cancel()
+            self._evaluation = None
+        self._unwatch()
         await self.disconnect_redis()
         logger.info("Stopped time value monitoring")
 
     async def _check_all_positions(self):
-        """Check time value for all open positions."""
+        """Sweep the time value of all followers' positions and record its duration."""
         logger.debug("Checking time value for all positions")
 
-        # Get all active followers
-        for follower_id, follower in self.service.active_followers.items():
-            try:
-                await self._check_follower_positions(follower_id, follower)
-            except Exception as e:
-                logger.error(
-                    f"Error checking positions for follower {follower_id}: {e}",
-                    exc_info=True,
-                )
+        started = time.monotonic()
+        positions_checked = 0
+        try:
+            positions_checked = await self._sweep(
+                list(self.service.active_followers), watch=self.streaming
+            )
+        except Exception as e:
+            logger.error(f"Error sweeping time value of positions: {e}", exc_info=True)
+        finally:
+            self._record_sweep(time.monotonic() - started, positions_checked)
 
     async def _check_follower_positions(self, follower_id: str, follower: Any):
         """Check time value for a specific follower's positions.
@@ -123,38 +197,120 @@ class TimeValueMonitor:
             follower_id: Follower ID
             follower: Follower object
         """
-        # Get IBKR client for this follower
-        ibkr_client = await self.service.ibkr_manager.get_client(follower_id)
-        if not ibkr_client:
-            logger.warning(f"No IBKR client available for follower {follower_id}")
-            return
+        await self._sweep([follower_id])
 
-        # Ensure connected
-        if not await ibkr_client.ensure_connected():
-            logger.error(f"Failed to connect to IB Gateway for follower {follower_id}")
-            return
+    async def _sweep(self, follower_ids: list[str], watch: bool = False) -> int:
+        """Check the time value of several followers' positions in one pass.
 
-        # Get all positions from IB
-        try:
-            positions = ibkr_client.ib.positions()
+        Positions of all followers are fetched concurrently, once per IB
+        account. The underlying and every distinct option held by any of them
+        are quoted once, in a single snapshot request, and the thresholds of
+        all positions are then evaluated and acted on concurrently.
 
-            for position in positions:
-                contract = position.contract
+        Args:
+            follower_ids: IDs of the followers to check
+            watch: Stream quotes of exactly the positions found until the next sweep
 
-                # Only check QQQ options
-                if contract.secType == "OPT" and contract.symbol == "QQQ":
-                    await self._check_position_time_value(
-                        follower_id, ibkr_client, position, contract
-                    )
+        Returns:
+            Number of positions checked
+        """
+        # One follower per account, so shared positions are not acted on twice
+        follower_ids = [
+            account_follower_ids[0]
+            for account_follower_ids in await self.service.ibkr_manager.group_by_account(
+                follower_ids
+            )
+        ]
+        holdings = await asyncio.gather(
+            *(self._get_follower_positions(follower_id) for follower_id in follower_ids)
+        )
+        positions = [
+            (follower_id, ibkr_client, position)
+            for follower_id, (ibkr_client, follower_positions) in zip(follower_ids, holdings)
+            for position in follower_positions
+        ]
+        if watch:
+            self._watch(positions)
+        if not positions:
+            return 0
+
+        # Any connected follower client can quote contracts held by the others
+        contracts = {}
+        for _, _, position in positions:
+            contracts.setdefault(get_contract_key(position.contract), position.contract)
+        quote_client = positions[0][1]
+        underlying_snapshot, *option_snapshots = await quote_client.get_market_snapshots(
+            [ib_insync.Stock("QQQ", "SMART", "USD"), *contracts.values()]
+        )
+
+        underlying_price = underlying_snapshot.mid if underlying_snapshot else None
+        if underlying_price is None:
+            logger.warning("Failed to get underlying QQQ price")
+            return 0
+
+        market_prices = {
+            key: snapshot.mid if snapshot else None
+            for key, snapshot in zip(contracts, option_snapshots)
+        }
+
+        await asyncio.gather(
+            *(
+                self._check_position_time_value(
+                    follower_id,
+                    ibkr_client,
+                    position,
+                    market_prices[get_contract_key(position.contract)],
+                    underlying_price,
+                )
+                for follower_id, ibkr_client, position in positions
+            )
+        )
+        return len(positions)
+
+    async def _get_follower_positions(self, follower_id: str) -> tuple[Any, list[Any]]:
+        """Get a follower's IBKR client and the QQQ option positions of its account.
+
+        Args:
+            follower_id: Follower ID
+
+        Returns:
+            (IBKR client, positions); the client is None and positions empty on failure
+        """
+        try:
+            # Get IBKR client for this follower
+            ibkr_client = await self.service.ibkr_manager.get_client(follower_id)
+            if not ibkr_client:
+                logger.warning(f"No IBKR client available for follower {follower_id}")
+                return None, []
+
+            # Ensure connected
+            if not await ibkr_client.ensure_connected():
+                logger.error(f"Failed to connect to IB Gateway for follower {follower_id}")
+                return None, []
+
+            # Only check QQQ options in the follower's account
+            account = self.service.ibkr_manager.get_account(follower_id, ibkr_client)
+            positions = [
+                position
+                for position in ibkr_client.ib.positions(account)
+                if position.contract.secType == "OPT" and position.contract.symbol == "QQQ"
+            ]
+            return ibkr_client, positions
 
         except Exception as e:
             logger.error(
                 f"Error getting positions for follower {follower_id}: {e}",
                 exc_info=True,
             )
+            return None, []
 
     async def _check_position_time_value(
-        self, follower_id: str, ibkr_client: Any, position: Any, contract: Contract
+        self,
+        follower_id: str,
+        ibkr_client: Any,
+        position: Any,
+        market_price: float | None,
+        underlying_price: float,
     ):
         """Check time value for a specific position.
 
@@ -162,24 +318,18 @@ class TimeValueMonitor:
             follower_id: Follower ID
             ibkr_client: IBKR client instance
             position: IB position object
-            contract: IB contract object
+            market_price: Option mid price, None if it could not be quoted
+            underlying_price: QQQ price
         """
+        contract = position.contract
         try:
-            # Get market price for the option
-            market_price = await ibkr_client.get_market_price(contract)
             if market_price is None:
                 logger.warning(
-                    f"Failed to get market price for {contract.symbol} {contract.strike} {contract.right}"
+                    f"Failed to get market price for {contract.symbol} {contract.strike} "
+                    f"{contract.right}"
                 )
                 return
 
-            # Get underlying price
-            underlying_contract = ib_insync.Stock("QQQ", "SMART", "USD")
-            underlying_price = await ibkr_client.get_market_price(underlying_contract)
-            if underlying_price is None:
-                logger.warning("Failed to get underlying QQQ price")
-                return
-
             # Calculate intrinsic value
             intrinsic_value = self._calculate_intrinsic_value(
                 contract.strike, contract.right, underlying_price
@@ -192,16 +342,10 @@ class TimeValueMonitor:
             status = self._get_time_value_status(time_value)
 
             logger.info(
-                "Position time value check",
-                follower_id=follower_id,
-                symbol=contract.symbol,
-                strike=contract.strike,
-                right=contract.right,
-                position_qty=position.position,
-                market_price=market_price,
-                intrinsic_value=intrinsic_value,
-                time_value=time_value,
-                status=status,
+                f"Position time value check for follower {follower_id}: "
+                f"{contract.symbol} {contract.strike}{contract.right} x{position.position}, "
+                f"price {market_price:.2f}, intrinsic {intrinsic_value:.2f}, "
+                f"TV {time_value:.2f} ({status.value})"
             )
 
             # Publish status to Redis key
@@ -215,20 +359,330 @@ class TimeValueMonitor:
 
             # If critical (TV <= $0.10), close the position
             if status == TimeValueStatus.CRITICAL and position.position != 0:
-                await self._close_position(
+                await self._close_once(
                     follower_id, ibkr_client, contract, position.position, time_value
                 )
 
         except Exception as e:
             logger.error(
-                f"Error checking time value for position: {e}",
-                follower_id=follower_id,
-                contract_symbol=contract.symbol,
-                strike=contract.strike,
-                right=contract.right,
+                f"Error checking time value for follower {follower_id} position "
+                f"{contract.symbol} {contract.strike}{contract.right}: {e}",
                 exc_info=True,
             )
 
+    def _watch(self, positions: list[tuple[str, Any, Any]]):
+        """Stream quotes of the underlying and every held option.
+
+        Subscriptions live on the market data hub of the first follower's
+        client. New contracts are subscribed before dropped ones are released,
+        so contracts held across sweeps keep their market data line.
+
+        Args:
+            positions: (follower ID, IBKR client, position) of all followers
+        """
+        if not positions:
+            self._unwatch()
+            return
+
+        hub = positions[0][1].market_data
+        if hub is not self._stream_hub:
+            self._unwatch()
+            self._stream_hub = hub
+            hub.add_listener(self._on_ticks)
+
+        holders = defaultdict(list)
+        for follower_id, ibkr_client, position in positions:
+            holders[get_contract_key(position.contract)].append(
+                (follower_id, ibkr_client, position)
+            )
+
+        wanted = {key: held[0][2].contract for key, held in holders.items()}
+        wanted[UNDERLYING_KEY] = self._underlying
+        watched = {}
+        for key, contract in wanted.items():
+            # Re-acquiring every contract also resubscribes after a reconnect
+            if hub.acquire(contract) is not None:
+                watched[key] = contract
+        for contract in self._watched.values():
+            hub.release(contract)
+
+        self._watched = watched
+        self._holders = dict(holders)
+        held = {(follower_id, key) for key, held in holders.items() for follower_id, *_ in held}
+        self._statuses = {
+            state: status for state, status in self._statuses.items() if state in held
+        }
+
+    def _unwatch(self):
+        """Release every streamed quote and stop listening for ticks."""
+        if self._stream_hub is not None:
+            self._stream_hub.remove_listener(self._on_ticks)
+            for contract in self._watched.values():
+                self._stream_hub.release(contract)
+        self._stream_hub = None
+        self._watched = {}
+        self._holders = {}
+        self._dirty.clear()
+
+    def _on_ticks(self, contracts: list[Any]):
+        """Mark the positions of ticked contracts for the next streamed evaluation.
+
+        Args:
+            contracts: Contracts that received a valid tick
+        """
+        keys = {get_contract_key(contract) for contract in contracts}.intersection(
+            self._watched
+        )
+        if not keys:
+            return
+
+        self._dirty.update(keys)
+        if self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+        if self._evaluation is None:
+            self._evaluation = asyncio.create_task(self._evaluate_ticks())
+
+    async def _evaluate_ticks(self):
+        """Evaluate the positions ticked during the debounce window."""
+        try:
+            await asyncio.sleep(self.debounce)
+        finally:
+            self._evaluation = None
+        keys, self._dirty = self._dirty, set()
+        ticked_at, self._dirty_since = self._dirty_since, None
+
+        try:
+            hub = self._stream_hub
+            underlying_price = hub.get_price(self._underlying) if hub else None
+            if underlying_price is None:
+                return
+
+            # An underlying tick moves the intrinsic value of every position
+            if UNDERLYING_KEY in keys:
+                keys = set(self._holders)
+
+            self.tick_evaluations += 1
+            await asyncio.gather(
+                *(
+                    self._evaluate_streamed_position(
+                        follower_id, ibkr_client, position, key, underlying_price, ticked_at
+                    )
+                    for key in keys
+                    for follower_id, ibkr_client, position in self._holders.get(key, [])
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error evaluating streamed time value: {e}", exc_info=True)
+
+    async def _evaluate_streamed_position(
+        self,
+        follower_id: str,
+        ibkr_client: Any,
+        position: Any,
+        key: tuple,
+        underlying_price: float,
+        ticked_at: float,
+    ):
+        """Re-evaluate one position from streamed prices, acting on status changes.
+
+        Args:
+            follower_id: Follower ID
+            ibkr_client: IBKR client instance
+            position: IB position object
+            key: Contract key of the position
+            underlying_price: Streamed QQQ price
+            ticked_at: Monotonic time of the first tick of the evaluation
+        """
+        contract = position.contract
+        # Quotes may have been released by a sweep since the ticks arrived
+        watched = self._watched.get(key)
+        market_price = self._stream_hub.get_price(watched) if watched is not None else None
+        if market_price is None:
+            return
+
+        time_value = market_price - self._calculate_intrinsic_value(
+            contract.strike, contract.right, underlying_price
+        )
+        state = (follower_id, key)
+        previous = self._statuses.get(state)
+        status = self._apply_hysteresis(previous, time_value)
+        self._statuses[state] = status
+        if status == previous:
+            return
+
+        logger.info(
+            f"Streamed time value of follower {follower_id} {contract.symbol} "
+            f"{contract.strike}{contract.right} is {time_value:.2f} "
+            f"({previous.value if previous else 'new'} -> {status.value})"
+        )
+
+        actions = [self._publish_time_value_status(follower_id, time_value, status)]
+        if status in [TimeValueStatus.RISK, TimeValueStatus.CRITICAL]:
+            actions.append(
+                self._publish_time_value_alert(
+                    follower_id, contract, position.position, time_value, status
+                )
+            )
+        if status == TimeValueStatus.CRITICAL and position.position != 0:
+            latency_ms = (time.monotonic() - ticked_at) * 1000
+            self.last_trigger_latency_ms = latency_ms
+            self.max_trigger_latency_ms = max(self.max_trigger_latency_ms, latency_ms)
+            actions.append(
+                self._close_once(follower_id, ibkr_client, contract, position.position, time_value)
+            )
+        await asyncio.gather(*actions)
+
+    def _apply_hysteresis(
+        self, previous: TimeValueStatus | None, time_value: float
+    ) -> TimeValueStatus:
+        """Get a position's status, lowering it only once clear of the boundary.
+
+        Args:
+            previous: Last status of the position, None if not evaluated yet
+            time_value: Current time value
+
+        Returns:
+            New status
+        """
+        status = self._get_time_value_status(time_value)
+        if previous is None or _STATUS_RANK[status] >= _STATUS_RANK[previous]:
+            return status
+
+        boundary = self.tv_threshold if previous == TimeValueStatus.CRITICAL else 1.00
+        if time_value <= boundary + self.hysteresis:
+            return previous
+        return status
+
+    async def _close_once(
+        self,
+        follower_id: str,
+        ibkr_client: Any,
+        contract: Contract,
+        position_qty: int,
+        time_value: float,
+    ):
+        """Close a position unless a close of it is already in flight.
+
+        The quantity is re-read from the connection's live positions, since the
+        position passed in may be cached from a sweep that ran before an
+        earlier close filled. A closed position is no longer evaluated on ticks.
+
+        Args:
+            follower_id: Follower ID
+            ibkr_client: IBKR client instance
+            contract: Option contract
+            position_qty: Position quantity
+            time_value: Current time value
+        """
+        state = (follower_id, get_contract_key(contract))
+        if state in self._closing:
+            logger.debug(f"Close of {contract.symbol} already in flight for {follower_id}")
+            return
+
+        position_qty = self._get_live_quantity(follower_id, ibkr_client, contract, position_qty)
+        if position_qty == 0:
+            logger.info(
+                f"Position {contract.symbol} {contract.strike}{contract.right} of follower "
+                f"{follower_id} is already closed"
+            )
+            self._forget(state)
+            return
+
+        self._closing.add(state)
+        try:
+            if await self._close_position(
+                follower_id, ibkr_client, contract, position_qty, time_value
+            ):
+                self._forget(state)
+        finally:
+            self._closing.discard(state)
+
+    def _get_live_quantity(
+        self, follower_id: str, ibkr_client: Any, contract: Contract, position_qty: int
+    ) -> int:
+        """Get the current quantity of a position from the connection's live positions.
+
+        Args:
+            follower_id: Follower ID
+            ibkr_client: IBKR client instance
+            contract: Option contract
+            position_qty: Quantity to fall back to if positions cannot be read
+
+        Returns:
+            Signed position quantity, 0 if the position is gone
+        """
+        key = get_contract_key(contract)
+        try:
+            account = self.service.ibkr_manager.get_account(follower_id, ibkr_client)
+            return int(
+                sum(
+                    position.position
+                    for position in ibkr_client.ib.positions(account)
+                    if get_contract_key(position.contract) == key
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Could not read live position of follower {follower_id}: {e}")
+            return position_qty
+
+    def _forget(self, state: tuple):
+        """Stop evaluating a closed position on ticks until a sweep finds it again.
+
+        Args:
+            state: (follower ID, contract key) of the position
+        """
+        follower_id, key = state
+        held = [holder for holder in self._holders.get(key, []) if holder[0] != follower_id]
+        if held:
+            self._holders[key] = held
+        else:
+            self._holders.pop(key, None)
+        self._statuses.pop(state, None)
+
+    def _record_sweep(self, duration: float, positions_checked: int):
+        """Update sweep metrics, warning when a sweep overruns the interval.
+
+        Args:
+            duration: Sweep duration in seconds
+            positions_checked: Number of positions checked
+        """
+        duration_ms = duration * 1000
+        self.sweep_count += 1
+        self.last_sweep_positions = positions_checked
+        self.last_sweep_duration_ms = duration_ms
+        self.max_sweep_duration_ms = max(self.max_sweep_duration_ms, duration_ms)
+
+        if duration > self.monitoring_interval:
+            self.overrun_count += 1
+            logger.warning(
+                f"Time value sweep of {positions_checked} positions took {duration:.1f}s, "
+                f"longer than the {self.monitoring_interval}s interval"
+            )
+        else:
+            logger.debug(
+                f"Time value sweep of {positions_checked} positions took {duration_ms:.0f}ms"
+            )
+
+    def get_metrics(self) -> dict[str, Any]:
+        """Get sweep metrics.
+
+        Returns:
+            Dictionary with sweep counters and durations
+        """
+        return {
+            "sweep_count": self.sweep_count,
+            "last_sweep_positions": self.last_sweep_positions,
+            "last_sweep_duration_ms": round(self.last_sweep_duration_ms, 3),
+            "max_sweep_duration_ms": round(self.max_sweep_duration_ms, 3),
+            "overrun_count": self.overrun_count,
+            "monitoring_interval_s": self.monitoring_interval,
+            "streaming": self.streaming,
+            "watched_contracts": len(self._watched),
+            "tick_evaluations": self.tick_evaluations,
+            "last_trigger_latency_ms": round(self.last_trigger_latency_ms, 3),
+            "max_trigger_latency_ms": round(self.max_trigger_latency_ms, 3),
+        }
+
     def _calculate_intrinsic_value(
         self, strike: float, right: str, underlying_price: float
     ) -> float:
@@ -349,15 +803,14 @@ class TimeValueMonitor:
             contract: Option contract
             position_qty: Position quantity
             time_value: Current time value
+
+        Returns:
+            True if the closing order filled
         """
         logger.warning(
-            "Closing position due to critical time value",
-            follower_id=follower_id,
-            symbol=contract.symbol,
-            strike=contract.strike,
-            right=contract.right,
-            position_qty=position_qty,
-            time_value=time_value,
+            f"Closing position due to critical time value for follower {follower_id}: "
+            f"{contract.symbol} {contract.strike}{contract.right} x{position_qty}, "
+            f"TV {time_value:.2f}"
         )
 
         try:
@@ -365,7 +818,12 @@ class TimeValueMonitor:
             # If long position (qty > 0), sell to close
             # If short position (qty < 0), buy to close
             action = "SELL" if position_qty > 0 else "BUY"
-            order = MarketOrder(action=action, totalQuantity=abs(position_qty), transmit=True)
+            order = MarketOrder(
+                action=action,
+                totalQuantity=abs(position_qty),
+                account=self.service.ibkr_manager.get_account(follower_id, ibkr_client) or "",
+                transmit=True,
+            )
 
             # Place the order
             trade = ibkr_client.ib.placeOrder(contract, order)
@@ -376,10 +834,8 @@ class TimeValueMonitor:
             # Check order status
             if trade.orderStatus.status == "Filled":
                 logger.info(
-                    "Successfully closed position",
-                    follower_id=follower_id,
-                    order_id=trade.order.orderId,
-                    fill_price=trade.orderStatus.avgFillPrice,
+                    f"Successfully closed position for follower {follower_id}: "
+                    f"order {trade.order.orderId} filled at {trade.orderStatus.avgFillPrice}"
                 )
 
                 # Publish success alert
@@ -393,20 +849,16 @@ class TimeValueMonitor:
 
                 if self.redis_client:
                     await self.redis_client.xadd("alerts", {"data": alert.model_dump_json()})
-            else:
-                logger.error(
-                    "Failed to close position",
-                    follower_id=follower_id,
-                    order_status=trade.orderStatus.status,
-                    order_id=trade.order.orderId,
-                )
+                return True
+
+            logger.error(
+                f"Failed to close position for follower {follower_id}: "
+                f"order {trade.order.orderId} is {trade.orderStatus.status}"
+            )
 
         except Exception as e:
             logger.error(
-                f"Error closing position: {e}",
-                follower_id=follower_id,
-                contract_symbol=contract.symbol,
-                strike=contract.strike,
-                right=contract.right,
+                f"Error closing position for follower {follower_id} "
+                f"{contract.symbol} {contract.strike}{contract.right}: {e}",
                 exc_info=True,
             )
@@ -19,7 +19,7 @@ logger = get_logger(__name__)
 class VerticalSpreadsStrategyHandler:
     """
     Implements the logic for the Vertical Spreads on QQQ trading strategy.
-    Manages its own IBKR connection and state.
+    Manages its own state on the trading service's shared IBKR connection.
     """
 
     def __init__(self, service: "TradingService", config: dict[str, Any]):
@@ -38,6 +38,8 @@ class VerticalSpreadsStrategyHandler:
         self._initialized = False
         self._last_signal_check = None
         self._last_time_value_check = None
+        self._last_prewarm_date = None
+        self._prewarm_task: asyncio.Task | None = None
         logger.info("VerticalSpreadsStrategyHandler initialized.")
 
     async def initialize(self):
@@ -54,16 +56,10 @@ class VerticalSpreadsStrategyHandler:
 
         logger.info("Initializing VerticalSpreadsStrategyHandler...")
         try:
-            # Use a dedicated IBKR client for the strategy
-            ib_settings = {
-                "host": self.service.settings.ib_gateway_host,
-                "port": self.service.settings.ib_gateway_port,
-                "client_id": self.service.settings.ib_client_id + 20,  # Use a different client ID
-                "account": None,  # Let ib_insync determine account or fetch from secrets
-                "trading_mode": self.service.settings.ib_trading_mode,
-            }
-            self.ibkr_client = IBKRClient(**ib_settings)
-            await self.ibkr_client.connect()
+            # Share the trading service's gateway session instead of opening another
+            self.ibkr_client = await self.service.ibkr_manager.get_gateway_client()
+            if not self.ibkr_client:
+                raise ConnectionError("IB Gateway session is not available")
             logger.info("IBKR client connected for Vertical Spreads Strategy.")
 
             # Fetch initial positions for QQQ
@@ -104,11 +100,27 @@ class VerticalSpreadsStrategyHandler:
 
         logger.info("Starting VerticalSpreadsStrategyHandler run loop...")
         try:
+            prewarm_time = datetime.datetime.strptime(
+                self.service.settings.contract_cache_prewarm_time, "%H:%M:%S"
+            ).time()
+
             while not shutdown_event.is_set():
                 # 1. Check if it's time to check for signals (9:27 AM NY Time)
                 ny_time = get_ny_time()
                 is_signal_time = ny_time.hour == 9 and ny_time.minute == 27
 
+                # Warm the contract cache once a day ahead of the signal, in the background
+                if (
+                    self.service.signal_generator
+                    and prewarm_time <= ny_time.time() < datetime.time(9, 27)
+                    and self._last_prewarm_date != ny_time.date()
+                ):
+                    logger.info("Warming contract cache before the open...")
+                    self._last_prewarm_date = ny_time.date()
+                    self._prewarm_task = asyncio.create_task(
+                        self.service.signal_generator.prewarm_contracts()
+                    )
+
                 # 2. Check for signals if it's time
                 if is_signal_time and (
                     self._last_signal_check is None
@@ -278,21 +290,24 @@ class VerticalSpreadsStrategyHandler:
             # Get current positions
             positions = await self.ibkr_client.get_positions(force_update=True)
 
-            # Check for QQQ option positions
-            for key, qty in positions.items():
-                if "QQQ" in key and qty != 0:
-                    # Calculate Time Value for the position
-                    time_value = await self._calculate_time_value(key, qty)
+            # Check QQQ option positions with one quote request
+            open_positions = {
+                key: qty for key, qty in positions.items() if "QQQ" in key and qty != 0
+            }
+            time_values = await self._calculate_time_values(open_positions)
+
+            to_close = []
+            for key, time_value in time_values.items():
+                logger.debug(f"Time Value for {key}: ${time_value:.2f}")
 
-                    if time_value is not None:
-                        logger.debug(f"Time Value for {key}: ${time_value:.2f}")
+                # Close position if Time Value < $0.10
+                if time_value < 0.10:
+                    logger.info(
+                        f"Time Value below threshold for {key}: ${time_value:.2f}, closing position"
+                    )
+                    to_close.append(key)
 
-                        # Close position if Time Value < $0.10
-                        if time_value < 0.10:
-                            logger.info(
-                                f"Time Value below threshold for {key}: ${time_value:.2f}, closing position"
-                            )
-                            await self._close_position(key, qty)
+            await asyncio.gather(*(self._close_position(key, positions[key]) for key in to_close))
 
         except Exception as e:
             logger.error(f"Error monitoring Time Value: {e}", exc_info=True)
@@ -308,53 +323,79 @@ class VerticalSpreadsStrategyHandler:
         Returns:
             Time Value or None if calculation failed
         """
-        try:
-            # Parse position key to get contract details
-            parts = position_key.split("-")
-            if len(parts) < 3:
-                logger.warning(f"Invalid position key: {position_key}")
-                return None
+        time_values = await self._calculate_time_values({position_key: qty})
+        return time_values.get(position_key)
 
-            symbol = parts[0]
-            strike = float(parts[1])
-            right = parts[2]
+    async def _calculate_time_values(self, positions: dict[str, float]) -> dict[str, float]:
+        """
+        Calculate the Time Value of several option positions.
 
-            # Create option contract
-            if right == "C":
-                contract = self.ibkr_client._get_qqq_option_contract(strike, "C")
-            elif right == "P":
-                contract = self.ibkr_client._get_qqq_option_contract(strike, "P")
-            else:
-                logger.warning(f"Invalid option right: {right}")
-                return None
+        The underlying and all options are quoted in a single snapshot request.
+
+        Args:
+            positions: Position key (e.g., "QQQ-380-C") -> quantity
 
-            # Get market price
-            option_price = await self.ibkr_client.get_market_price(contract)
-            if option_price is None:
-                logger.warning(f"Failed to get market price for {position_key}")
-                return None
+        Returns:
+            Time Value by position key, leaving out positions that could not be priced
+        """
+        try:
+            # Parse position keys to get contract details
+            contracts = {}
+            for position_key in positions:
+                parts = position_key.split("-")
+                if len(parts) < 3:
+                    logger.warning(f"Invalid position key: {position_key}")
+                    continue
+
+                strike = float(parts[1])
+                right = parts[2]
+                if right not in ("C", "P"):
+                    logger.warning(f"Invalid option right: {right}")
+                    continue
+
+                contracts[position_key] = (
+                    strike,
+                    right,
+                    self.ibkr_client._get_qqq_option_contract(strike, right),
+                )
 
-            # Get underlying price
+            if not contracts:
+                return {}
+
+            # Get the underlying and option prices in one request
             underlying_contract = await self.ibkr_client.get_stock_contract("QQQ")
-            underlying_price = await self.ibkr_client.get_market_price(underlying_contract)
+            underlying_snapshot, *option_snapshots = await self.ibkr_client.get_market_snapshots(
+                [underlying_contract, *(contract for _, _, contract in contracts.values())]
+            )
+
+            underlying_price = underlying_snapshot.mid if underlying_snapshot else None
             if underlying_price is None:
                 logger.warning("Failed to get underlying price for QQQ")
-                return None
+                return {}
+
+            time_values = {}
+            for (position_key, (strike, right, _)), snapshot in zip(
+                contracts.items(), option_snapshots
+            ):
+                option_price = snapshot.mid if snapshot else None
+                if option_price is None:
+                    logger.warning(f"Failed to get market price for {position_key}")
+                    continue
 
-            # Calculate intrinsic value
-            if right == "C":  # Call option
-                intrinsic_value = max(0, underlying_price - strike)
-            else:  # Put option
-                intrinsic_value = max(0, strike - underlying_price)
+                # Calculate intrinsic value
+                if right == "C":  # Call option
+                    intrinsic_value = max(0, underlying_price - strike)
+                else:  # Put option
+                    intrinsic_value = max(0, strike - underlying_price)
 
-            # Calculate Time Value
-            time_value = option_price - intrinsic_value
+                # Calculate Time Value
+                time_values[position_key] = option_price - intrinsic_value
 
-            return time_value
+            return time_values
 
         except Exception as e:
-            logger.error(f"Error calculating Time Value for {position_key}: {e}", exc_info=True)
-            return None
+            logger.error(f"Error calculating Time Value: {e}", exc_info=True)
+            return {}
 
     async def _close_position(self, position_key: str, qty: float):
         """
@@ -452,10 +493,9 @@ class VerticalSpreadsStrategyHandler:
 
     async def shutdown(self):
         """
-        Cleanly disconnect the dedicated IBKR client.
+        Release the shared IBKR client.
         """
         logger.info("Shutting down VerticalSpreadsStrategyHandler...")
-        if self.ibkr_client and self.ibkr_client.is_connected():
-            await self.ibkr_client.disconnect()
-            logger.info("IBKR client for Vertical Spreads Strategy disconnected.")
+        # The session is shared with the trading service, which disconnects it
+        self.ibkr_client = None
         self._initialized = False
@@ -2,25 +2,33 @@
 
 This module generates trading signals based on:
 - Time-based triggers (daily at 9:27 AM ET)
-- Market trend analysis (SMA crossovers, momentum)
-- Delta-based strike selection using IBKR option chains
+- Market trend analysis (SMA crossovers, momentum) over stored daily bars
+- Delta-based strike selection using IBKR option chains and quotes
 - Historical data analysis from MongoDB
 
-IMPORTANT: This module uses ib_insync library which has blocking I/O operations.
-All blocking IBKR calls (reqMktData, reqHistoricalData, qualifyContracts, etc.)
-should be wrapped with asyncio.to_thread() to prevent blocking the event loop.
+IMPORTANT: ib_insync runs on the same event loop as the trading service, so its
+blocking request helpers (qualifyContracts, reqHistoricalData, etc.) must not be
+called here. Use the ``*Async`` variants instead so other tasks keep running.
 See: https://ib-insync.readthedocs.io/recipes.html#asyncio-integration
 """
 
 import asyncio
 from datetime import datetime, timedelta
 
-from ib_insync import IB, Option, Stock
+from ib_insync import IB, Stock
+from spreadpilot_core.ibkr.bar_store import BarStore, get_bar_store
+from spreadpilot_core.ibkr.contract_cache import ContractCache
 from spreadpilot_core.logging import get_logger
+from spreadpilot_core.utils.indicators import TrendIndicators
 from spreadpilot_core.utils.time import get_ny_time
 
+from .chain_scanner import OptionChainScanner
+
 logger = get_logger(__name__)
 
+# Days averaged by the momentum fallback strategy
+MOMENTUM_PERIOD = 5
+
 
 class QQQSignalGenerator:
     """
@@ -35,6 +43,11 @@ class QQQSignalGenerator:
         sma_short_period: int = 20,
         sma_long_period: int = 50,
         qty_per_leg: int = 1,
+        greeks_timeout: float = 1.5,
+        contract_cache: ContractCache | None = None,
+        prewarm_strike_range: float = 0.08,
+        risk_free_rate: float = 0.045,
+        bar_store: BarStore | None = None,
     ):
         """
         Initialize the signal generator.
@@ -46,6 +59,12 @@ class QQQSignalGenerator:
             sma_short_period: Short-term SMA period in days (default 20)
             sma_long_period: Long-term SMA period in days (default 50)
             qty_per_leg: Quantity of contracts per leg (default 1)
+            greeks_timeout: Maximum seconds to wait for option greeks (default 1.5)
+            contract_cache: Contract cache for conIds and chains (defaults to the shared cache)
+            prewarm_strike_range: Fraction around the last close whose strikes are
+                pre-qualified before the open (default 0.08)
+            risk_free_rate: Annual rate for deltas computed from option quotes (default 0.045)
+            bar_store: Store of daily bars (defaults to the shared store)
         """
         self.ib = ib_client
         self.short_leg_delta = abs(short_leg_delta)
@@ -53,17 +72,24 @@ class QQQSignalGenerator:
         self.sma_short_period = sma_short_period
         self.sma_long_period = sma_long_period
         self.qty_per_leg = qty_per_leg
+        self.prewarm_strike_range = prewarm_strike_range
+        self.chain_scanner = OptionChainScanner(
+            ib_client,
+            greeks_timeout=greeks_timeout,
+            contract_cache=contract_cache,
+            risk_free_rate=risk_free_rate,
+        )
 
-        # Cache for historical data
-        self._price_cache: list[float] = []
-        self._cache_updated: datetime | None = None
+        # Trend indicators, fed each stored daily bar once
+        self.bar_store = bar_store
+        self._indicators = TrendIndicators(
+            sma_periods={sma_short_period, sma_long_period, MOMENTUM_PERIOD}
+        )
+        self._last_bar_date: str | None = None
 
         logger.info(
-            "Initialized QQQ signal generator",
-            short_leg_delta=short_leg_delta,
-            long_leg_delta=long_leg_delta,
-            sma_short=sma_short_period,
-            sma_long=sma_long_period,
+            f"Initialized QQQ signal generator (deltas {short_leg_delta}/{long_leg_delta}, "
+            f"SMA {sma_short_period}/{sma_long_period})"
         )
 
     async def generate_signal(self) -> dict | None:
@@ -88,8 +114,10 @@ class QQQSignalGenerator:
 
             logger.info("Generating signal for QQQ vertical spread", extra={"date": current_date})
 
-            # Step 1: Get current QQQ price
-            current_price = await self._get_current_price()
+            # Step 1: Get current QQQ price, refreshing price history meanwhile
+            current_price, _ = await asyncio.gather(
+                self._get_current_price(), self._update_price_history()
+            )
             if not current_price:
                 logger.error("Unable to fetch current QQQ price")
                 return None
@@ -135,6 +163,36 @@ class QQQSignalGenerator:
             logger.error(f"Error generating signal: {e}", exc_info=True)
             return None
 
+    async def prewarm_contracts(self) -> int:
+        """
+        Warm the contract cache before the open.
+
+        Fetches the option chain and qualifies the QQQ options of today's and the
+        signal's expiration within prewarm_strike_range of the last close, so
+        signal generation and order placement do not wait on contract lookups.
+
+        Returns:
+            Number of option contracts cached
+        """
+        try:
+            ny_time = get_ny_time()
+            expirations = sorted({ny_time.strftime("%Y%m%d"), self._get_next_expiration(ny_time)})
+
+            await self._update_price_history()
+            strike_range = None
+            last_close = self._indicators.last_close
+            if last_close:
+                strike_range = (
+                    last_close * (1 - self.prewarm_strike_range),
+                    last_close * (1 + self.prewarm_strike_range),
+                )
+
+            return await self.chain_scanner.warm("QQQ", expirations, strike_range)
+
+        except Exception as e:
+            logger.error(f"Error warming contract cache: {e}", exc_info=True)
+            return 0
+
     async def _get_current_price(self) -> float | None:
         """
         Get current QQQ market price from IBKR.
@@ -147,7 +205,7 @@ class QQQSignalGenerator:
             qqq = Stock("QQQ", "SMART", "USD")
 
             # Request market data
-            self.ib.qualifyContracts(qqq)
+            await self.chain_scanner.qualify(qqq)
             ticker = self.ib.reqMktData(qqq, "", False, False)
 
             # Wait for data with timeout
@@ -190,18 +248,16 @@ class QQQSignalGenerator:
             # Update price history if needed
             await self._update_price_history()
 
-            if len(self._price_cache) < self.sma_long_period:
+            if self._indicators.count < self.sma_long_period:
                 logger.warning(
-                    f"Insufficient historical data: {len(self._price_cache)} days, "
+                    f"Insufficient historical data: {self._indicators.count} days, "
                     f"need {self.sma_long_period}"
                 )
                 # Fallback: use simple momentum
                 return await self._fallback_strategy(current_price)
 
-            # Calculate SMAs
-            prices = self._price_cache[-self.sma_long_period :]
-            sma_short = sum(prices[-self.sma_short_period :]) / self.sma_short_period
-            sma_long = sum(prices) / self.sma_long_period
+            sma_short = self._indicators.sma(self.sma_short_period)
+            sma_long = self._indicators.sma(self.sma_long_period)
 
             logger.info(
                 f"Technical analysis: SMA{self.sma_short_period}={sma_short:.2f}, "
@@ -235,12 +291,12 @@ class QQQSignalGenerator:
             "Long" or "Short" based on recent price action
         """
         try:
-            if len(self._price_cache) < 5:
+            if self._indicators.count < MOMENTUM_PERIOD:
                 logger.warning("Insufficient data even for fallback strategy")
                 return "Long"  # Default to bullish bias
 
             # Compare current price to 5-day average
-            recent_avg = sum(self._price_cache[-5:]) / 5
+            recent_avg = self._indicators.sma(MOMENTUM_PERIOD)
 
             if current_price > recent_avg * 1.01:  # 1% above average
                 logger.info("Short-term bullish momentum detected")
@@ -258,43 +314,34 @@ class QQQSignalGenerator:
 
     async def _update_price_history(self) -> None:
         """
-        Update cached price history from IBKR historical data.
-        Only updates once per day to avoid excessive API calls.
+        Feed new daily bars from the bar store to the trend indicators.
+
+        The store requests bars from IBKR at most once a day and only since the
+        last stored bar; each bar updates the indicators in constant time.
         """
         try:
-            # Check if cache needs updating
-            now = datetime.utcnow()
-            if self._cache_updated and (now - self._cache_updated).total_seconds() < 3600:
-                logger.debug("Price cache is fresh, skipping update")
-                return
-
-            logger.info("Updating QQQ price history from IBKR")
+            if self.bar_store is None:
+                self.bar_store = await get_bar_store()
 
-            # Create QQQ contract
             qqq = Stock("QQQ", "SMART", "USD")
-            self.ib.qualifyContracts(qqq)
-
-            # Request historical data (60 days to ensure enough for SMA)
-            end_datetime = ""
-            duration = f"{self.sma_long_period + 10} D"
-            bar_size = "1 day"
-
-            bars = self.ib.reqHistoricalData(
-                qqq,
-                endDateTime=end_datetime,
-                durationStr=duration,
-                barSizeSetting=bar_size,
-                whatToShow="TRADES",
-                useRTH=True,
-                formatDate=1,
+            await self.chain_scanner.qualify(qqq)
+
+            bars = await self.bar_store.get_daily_bars(
+                self.ib, qqq, lookback_days=self.sma_long_period + 10
             )
+            new_bars = [
+                bar for bar in bars if self._last_bar_date is None or bar.date > self._last_bar_date
+            ]
+            if not new_bars:
+                logger.debug("Trend indicators are up to date")
+                return
 
-            if bars:
-                self._price_cache = [bar.close for bar in bars]
-                self._cache_updated = now
-                logger.info(f"Updated price cache with {len(self._price_cache)} days of data")
-            else:
-                logger.warning("No historical data received from IBKR")
+            for bar in new_bars:
+                self._indicators.update(bar.close)
+            self._last_bar_date = new_bars[-1].date
+            logger.info(
+                f"Updated trend indicators with {len(new_bars)} bars through {self._last_bar_date}"
+            )
 
         except Exception as e:
             logger.error(f"Error updating price history: {e}", exc_info=True)
@@ -338,41 +385,18 @@ class QQQSignalGenerator:
         Returns:
             Tuple of (strike_long, strike_short) or None if unable to select
         """
+        relevant_strikes: list[float] = []
         try:
             # Determine option type based on strategy
             right = "P" if strategy == "Long" else "C"
 
             logger.info(f"Fetching option chain for {strategy} strategy ({right} options)")
 
-            # Get option chain
-            qqq = Stock("QQQ", "SMART", "USD")
-            self.ib.qualifyContracts(qqq)
-
-            chains = self.ib.reqSecDefOptParams(
-                underlyingSymbol="QQQ",
-                futFopExchange="",
-                underlyingSecType="STK",
-                underlyingConId=qqq.conId,
-            )
-
-            if not chains:
-                logger.error("No option chains available")
-                return None
-
-            # Find chain for our expiration
-            target_chain = None
-            for chain in chains:
-                if expiration in chain.expirations:
-                    target_chain = chain
-                    break
-
-            if not target_chain:
-                logger.error(f"No option chain found for expiration {expiration}")
+            # Get available strikes for our expiration
+            strikes = await self.chain_scanner.get_strikes("QQQ", expiration)
+            if not strikes:
                 return None
 
-            # Get available strikes around current price
-            strikes = sorted(target_chain.strikes)
-
             # Filter strikes based on strategy
             if strategy == "Long":
                 # For Bull Put Spread, we want strikes below current price
@@ -385,31 +409,20 @@ class QQQSignalGenerator:
                 logger.error("Insufficient strikes available")
                 return None
 
-            # Request option data to get Greeks
+            # Request option data to get Greeks, computing deltas from quotes
+            # for strikes IB has not sent model greeks for yet
             # For performance, sample strikes instead of all
             sample_strikes = relevant_strikes[:: max(1, len(relevant_strikes) // 20)]
 
-            option_data = []
-            for strike in sample_strikes:
-                option = Option("QQQ", expiration, strike, right, "SMART")
-                self.ib.qualifyContracts(option)
-                ticker = self.ib.reqMktData(option, "", False, False)
-
-                try:
-                    # Wait briefly for data
-                    for _ in range(10):
-                        await asyncio.sleep(0.1)
-                        if ticker.modelGreeks and ticker.modelGreeks.delta:
-                            option_data.append(
-                                {
-                                    "strike": strike,
-                                    "delta": abs(ticker.modelGreeks.delta),
-                                }
-                            )
-                            break
-                finally:
-                    # Always cancel market data subscription, even if error occurs
-                    self.ib.cancelMktData(option)
+            deltas = await self.chain_scanner.scan_deltas(
+                "QQQ",
+                expiration,
+                right,
+                sample_strikes,
+                target_deltas=(self.short_leg_delta, self.long_leg_delta),
+                underlying_price=current_price,
+            )
+            option_data = [{"strike": strike, "delta": delta} for strike, delta in deltas.items()]
 
             if len(option_data) < 2:
                 logger.error("Unable to fetch option Greeks")
@@ -18,6 +18,7 @@ async def test_vertical_spreads_strategy_initialization():
     settings.ib_gateway_host = "localhost"
     settings.ib_gateway_port = 4002
     settings.ib_client_id = 1
+    settings.ib_client_id_range = 10
     settings.ib_trading_mode = "paper"
     settings.signal_generator_enabled = False  # Disable for this test
 
@@ -44,6 +45,11 @@ async def test_vertical_spreads_strategy_initialization():
             return_value={}
         )
 
+        # The handler takes its client from the shared gateway session
+        service.ibkr_manager.get_gateway_client = AsyncMock(
+            return_value=service.vertical_spreads_strategy_handler.ibkr_client
+        )
+
         # Initialize the vertical spreads strategy handler
         await service.vertical_spreads_strategy_handler.initialize()
 
@@ -59,6 +65,7 @@ async def test_vertical_spreads_strategy_signal_processing():
     settings.ib_gateway_host = "localhost"
     settings.ib_gateway_port = 4002
     settings.ib_client_id = 1
+    settings.ib_client_id_range = 10
     settings.ib_trading_mode = "paper"
     settings.signal_generator_enabled = False  # Disable for this test
 
@@ -120,6 +127,11 @@ async def test_vertical_spreads_strategy_signal_processing():
         service.alert_manager = AsyncMock()
         service.alert_manager.create_alert = AsyncMock()
 
+        # The handler takes its client from the shared gateway session
+        service.ibkr_manager.get_gateway_client = AsyncMock(
+            return_value=service.vertical_spreads_strategy_handler.ibkr_client
+        )
+
         # Initialize the vertical spreads strategy handler
         await service.vertical_spreads_strategy_handler.initialize()
 
@@ -164,6 +176,7 @@ async def test_vertical_spreads_strategy_time_value_monitoring():
     settings.ib_gateway_host = "localhost"
     settings.ib_gateway_port = 4002
     settings.ib_client_id = 1
+    settings.ib_client_id_range = 10
     settings.ib_trading_mode = "paper"
     settings.signal_generator_enabled = False  # Disable for this test
 
@@ -211,6 +224,11 @@ async def test_vertical_spreads_strategy_time_value_monitoring():
         service.alert_manager = AsyncMock()
         service.alert_manager.create_alert = AsyncMock()
 
+        # The handler takes its client from the shared gateway session
+        service.ibkr_manager.get_gateway_client = AsyncMock(
+            return_value=service.vertical_spreads_strategy_handler.ibkr_client
+        )
+
         # Initialize the vertical spreads strategy handler
         await service.vertical_spreads_strategy_handler.initialize()
 
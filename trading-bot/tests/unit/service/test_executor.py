@@ -11,9 +11,18 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../../../sprea
 
 from app.service.executor import VerticalSpreadExecutor
 from spreadpilot_core.ibkr.client import IBKRClient, OrderStatus
+from spreadpilot_core.ibkr.market_data import MarketSnapshot
 from spreadpilot_core.models.alert import AlertSeverity
 
 
+def snapshots(*mids):
+    """Build market snapshots with the given midpoints."""
+    return [
+        None if mid is None else MarketSnapshot(bid=None, ask=None, mid=mid, last=None)
+        for mid in mids
+    ]
+
+
 class TestVerticalSpreadExecutor(unittest.TestCase):
     """Test cases for the VerticalSpreadExecutor."""
 
@@ -24,7 +33,7 @@ class TestVerticalSpreadExecutor(unittest.TestCase):
         self.mock_ibkr_client.ib = MagicMock()
         self.mock_ibkr_client.ensure_connected = AsyncMock(return_value=True)
         self.mock_ibkr_client._get_qqq_option_contract = MagicMock()
-        self.mock_ibkr_client.get_market_price = AsyncMock()
+        self.mock_ibkr_client.get_market_snapshots = AsyncMock()
         self.mock_ibkr_client.get_account_summary = AsyncMock()
 
         # Create executor instance with fake Redis URL
@@ -54,8 +63,8 @@ class TestVerticalSpreadExecutor(unittest.TestCase):
         )
 
         # Mock market price calculation
-        self.mock_ibkr_client.get_market_price = AsyncMock(
-            side_effect=[2.50, 3.25]
+        self.mock_ibkr_client.get_market_snapshots = AsyncMock(
+            return_value=snapshots(2.50, 3.25)
         )  # long_price, short_price
 
         # Mock successful order execution
@@ -129,8 +138,8 @@ class TestVerticalSpreadExecutor(unittest.TestCase):
         )
 
         # Mock market prices that result in low MID price
-        self.mock_ibkr_client.get_market_price = AsyncMock(
-            side_effect=[2.50, 2.60]
+        self.mock_ibkr_client.get_market_snapshots = AsyncMock(
+            return_value=snapshots(2.50, 2.60)
         )  # MID = 0.10 (below 0.70)
 
         # Mock _send_alert
@@ -220,8 +229,8 @@ class TestVerticalSpreadExecutor(unittest.TestCase):
 
     async def test_calculate_mid_price_success(self):
         """Test successful MID price calculation."""
-        # Mock market prices
-        self.mock_ibkr_client.get_market_price = AsyncMock(side_effect=[2.50, 3.25])  # long, short
+        # Mock market prices (long, short)
+        self.mock_ibkr_client.get_market_snapshots = AsyncMock(return_value=snapshots(2.50, 3.25))
 
         # Mock contract creation
         mock_contract = MagicMock()
@@ -236,8 +245,8 @@ class TestVerticalSpreadExecutor(unittest.TestCase):
 
     async def test_calculate_mid_price_failed_market_data(self):
         """Test MID price calculation when market data fails."""
-        # Mock failed market prices
-        self.mock_ibkr_client.get_market_price = AsyncMock(side_effect=[None, 3.25])  # long fails
+        # Mock failed market prices (long fails)
+        self.mock_ibkr_client.get_market_snapshots = AsyncMock(return_value=snapshots(None, 3.25))
 
         # Mock contract creation
         mock_contract = MagicMock()
@@ -420,8 +429,8 @@ class TestVerticalSpreadExecutor(unittest.TestCase):
         )
 
         # Mock market price calculation for calls
-        self.mock_ibkr_client.get_market_price = AsyncMock(
-            side_effect=[1.50, 2.25]
+        self.mock_ibkr_client.get_market_snapshots = AsyncMock(
+            return_value=snapshots(1.50, 2.25)
         )  # long_price, short_price
 
         # Mock successful order execution
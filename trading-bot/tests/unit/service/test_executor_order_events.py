@@ -0,0 +1,163 @@
+"""Unit tests for event-driven fill detection in the limit ladder."""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../"))
+
+from app.service.executor import VerticalSpreadExecutor
+from spreadpilot_core.ibkr.client import OrderStatus
+
+
+class FakeEvent:
+    """Minimal stand-in for an eventkit Event."""
+
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        self.handlers.remove(handler)
+        return self
+
+    def emit(self, *args):
+        for handler in list(self.handlers):
+            handler(*args)
+
+
+def make_trade(order_id: int):
+    return SimpleNamespace(
+        order=SimpleNamespace(orderId=order_id),
+        orderStatus=SimpleNamespace(
+            status="Submitted", filled=0, remaining=1, avgFillPrice=0.0, whyHeld=""
+        ),
+        statusEvent=FakeEvent(),
+        fillEvent=FakeEvent(),
+    )
+
+
+def fill(trade, price: float):
+    trade.orderStatus.status = "Filled"
+    trade.orderStatus.filled = 1
+    trade.orderStatus.remaining = 0
+    trade.orderStatus.avgFillPrice = price
+    trade.fillEvent.emit(trade, MagicMock())
+    trade.statusEvent.emit(trade)
+
+
+def make_executor(trades):
+    ibkr_client = MagicMock()
+    ibkr_client.ib.placeOrder.side_effect = trades
+    executor = VerticalSpreadExecutor(ibkr_client, redis_url="redis://fake")
+    executor._publish_alert = AsyncMock()
+    return executor
+
+
+async def run_ladder(executor, follower_id: str, **overrides):
+    params = {
+        "strategy": "Long",
+        "qty_per_leg": 1,
+        "strike_long": 380.0,
+        "strike_short": 385.0,
+        "initial_mid_price": -0.75,
+        "max_attempts": 3,
+        "price_increment": 0.01,
+        "min_price_threshold": 0.70,
+        "attempt_interval": 0,
+        "timeout_per_attempt": 5,
+        "follower_id": follower_id,
+    }
+    params.update(overrides)
+    return await executor._execute_limit_ladder(**params)
+
+
+@pytest.fixture(autouse=True)
+def mock_ib_insync():
+    with patch("app.service.executor.ib_insync"), patch("app.service.executor.LimitOrder"):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_fill_event_wakes_ladder_immediately():
+    """Test that a fill is detected on its event, well before the attempt timeout."""
+    trade = make_trade(1)
+    executor = make_executor([trade])
+
+    start = time.monotonic()
+    ladder = asyncio.create_task(run_ladder(executor, "f1"))
+    await asyncio.sleep(0.01)
+    fill(trade, -0.74)
+    result = await ladder
+
+    assert result["status"] == OrderStatus.FILLED
+    assert result["fill_price"] == -0.74
+    assert time.monotonic() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_ladders_for_many_followers_share_the_loop():
+    """Test that concurrent ladders each react to their own fills."""
+    trades = {f"f{i}": make_trade(i) for i in range(20)}
+    ladders = {
+        follower_id: asyncio.create_task(run_ladder(make_executor([trade]), follower_id))
+        for follower_id, trade in trades.items()
+    }
+    await asyncio.sleep(0.01)
+
+    for trade in trades.values():
+        fill(trade, -0.75)
+    results = await asyncio.wait_for(asyncio.gather(*ladders.values()), timeout=1)
+
+    assert all(result["status"] == OrderStatus.FILLED for result in results)
+    assert [result["follower_id"] for result in results] == list(trades)
+
+
+@pytest.mark.asyncio
+async def test_unfilled_rung_is_cancelled_and_next_rung_placed():
+    """Test that an unfilled rung is cancelled on confirmation before moving up the ladder."""
+    first, second = make_trade(1), make_trade(2)
+    executor = make_executor([first, second])
+
+    def confirm_cancel(order):
+        first.orderStatus.status = "Cancelled"
+        asyncio.get_running_loop().call_soon(first.statusEvent.emit, first)
+
+    def place_order(contract, order):
+        if executor.ibkr_client.ib.placeOrder.call_count == 1:
+            return first
+        asyncio.get_running_loop().call_soon(fill, second, -0.74)
+        return second
+
+    executor.ibkr_client.ib.cancelOrder.side_effect = confirm_cancel
+    executor.ibkr_client.ib.placeOrder.side_effect = place_order
+
+    result = await run_ladder(executor, "f1", timeout_per_attempt=0.02)
+
+    assert result["status"] == OrderStatus.FILLED
+    assert result["attempts"] == 2
+    executor.ibkr_client.ib.cancelOrder.assert_called_once_with(first.order)
+
+
+@pytest.mark.asyncio
+async def test_fill_during_cancel_is_not_retried():
+    """Test that a rung filling while being cancelled ends the ladder as filled."""
+    trade = make_trade(1)
+    executor = make_executor([trade])
+    executor.ibkr_client.ib.cancelOrder.side_effect = lambda order: (
+        asyncio.get_running_loop().call_soon(fill, trade, -0.75)
+    )
+
+    result = await run_ladder(executor, "f1", timeout_per_attempt=0.01)
+
+    assert result["status"] == OrderStatus.FILLED
+    assert executor.ibkr_client.ib.placeOrder.call_count == 1
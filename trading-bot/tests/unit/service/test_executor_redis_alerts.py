@@ -14,9 +14,15 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../../../sprea
 
 from app.service.executor import VerticalSpreadExecutor
 from spreadpilot_core.ibkr.client import IBKRClient, OrderStatus
+from spreadpilot_core.ibkr.market_data import MarketSnapshot
 from spreadpilot_core.models.alert import AlertType
 
 
+def snapshots(*mids):
+    """Build market snapshots with the given midpoints."""
+    return [MarketSnapshot(bid=None, ask=None, mid=mid, last=None) for mid in mids]
+
+
 class TestVerticalSpreadExecutorRedisAlerts(unittest.TestCase):
     """Test cases for Redis alert publishing in VerticalSpreadExecutor."""
 
@@ -27,7 +33,7 @@ class TestVerticalSpreadExecutorRedisAlerts(unittest.TestCase):
         self.mock_ibkr_client.ib = MagicMock()
         self.mock_ibkr_client.ensure_connected = AsyncMock(return_value=True)
         self.mock_ibkr_client._get_qqq_option_contract = MagicMock()
-        self.mock_ibkr_client.get_market_price = AsyncMock()
+        self.mock_ibkr_client.get_market_snapshots = AsyncMock()
         self.mock_ibkr_client.get_account_summary = AsyncMock()
 
         # Create executor with fake Redis
@@ -105,8 +111,8 @@ class TestVerticalSpreadExecutorRedisAlerts(unittest.TestCase):
             )
 
             # Mock market prices that result in low MID price
-            self.mock_ibkr_client.get_market_price = AsyncMock(
-                side_effect=[0.30, 0.80]  # Long price  # Short price
+            self.mock_ibkr_client.get_market_snapshots = AsyncMock(
+                return_value=snapshots(0.30, 0.80)  # Long price, short price
             )
 
             # Execute with threshold that will fail
@@ -154,8 +160,8 @@ class TestVerticalSpreadExecutorRedisAlerts(unittest.TestCase):
             )
 
             # Mock market prices
-            self.mock_ibkr_client.get_market_price = AsyncMock(
-                side_effect=[1.00, 2.00]  # Long price  # Short price
+            self.mock_ibkr_client.get_market_snapshots = AsyncMock(
+                return_value=snapshots(1.00, 2.00)  # Long price, short price
             )
 
             # Mock order placement that never fills
@@ -0,0 +1,232 @@
+"""Unit tests for the emergency flatten engine."""
+
+import asyncio
+import json
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from eventkit import Event
+from fakeredis import aioredis as fakeredis
+from ib_insync import Option
+from spreadpilot_core.ibkr import IBKRClient
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../"))
+
+from app.service.flatten import FlattenEngine
+from app.service.ibkr import IBKRManager
+
+
+def make_close_positions(delays: dict[str, float] | None = None, unfilled: set[str] = ()):
+    """Create a close_positions mock that closes two legs per follower."""
+    delays = delays or {}
+
+    async def close_positions(follower_id, timeout, on_leg_done):
+        await asyncio.sleep(delays.get(follower_id, 0.0))
+        results = []
+        for key in ("380.0-P", "385.0-P"):
+            leg = {
+                "contract": key,
+                "qty": 1,
+                "action": "SELL",
+                "status": "Submitted" if follower_id in unfilled else "Filled",
+                "filled": 0 if follower_id in unfilled else 1,
+            }
+            await on_leg_done(leg)
+            results.append(leg)
+        return {"success": True, "results": results, "error": None}
+
+    return AsyncMock(side_effect=close_positions)
+
+
+def make_shared_client(positions):
+    """Create an IBKRClient on a mocked IB session holding the given positions."""
+    ib = MagicMock()
+    ib.positionEvent = Event("positionEvent")
+    ib.updatePortfolioEvent = Event("updatePortfolioEvent")
+    ib.execDetailsEvent = Event("execDetailsEvent")
+    ib.managedAccounts.return_value = ["DU1", "DU2"]
+    ib.positions.return_value = [
+        SimpleNamespace(
+            account=account,
+            contract=Option("QQQ", "20250117", strike, right, "SMART", conId=con_id),
+            position=qty,
+            avgCost=1.0,
+        )
+        for con_id, (account, strike, right, qty) in enumerate(positions, start=1)
+    ]
+    ib.portfolio.return_value = []
+    ib.placeOrder.side_effect = lambda contract, order: SimpleNamespace(
+        contract=contract,
+        order=order,
+        orderStatus=SimpleNamespace(status="Filled", filled=order.totalQuantity),
+    )
+
+    with patch("spreadpilot_core.ibkr.client.ib_insync.IB", return_value=ib):
+        client = IBKRClient(username="", password="")
+    client.connect = AsyncMock(return_value=True)
+    client.ensure_connected = AsyncMock(return_value=True)
+    client.orders.wait_for_status = AsyncMock()
+    client.position_store.publish = False
+    client.position_store.attach()
+    return client
+
+
+@pytest.fixture
+async def fake_redis():
+    """Create a fake Redis client used for progress publishing."""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    with patch("app.service.flatten.get_redis_client", AsyncMock(return_value=client)):
+        yield client
+    await client.close()
+
+
+@pytest.fixture
+def mock_service():
+    """Create a mock trading service with four active followers."""
+    service = MagicMock()
+    service.active_followers = {f"follower-{i}": MagicMock() for i in range(4)}
+    service.settings = SimpleNamespace(
+        flatten_max_in_flight=4,
+        flatten_fill_timeout_seconds=1.0,
+        flatten_follower_timeout_seconds=1.0,
+    )
+    service.ibkr_manager = MagicMock()
+    service.ibkr_manager.close_positions = make_close_positions()
+    service.ibkr_manager.group_by_account = AsyncMock(
+        side_effect=lambda follower_ids: [[follower_id] for follower_id in follower_ids]
+    )
+    return service
+
+
+@pytest.fixture
+def engine(mock_service):
+    """Create a flatten engine."""
+    return FlattenEngine(mock_service)
+
+
+class TestFlattenEngine:
+    """Test cases for concurrent emergency flattening."""
+
+    @pytest.mark.asyncio
+    async def test_flattens_followers_concurrently(self, engine, mock_service, fake_redis):
+        """Test that followers are closed at the same time and the run reports time to flat."""
+        mock_service.ibkr_manager.close_positions = make_close_positions(
+            {follower_id: 0.1 for follower_id in mock_service.active_followers}
+        )
+
+        run = await engine.flatten()
+
+        assert run["status"] == "COMPLETED"
+        assert run["followers_flat"] == 4
+        assert run["legs_done"] == run["legs_filled"] == 8
+        # Four 100 ms closes in parallel, not one after another
+        assert 100 <= run["time_to_flat_ms"] < 300
+        assert engine.get_run(run["run_id"]) is run
+
+    @pytest.mark.asyncio
+    async def test_respects_max_in_flight(self, engine, mock_service, fake_redis):
+        """Test that no more than max_in_flight followers are closed at once."""
+        in_flight = 0
+        peak = 0
+        close_positions = make_close_positions()
+
+        async def tracked(follower_id, timeout, on_leg_done):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return await close_positions(follower_id, timeout, on_leg_done)
+
+        mock_service.ibkr_manager.close_positions = AsyncMock(side_effect=tracked)
+        mock_service.settings.flatten_max_in_flight = 2
+
+        await engine.flatten()
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_partial_run_reports_unflat_followers(self, engine, mock_service, fake_redis):
+        """Test that unfilled legs and timed out followers leave the run partial."""
+        mock_service.ibkr_manager.close_positions = make_close_positions(
+            delays={"follower-3": 5.0}, unfilled={"follower-1"}
+        )
+        mock_service.settings.flatten_follower_timeout_seconds = 0.1
+
+        run = await engine.flatten(follower_ids=["follower-0", "follower-1", "follower-3", "gone"])
+
+        assert run["status"] == "PARTIAL"
+        assert run["time_to_flat_ms"] is None
+        assert run["results"]["follower-0"]["flat"] is True
+        assert run["results"]["follower-1"]["flat"] is False
+        assert "Timed out" in run["results"]["follower-3"]["error"]
+        assert "not active" in run["results"]["gone"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_progress_is_published_to_redis(self, engine, mock_service, fake_redis):
+        """Test that the snapshot and leg, follower and completion events reach Redis."""
+        run = await engine.start(follower_ids=["follower-0"])
+        assert run["status"] == "RUNNING"
+        # The run can be followed as soon as its ID is returned
+        assert await fake_redis.exists(f"flatten:{run['run_id']}")
+
+        await asyncio.sleep(0.05)
+
+        snapshot = json.loads(await fake_redis.get(f"flatten:{run['run_id']}"))
+        assert snapshot["status"] == "COMPLETED"
+
+        entries = await fake_redis.xrange(f"flatten:{run['run_id']}:events")
+        events = [json.loads(fields["data"])["event"] for _, fields in entries]
+        assert events == ["started", "leg", "leg", "follower", "completed"]
+
+    @pytest.mark.asyncio
+    async def test_followers_sharing_a_session_close_each_leg_once(self, fake_redis):
+        """Test that followers of one account send a single closing order per leg."""
+        client = make_shared_client(
+            [("DU1", 380.0, "P", 2), ("DU1", 385.0, "P", -2), ("DU2", 390.0, "C", -1)]
+        )
+        service = MagicMock()
+        service.settings = SimpleNamespace(
+            ib_client_id=1,
+            ib_client_id_range=1,
+            ib_gateway_host="gateway",
+            ib_gateway_port=4002,
+            ib_trading_mode="paper",
+            flatten_max_in_flight=4,
+            flatten_fill_timeout_seconds=1.0,
+            flatten_follower_timeout_seconds=1.0,
+        )
+        service.get_secret = AsyncMock(return_value="secret")
+        service.active_followers = {
+            # The first follower trades in the session's default account, DU1
+            "follower-0": SimpleNamespace(
+                ibkr_username="a", ibkr_secret_ref="a", ibkr_account_id=None
+            ),
+            "follower-1": SimpleNamespace(
+                ibkr_username="b", ibkr_secret_ref="b", ibkr_account_id="DU1"
+            ),
+            "follower-2": SimpleNamespace(
+                ibkr_username="c", ibkr_secret_ref="c", ibkr_account_id="DU2"
+            ),
+        }
+        service.ibkr_manager = IBKRManager(service)
+        service.ibkr_manager.connections.client_factory = lambda **kwargs: client
+
+        run = await FlattenEngine(service).flatten()
+
+        orders = sorted(
+            (order.account, contract.strike, order.action, order.totalQuantity)
+            for (contract, order), _ in client.ib.placeOrder.call_args_list
+        )
+        assert orders == [
+            ("DU1", 380.0, "SELL", 2),
+            ("DU1", 385.0, "BUY", 2),
+            ("DU2", 390.0, "BUY", 1),
+        ]
+        assert run["status"] == "COMPLETED"
+        assert run["followers_flat"] == 3
+        assert run["legs_done"] == 3
@@ -27,6 +27,7 @@ class TestPnLService:
 
         # Mock IBKR manager
         service.ibkr_manager = AsyncMock()
+        service.ibkr_manager.get_account = MagicMock(return_value="DU123")
 
         return service
 
@@ -34,7 +35,9 @@ class TestPnLService:
     def mock_ibkr_client(self):
         """Create a mock IBKR client."""
         client = AsyncMock()
-        client.get_pnl = AsyncMock(return_value=150.75)
+        client.get_portfolio_pnl = AsyncMock(
+            return_value={"unrealized_pnl": 150.75, "realized_pnl": 0.0}
+        )
         client.get_portfolio_value = AsyncMock(return_value=10000.00)
         return client
 
@@ -105,6 +108,46 @@ class TestPnLService:
             # Should have looked for positions but found none
             mock_collection.find_one.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_calculate_follower_mtm_success(
+        self, pnl_service, mock_trading_service, mock_ibkr_client
+    ):
+        """Test that the MTM snapshot takes unrealized P&L from the account's portfolio."""
+        mock_trading_service.ibkr_manager.get_client.return_value = mock_ibkr_client
+        pnl_service._get_daily_commission = AsyncMock(return_value=Decimal("3.00"))
+
+        mock_collection = AsyncMock()
+        mock_collection.find_one.return_value = {
+            "follower_id": "follower1",
+            "long_qty": 2,
+            "short_qty": 2,
+            "pnl_realized": 25.5,
+        }
+        mock_db = AsyncMock()
+        mock_db.__getitem__.return_value = mock_collection
+
+        with (
+            patch("app.service.pnl_service.get_mongo_db", return_value=mock_db),
+            patch("app.service.pnl_service.get_postgres_session") as mock_session_ctx,
+        ):
+            mock_session = AsyncMock()
+            mock_session.add = MagicMock()
+            mock_session_ctx.return_value.__aenter__.return_value = mock_session
+
+            await pnl_service._calculate_follower_mtm("follower1")
+
+        mock_ibkr_client.get_portfolio_pnl.assert_awaited_once_with("DU123")
+        mock_ibkr_client.get_portfolio_value.assert_awaited_once_with("DU123")
+        snapshot = mock_session.add.call_args[0][0]
+        assert snapshot.follower_id == "follower1"
+        assert snapshot.realized_pnl == Decimal("25.5")
+        assert snapshot.unrealized_pnl == Decimal("150.75")
+        assert snapshot.total_pnl == Decimal("176.25")
+        assert snapshot.position_count == 4
+        assert snapshot.total_market_value == Decimal("10000.0")
+        assert snapshot.total_commission == Decimal("3.00")
+        mock_session.commit.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_record_trade_fill(self, pnl_service):
         """Test recording a trade fill."""
@@ -269,7 +312,7 @@ class TestPnLService:
         """Test calculating market value successfully."""
         mock_ibkr_client.get_portfolio_value.return_value = 25000.75
 
-        market_value = await pnl_service._calculate_market_value(mock_ibkr_client, {})
+        market_value = await pnl_service._calculate_market_value(mock_ibkr_client, "DU123")
 
         assert market_value == Decimal("25000.75")
 
@@ -278,6 +321,6 @@ class TestPnLService:
         """Test calculating market value with error."""
         mock_ibkr_client.get_portfolio_value.side_effect = Exception("IBKR Error")
 
-        market_value = await pnl_service._calculate_market_value(mock_ibkr_client, {})
+        market_value = await pnl_service._calculate_market_value(mock_ibkr_client, "DU123")
 
         assert market_value == Decimal("0")
@@ -0,0 +1,258 @@
+"""Unit tests for concurrent position checks in PositionManager."""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from spreadpilot_core.models import AssignmentState
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../"))
+
+from app.service.positions import PositionManager
+
+
+def make_client(delay: float = 0.0):
+    """Create a mock IBKR client with no assignment and some P&L."""
+    client = MagicMock()
+
+    async def check_assignment(account=None):
+        await asyncio.sleep(delay)
+        return AssignmentState.NONE, 2, 2
+
+    client.check_assignment = AsyncMock(side_effect=check_assignment)
+    client.get_pnl = AsyncMock(return_value={"realized_pnl": 10.0, "unrealized_pnl": -5.0})
+    return client
+
+
+@pytest.fixture
+def positions_collection():
+    """Create a mock positions collection holding today's position of each follower."""
+
+    async def find_one(query):
+        return {"_id": f"pos-{query['follower_id']}", **query}
+
+    collection = MagicMock()
+    collection.find_one = AsyncMock(side_effect=find_one)
+    collection.update_one = AsyncMock()
+    collection.bulk_write = AsyncMock()
+    return collection
+
+
+@pytest.fixture
+def mock_service(positions_collection):
+    """Create a mock trading service with three active followers."""
+    service = MagicMock()
+    service.active_followers = {f"follower-{i}": MagicMock() for i in range(3)}
+    service.settings = SimpleNamespace(
+        position_check_max_in_flight=2,
+        position_check_timeout_seconds=1.0,
+    )
+    clients = {follower_id: make_client() for follower_id in service.active_followers}
+    service.ibkr_manager = MagicMock()
+    service.ibkr_manager.get_client = AsyncMock(side_effect=clients.get)
+    service.ibkr_manager.get_account = MagicMock(return_value="DU123")
+    service.ibkr_manager.group_by_account = AsyncMock(
+        side_effect=lambda follower_ids: [[follower_id] for follower_id in follower_ids]
+    )
+    service.alert_manager = MagicMock()
+    service.alert_manager.create_alert = AsyncMock()
+    service.mongo_db = {"positions": positions_collection}
+    service.clients = clients
+    return service
+
+
+@pytest.fixture
+def manager(mock_service):
+    """Create a position manager."""
+    return PositionManager(mock_service)
+
+
+class TestConcurrentPositionChecks:
+    """Test cases for bounded-concurrency position checks."""
+
+    @pytest.mark.asyncio
+    async def test_checks_respect_max_in_flight(self, manager, mock_service):
+        """Test that no more than max_in_flight followers are checked at once."""
+        in_flight = 0
+        peak = 0
+
+        async def check_assignment(account=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return AssignmentState.NONE, 2, 2
+
+        for client in mock_service.clients.values():
+            client.check_assignment = AsyncMock(side_effect=check_assignment)
+
+        stats = await manager.check_all_positions()
+
+        assert peak == 2
+        assert stats["followers"] == 3
+        assert stats["timeouts"] == 0
+        assert manager.last_check_stats == stats
+
+    @pytest.mark.asyncio
+    async def test_updates_are_written_in_one_bulk_write(
+        self, manager, mock_service, positions_collection
+    ):
+        """Test that all followers' position updates go to MongoDB in one batch."""
+        stats = await manager.check_all_positions()
+
+        positions_collection.update_one.assert_not_called()
+        positions_collection.bulk_write.assert_awaited_once()
+        writes = positions_collection.bulk_write.call_args[0][0]
+        assert len(writes) == stats["writes"] == 3
+        assert {write._filter["follower_id"] for write in writes} == set(
+            mock_service.active_followers
+        )
+        assert all(write._upsert for write in writes)
+        assert manager.positions["follower-0"].pnl_realized == 10.0
+
+    @pytest.mark.asyncio
+    async def test_slow_follower_times_out_without_blocking_others(
+        self, manager, mock_service, positions_collection
+    ):
+        """Test that a slow follower is abandoned and the others are still written."""
+        mock_service.clients["follower-1"].check_assignment = make_client(5).check_assignment
+        mock_service.settings.position_check_timeout_seconds = 0.1
+
+        stats = await manager.check_all_positions()
+
+        assert stats["timeouts"] == 1
+        writes = positions_collection.bulk_write.call_args[0][0]
+        assert {write._filter["follower_id"] for write in writes} == {"follower-0", "follower-2"}
+        assert stats["total_ms"] < 1000
+
+    @pytest.mark.asyncio
+    async def test_shared_account_assignment_is_exercised_once(
+        self, manager, mock_service, positions_collection
+    ):
+        """Test that followers trading in one account record it but exercise only once."""
+        mock_service.ibkr_manager.group_by_account = AsyncMock(
+            return_value=[["follower-0", "follower-1"], ["follower-2"]]
+        )
+        mock_service.ibkr_manager.exercise_options = AsyncMock(return_value={"success": True})
+        for client in mock_service.clients.values():
+            client.check_assignment = AsyncMock(return_value=(AssignmentState.ASSIGNED, 1, 2))
+            client.get_positions = AsyncMock(return_value={"380.0-P": 2, "385.0-P": -1})
+
+        await manager.check_all_positions()
+
+        exercised = [
+            call.kwargs["follower_id"]
+            for call in mock_service.ibkr_manager.exercise_options.call_args_list
+        ]
+        assert exercised == ["follower-0", "follower-2"]
+        writes = positions_collection.bulk_write.call_args[0][0]
+        assert {write._filter["follower_id"] for write in writes} == set(
+            mock_service.active_followers
+        )
+        mock_service.clients["follower-1"].check_assignment.assert_awaited_once_with("DU123")
+
+    @pytest.mark.asyncio
+    async def test_compensation_is_recorded_when_check_times_out(
+        self, manager, mock_service, positions_collection
+    ):
+        """Test that an exercise past the deadline still records COMPENSATED right away."""
+        mock_service.active_followers = {"follower-0": MagicMock()}
+        mock_service.settings.position_check_timeout_seconds = 0.05
+        client = mock_service.clients["follower-0"]
+        client.check_assignment = AsyncMock(return_value=(AssignmentState.ASSIGNED, 1, 2))
+        client.get_positions = AsyncMock(return_value={"380.0-P": 2, "385.0-P": -1})
+
+        async def exercise_options(**kwargs):
+            await asyncio.sleep(0.1)
+            return {"success": True}
+
+        mock_service.ibkr_manager.exercise_options = AsyncMock(side_effect=exercise_options)
+
+        stats = await manager.check_all_positions()
+        assert stats["timeouts"] == 1
+        await asyncio.sleep(0.1)
+
+        mock_service.ibkr_manager.exercise_options.assert_awaited_once()
+        states = [
+            call[0][1]["$set"]["assignment_state"]
+            for call in positions_collection.update_one.call_args_list
+        ]
+        assert states == [AssignmentState.ASSIGNED, AssignmentState.COMPENSATED]
+        assert manager.positions["follower-0"].assignment_state == AssignmentState.COMPENSATED
+
+    @pytest.mark.asyncio
+    async def test_single_follower_check_writes_immediately(self, manager, positions_collection):
+        """Test that checking one follower outside a cycle still writes right away."""
+        await manager.check_positions("follower-0")
+
+        positions_collection.update_one.assert_awaited_once()
+        positions_collection.bulk_write.assert_not_called()
+
+
+class TestPushedPositionChecks:
+    """Test cases for position checks triggered by IB position events."""
+
+    @pytest.mark.asyncio
+    async def test_position_change_triggers_check(self, manager, mock_service):
+        """Test that a pushed change re-checks the follower, coalescing changes mid-check."""
+        client = mock_service.clients["follower-0"]
+        await manager.check_positions("follower-0")
+        listener = client.position_store.add_listener.call_args[0][0]
+        client.check_assignment = make_client(0.05).check_assignment
+
+        # Two more changes arrive while the triggered check is running
+        listener("DU123")
+        await asyncio.sleep(0.01)
+        listener("DU123")
+        listener("DU123")
+        await manager._change_checks["follower-0"]
+
+        # One check for the first change, one more for those that arrived meanwhile
+        assert client.check_assignment.await_count == 2
+
+        # Watching the same client again does not add another listener
+        await manager.check_positions("follower-0")
+        client.position_store.add_listener.assert_called_once()
+
+        # Changes in other accounts of the shared session are ignored
+        listener("DU999")
+        assert manager._change_checks["follower-0"].done()
+
+    @pytest.mark.asyncio
+    async def test_pushed_imbalance_is_recorded_without_exercising(
+        self, manager, mock_service, positions_collection
+    ):
+        """Test that a pushed change mid-close does not exercise the remaining long leg."""
+        client = mock_service.clients["follower-0"]
+        await manager.check_positions("follower-0")
+        listener = client.position_store.add_listener.call_args[0][0]
+        mock_service.ibkr_manager.exercise_options = AsyncMock(return_value={"success": True})
+        # The short leg's buy-to-close filled before the long leg's sell
+        client.check_assignment = AsyncMock(return_value=(AssignmentState.ASSIGNED, 0, 2))
+        client.get_positions = AsyncMock(return_value={"380.0-P": 2})
+
+        listener("DU123")
+        await manager._change_checks["follower-0"]
+
+        mock_service.ibkr_manager.exercise_options.assert_not_called()
+        mock_service.alert_manager.create_alert.assert_not_called()
+        position = positions_collection.update_one.call_args[0][1]["$set"]
+        assert (position["short_qty"], position["long_qty"]) == (0, 2)
+        assert position["assignment_state"] == AssignmentState.NONE
+
+    @pytest.mark.asyncio
+    async def test_inactive_follower_is_not_checked(self, manager, mock_service):
+        """Test that changes for a follower no longer active are ignored."""
+        client = mock_service.clients["follower-0"]
+        await manager.check_positions("follower-0")
+        listener = client.position_store.add_listener.call_args[0][0]
+        del mock_service.active_followers["follower-0"]
+
+        listener("DU123")
+
+        assert "follower-0" not in manager._change_checks
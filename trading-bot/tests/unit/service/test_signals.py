@@ -0,0 +1,171 @@
+"""Unit tests for concurrent signal fan-out in SignalProcessor."""
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# Add the parent directory to the path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../"))
+
+from app.service.signals import SignalProcessor
+
+
+@pytest.fixture
+def mock_service():
+    """Create a mock trading service with three active followers."""
+    service = MagicMock()
+    service.active_followers = {f"follower-{i}": MagicMock() for i in range(3)}
+    service.settings = SimpleNamespace(
+        signal_fanout_enabled=True,
+        signal_fanout_max_in_flight=2,
+        signal_follower_timeout_seconds=1.0,
+        min_price=0.70,
+    )
+    service.ibkr_manager = MagicMock()
+    service.ibkr_manager.check_margin_for_trade = AsyncMock(return_value=(True, None))
+    service.alert_manager = MagicMock()
+    service.alert_manager.create_alert = AsyncMock()
+    service.position_manager = MagicMock()
+    service.position_manager.update_position = AsyncMock()
+    service.mongo_db = {"trades": MagicMock(insert_one=AsyncMock())}
+    return service
+
+
+@pytest.fixture
+def processor(mock_service):
+    """Create a signal processor."""
+    return SignalProcessor(mock_service)
+
+
+async def _process(processor):
+    return await processor.process_signal(
+        strategy="Long",
+        qty_per_leg=1,
+        strike_long=380.0,
+        strike_short=385.0,
+    )
+
+
+class TestSignalFanOut:
+    """Test cases for bounded-concurrency signal fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_fan_out_respects_max_in_flight(self, processor, mock_service):
+        """Test that no more than max_in_flight followers are processed at once."""
+        in_flight = 0
+        peak = 0
+
+        async def place_vertical_spread(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return {"status": "FILLED", "fill_price": -0.75}
+
+        mock_service.ibkr_manager.place_vertical_spread = AsyncMock(
+            side_effect=place_vertical_spread
+        )
+
+        result = await _process(processor)
+
+        assert result["success"] is True
+        assert peak == 2
+        assert all(r["success"] for r in result["results"].values())
+
+    @pytest.mark.asyncio
+    async def test_fan_out_results_keep_follower_order(self, processor, mock_service):
+        """Test that results are keyed in active follower order regardless of completion."""
+        delays = {"follower-0": 0.06, "follower-1": 0.0, "follower-2": 0.03}
+
+        async def place_vertical_spread(follower_id, **kwargs):
+            await asyncio.sleep(delays[follower_id])
+            return {"status": "FILLED", "fill_price": -0.75, "submitted_at": time.monotonic()}
+
+        mock_service.ibkr_manager.place_vertical_spread = AsyncMock(
+            side_effect=place_vertical_spread
+        )
+        mock_service.settings.signal_fanout_max_in_flight = 3
+
+        result = await _process(processor)
+
+        assert list(result["results"]) == ["follower-0", "follower-1", "follower-2"]
+        fanout = result["fanout"]
+        assert fanout["orders"] == 3
+        assert fanout["order_latency_spread_ms"] >= 50
+        assert processor.last_fanout_stats == fanout
+
+    @pytest.mark.asyncio
+    async def test_order_latency_is_measured_to_first_submission(self, processor, mock_service):
+        """Test that order latency excludes the time spent walking the limit ladder."""
+
+        async def place_vertical_spread(**kwargs):
+            submitted_at = time.monotonic()
+            # Further attempts at worse prices until the order fills
+            await asyncio.sleep(0.1)
+            return {"status": "FILLED", "fill_price": -0.75, "submitted_at": submitted_at}
+
+        mock_service.ibkr_manager.place_vertical_spread = AsyncMock(
+            side_effect=place_vertical_spread
+        )
+        mock_service.settings.signal_fanout_max_in_flight = 3
+
+        result = await _process(processor)
+
+        fanout = result["fanout"]
+        assert fanout["orders"] == 3
+        assert fanout["last_order_ms"] < 50
+        assert fanout["total_ms"] >= 100
+
+    @pytest.mark.asyncio
+    async def test_rejection_before_submission_reports_no_latency(self, processor, mock_service):
+        """Test that followers whose order never reached the broker have no order latency."""
+        mock_service.ibkr_manager.place_vertical_spread = AsyncMock(
+            return_value={"status": "REJECTED", "error": "Mid price too low", "mid_price": 0.5}
+        )
+
+        result = await _process(processor)
+
+        assert all("order_latency_ms" not in r for r in result["results"].values())
+        assert result["fanout"]["orders"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fan_out_per_follower_deadline(self, processor, mock_service):
+        """Test that a slow follower times out without blocking the others."""
+
+        async def place_vertical_spread(follower_id, **kwargs):
+            if follower_id == "follower-1":
+                await asyncio.sleep(5)
+            return {"status": "FILLED", "fill_price": -0.75}
+
+        mock_service.ibkr_manager.place_vertical_spread = AsyncMock(
+            side_effect=place_vertical_spread
+        )
+        mock_service.settings.signal_follower_timeout_seconds = 0.1
+
+        result = await _process(processor)
+
+        assert result["results"]["follower-0"]["success"] is True
+        assert result["results"]["follower-2"]["success"] is True
+        assert result["results"]["follower-1"]["success"] is False
+        assert "Timed out" in result["results"]["follower-1"]["error"]
+        mock_service.alert_manager.create_alert.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_sequential_mode_when_fan_out_disabled(self, processor, mock_service):
+        """Test that disabling fan-out falls back to sequential processing."""
+        mock_service.settings.signal_fanout_enabled = False
+        mock_service.ibkr_manager.place_vertical_spread = AsyncMock(
+            return_value={"status": "FILLED", "fill_price": -0.75}
+        )
+
+        result = await _process(processor)
+
+        assert result["success"] is True
+        assert "fanout" not in result
+        assert len(result["results"]) == 3
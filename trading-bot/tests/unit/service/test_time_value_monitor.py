@@ -66,6 +66,9 @@ class TestTimeValueMonitor(unittest.TestCase):
         self.mock_service = MagicMock()
         self.mock_service.active_followers = {"test-follower": MagicMock()}
         self.mock_service.ibkr_manager = MagicMock()
+        self.mock_service.ibkr_manager.group_by_account = AsyncMock(
+            side_effect=lambda follower_ids: [[follower_id] for follower_id in follower_ids]
+        )
 
         # Create monitor
         self.monitor = TimeValueMonitor(self.mock_service, redis_url="redis://fake")
@@ -120,20 +123,17 @@ class TestTimeValueMonitor(unittest.TestCase):
 
             # Mock IBKR client
             mock_client = MagicMock()
-            mock_client.get_market_price = AsyncMock()
 
-            # Mock market prices
+            # Market prices
             # Option price: $2.50
             # Underlying: $100, Strike: $98 Put -> Intrinsic: $0
             # Time value: $2.50 - $0 = $2.50 (SAFE)
-            mock_client.get_market_price.side_effect = [2.50, 100.0]
-
             # Create position
             contract = MockContract("QQQ", "OPT", 98.0, "P")
             position = MockPosition(contract, 10)
 
             await self.monitor._check_position_time_value(
-                "test-follower", mock_client, position, contract
+                "test-follower", mock_client, position, 2.50, 100.0
             )
 
             # Check alert was published
@@ -161,20 +161,17 @@ class TestTimeValueMonitor(unittest.TestCase):
 
             # Mock IBKR client
             mock_client = MagicMock()
-            mock_client.get_market_price = AsyncMock()
 
-            # Mock market prices
+            # Market prices
             # Option price: $0.80
             # Underlying: $100, Strike: $98 Put -> Intrinsic: $0
             # Time value: $0.80 - $0 = $0.80 (RISK)
-            mock_client.get_market_price.side_effect = [0.80, 100.0]
-
             # Create position
             contract = MockContract("QQQ", "OPT", 98.0, "P")
             position = MockPosition(contract, 10)
 
             await self.monitor._check_position_time_value(
-                "test-follower", mock_client, position, contract
+                "test-follower", mock_client, position, 0.80, 100.0
             )
 
             # Check alert was published
@@ -202,15 +199,12 @@ class TestTimeValueMonitor(unittest.TestCase):
 
             # Mock IBKR client
             mock_client = MagicMock()
-            mock_client.get_market_price = AsyncMock()
             mock_client.ib = MagicMock()
 
-            # Mock market prices
+            # Market prices
             # Option price: $0.08
             # Underlying: $100, Strike: $98 Put -> Intrinsic: $0
             # Time value: $0.08 - $0 = $0.08 (CRITICAL)
-            mock_client.get_market_price.side_effect = [0.08, 100.0]
-
             # Mock order placement
             mock_trade = MockTrade(status="Filled", avgFillPrice=0.07)
             mock_client.ib.placeOrder = MagicMock(return_value=mock_trade)
@@ -220,7 +214,7 @@ class TestTimeValueMonitor(unittest.TestCase):
             position = MockPosition(contract, 10)
 
             await self.monitor._check_position_time_value(
-                "test-follower", mock_client, position, contract
+                "test-follower", mock_client, position, 0.08, 100.0
             )
 
             # Verify market order was placed
@@ -262,15 +256,12 @@ class TestTimeValueMonitor(unittest.TestCase):
 
             # Mock IBKR client
             mock_client = MagicMock()
-            mock_client.get_market_price = AsyncMock()
             mock_client.ib = MagicMock()
 
-            # Mock market prices
+            # Market prices
             # Option price: $0.09
             # Underlying: $100, Strike: $102 Call -> Intrinsic: $0
             # Time value: $0.09 - $0 = $0.09 (CRITICAL)
-            mock_client.get_market_price.side_effect = [0.09, 100.0]
-
             # Mock order placement
             mock_trade = MockTrade(status="Filled", avgFillPrice=0.08)
             mock_client.ib.placeOrder = MagicMock(return_value=mock_trade)
@@ -280,7 +271,7 @@ class TestTimeValueMonitor(unittest.TestCase):
             position = MockPosition(contract, -5)
 
             await self.monitor._check_position_time_value(
-                "test-follower", mock_client, position, contract
+                "test-follower", mock_client, position, 0.09, 100.0
             )
 
             # Verify market order was placed
@@ -313,8 +304,8 @@ class TestTimeValueMonitor(unittest.TestCase):
 
     async def test_check_all_positions(self):
         """Test checking positions for all followers."""
-        # Mock follower positions check
-        self.monitor._check_follower_positions = AsyncMock()
+        # Mock follower positions fetch
+        self.monitor._get_follower_positions = AsyncMock(return_value=(None, []))
 
         # Add more followers
         self.mock_service.active_followers = {
@@ -325,8 +316,9 @@ class TestTimeValueMonitor(unittest.TestCase):
 
         await self.monitor._check_all_positions()
 
-        # Should check each follower
-        self.assertEqual(self.monitor._check_follower_positions.call_count, 3)
+        # Should fetch each follower's positions and record the sweep
+        self.assertEqual(self.monitor._get_follower_positions.call_count, 3)
+        self.assertEqual(self.monitor.get_metrics()["sweep_count"], 1)
 
     async def test_no_positions(self):
         """Test handling when no positions exist."""
@@ -361,7 +353,6 @@ class TestTimeValueMonitor(unittest.TestCase):
 
             # Mock IBKR client
             mock_client = MagicMock()
-            mock_client.get_market_price = AsyncMock(return_value=None)
 
             # Create position
             contract = MockContract("QQQ", "OPT", 98.0, "P")
@@ -369,7 +360,7 @@ class TestTimeValueMonitor(unittest.TestCase):
 
             # Should handle gracefully
             await self.monitor._check_position_time_value(
-                "test-follower", mock_client, position, contract
+                "test-follower", mock_client, position, None, 100.0
             )
 
             # No alerts should be published
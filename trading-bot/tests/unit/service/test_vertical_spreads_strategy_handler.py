@@ -3,9 +3,15 @@
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from spreadpilot_core.ibkr.market_data import MarketSnapshot
 from trading_bot.app.service.vertical_spreads_strategy_handler import VerticalSpreadsStrategyHandler
 
 
+def snapshots(*mids):
+    """Build market snapshots with the given midpoints."""
+    return [MarketSnapshot(bid=None, ask=None, mid=mid, last=None) for mid in mids]
+
+
 class TestVerticalSpreadsStrategyHandler(unittest.TestCase):
     """Test cases for the Vertical Spreads Strategy Handler."""
 
@@ -129,9 +135,10 @@ class TestVerticalSpreadsStrategyHandler(unittest.TestCase):
         """Test calculating time value for an option position."""
         # Mock the necessary methods
         self.handler.ibkr_client._get_qqq_option_contract = MagicMock()
-        self.handler.ibkr_client.get_market_price = AsyncMock(
-            side_effect=[1.50, 390.0]
-        )  # Option price, underlying price
+        # Underlying price, option price
+        self.handler.ibkr_client.get_market_snapshots = AsyncMock(
+            return_value=snapshots(390.0, 1.50)
+        )
         self.handler.ibkr_client.get_stock_contract = AsyncMock()
 
         # Calculate time value for a call option
@@ -143,11 +150,9 @@ class TestVerticalSpreadsStrategyHandler(unittest.TestCase):
         self.assertEqual(time_value, 0)
 
         # Reset mocks
-        self.handler.ibkr_client.get_market_price.reset_mock()
-        self.handler.ibkr_client.get_market_price.side_effect = [
-            1.50,
-            370.0,
-        ]  # Option price, underlying price
+        self.handler.ibkr_client.get_market_snapshots.reset_mock()
+        # Underlying price, option price
+        self.handler.ibkr_client.get_market_snapshots.return_value = snapshots(370.0, 1.50)
 
         # Calculate time value for a put option
         time_value = await self.handler._calculate_time_value("QQQ-380-P", 1)
@@ -162,7 +167,8 @@ class TestVerticalSpreadsStrategyHandler(unittest.TestCase):
         """Test that monitor_time_value closes positions when time value is below threshold."""
         # Mock the necessary methods
         self.handler.ibkr_client.get_positions = AsyncMock(return_value={"QQQ-380-C": 1})
-        self.handler._calculate_time_value = AsyncMock(return_value=0.05)  # Below threshold
+        # Below threshold
+        self.handler._calculate_time_values = AsyncMock(return_value={"QQQ-380-C": 0.05})
         self.handler._close_position = AsyncMock()
 
         # Monitor time value
@@ -170,7 +176,7 @@ class TestVerticalSpreadsStrategyHandler(unittest.TestCase):
 
         # Verify the methods were called correctly
         self.handler.ibkr_client.get_positions.assert_called_once()
-        self.handler._calculate_time_value.assert_called_once_with("QQQ-380-C", 1)
+        self.handler._calculate_time_values.assert_called_once_with({"QQQ-380-C": 1})
         self.handler._close_position.assert_called_once_with("QQQ-380-C", 1)
 
     @patch("trading_bot.app.service.vertical_spreads_strategy_handler.get_ny_time")
@@ -178,7 +184,8 @@ class TestVerticalSpreadsStrategyHandler(unittest.TestCase):
         """Test that monitor_time_value keeps positions when time value is above threshold."""
         # Mock the necessary methods
         self.handler.ibkr_client.get_positions = AsyncMock(return_value={"QQQ-380-C": 1})
-        self.handler._calculate_time_value = AsyncMock(return_value=0.15)  # Above threshold
+        # Above threshold
+        self.handler._calculate_time_values = AsyncMock(return_value={"QQQ-380-C": 0.15})
         self.handler._close_position = AsyncMock()
 
         # Monitor time value
@@ -186,7 +193,7 @@ class TestVerticalSpreadsStrategyHandler(unittest.TestCase):
 
         # Verify the methods were called correctly
         self.handler.ibkr_client.get_positions.assert_called_once()
-        self.handler._calculate_time_value.assert_called_once_with("QQQ-380-C", 1)
+        self.handler._calculate_time_values.assert_called_once_with({"QQQ-380-C": 1})
         self.handler._close_position.assert_not_called()
 
 
@@ -0,0 +1,208 @@
+"""Unit tests for the option chain scanner."""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from ib_insync import IB
+from spreadpilot_core.ibkr.contract_cache import ContractCache
+from spreadpilot_core.utils.black_scholes import bs_delta, bs_price
+
+# Add trading-bot directory to path
+trading_bot_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(trading_bot_dir))
+
+from app.chain_scanner import OptionChainScanner, is_target_bracketed
+
+
+class FakeEvent:
+    """Minimal stand-in for an eventkit Event."""
+
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        self.handlers.remove(handler)
+        return self
+
+    def emit(self, *args):
+        for handler in list(self.handlers):
+            handler(*args)
+
+
+def qualify(*contracts):
+    """Qualify contracts the way IB does, by filling in their conId."""
+    for con_id, contract in enumerate(contracts, start=1):
+        contract.conId = con_id
+    return list(contracts)
+
+
+def make_contract(symbol, expiry="", strike=0.0, right="", exchange="SMART"):
+    return SimpleNamespace(
+        symbol=symbol,
+        secType="OPT" if right else "STK",
+        lastTradeDateOrContractMonth=expiry,
+        strike=strike,
+        right=right,
+        conId=0,
+    )
+
+
+def make_stock(symbol, exchange="SMART", currency="USD"):
+    return make_contract(symbol)
+
+
+def ticker(delta=None, bid=None, ask=None):
+    result = Mock()
+    result.modelGreeks = Mock(delta=delta) if delta is not None else None
+    result.bid = bid
+    result.ask = ask
+    return result
+
+
+@pytest.fixture(autouse=True)
+def mock_contracts():
+    with (
+        patch("app.chain_scanner.Option", side_effect=make_contract),
+        patch("app.chain_scanner.Stock", side_effect=make_stock),
+    ):
+        yield
+
+
+@pytest.fixture
+def mock_ib_client():
+    client = Mock(spec=IB)
+    client.qualifyContractsAsync = AsyncMock(side_effect=qualify)
+    client.reqSecDefOptParamsAsync = AsyncMock()
+    client.reqMktData = Mock()
+    client.cancelMktData = Mock()
+    client.pendingTickersEvent = FakeEvent()
+    return client
+
+
+@pytest.fixture
+def scanner(mock_ib_client):
+    return OptionChainScanner(mock_ib_client, greeks_timeout=1.0, contract_cache=ContractCache())
+
+
+def test_is_target_bracketed():
+    """Test that only adjacent strikes straddling the target bracket it."""
+    strikes = [440.0, 442.0, 444.0, 446.0]
+
+    assert is_target_bracketed(strikes, {442.0: 0.12, 444.0: 0.18}, 0.15)
+    # The closest strike could still be 442 or 444
+    assert not is_target_bracketed(strikes, {440.0: 0.10, 446.0: 0.30}, 0.15)
+    assert not is_target_bracketed(strikes, {440.0: 0.10, 442.0: 0.12}, 0.15)
+
+
+@pytest.mark.asyncio
+async def test_scan_qualifies_all_strikes_in_one_batch(scanner, mock_ib_client):
+    """Test that all candidate strikes are qualified with a single request."""
+    mock_ib_client.reqMktData.side_effect = [ticker(-0.2), ticker(-0.3), ticker(-0.4)]
+
+    deltas = await scanner.scan_deltas("QQQ", "20250110", "P", [444.0, 442.0, 446.0])
+
+    mock_ib_client.qualifyContractsAsync.assert_awaited_once()
+    assert len(mock_ib_client.qualifyContractsAsync.await_args[0]) == 3
+    assert deltas == {442.0: 0.2, 444.0: 0.3, 446.0: 0.4}
+    assert mock_ib_client.cancelMktData.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_scan_returns_once_targets_are_bracketed(scanner, mock_ib_client):
+    """Test that the scan stops waiting for strikes that can no longer matter."""
+    tickers = [ticker() for _ in range(5)]
+    mock_ib_client.reqMktData.side_effect = tickers
+
+    start = time.monotonic()
+    scan = asyncio.create_task(
+        scanner.scan_deltas(
+            "QQQ", "20250110", "P", [440.0, 442.0, 444.0, 446.0, 448.0], target_deltas=(0.3,)
+        )
+    )
+    await asyncio.sleep(0)
+
+    # Only the strikes either side of 0.30 report; the far strikes never do
+    tickers[2].modelGreeks = Mock(delta=-0.25)
+    tickers[3].modelGreeks = Mock(delta=-0.33)
+    mock_ib_client.pendingTickersEvent.emit({tickers[2], tickers[3]})
+
+    deltas = await asyncio.wait_for(scan, timeout=0.5)
+
+    assert deltas == {444.0: 0.25, 446.0: 0.33}
+    assert time.monotonic() - start < 0.5
+    assert mock_ib_client.pendingTickersEvent.handlers == []
+    assert mock_ib_client.cancelMktData.call_count == 5
+
+
+@pytest.mark.asyncio
+async def test_scan_returns_partial_deltas_on_timeout(scanner, mock_ib_client):
+    """Test that strikes without greeks are left out after the timeout."""
+    mock_ib_client.reqMktData.side_effect = [ticker(-0.2), ticker()]
+
+    deltas = await scanner.scan_deltas(
+        "QQQ", "20250110", "P", [440.0, 442.0], target_deltas=(0.3,), timeout=0.01
+    )
+
+    assert deltas == {440.0: 0.2}
+    assert mock_ib_client.cancelMktData.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_strikes_for_expiration(scanner, mock_ib_client):
+    """Test that strikes come from the chain listing the expiration."""
+    mock_ib_client.reqSecDefOptParamsAsync.return_value = [
+        SimpleNamespace(
+            exchange="SMART", tradingClass="QQQ", expirations=["20250117"], strikes=[500.0]
+        ),
+        SimpleNamespace(
+            exchange="CBOE", tradingClass="QQQ", expirations=["20250110"], strikes=[452.0, 450.0]
+        ),
+    ]
+
+    assert await scanner.get_strikes("QQQ", "20250110") == [450.0, 452.0]
+    assert await scanner.get_strikes("QQQ", "20250124") == []
+    # The chain is requested once and then served from the contract cache
+    mock_ib_client.reqSecDefOptParamsAsync.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_scan_skips_qualification_of_cached_strikes(scanner, mock_ib_client):
+    """Test that strikes qualified earlier in the day are not looked up again."""
+    mock_ib_client.reqMktData.side_effect = lambda *args: ticker(-0.3)
+    await scanner.scan_deltas("QQQ", "20250110", "P", [440.0, 442.0])
+
+    await scanner.scan_deltas("QQQ", "20250110", "P", [440.0, 442.0, 444.0])
+
+    assert mock_ib_client.qualifyContractsAsync.await_count == 2
+    assert len(mock_ib_client.qualifyContractsAsync.await_args[0]) == 1
+
+
+@pytest.mark.asyncio
+async def test_scan_computes_deltas_from_quotes_without_model_greeks(scanner, mock_ib_client):
+    """Test that quotes give deltas for strikes IB has not sent greeks for."""
+    strikes = [440.0, 445.0, 450.0]
+    t = 7 / 365
+    mids = bs_price(450.0, strikes, t, 0.045, 0.2, False)
+    mock_ib_client.reqMktData.side_effect = [
+        ticker(bid=mid - 0.01, ask=mid + 0.01) for mid in mids[:2]
+    ] + [ticker(delta=-0.5)]
+
+    with patch("app.chain_scanner.time_to_expiry", return_value=t):
+        deltas = await scanner.scan_deltas(
+            "QQQ", "20250110", "P", strikes, timeout=0.01, underlying_price=450.0
+        )
+
+    expected = abs(bs_delta(450.0, strikes[:2], t, 0.045, 0.2, False))
+    assert deltas[440.0] == pytest.approx(expected[0], abs=1e-6)
+    assert deltas[445.0] == pytest.approx(expected[1], abs=1e-6)
+    # IB's model delta is kept where it was sent
+    assert deltas[450.0] == 0.5
@@ -2,12 +2,16 @@
 
 # Import from trading_bot package
 import sys
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from unittest.mock import Mock, patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
+import pytz
 from ib_insync import IB
+from spreadpilot_core.ibkr.bar_store import BarStore
+from spreadpilot_core.ibkr.contract_cache import ContractCache
 
 # Add trading-bot directory to path
 trading_bot_dir = Path(__file__).parent.parent.parent
@@ -16,15 +20,73 @@ sys.path.insert(0, str(trading_bot_dir))
 from app.signal_generator import QQQSignalGenerator
 
 
+def qualify(*contracts):
+    """Qualify contracts the way IB does, by filling in their conId."""
+    for con_id, contract in enumerate(contracts, start=1):
+        contract.conId = con_id
+    return list(contracts)
+
+
+def make_contract(symbol, expiry="", strike=0.0, right="", exchange="SMART"):
+    """Create a contract the contract cache can key."""
+    return SimpleNamespace(
+        symbol=symbol,
+        secType="OPT" if right else "STK",
+        lastTradeDateOrContractMonth=expiry,
+        strike=strike,
+        right=right,
+        conId=0,
+    )
+
+
+def make_stock(symbol, exchange="SMART", currency="USD"):
+    return make_contract(symbol)
+
+
+def make_bars(closes, start=date(2024, 10, 1)):
+    """Create consecutive daily bars with the given closes."""
+    return [
+        SimpleNamespace(
+            date=start + timedelta(days=i), open=close, high=close, low=close, close=close, volume=0
+        )
+        for i, close in enumerate(closes)
+    ]
+
+
+def feed(generator, closes):
+    """Feed closes to the generator's trend indicators."""
+    for close in closes:
+        generator._indicators.update(close)
+
+
+def greeks_ticker(delta):
+    """Create an option ticker with the given model delta."""
+    ticker = Mock()
+    ticker.modelGreeks = Mock(delta=delta) if delta is not None else None
+    return ticker
+
+
+@pytest.fixture(autouse=True)
+def mock_contracts():
+    """Build contracts as plain objects so they can be cached and qualified."""
+    with (
+        patch("app.chain_scanner.Option", side_effect=make_contract),
+        patch("app.chain_scanner.Stock", side_effect=make_stock),
+        patch("app.signal_generator.Stock", side_effect=make_stock),
+    ):
+        yield
+
+
 @pytest.fixture
 def mock_ib_client():
     """Create a mock IBKR client."""
     client = Mock(spec=IB)
-    client.qualifyContracts = Mock(return_value=[])
+    client.qualifyContractsAsync = AsyncMock(side_effect=qualify)
     client.reqMktData = Mock()
     client.cancelMktData = Mock()
-    client.reqHistoricalData = Mock()
-    client.reqSecDefOptParams = Mock()
+    client.reqHistoricalDataAsync = AsyncMock(return_value=[])
+    client.reqSecDefOptParamsAsync = AsyncMock()
+    client.pendingTickersEvent = MagicMock()
     return client
 
 
@@ -38,6 +100,8 @@ def signal_generator(mock_ib_client):
         sma_short_period=20,
         sma_long_period=50,
         qty_per_leg=1,
+        contract_cache=ContractCache(),
+        bar_store=BarStore(),
     )
 
 
@@ -54,8 +118,8 @@ class TestQQQSignalGeneratorInit:
         assert generator.sma_short_period == 20
         assert generator.sma_long_period == 50
         assert generator.qty_per_leg == 1
-        assert generator._price_cache == []
-        assert generator._cache_updated is None
+        assert generator._indicators.count == 0
+        assert generator._last_bar_date is None
 
     def test_initialization_with_custom_params(self, mock_ib_client):
         """Test initialization with custom parameters."""
@@ -101,7 +165,7 @@ class TestGetCurrentPrice:
         price = await signal_generator._get_current_price()
 
         assert price == 450.25
-        mock_ib_client.qualifyContracts.assert_called_once()
+        mock_ib_client.qualifyContractsAsync.assert_awaited_once()
         mock_ib_client.reqMktData.assert_called_once()
         mock_ib_client.cancelMktData.assert_called_once()
 
@@ -150,8 +214,7 @@ class TestDetermineStrategy:
     async def test_determine_strategy_bullish(self, signal_generator):
         """Test bullish strategy determination (SMA short > SMA long)."""
         # Set up price cache with bullish trend
-        signal_generator._price_cache = [100 + i * 0.5 for i in range(50)]
-        signal_generator._cache_updated = datetime.utcnow()
+        feed(signal_generator, [100 + i * 0.5 for i in range(50)])
 
         strategy = await signal_generator._determine_strategy(current_price=125.0)
 
@@ -161,8 +224,7 @@ class TestDetermineStrategy:
     async def test_determine_strategy_bearish(self, signal_generator):
         """Test bearish strategy determination (SMA short < SMA long)."""
         # Set up price cache with bearish trend
-        signal_generator._price_cache = [150 - i * 0.5 for i in range(50)]
-        signal_generator._cache_updated = datetime.utcnow()
+        feed(signal_generator, [150 - i * 0.5 for i in range(50)])
 
         strategy = await signal_generator._determine_strategy(current_price=125.0)
 
@@ -172,8 +234,7 @@ class TestDetermineStrategy:
     async def test_determine_strategy_neutral(self, signal_generator):
         """Test neutral strategy when SMAs are equal."""
         # Set up price cache with no clear trend
-        signal_generator._price_cache = [100.0] * 50
-        signal_generator._cache_updated = datetime.utcnow()
+        feed(signal_generator, [100.0] * 50)
 
         strategy = await signal_generator._determine_strategy(current_price=100.0)
 
@@ -183,8 +244,7 @@ class TestDetermineStrategy:
     async def test_determine_strategy_insufficient_data_uses_fallback(self, signal_generator):
         """Test fallback when insufficient data for SMA calculation."""
         # Set up price cache with insufficient data
-        signal_generator._price_cache = [100.0, 101.0, 102.0, 103.0, 104.0]
-        signal_generator._cache_updated = datetime.utcnow()
+        feed(signal_generator, [100.0, 101.0, 102.0, 103.0, 104.0])
 
         with patch.object(
             signal_generator, "_fallback_strategy", return_value="Long"
@@ -197,7 +257,7 @@ class TestDetermineStrategy:
     @pytest.mark.asyncio
     async def test_determine_strategy_exception(self, signal_generator):
         """Test exception handling in strategy determination."""
-        signal_generator._price_cache = None  # Force an error
+        signal_generator._indicators = None  # Force an error
 
         strategy = await signal_generator._determine_strategy(current_price=100.0)
 
@@ -210,7 +270,7 @@ class TestFallbackStrategy:
     @pytest.mark.asyncio
     async def test_fallback_strategy_bullish_momentum(self, signal_generator):
         """Test bullish momentum detection."""
-        signal_generator._price_cache = [100.0, 101.0, 102.0, 103.0, 104.0]
+        feed(signal_generator, [100.0, 101.0, 102.0, 103.0, 104.0])
 
         strategy = await signal_generator._fallback_strategy(current_price=106.0)
 
@@ -219,7 +279,7 @@ class TestFallbackStrategy:
     @pytest.mark.asyncio
     async def test_fallback_strategy_bearish_momentum(self, signal_generator):
         """Test bearish momentum detection."""
-        signal_generator._price_cache = [110.0, 109.0, 108.0, 107.0, 106.0]
+        feed(signal_generator, [110.0, 109.0, 108.0, 107.0, 106.0])
 
         strategy = await signal_generator._fallback_strategy(current_price=104.0)
 
@@ -228,7 +288,7 @@ class TestFallbackStrategy:
     @pytest.mark.asyncio
     async def test_fallback_strategy_neutral_defaults_long(self, signal_generator):
         """Test neutral momentum defaults to Long."""
-        signal_generator._price_cache = [100.0, 100.5, 99.5, 100.0, 100.0]
+        feed(signal_generator, [100.0, 100.5, 99.5, 100.0, 100.0])
 
         strategy = await signal_generator._fallback_strategy(current_price=100.0)
 
@@ -237,7 +297,7 @@ class TestFallbackStrategy:
     @pytest.mark.asyncio
     async def test_fallback_strategy_insufficient_data(self, signal_generator):
         """Test insufficient data defaults to Long."""
-        signal_generator._price_cache = [100.0, 101.0]
+        feed(signal_generator, [100.0, 101.0])
 
         strategy = await signal_generator._fallback_strategy(current_price=102.0)
 
@@ -246,7 +306,7 @@ class TestFallbackStrategy:
     @pytest.mark.asyncio
     async def test_fallback_strategy_exception(self, signal_generator):
         """Test exception handling defaults to Long."""
-        signal_generator._price_cache = None  # Force an error
+        signal_generator._indicators = None  # Force an error
 
         strategy = await signal_generator._fallback_strategy(current_price=100.0)
 
@@ -254,67 +314,77 @@ class TestFallbackStrategy:
 
 
 class TestUpdatePriceHistory:
-    """Test historical price data updates."""
+    """Test feeding stored daily bars to the trend indicators."""
 
     @pytest.mark.asyncio
     async def test_update_price_history_success(self, signal_generator, mock_ib_client):
         """Test successful price history update."""
-        # Mock historical bars
-        mock_bars = [Mock(close=100.0 + i) for i in range(60)]
-        mock_ib_client.reqHistoricalData.return_value = mock_bars
+        mock_ib_client.reqHistoricalDataAsync.return_value = make_bars(
+            [100.0 + i for i in range(60)]
+        )
 
         await signal_generator._update_price_history()
 
-        assert len(signal_generator._price_cache) == 60
-        assert signal_generator._price_cache[0] == 100.0
-        assert signal_generator._price_cache[-1] == 159.0
-        assert signal_generator._cache_updated is not None
+        assert signal_generator._indicators.count == 60
+        assert signal_generator._indicators.last_close == 159.0
+        assert signal_generator._indicators.sma(20) == sum(range(140, 160)) / 20
+        assert signal_generator._last_bar_date == "20241129"
 
     @pytest.mark.asyncio
-    async def test_update_price_history_cached(self, signal_generator):
-        """Test that cache is not updated if fresh."""
-        signal_generator._cache_updated = datetime.utcnow()
-        signal_generator._price_cache = [100.0] * 50
+    async def test_update_price_history_cached(self, signal_generator, mock_ib_client):
+        """Test that bars are requested once a day and fed to the indicators once."""
+        mock_ib_client.reqHistoricalDataAsync.return_value = make_bars([100.0] * 50)
 
+        await signal_generator._update_price_history()
         await signal_generator._update_price_history()
 
-        # Cache should remain unchanged
-        assert len(signal_generator._price_cache) == 50
+        mock_ib_client.reqHistoricalDataAsync.assert_awaited_once()
+        assert signal_generator._indicators.count == 50
 
     @pytest.mark.asyncio
-    async def test_update_price_history_expired_cache(self, signal_generator, mock_ib_client):
-        """Test that expired cache is updated."""
-        signal_generator._cache_updated = datetime.utcnow() - timedelta(hours=2)
-        signal_generator._price_cache = [100.0] * 50
-
-        mock_bars = [Mock(close=200.0 + i) for i in range(60)]
-        mock_ib_client.reqHistoricalData.return_value = mock_bars
+    async def test_update_price_history_next_day_is_incremental(
+        self, signal_generator, mock_ib_client
+    ):
+        """Test that a new day only requests and feeds bars since the last one."""
+        ny = pytz.timezone("America/New_York")
+        mock_ib_client.reqHistoricalDataAsync.return_value = make_bars([100.0] * 50)
+        with patch(
+            "spreadpilot_core.ibkr.bar_store.get_ny_time",
+            return_value=ny.localize(datetime(2024, 11, 20, 9, 0)),
+        ):
+            await signal_generator._update_price_history()
 
-        await signal_generator._update_price_history()
+        mock_ib_client.reqHistoricalDataAsync.return_value = make_bars(
+            [100.0, 130.0], start=date(2024, 11, 19)
+        )
+        with patch(
+            "spreadpilot_core.ibkr.bar_store.get_ny_time",
+            return_value=ny.localize(datetime(2024, 11, 21, 9, 0)),
+        ):
+            await signal_generator._update_price_history()
 
-        # Cache should be updated with new data
-        assert signal_generator._price_cache[0] == 200.0
-        assert len(signal_generator._price_cache) == 60
+        assert mock_ib_client.reqHistoricalDataAsync.await_args.kwargs["durationStr"] == "3 D"
+        assert signal_generator._indicators.count == 51
+        assert signal_generator._indicators.last_close == 130.0
+        assert signal_generator._indicators.sma(5) == 106.0
 
     @pytest.mark.asyncio
     async def test_update_price_history_no_data(self, signal_generator, mock_ib_client):
         """Test handling of empty historical data."""
-        mock_ib_client.reqHistoricalData.return_value = []
+        mock_ib_client.reqHistoricalDataAsync.return_value = []
 
         await signal_generator._update_price_history()
 
-        # Cache should remain empty
-        assert signal_generator._price_cache == []
+        assert signal_generator._indicators.count == 0
 
     @pytest.mark.asyncio
     async def test_update_price_history_exception(self, signal_generator, mock_ib_client):
         """Test exception handling during update."""
-        mock_ib_client.reqHistoricalData.side_effect = Exception("API error")
+        mock_ib_client.reqHistoricalDataAsync.side_effect = Exception("API error")
 
         await signal_generator._update_price_history()
 
-        # Cache should remain unchanged
-        assert signal_generator._price_cache == []
+        assert signal_generator._indicators.count == 0
 
 
 class TestGetNextExpiration:
@@ -363,25 +433,21 @@ class TestSelectStrikesByDelta:
         mock_chain = Mock()
         mock_chain.expirations = ["20250110"]
         mock_chain.strikes = [440.0, 442.0, 444.0, 446.0, 448.0, 450.0]
-        mock_ib_client.reqSecDefOptParams.return_value = [mock_chain]
+        mock_ib_client.reqSecDefOptParamsAsync.return_value = [mock_chain]
 
-        # Mock option Greeks
-        mock_ticker_30 = Mock()
-        mock_ticker_30.modelGreeks = Mock(delta=0.30)
-        mock_ticker_15 = Mock()
-        mock_ticker_15.modelGreeks = Mock(delta=0.15)
-
-        mock_ib_client.reqMktData.side_effect = [mock_ticker_30, mock_ticker_15]
+        # Mock option Greeks for puts at 440-448
+        mock_ib_client.reqMktData.side_effect = [
+            greeks_ticker(delta) for delta in (-0.10, -0.15, -0.21, -0.30, -0.42)
+        ]
 
         strikes = await signal_generator._select_strikes_by_delta(
             current_price=450.0, expiration="20250110", strategy="Long"
         )
 
-        assert strikes is not None
-        strike_long, strike_short = strikes
-        assert strike_long < strike_short  # Bull Put: long < short
-        assert strike_long < 450.0  # Both below current price
-        assert strike_short < 450.0
+        assert strikes == (442.0, 446.0)  # Bull Put: long < short, both below price
+        # All strikes are subscribed together and cancelled afterwards
+        assert mock_ib_client.reqMktData.call_count == 5
+        assert mock_ib_client.cancelMktData.call_count == 5
 
     @pytest.mark.asyncio
     async def test_select_strikes_short_strategy(self, signal_generator, mock_ib_client):
@@ -390,30 +456,23 @@ class TestSelectStrikesByDelta:
         mock_chain = Mock()
         mock_chain.expirations = ["20250110"]
         mock_chain.strikes = [450.0, 452.0, 454.0, 456.0, 458.0, 460.0]
-        mock_ib_client.reqSecDefOptParams.return_value = [mock_chain]
+        mock_ib_client.reqSecDefOptParamsAsync.return_value = [mock_chain]
 
-        # Mock option Greeks
-        mock_ticker_30 = Mock()
-        mock_ticker_30.modelGreeks = Mock(delta=-0.30)
-        mock_ticker_15 = Mock()
-        mock_ticker_15.modelGreeks = Mock(delta=-0.15)
-
-        mock_ib_client.reqMktData.side_effect = [mock_ticker_30, mock_ticker_15]
+        # Mock option Greeks for calls at 452-460
+        mock_ib_client.reqMktData.side_effect = [
+            greeks_ticker(delta) for delta in (0.40, 0.31, 0.22, 0.16, 0.11)
+        ]
 
         strikes = await signal_generator._select_strikes_by_delta(
             current_price=450.0, expiration="20250110", strategy="Short"
         )
 
-        assert strikes is not None
-        strike_long, strike_short = strikes
-        assert strike_long > strike_short  # Bear Call: long > short
-        assert strike_long > 450.0  # Both above current price
-        assert strike_short > 450.0
+        assert strikes == (458.0, 454.0)  # Bear Call: long > short, both above price
 
     @pytest.mark.asyncio
     async def test_select_strikes_no_chains(self, signal_generator, mock_ib_client):
         """Test handling when no option chains available."""
-        mock_ib_client.reqSecDefOptParams.return_value = []
+        mock_ib_client.reqSecDefOptParamsAsync.return_value = []
 
         strikes = await signal_generator._select_strikes_by_delta(
             current_price=450.0, expiration="20250110", strategy="Long"
@@ -427,7 +486,7 @@ class TestSelectStrikesByDelta:
         mock_chain = Mock()
         mock_chain.expirations = ["20250117", "20250124"]
         mock_chain.strikes = [440.0, 442.0, 444.0]
-        mock_ib_client.reqSecDefOptParams.return_value = [mock_chain]
+        mock_ib_client.reqSecDefOptParamsAsync.return_value = [mock_chain]
 
         strikes = await signal_generator._select_strikes_by_delta(
             current_price=450.0, expiration="20250110", strategy="Long"
@@ -441,7 +500,7 @@ class TestSelectStrikesByDelta:
         mock_chain = Mock()
         mock_chain.expirations = ["20250110"]
         mock_chain.strikes = [448.0]  # Only one strike
-        mock_ib_client.reqSecDefOptParams.return_value = [mock_chain]
+        mock_ib_client.reqSecDefOptParamsAsync.return_value = [mock_chain]
 
         strikes = await signal_generator._select_strikes_by_delta(
             current_price=450.0, expiration="20250110", strategy="Long"
@@ -455,12 +514,11 @@ class TestSelectStrikesByDelta:
         mock_chain = Mock()
         mock_chain.expirations = ["20250110"]
         mock_chain.strikes = [440.0, 442.0, 444.0, 446.0, 448.0, 450.0]
-        mock_ib_client.reqSecDefOptParams.return_value = [mock_chain]
+        mock_ib_client.reqSecDefOptParamsAsync.return_value = [mock_chain]
 
         # Mock ticker with no Greeks
-        mock_ticker = Mock()
-        mock_ticker.modelGreeks = None
-        mock_ib_client.reqMktData.return_value = mock_ticker
+        mock_ib_client.reqMktData.return_value = greeks_ticker(None)
+        signal_generator.chain_scanner.greeks_timeout = 0.01
 
         with patch.object(
             signal_generator,
@@ -480,10 +538,10 @@ class TestSelectStrikesByDelta:
         mock_chain = Mock()
         mock_chain.expirations = ["20250110"]
         mock_chain.strikes = [440.0, 442.0]
-        mock_ib_client.reqSecDefOptParams.return_value = [mock_chain]
+        mock_ib_client.reqSecDefOptParamsAsync.return_value = [mock_chain]
 
-        # Mock ticker that raises exception
-        mock_ib_client.reqMktData.side_effect = Exception("Connection error")
+        # Mock second subscription raising an exception
+        mock_ib_client.reqMktData.side_effect = [greeks_ticker(None), Exception("Connection error")]
 
         with patch.object(
             signal_generator,
@@ -498,6 +556,39 @@ class TestSelectStrikesByDelta:
             assert mock_ib_client.cancelMktData.called
 
 
+class TestPrewarmContracts:
+    """Test warming the contract cache before the open."""
+
+    @pytest.mark.asyncio
+    async def test_prewarm_caches_strikes_near_last_close(self, signal_generator, mock_ib_client):
+        """Test that strikes near the last close are qualified ahead of the signal."""
+        mock_chain = Mock()
+        mock_chain.expirations = ["20250110"]
+        mock_chain.strikes = [400.0, 440.0, 450.0, 460.0, 500.0]
+        mock_ib_client.reqSecDefOptParamsAsync.return_value = [mock_chain]
+        feed(signal_generator, [450.0] * 50)
+
+        with (
+            patch("app.signal_generator.get_ny_time", return_value=datetime(2025, 1, 10, 9, 0)),
+            patch(
+                "spreadpilot_core.ibkr.contract_cache.Option",
+                side_effect=lambda **kwargs: make_contract(
+                    kwargs["symbol"],
+                    kwargs["lastTradeDateOrContractMonth"],
+                    kwargs["strike"],
+                    kwargs["right"],
+                ),
+            ),
+        ):
+            count = await signal_generator.prewarm_contracts()
+
+        # Puts and calls at 440, 450 and 460 are within 8% of 450
+        assert count == 6
+        cache = signal_generator.chain_scanner.contract_cache
+        assert cache.get_con_id(make_contract("QQQ", "20250110", 440.0, "P"))
+        assert cache.get_con_id(make_contract("QQQ", "20250110", 400.0, "P")) is None
+
+
 class TestFallbackStrikeSelection:
     """Test fallback strike selection using percentage offsets."""
 